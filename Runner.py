@@ -83,17 +83,30 @@ def main():
         logger.addHandler(syslog)
         logger.setLevel(logging.INFO)
 
-    feed, api = getFeed(
-        creds, broker=config['Broker'], underlyings=config['Underlyings'])
+    replay = config.get('Replay', None)
+    if replay is not None:
+        # Every strategy replays the recorded ticks on a feed of its own
+        from pyalgomate.backtesting.ReplayFeed import ReplayFeed
+        feed, api = None, None
+        logger.info(f"Replaying {replay['Path']} at speed {replay.get('Speed', None)}....")
+    else:
+        feed, api = getFeed(
+            creds, broker=config['Broker'], underlyings=config['Underlyings'])
 
-    logger.info(f"Starting {config['Broker']} data feed....")
-    feed.start()
+        logger.info(f"Starting {config['Broker']} data feed....")
+        feed.start()
 
     for strategyName, details in config['Strategies'].items():
         try:
             strategyClassName = details['Class']
             strategyPath = details['Path']
             strategyMode = details['Mode']
+            strategyFeed = feed
+            if replay is not None:
+                strategyFeed = ReplayFeed(replay['Path'], replay.get('Speed', None))
+                if str(strategyMode).lower() != 'paper':
+                    logger.warning(f'Paper trading <{strategyName}> since its ticks are replayed')
+                    strategyMode = 'paper'
             strategyArgs = details['Args'] if details['Args'] is not None else list(
             )
             strategyArgs.append({'telegramBot': telegramBot})
@@ -106,7 +119,7 @@ def main():
             strategyArgsDict = {
                 key: value for item in strategyArgs for key, value in item.items()}
 
-            broker = getBroker(feed, api, config['Broker'], strategyMode)
+            broker = getBroker(strategyFeed, api, config['Broker'], strategyMode)
 
             if hasattr(strategyClass, 'getAdditionalArgs') and callable(getattr(strategyClass, 'getAdditionalArgs')):
                 additionalArgs = strategyClass.getAdditionalArgs(broker)
@@ -117,7 +130,7 @@ def main():
                             strategyArgsDict[key] = value
 
             strategyInstance = strategyClass(
-                feed=feed, broker=broker, **strategyArgsDict)
+                feed=strategyFeed, broker=broker, **strategyArgsDict)
 
             strategies.append(strategyInstance)
         except Exception as e:
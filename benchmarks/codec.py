@@ -0,0 +1,71 @@
+"""
+Throughput and size of the binary bar codec against the BasicBarEx JSON round trip and DataFrame.to_json.
+
+Run from the repository root with `python -m benchmarks.codec`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import time
+
+import pandas as pd
+from pyalgotrade import bar
+
+from pyalgomate.barfeed.BasicBarEx import BasicBarEx
+from pyalgomate.barfeed.codec import BarCodec
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+
+if __name__ == "__main__":
+    instrumentCount = 300
+    repeat = 50
+    now = datetime.datetime.now().replace(microsecond=0)
+    instruments = [f'NFO|BANKNIFTY24APR{44000 + (i // 2) * 100}{"C" if i % 2 else "P"}'
+                   for i in range(instrumentCount)]
+    basicBars = [BasicBarEx(now, 100.5 + i, 101.5 + i, 99.5 + i, 100.75 + i, 1000 + i, None, bar.Frequency.MINUTE,
+                            {"Instrument": instrument, "Open Interest": 5000 + i})
+                 for i, instrument in enumerate(instruments)]
+    bars = bar.Bars(dict(zip(instruments, basicBars)))
+
+    def measure(name, function):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            size = function()
+        elapsed = time.perf_counter() - start
+        print(f'{name:<24} {repeat * instrumentCount / elapsed:12.0f} bars/s {size / instrumentCount:8.1f} bytes/bar')
+
+    def jsonRoundTrip():
+        encoded = [basicBar.to_json() for basicBar in basicBars]
+        [BasicBarEx.from_json(data) for data in encoded]
+        return sum(len(data) for data in encoded)
+
+    def dataFrameJson():
+        df = pd.DataFrame([{"Ticker": instrument, "Date/Time": basicBar.getDateTime(), "Open": basicBar.getOpen(),
+                            "High": basicBar.getHigh(), "Low": basicBar.getLow(), "Close": basicBar.getClose(),
+                            "Volume": basicBar.getVolume(),
+                            "Open Interest": basicBar.getExtraColumns().get("Open Interest", 0)}
+                           for instrument, basicBar in bars.items()])
+        data = df.to_json()
+        pd.read_json(data)
+        return len(data)
+
+    codec = BarCodec()
+
+    def binaryRoundTrip():
+        data = codec.encodeBars(bars)
+        codec.decode(data)
+        return len(data)
+
+    quoteBars = [QuoteBar(now, basicBar.getClose(), basicBar.getClose(), basicBar.getClose(), basicBar.getClose(),
+                          basicBar.getVolume(), 5000, instrument, now) for instrument, basicBar in bars.items()]
+
+    def binaryTickRoundTrip():
+        data = codec.encodeTicks(quoteBars)
+        codec.decode(data)
+        return len(data)
+
+    measure('BasicBarEx JSON', jsonRoundTrip)
+    measure('DataFrame JSON', dataFrameJson)
+    measure('binary bars', binaryRoundTrip)
+    measure('binary ticks', binaryTickRoundTrip)
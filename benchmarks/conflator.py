@@ -0,0 +1,83 @@
+"""
+A websocket thread queues ~2000 ticks a second over 81 instruments while the dispatcher runs a strategy whose onBars
+costs 1 ms, the order of a greeks update. Without conflation every tick is an onBars and the queue grows without bound.
+With :class:`pyalgomate.barfeed.conflator.TickConflator` the strategy keeps up and sees the latest tick of every
+instrument.
+
+Run from the repository root with `python -m benchmarks.conflator`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import queue
+import random
+import threading
+import time
+
+from pyalgomate.barfeed.conflator import TickConflator
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+
+if __name__ == "__main__":
+    instruments = ['NSE|NIFTY BANK'] + [f'NFO|BANKNIFTY24APR{44000 + (i // 2) * 100}{"CE" if i % 2 else "PE"}'
+                                        for i in range(80)]
+    ticksPerSecond = 2000
+    onBarsCost = 0.001
+    duration = 3
+
+    def produceTicks(ticks, stopped):
+        start = time.perf_counter()
+        count = 0
+        while not stopped.is_set():
+            instrument = random.choice(instruments)
+            price = random.uniform(50, 500)
+            ticks.put(QuoteBar(datetime.datetime.now(), price, price, price, price, 0, 0, instrument))
+            count += 1
+            if count % 20 == 0:
+                delay = start + count / ticksPerSecond - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def run(window):
+        ticks = queue.Queue()
+        stopped = threading.Event()
+        producer = threading.Thread(target=produceTicks, args=(ticks, stopped))
+        producer.start()
+
+        conflator = TickConflator(window if window is not None else TickConflator.DRAIN_ALL)
+        # The lag of a batch is measured from its first pending tick, the one that waited the longest. The bars
+        # are stamped with the latest tick.
+        firstDateTime = None
+        lags = []
+        endTime = time.perf_counter() + duration
+        while time.perf_counter() < endTime:
+            conflator.recordQueueDepth(ticks.qsize())
+            try:
+                tick = ticks.get(True, 0.01)
+                if len(conflator) == 0:
+                    firstDateTime = tick.getDateTime()
+                conflator.add(tick)
+                # One onBars per tick, as the feeds used to do, unless conflating
+                for _ in range(ticks.qsize() if window is not None else 0):
+                    conflator.add(ticks.get_nowait())
+            except queue.Empty:
+                pass
+            bars = conflator.pop()
+            if bars is None:
+                continue
+            lags.append((datetime.datetime.now() - firstDateTime).total_seconds())
+            time.sleep(onBarsCost)
+
+        stopped.set()
+        producer.join()
+        backlog = ticks.qsize()
+        name = 'per tick' if window is None else ('drain all' if window == TickConflator.DRAIN_ALL else
+                                                  f'{window * 1000:.0f} ms')
+        print(f'{name:<10} {len(lags) / duration:7.0f} onBars/s, ratio {conflator.getConflationRatio():6.1f} '
+              f'ticks/onBars, max queue depth {max(conflator.getMaxQueueDepth(), backlog):6d}, '
+              f'mean lag {sum(lags) / max(len(lags), 1) * 1000:7.1f} ms')
+
+    random.seed(1)
+    for window in (None, TickConflator.DRAIN_ALL, 0.05, 0.25):
+        run(window)
@@ -0,0 +1,55 @@
+"""
+Cost of a lookup when every call parses the symbol, as the brokers used to do, and when
+:class:`pyalgomate.brokers.contracts.OptionContractRegistry` serves it from its cache, for a chain of weekly Finvasia
+symbols. Then the cost of finding the symbol of a strike by scanning every contract, as the strategies used to do, and
+through :class:`pyalgomate.brokers.contracts.StrikeLadder`.
+
+Run from the repository root with `python -m benchmarks.contracts`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import re
+import timeit
+
+from pyalgomate.brokers.contracts import OptionContractParser, OptionContractRegistry, buildStrikeLadders, \
+    datedGrammar
+from pyalgomate.strategies import OptionContract
+
+
+if __name__ == "__main__":
+    def parse(symbol):
+        m = re.match(r"([A-Z\|]+)(\d{2})([A-Z]{3})(\d{2})([CP])(\d+)", symbol)
+        expiry = datetime.date(int(m.group(4)) + 2000, datetime.datetime.strptime(m.group(3), '%b').month,
+                               int(m.group(2)))
+        return OptionContract(symbol, int(m.group(6)), expiry, "c" if m.group(5) == "C" else "p", m.group(1))
+
+    symbols = [f'NFO|BANKNIFTY10APR24{type_}{strike}' for strike in range(44000, 52000, 100) for type_ in 'CP']
+    registry = OptionContractRegistry(OptionContractParser([datedGrammar(r'[A-Z\|]+')]))
+    registry.register(symbols)
+
+    repeat = 100
+    parseTime = timeit.timeit(lambda: [parse(symbol) for symbol in symbols], number=repeat) / repeat
+    registryTime = timeit.timeit(lambda: [registry.getOptionContract(symbol) for symbol in symbols],
+                                 number=repeat) / repeat
+    print(f'parse {parseTime * 1e6 / len(symbols):.2f} us/symbol registry {registryTime * 1e6 / len(symbols):.3f} '
+          f'us/symbol')
+
+    underlying = 'NSE|NIFTY BANK'
+    contracts = [OptionContract(symbol, int(symbol[-5:]), datetime.date(2024, 4, 10), symbol[-6].lower(), underlying)
+                 for symbol in symbols]
+    ladders = buildStrikeLadders(contracts)
+    ladder = ladders[(underlying, datetime.date(2024, 4, 10))]
+    strikes = [47000 + 100 * n for n in range(-10, 11)]
+
+    def scan(strike, type_):
+        options = [opt for opt in contracts if opt.type == type_ and opt.expiry == ladder.getExpiry() and
+                   opt.underlying == underlying and opt.strike == strike]
+        return options[0].symbol if len(options) > 0 else None
+
+    scanTime = timeit.timeit(lambda: [scan(strike, 'c') for strike in strikes], number=repeat) / repeat
+    ladderTime = timeit.timeit(lambda: [ladders[(underlying, ladder.getExpiry())].getSymbol(strike, 'c')
+                                        for strike in strikes], number=repeat) / repeat
+    print(f'scan {scanTime * 1e6 / len(strikes):.2f} us/lookup ladder {ladderTime * 1e6 / len(strikes):.3f} '
+          f'us/lookup')
@@ -0,0 +1,143 @@
+"""
+Event to callback latency and CPU use of a live strategy's dispatch loop: a broker subject whose trade monitor queue is
+polled with a 10 ms timeout, like the live brokers, and a feed subject that builds bars from a tick queue, polled the
+same way. A producer thread queues ticks at a quiet and a busy rate. With the pyalgotrade dispatcher a tick that arrives
+while the broker polls waits for it, with the live dispatcher both subjects are woken up by the queues.
+
+Run from the repository root with `python -m benchmarks.dispatcher`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+from pyalgotrade import bar
+from pyalgotrade import dispatcher
+from pyalgotrade import observer
+
+from pyalgomate.barfeed import BaseBarFeed
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.core.dispatcher import LiveDispatcher, WakeUpQueue, getWakeUp
+
+QUEUE_TIMEOUT = 0.01
+
+
+class Broker(observer.Subject):
+    def __init__(self):
+        super(Broker, self).__init__()
+        self.queue = WakeUpQueue()
+        self.wakeUp = None
+
+    def onDispatcherRegistered(self, dispatcher_):
+        self.wakeUp = getWakeUp(dispatcher_)
+        self.queue.setWakeUp(self.wakeUp)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def join(self):
+        pass
+
+    def eof(self):
+        return False
+
+    def peekDateTime(self):
+        return None
+
+    def dispatch(self):
+        try:
+            self.queue.get(True, QUEUE_TIMEOUT if self.wakeUp is None else 0)
+            return True
+        except queue.Empty:
+            return False
+
+
+class Feed(BaseBarFeed):
+    def __init__(self):
+        super(Feed, self).__init__(bar.Frequency.TRADE)
+        self.queue = WakeUpQueue()
+        self.registerDataSeries('NSE|NIFTY BANK')
+        self.lastDateTime = datetime.datetime.now()
+
+    def onDispatcherRegistered(self, dispatcher_):
+        super(Feed, self).onDispatcherRegistered(dispatcher_)
+        self.queue.setWakeUp(self.getWakeUp())
+
+    def getCurrentDateTime(self):
+        return datetime.datetime.now()
+
+    def barsHaveAdjClose(self):
+        return False
+
+    def peekDateTime(self):
+        return None
+
+    def start(self):
+        super(Feed, self).start()
+
+    def stop(self):
+        pass
+
+    def join(self):
+        pass
+
+    def eof(self):
+        return False
+
+    def getNextBars(self):
+        try:
+            price = self.queue.get(True, QUEUE_TIMEOUT if self.getWakeUp() is None else 0)
+        except queue.Empty:
+            return None
+        self.lastDateTime += datetime.timedelta(microseconds=1)
+        return bar.Bars({'NSE|NIFTY BANK': QuoteBar(self.lastDateTime, price, price, price, price, 0, 0,
+                                                    'NSE|NIFTY BANK')})
+
+
+def run(name, dispatcher_, ticksPerSecond, duration=3):
+    broker = Broker()
+    feed = Feed()
+    dispatcher_.addSubject(broker)
+    dispatcher_.addSubject(feed)
+
+    sentAt = []
+    latencies = []
+    feed.getNewValuesEvent().subscribe(lambda dateTime, bars: latencies.append(time.perf_counter() - sentAt[-1]))
+
+    def produce():
+        time.sleep(0.1)
+        endTime = time.perf_counter() + duration
+        while time.perf_counter() < endTime:
+            time.sleep(random.expovariate(ticksPerSecond))
+            # One tick in flight at a time, so the latency is the tick's own
+            sentAt.append(time.perf_counter())
+            feed.queue.put(random.uniform(47000, 48000))
+            while len(latencies) < len(sentAt) and time.perf_counter() < endTime:
+                time.sleep(0)
+        dispatcher_.stop()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    cpuStart = time.process_time()
+    dispatcher_.run()
+    cpu = time.process_time() - cpuStart
+    producer.join()
+
+    latencies = np.array(latencies) * 1e6
+    print(f'{name:<10} {ticksPerSecond:4d} ticks/s: latency p50 {np.percentile(latencies, 50):6.0f} us '
+          f'p99 {np.percentile(latencies, 99):6.0f} us, CPU {cpu / (duration + 0.1) * 100:5.1f}%')
+
+
+if __name__ == "__main__":
+    random.seed(1)
+    for ticksPerSecond in (20, 500):
+        run('polling', dispatcher.Dispatcher(), ticksPerSecond)
+        run('live', LiveDispatcher(), ticksPerSecond)
@@ -0,0 +1,64 @@
+"""
+Replays a chain where the underlying moves every tick and a few options trade, solving everything on each tick and
+solving through :class:`pyalgomate.greeks.engine.GreeksEngine` with tolerances of 0.05 on the option price and 2 points
+on the underlying.
+
+Run from the repository root with `python -m benchmarks.engine`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import random
+import time
+
+import numpy as np
+
+from pyalgomate.greeks.engine import GreeksEngine
+
+
+if __name__ == "__main__":
+    strikes = np.array([44000 + (i // 2) * 100 for i in range(80)], dtype=float)
+    types = np.array(['c' if i % 2 else 'p' for i in range(80)])
+    timeToExpiries = np.full(len(strikes), 3 / 365.0)
+    ticks = 500
+
+    def priceOptions(underlyingPrice):
+        intrinsic = np.where(types == 'c', underlyingPrice - strikes, strikes - underlyingPrice)
+        return np.maximum(intrinsic, 0) + 150 * np.exp(-np.abs(underlyingPrice - strikes) / 800)
+
+    random.seed(1)
+    underlyingPrice = 46000.0
+    prices = priceOptions(underlyingPrice)
+    snapshots = []
+    for _ in range(ticks):
+        underlyingPrice += random.choice([-1.5, -0.5, 0, 0.5, 1.5])
+        moved = random.sample(range(len(strikes)), 3)
+        prices = prices.copy()
+        prices[moved] = priceOptions(underlyingPrice)[moved]
+        snapshots.append((np.full(len(strikes), underlyingPrice), prices))
+
+    # Warm up the JIT compiled solvers.
+    warmUpEngine = GreeksEngine()
+    warmUpEngine.update(warmUpEngine.addOptions(strikes, types), snapshots[0][1], snapshots[0][0], timeToExpiries)
+
+    fullEngine = GreeksEngine()
+    incrementalEngine = GreeksEngine(priceTolerance=0.05, underlyingPriceTolerance=2)
+    fullSlots = fullEngine.addOptions(strikes, types)
+    incrementalSlots = incrementalEngine.addOptions(strikes, types)
+
+    start = time.perf_counter()
+    for underlyingPrices, prices in snapshots:
+        # Force a solve of every option, like the strategy used to do.
+        fullEngine.setTolerances(-1, -1, -1)
+        fullEngine.update(fullSlots, prices, underlyingPrices, timeToExpiries)
+    fullTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for underlyingPrices, prices in snapshots:
+        incrementalEngine.update(incrementalSlots, prices, underlyingPrices, timeToExpiries)
+    incrementalTime = time.perf_counter() - start
+
+    deltaError = np.nanmax(np.abs(fullEngine.getDeltas() - incrementalEngine.getDeltas()))
+    print(f'full        : {fullTime * 1e3 / ticks:8.3f} ms/tick hit ratio {fullEngine.getHitRatio():.2f}')
+    print(f'incremental : {incrementalTime * 1e3 / ticks:8.3f} ms/tick hit ratio {incrementalEngine.getHitRatio():.2f} '
+          f'solve time {incrementalEngine.getSolveTime() * 1e3 / ticks:.3f} ms/tick max delta error {deltaError:.4f}')
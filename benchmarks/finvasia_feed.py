@@ -0,0 +1,95 @@
+"""
+Tick to bars latency of :class:`pyalgomate.brokers.finvasia.feed.LiveTradeFeed` at a realistic tick rate: an index and
+80 options ticking ~200 times a second in total, with most of the ticks on the strikes near the money. The latency of a
+bar is measured from the last tick of its instrument to the return of getNextBars.
+
+Run from the repository root with `python -m benchmarks.finvasia_feed`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import random
+import threading
+import time
+
+import numpy as np
+
+from pyalgomate.brokers.finvasia.feed import LiveTradeFeed
+
+
+if __name__ == "__main__":
+    instrumentCount = 80
+    ticksPerSecond = 200
+    duration = 5
+
+    class FakeApi(object):
+        def __init__(self):
+            self.callbacks = dict()
+            self.sentAt = dict()
+            self.ticks = 0
+
+        def start_websocket(self, **callbacks):
+            self.callbacks = callbacks
+            self.callbacks['socket_open_callback']()
+
+        def subscribe(self, channel):
+            exchange, token = channel.split('|')
+            self.tick(exchange, token)
+
+        def close_websocket(self):
+            pass
+
+        def tick(self, exchange, token):
+            message = {'t': 'tf', 'e': exchange, 'tk': token, 'lp': f'{random.uniform(50, 500):.2f}',
+                       'v': str(random.randint(0, 100000)), 'oi': str(random.randint(0, 100000)),
+                       'ft': str(int(time.time()))}
+            self.ticks += 1
+            self.sentAt[f'{exchange}|{token}'] = time.perf_counter()
+            self.callbacks['subscribe_callback'](message)
+
+    tokenMappings = {'NSE|Nifty Bank': 'NSE|26009'}
+    tokenMappings.update({f'NFO|BANKNIFTY24APR{44000 + (i // 2) * 100}{"C" if i % 2 else "P"}': f'NFO|{35000 + i}'
+                          for i in range(instrumentCount)})
+    channels = {value: key for key, value in tokenMappings.items()}
+
+    api = FakeApi()
+    feed = LiveTradeFeed(api, tokenMappings, list(tokenMappings.keys()))
+    feed.start()
+    feed.getNextBars()
+    api.ticks = 0
+
+    stopped = threading.Event()
+
+    def produceTicks():
+        keys = list(channels.keys())
+        weights = [1.0 / (1 + abs(i - instrumentCount // 2) // 2) ** 2 for i in range(len(keys))]
+        while not stopped.is_set():
+            exchange, token = random.choices(keys, weights)[0].split('|')
+            api.tick(exchange, token)
+            time.sleep(1.0 / ticksPerSecond)
+
+    producer = threading.Thread(target=produceTicks)
+    producer.start()
+
+    dispatches = idleWakeUps = bars = 0
+    latencies = []
+    endTime = time.time() + duration
+    while time.time() < endTime:
+        nextBars = feed.getNextBars()
+        now = time.perf_counter()
+        if nextBars is None:
+            idleWakeUps += 1
+            continue
+
+        dispatches += 1
+        bars += len(nextBars.getInstruments())
+        latencies.extend(now - api.sentAt[tokenMappings[instrument]] for instrument in nextBars.getInstruments())
+
+    stopped.set()
+    producer.join()
+    feed.stop()
+
+    latencies = np.array(latencies) * 1e6
+    print(f'{api.ticks} ticks, {dispatches} dispatches, {bars / max(dispatches, 1):.2f} bars per dispatch, '
+          f'{idleWakeUps} idle wake ups')
+    print(f'tick to bars latency: median {np.median(latencies):.0f} us p99 {np.percentile(latencies, 99):.0f} us')
@@ -0,0 +1,70 @@
+"""
+Speed of :func:`pyalgomate.greeks.iv.impliedVolatility` against py_vollib_vectorized on BANKNIFTY and NIFTY chains
+priced with a volatility smile. Cold solves have no previous volatilities and go through py_vollib_vectorized, warm
+solves start from the volatilities of the previous tick. The accuracy is checked by tests/test_iv.py.
+
+Run from the repository root with `python -m benchmarks.iv`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import time
+
+import numpy as np
+from py_vollib.black_scholes import black_scholes
+from py_vollib_vectorized import vectorized_implied_volatility
+
+from pyalgomate.greeks.iv import impliedVolatility
+
+
+def buildChain(spot, strikeDifference, strikeCount, days, move=0):
+    strikes = float(spot) + strikeDifference * np.arange(-strikeCount, strikeCount + 1)
+    strikes = np.concatenate([strikes, strikes])
+    types = np.array(['c'] * (2 * strikeCount + 1) + ['p'] * (2 * strikeCount + 1))
+    T = np.full(len(strikes), days / 365.0)
+    spot = spot + move
+    moneyness = np.log(strikes / spot)
+    volatilities = 0.13 + 0.8 * moneyness ** 2 - 0.1 * moneyness
+    prices = np.array([black_scholes(flag, spot, strike, t, 0.0, volatility)
+                       for flag, strike, t, volatility in zip(types.tolist(), strikes.tolist(), T.tolist(),
+                                                              volatilities.tolist())]).ravel()
+    # Exchange prices are quoted in 0.05 ticks
+    prices = np.maximum(np.round(prices / 0.05) * 0.05, 0.05)
+    return prices, np.full(len(strikes), float(spot)), strikes, T, types
+
+
+if __name__ == "__main__":
+    chains = {
+        'BANKNIFTY weekly': (48000, 100, 40, 3, 8),
+        'BANKNIFTY monthly': (48000, 100, 40, 24, 8),
+        'NIFTY weekly': (22000, 50, 40, 2, 3),
+        'NIFTY expiry day': (22000, 50, 40, 0.2, 3),
+    }
+    repeat = 200
+
+    for name, (spot, strikeDifference, strikeCount, days, move) in chains.items():
+        prices, S, K, T, types = buildChain(spot, strikeDifference, strikeCount, days)
+
+        vectorized_implied_volatility(prices, S, K, T, 0.0, types, q=0, model='black_scholes_merton',
+                                      return_as='numpy', on_error='ignore')
+        start = time.perf_counter()
+        for _ in range(repeat):
+            vectorized_implied_volatility(prices, S, K, T, 0.0, types, q=0, model='black_scholes_merton',
+                                          return_as='numpy', on_error='ignore')
+        libraryTime = (time.perf_counter() - start) / repeat
+
+        ivs = impliedVolatility(prices, S, K, T, 0.0, types)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            impliedVolatility(prices, S, K, T, 0.0, types)
+        coldTime = (time.perf_counter() - start) / repeat
+
+        # Next tick: the underlying moved by a few points and the options were repriced with it.
+        movedPrices, movedS = buildChain(spot, strikeDifference, strikeCount, days, move)[:2]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            impliedVolatility(movedPrices, movedS, K, T, 0.0, types, previous=ivs)
+        warmTime = (time.perf_counter() - start) / repeat
+
+        print(f'{name:<18} {len(prices)} options py_vollib_vectorized {libraryTime * 1e3:.3f} ms '
+              f'cold {coldTime * 1e3:.3f} ms warm {warmTime * 1e3:.3f} ms')
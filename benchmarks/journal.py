@@ -0,0 +1,78 @@
+"""
+Cost on the dispatcher thread of recording 200k ticks over 81 instruments in a
+:class:`pyalgomate.barfeed.journal.TickJournal`, against appending them to a CSV file a minute at a time the way
+collectData did, and the round trip of the journal.
+
+Run from the repository root with `python -m benchmarks.journal`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyalgomate.barfeed.journal import TickJournal, readJournal
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+
+if __name__ == "__main__":
+    tickCount = 200000
+    instruments = ['NSE|NIFTY BANK'] + [f'NFO|BANKNIFTY24APR{44000 + (i // 2) * 100}{"CE" if i % 2 else "PE"}'
+                                        for i in range(80)]
+    start = datetime.datetime(2024, 4, 10, 15, 29)
+    random.seed(1)
+    ticks = []
+    for i in range(tickCount):
+        price = round(random.uniform(50, 500), 2)
+        dateTime = start + datetime.timedelta(microseconds=i * 1000)
+        ticks.append(QuoteBar(dateTime, price, price, price, price, random.randint(0, 100000),
+                              random.randint(0, 100000), random.choice(instruments), dateTime.replace(microsecond=0)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TickJournal(directory)
+        journal.start()
+        costs = np.empty(tickCount)
+        for i, tick in enumerate(ticks):
+            callStart = time.perf_counter_ns()
+            journal.record(tick)
+            costs[i] = time.perf_counter_ns() - callStart
+        closeStart = time.perf_counter()
+        journal.close()
+        closeTime = time.perf_counter() - closeStart
+        metrics = journal.getMetrics()
+        print(f'journal: record p50 {np.percentile(costs, 50):.0f} ns p99 {np.percentile(costs, 99):.0f} ns, '
+              f'{costs.sum() / 1e6:.0f} ms on the dispatcher thread, {closeTime * 1e3:.0f} ms to drain, '
+              f'{metrics["bytes"] / metrics["written"]:.1f} bytes/tick, {metrics["blocks"]} blocks over '
+              f'{len(os.listdir(directory))} files')
+
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+        readStart = time.perf_counter()
+        readTicks = [tick for path in paths for tick in readJournal(path)]
+        readTime = time.perf_counter() - readStart
+        assert len(readTicks) == tickCount
+        assert all(a.getInstrument() == b.getInstrument() and a.getClose() == b.getClose() and
+                   a.getDateTime() == b.getDateTime() and a.getExchangeDateTime() == b.getExchangeDateTime()
+                   for a, b in zip(ticks, readTicks))
+        print(f'journal: read back {tickCount / readTime:.0f} ticks/s, identical')
+
+        csvPath = os.path.join(directory, 'data.csv')
+        costs = []
+        batch = []
+        for tick in ticks:
+            batch.append(tick)
+            if len(batch) == 10000:
+                callStart = time.perf_counter_ns()
+                pd.DataFrame([{"Ticker": tick.getInstrument(), "Date/Time": tick.getDateTime(),
+                               "Price": tick.getClose(), "Volume": tick.getVolume(),
+                               "Open Interest": tick.getOpenInterest()} for tick in batch]).to_csv(
+                    csvPath, mode='a', header=not os.path.exists(csvPath), index=False)
+                costs.append(time.perf_counter_ns() - callStart)
+                batch = []
+        print(f'csv    : {np.mean(costs) / 1e6:.0f} ms per append of 10000 ticks, {sum(costs) / 1e6:.0f} ms on the '
+              f'dispatcher thread, {os.path.getsize(csvPath) / tickCount:.1f} bytes/tick')
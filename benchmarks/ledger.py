@@ -0,0 +1,61 @@
+"""
+Cost of a PnL query when it is summed over every position ever opened, as getOverallPnL used to do, and when it is read
+from :class:`pyalgomate.analyzers.ledger.Ledger`, as the number of round trips in the session grows.
+
+Run from the repository root with `python -m benchmarks.ledger`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import random
+import timeit
+
+from pyalgotrade import broker
+from pyalgotrade.stratanalyzer import returns
+
+from pyalgomate.analyzers.ledger import Ledger
+from pyalgomate.brokers import QuantityTraits
+
+
+if __name__ == "__main__":
+    class Position(object):
+        def __init__(self, instrument):
+            self.instrument = instrument
+            self.tracker = returns.PositionTracker(QuantityTraits())
+
+        def getInstrument(self):
+            return self.instrument
+
+    def fill(order, price, dateTime):
+        order.switchState(broker.Order.State.SUBMITTED)
+        order.switchState(broker.Order.State.ACCEPTED)
+        order.addExecutionInfo(broker.OrderExecutionInfo(price, order.getQuantity(), 0, dateTime))
+
+    random.seed(1)
+    instruments = [f'BANKNIFTY{strike}{type_}' for strike in range(47000, 49000, 100) for type_ in ('CE', 'PE')]
+    lastPrices = {instrument: random.uniform(50, 500) for instrument in instruments}
+    dateTime = datetime.datetime(2024, 4, 8, 9, 15)
+
+    for roundTrips in (10, 100, 1000):
+        ledger = Ledger()
+        positions = []
+        for orderId in range(roundTrips):
+            position = Position(random.choice(instruments))
+            for action in (broker.Order.Action.SELL, broker.Order.Action.BUY):
+                order = broker.MarketOrder(action, position.getInstrument(), 15, False, QuantityTraits())
+                order.setSubmitted(f'{orderId}{action}', dateTime)
+                ledger.addPositionOrder(position, order)
+                price = random.uniform(50, 500)
+                fill(order, price, dateTime)
+                ledger.updateOrder(order)
+                position.tracker.update(15 if order.isBuy() else -15, price, 0)
+            ledger.removePosition(position)
+            positions.append(position)
+
+        repeat = 1000
+        loopTime = timeit.timeit(lambda: sum(position.tracker.getPnL(lastPrices[position.getInstrument()])
+                                             for position in positions), number=repeat) / repeat
+        ledgerTime = timeit.timeit(ledger.getPnL, number=repeat) / repeat
+        print(f'{roundTrips:>4} round trips: sum over positions {loopTime * 1e6:8.2f} us '
+              f'ledger {ledgerTime * 1e6:.2f} us')
@@ -0,0 +1,54 @@
+"""
+Memory per bar and allocation rate of :class:`pyalgomate.barfeed.QuoteBar.QuoteBar` and
+:class:`pyalgomate.barfeed.BasicBarEx.BasicBarEx`, for a feed that emits every subscribed instrument on each update.
+
+Run from the repository root with `python -m benchmarks.quotebar`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import time
+import tracemalloc
+
+from pyalgotrade import bar
+
+from pyalgomate.barfeed.BasicBarEx import BasicBarEx
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+
+if __name__ == "__main__":
+    instrumentCount = 300
+    updates = 200
+    now = datetime.datetime.now()
+    instruments = [f'NFO|BANKNIFTY24APR{48000 + (i * 100)}{"C" if i % 2 else "P"}' for i in range(instrumentCount)]
+    messages = [{'t': 'tf', 'e': 'NFO', 'tk': str(35000 + i), 'lp': '101.05', 'v': '1200', 'oi': '4500',
+                 'ft': now, 'ct': now, 'pc': '1.2', 'ap': '100.5', 'bp1': '101', 'sp1': '101.1'}
+                for i in range(instrumentCount)]
+
+    def buildBasicBarEx(instrument, message):
+        price = float(message['lp'])
+        return BasicBarEx(now, price, price, price, price, float(message['v']), None, bar.Frequency.TRADE,
+                          {"Instrument": instrument, "Open Interest": float(message['oi']), "Message": message})
+
+    def buildQuoteBar(instrument, message):
+        price = float(message['lp'])
+        return QuoteBar(now, price, price, price, price, float(message['v']), float(message['oi']), instrument,
+                        message['ft'])
+
+    for name, builder in [('BasicBarEx', buildBasicBarEx), ('QuoteBar', buildQuoteBar)]:
+        tracemalloc.start()
+        bars = [builder(instrument, message) for instrument, message in zip(instruments, messages)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del bars
+
+        start = time.perf_counter()
+        for _ in range(updates):
+            for instrument, message in zip(instruments, messages):
+                builder(instrument, message)
+        elapsed = time.perf_counter() - start
+        barsPerSecond = (updates * instrumentCount) / elapsed
+
+        print(f'{name:<12} {size / instrumentCount:8.1f} bytes/bar '
+              f'{barsPerSecond:12.0f} bars/s {barsPerSecond * size / instrumentCount / 1e6:8.1f} MB/s allocated')
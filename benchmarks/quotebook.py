@@ -0,0 +1,104 @@
+"""
+A writer thread applies 20k ticks a second to 81 keys while reader threads iterate the quotes and check them, once
+against :class:`pyalgomate.barfeed.quotebook.QuoteBook` and once against a dictionary updated in place, the way the
+websocket clients used to keep their quotes. Each tick carries fields derived from the same counter, so a torn quote
+shows up as fields that don't agree. The consistency itself is asserted by tests/test_quotebook.py.
+
+Run from the repository root with `python -m benchmarks.quotebook`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import threading
+import time
+
+from pyalgomate.barfeed.quotebook import QuoteBook
+
+
+class InPlaceBook(object):
+    def __init__(self):
+        self.quotes = dict()
+        self.versions = dict()
+
+    def update(self, key, message):
+        if key in self.quotes:
+            self.quotes[key].update(message)
+        else:
+            self.quotes[key] = message
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+
+def checkQuote(quote, version):
+    count = quote['count']
+    return quote['lp'] == count * 2 and quote['v'] == count * 3 and version == count
+
+
+def readQuoteBook(book, stopped, stats):
+    while not stopped.is_set():
+        stats['reads'] += 1
+        for key, (version, quote) in book.items():
+            if not checkQuote(quote, version):
+                stats['errors'] += 1
+
+
+def readInPlace(book, stopped, stats):
+    while not stopped.is_set():
+        stats['reads'] += 1
+        try:
+            for key, quote in book.quotes.items():
+                if not checkQuote(quote, book.versions.get(key, 0)):
+                    stats['errors'] += 1
+        except RuntimeError:
+            stats['errors'] += 1
+
+
+def write(book, keys, ticksPerSecond, stopped, stats):
+    counts = dict()
+    start = time.perf_counter()
+    writeTime = 0.0
+    tick = 0
+    while not stopped.is_set():
+        # Keys are added while readers run, as they are when subscriptions complete
+        key = keys[tick % len(keys)] if tick >= len(keys) * 10 else keys[(tick // 10) % len(keys)]
+        count = counts.get(key, 0) + 1
+        counts[key] = count
+        message = {'count': count, 'lp': count * 2, 'v': count * 3, 'tk': key}
+        updateStart = time.perf_counter()
+        book.update(key, message)
+        writeTime += time.perf_counter() - updateStart
+        tick += 1
+        if tick % 100 == 0:
+            # Pace the writer at ticksPerSecond
+            delay = start + tick / ticksPerSecond - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    stats['ticks'] = tick
+    stats['writeTime'] = writeTime
+    stats['elapsed'] = time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    keys = [f'NFO|{35000 + i}' for i in range(81)]
+    ticksPerSecond = 20000
+    duration = 3
+    readerCount = 2
+
+    for name, book, read in (('in place', InPlaceBook(), readInPlace),
+                             ('quote book', QuoteBook(), readQuoteBook)):
+        stopped = threading.Event()
+        writerStats = dict()
+        readerStats = [dict(reads=0, errors=0) for _ in range(readerCount)]
+        threads = [threading.Thread(target=write, args=(book, keys, ticksPerSecond, stopped, writerStats))]
+        threads += [threading.Thread(target=read, args=(book, stopped, stats)) for stats in readerStats]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stopped.set()
+        for thread in threads:
+            thread.join()
+
+        reads = sum(stats['reads'] for stats in readerStats)
+        errors = sum(stats['errors'] for stats in readerStats)
+        print(f'{name:<14} {writerStats["ticks"] / writerStats["elapsed"]:8.0f} ticks/s '
+              f'{writerStats["writeTime"] * 1e6 / writerStats["ticks"]:5.2f} us/update {reads:8d} reads '
+              f'{errors:6d} errors')
@@ -0,0 +1,135 @@
+"""
+Three Finvasia clients against a local fake Noren websocket server sending ~600 ticks a second each, with their
+websockets on threads of the api and on one :class:`pyalgomate.brokers.reactor.Reactor`. The latency of a tick is
+measured from the server sending it to a feed thread draining its key, the way LiveTradeFeed.getNextBars does.
+
+Run from the repository root with `python -m benchmarks.reactor`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import asyncio
+import json
+import logging
+import random
+import resource
+import threading
+import time
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+from NorenRestApiPy.NorenApi import NorenApi
+
+from pyalgomate.brokers.finvasia.wsclient import WebSocketClient
+from pyalgomate.brokers.reactor import Reactor
+
+
+if __name__ == "__main__":
+    feedCount = 3
+    channelCount = 81
+    ticksPerSecond = 600
+    duration = 5
+
+    def tick(channel):
+        exchange, token = channel.split('|')
+        return json.dumps({'t': 'tf', 'e': exchange, 'tk': token, 'lp': f'{random.uniform(50, 500):.2f}',
+                           'v': str(random.randint(0, 100000)), 'ft': str(int(time.time())),
+                           'st': repr(time.perf_counter())})
+
+    async def serveNoren(request):
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        channels = []
+        ticker = None
+
+        async def sendTicks():
+            while True:
+                await asyncio.sleep(0.01)
+                for _ in range(ticksPerSecond // 100):
+                    await socket.send_str(tick(random.choice(channels)))
+
+        async for message in socket:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                continue
+            message = json.loads(message.data)
+            if message['t'] == 'c':
+                await socket.send_str(json.dumps({'t': 'ck', 's': 'OK', 'uid': message['uid']}))
+            elif message['t'] == 't':
+                for channel in message['k'].split('#'):
+                    channels.append(channel)
+                    await socket.send_str(tick(channel).replace('"tf"', '"tk"'))
+                if ticker is None:
+                    ticker = asyncio.ensure_future(sendTicks())
+        if ticker is not None:
+            ticker.cancel()
+        return socket
+
+    serverLoop = asyncio.new_event_loop()
+    serverStarted = threading.Event()
+
+    def runServer():
+        asyncio.set_event_loop(serverLoop)
+        app = web.Application()
+        app.router.add_get('/', serveNoren)
+        runner = web.AppRunner(app)
+        serverLoop.run_until_complete(runner.setup())
+        serverLoop.run_until_complete(web.TCPSite(runner, '127.0.0.1', 18765).start())
+        serverStarted.set()
+        serverLoop.run_forever()
+
+    threading.Thread(target=runServer, daemon=True).start()
+    serverStarted.wait()
+
+    tokenMappings = {f'NFO|{35000 + i}': f'NFO|BANKNIFTY{i}' for i in range(channelCount)}
+
+    def run(name, reactor):
+        baseThreads = threading.active_count()
+        clients = []
+        for i in range(feedCount):
+            api = NorenApi(host='http://127.0.0.1:18765/', websocket='ws://127.0.0.1:18765/')
+            api.set_session(userid=f'USER{i}', password='', usertoken='TOKEN')
+            client = WebSocketClient(api, tokenMappings, reactor, 'ws://127.0.0.1:18765/', f'USER{i}', 'TOKEN')
+            client.startClient()
+            if not client.waitInitialized(10):
+                raise Exception(f'{name} client did not initialize')
+            clients.append(client)
+
+        latencies = []
+        stopped = threading.Event()
+
+        def consume(client):
+            # Skip the ticks queued while the other feeds connected
+            client.popUpdatedKeys()
+            while not stopped.is_set():
+                keys = client.waitUpdatedKeys(0.01)
+                now = time.perf_counter()
+                quotes = client.getQuotes()
+                latencies.extend(now - float(quotes.get(key)['st']) for key in keys)
+
+        consumers = [threading.Thread(target=consume, args=(client,)) for client in clients]
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        for consumer in consumers:
+            consumer.start()
+        time.sleep(duration)
+        threads = threading.active_count() - baseThreads - len(consumers)
+        stopped.set()
+        for consumer in consumers:
+            consumer.join()
+        afterUsage = resource.getrusage(resource.RUSAGE_SELF)
+        for client in clients:
+            client.stopClient()
+
+        switches = (afterUsage.ru_nvcsw + afterUsage.ru_nivcsw) - (usage.ru_nvcsw + usage.ru_nivcsw)
+        latencies = np.array(latencies) * 1e6
+        print(f'{name:<8} {threads} websocket threads, {len(latencies) / duration:6.0f} ticks/s, '
+              f'{switches / duration:7.0f} context switches/s, latency median {np.median(latencies):5.0f} us '
+              f'p99 {np.percentile(latencies, 99):6.0f} us')
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('NorenRestApiPy').setLevel(logging.ERROR)
+    random.seed(1)
+    run('threads', None)
+    reactor = Reactor()
+    run('reactor', reactor)
+    reactor.stop()
@@ -0,0 +1,66 @@
+"""
+Replays a journal of 20 seconds of ticks, 81 instruments at ~2000 ticks a second, as fast as possible twice, and 10 and
+100 times faster than real time with a strategy that spends 200 us on every dispatch. As fast as possible both runs
+dispatch the same bars, paced the feed coalesces the ticks that are due while the strategy is busy, like the live feeds
+do.
+
+Run from the repository root with `python -m benchmarks.replay`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import hashlib
+import random
+import tempfile
+import time
+
+from pyalgotrade import dispatcher
+
+from pyalgomate.backtesting.ReplayFeed import ReplayFeed
+from pyalgomate.barfeed.journal import TickJournal
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.core.dispatcher import LiveDispatcher
+
+
+if __name__ == "__main__":
+    tickCount = 40000
+    instruments = ['NSE|NIFTY BANK'] + [f'NFO|BANKNIFTY24APR{44000 + (i // 2) * 100}{"CE" if i % 2 else "PE"}'
+                                        for i in range(80)]
+    start = datetime.datetime(2024, 4, 10, 9, 15)
+
+    def run(name, feed, dispatcher_, workTime=0):
+        digest = hashlib.sha256()
+
+        def onBars(dateTime, bars):
+            digest.update(repr([(dateTime, instrument, bars[instrument].getClose())
+                                for instrument in sorted(bars.getInstruments())]).encode())
+            if workTime:
+                time.sleep(workTime)
+
+        dispatcher_.addSubject(feed)
+        feed.getNewValuesEvent().subscribe(onBars)
+        runStart = time.perf_counter()
+        dispatcher_.run()
+        elapsed = time.perf_counter() - runStart
+        metrics = feed.getMetrics()
+        print(f'{name:<12} {elapsed:6.2f} s, {metrics["ticks"] / elapsed:8.0f} ticks/s, {metrics["dispatches"]:6d} '
+              f'dispatches, {metrics["conflated"]:5d} conflated, max lag {metrics["maxLag"] * 1000:5.1f} ms, '
+              f'bars {digest.hexdigest()[:12]}')
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TickJournal(directory)
+        journal.start()
+        for i in range(tickCount):
+            price = round(random.uniform(50, 500), 2)
+            dateTime = start + datetime.timedelta(microseconds=i * 500)
+            journal.record(QuoteBar(dateTime, price, price, price, price, random.randint(0, 100000),
+                                    random.randint(0, 100000), random.choice(instruments),
+                                    dateTime.replace(microsecond=0)))
+        journal.close()
+
+        run('fastest', ReplayFeed(directory), dispatcher.Dispatcher())
+        run('fastest', ReplayFeed(directory), dispatcher.Dispatcher())
+        run('10x', ReplayFeed(directory, 10), LiveDispatcher(), 0.0002)
+        run('100x', ReplayFeed(directory, 100), LiveDispatcher(), 0.0002)
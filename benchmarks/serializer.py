@@ -0,0 +1,47 @@
+"""
+Cost per option of the reflection based payload the strategies used to build every minute, and of the record and
+columnar exports of :mod:`pyalgomate.greeks.serializer`.
+
+Run from the repository root with `python -m benchmarks.serializer`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import timeit
+
+import numpy as np
+
+from pyalgomate.greeks.serializer import toColumns, toRecords
+from pyalgomate.strategies import OptionContract, OptionGreeks
+
+
+if __name__ == "__main__":
+    def reflect(optionData):
+        ret = dict()
+        for instrument, optionGreek in optionData.items():
+            optionGreekDict = dict([attr, getattr(optionGreek, attr)]
+                                   for attr in dir(optionGreek) if not attr.startswith('_'))
+            optionContract = optionGreekDict.pop('optionContract')
+            optionContractDict = dict([attr, getattr(optionContract, attr)] for attr in dir(
+                optionContract) if not attr.startswith('_'))
+            if 'expiry' in optionContractDict:
+                optionContractDict['expiry'] = optionContractDict['expiry'].strftime('%Y-%m-%d')
+            optionGreekDict.update(optionContractDict)
+            ret[instrument] = optionGreekDict
+        return ret
+
+    expiry = datetime.date(2024, 4, 10)
+    optionData = dict()
+    for strike in range(46000, 50000, 100):
+        for type_ in 'cp':
+            symbol = f'BANKNIFTY24410{strike}{type_.upper()}E'
+            optionData[symbol] = OptionGreeks(OptionContract(symbol, strike, expiry, type_, 'NSE|NIFTY BANK'),
+                                              np.float64(120.5), np.float64(0.45), np.float64(0.0004),
+                                              np.float64(-25.3), np.float64(12.1), np.float64(0.14), 1500.0)
+
+
+    repeat = 200
+    for name, function in (('reflection', reflect), ('records', toRecords), ('columns', toColumns)):
+        elapsed = timeit.timeit(lambda: function(optionData), number=repeat) / repeat
+        print(f'{name:<10} {elapsed * 1e6 / len(optionData):6.2f} us/option')
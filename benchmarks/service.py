@@ -0,0 +1,77 @@
+"""
+CPU time per tick as strategies are added, when each strategy computes its own greeks and when they share the feed's
+:class:`pyalgomate.greeks.service.GreeksService`.
+
+Run from the repository root with `python -m benchmarks.service`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import random
+import time
+
+from pyalgotrade import bar
+
+from pyalgomate.barfeed.arrays import BarArrays
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.greeks.calculator import GreeksCalculator
+from pyalgomate.greeks.service import GreeksService
+from pyalgomate.strategies import OptionContract
+
+
+if __name__ == "__main__":
+    underlying = 'NSE|NIFTY BANK'
+    expiry = datetime.date(2024, 4, 10)
+    contracts = {f'BANKNIFTY24410{strike}{type_}': OptionContract(f'BANKNIFTY24410{strike}{type_}', strike, expiry,
+                                                                    type_.lower(), underlying)
+                 for strike in range(44000, 52000, 100) for type_ in 'CP'}
+    ticks = 200
+
+    random.seed(1)
+    underlyingPrice = 48000.0
+    dateTime = datetime.datetime(2024, 4, 8, 10, 0)
+    allBars = []
+    for tick in range(ticks):
+        underlyingPrice += random.choice([-5, 0, 5])
+        dateTime += datetime.timedelta(seconds=1)
+        bars = {underlying: QuoteBar(dateTime, underlyingPrice, underlyingPrice, underlyingPrice, underlyingPrice, 0,
+                                     0, underlying)}
+        for symbol in (contracts if tick == 0 else random.sample(list(contracts), 20)):
+            contract = contracts[symbol]
+            price = max(underlyingPrice - contract.strike if contract.type == 'c' else
+                        contract.strike - underlyingPrice, 0) + 150 * 0.999 ** abs(underlyingPrice - contract.strike)
+            bars[symbol] = QuoteBar(dateTime, price, price, price, price, 0, 100, symbol)
+        allBars.append(bar.Bars(bars))
+
+    # Warm up the solvers
+    warmUpArrays = BarArrays()
+    warmUpCalculator = GreeksCalculator(contracts.get)
+    for bars in allBars[:10]:
+        warmUpArrays.update(bars)
+        warmUpCalculator.addInstruments(warmUpArrays)
+        warmUpCalculator.calculate(warmUpArrays)
+
+    for strategyCount in (1, 5, 10):
+        barArrays = BarArrays()
+        calculators = [GreeksCalculator(contracts.get) for _ in range(strategyCount)]
+        start = time.perf_counter()
+        for bars in allBars:
+            barArrays.update(bars)
+            for calculator in calculators:
+                calculator.addInstruments(barArrays)
+                calculator.calculate(barArrays)
+        separateTime = time.perf_counter() - start
+
+        barArrays = BarArrays()
+        service = GreeksService(barArrays)
+        start = time.perf_counter()
+        for bars in allBars:
+            barArrays.update(bars)
+            for _ in range(strategyCount):
+                service.update(contracts.get)
+        sharedTime = time.perf_counter() - start
+
+        print(f'{strategyCount:>2} strategies: separate {separateTime * 1e3 / ticks:7.3f} ms/tick '
+              f'shared {sharedTime * 1e3 / ticks:7.3f} ms/tick '
+              f'({service.getCalculationCount()} of {service.getUpdateCount()} updates computed)')
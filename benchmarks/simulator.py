@@ -0,0 +1,124 @@
+"""
+The full live stack against a :class:`pyalgomate.brokers.finvasia.simulator.NorenSimulator`: LiveTradeFeed and
+LiveBroker on a live dispatcher, subscribed to a BANKNIFTY chain of 81 scrips ticking 10k and 20k times a second. On
+every 20th dispatch the strategy places a marketable limit order on a random option, buying and selling in turn, so a
+few hundred orders are working or filled at once. Fills are seen when the trade monitor polls the order book, every
+second. The simulator runs in a process of its own, so it doesn't share the GIL with the stack it loads, and waits for a
+client that doesn't read its websocket fast enough, so the rate it sends at is the rate the feed keeps up with.
+
+Run from the repository root with `python -m benchmarks.simulator`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import logging
+import multiprocessing
+import random
+import resource
+import threading
+import time
+
+import numpy as np
+from pyalgotrade import broker
+
+from pyalgomate.brokers.finvasia.broker import LiveBroker
+from pyalgomate.brokers.finvasia.feed import LiveTradeFeed
+from pyalgomate.brokers.finvasia.simulator import NorenSimulator, roundToTick
+from pyalgomate.brokers.reactor import Reactor
+from pyalgomate.core.dispatcher import LiveDispatcher
+
+
+if __name__ == "__main__":
+    duration = 10
+    expiry = datetime.date.today() + datetime.timedelta(days=7)
+
+    def run(ticksPerSecond, reactor=None):
+        simulator = NorenSimulator(port=18766, ticksPerSecond=ticksPerSecond, cash=1e9, seed=1)
+        tokenMappings = simulator.addOptionChain('NSE|NIFTY BANK', 47050, expiry, count=20)
+        # The session is created before the fork, so the simulator process knows it
+        api, userToken = simulator.createSession()
+
+        context = multiprocessing.get_context('fork')
+        started = context.Event()
+        stopped = context.Event()
+        metricsQueue = context.Queue()
+
+        def serve():
+            simulator.start()
+            started.set()
+            stopped.wait()
+            metricsQueue.put(simulator.getMetrics())
+            simulator.stop()
+
+        process = context.Process(target=serve)
+        process.start()
+        started.wait()
+
+        feed = LiveTradeFeed(api, tokenMappings, list(tokenMappings.keys()), reactor=reactor,
+                             websocketUrl=simulator.getWebsocketUrl(), userId='SIMULATOR', userToken=userToken)
+        liveBroker = LiveBroker(api, feed)
+        dispatcher = LiveDispatcher()
+        dispatcher.addSubject(liveBroker)
+        dispatcher.addSubject(feed)
+
+        options = [instrument for instrument in tokenMappings if instrument.startswith('NFO|')]
+        submitTimes = dict()
+        placeLatencies = []
+        fillLatencies = []
+        counts = {'dispatches': 0, 'bars': 0}
+
+        def onBars(dateTime, bars):
+            counts['dispatches'] += 1
+            counts['bars'] += len(bars.getInstruments())
+            if counts['dispatches'] % 20:
+                return
+            instrument = random.choice(options)
+            lastBar = feed.getLastBar(instrument)
+            if lastBar is None:
+                return
+            isBuy = len(submitTimes) % 2 == 0
+            action = broker.Order.Action.BUY if isBuy else broker.Order.Action.SELL
+            # A tick through the LTP, so most orders fill on one of the next ticks of their scrip
+            price = roundToTick(lastBar.getClose() + (0.05 if isBuy else -0.05))
+            order = liveBroker.createLimitOrder(action, instrument, price, 15)
+            placeStart = time.perf_counter()
+            liveBroker.submitOrder(order)
+            placeLatencies.append(time.perf_counter() - placeStart)
+            submitTimes[order] = time.perf_counter()
+
+        def onOrderEvent(broker_, orderEvent):
+            if orderEvent.getEventType() == broker.OrderEvent.Type.FILLED:
+                fillLatencies.append(time.perf_counter() - submitTimes[orderEvent.getOrder()])
+
+        feed.getNewValuesEvent().subscribe(onBars)
+        liveBroker.getOrderUpdatedEvent().subscribe(onOrderEvent)
+
+        threading.Timer(duration, dispatcher.stop).start()
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        dispatcher.run()
+        afterUsage = resource.getrusage(resource.RUSAGE_SELF)
+        stopped.set()
+        metrics = metricsQueue.get()
+        process.join()
+
+        cpu = (afterUsage.ru_utime + afterUsage.ru_stime) - (usage.ru_utime + usage.ru_stime)
+        placeLatencies = np.array(placeLatencies) * 1000
+        fillLatencies = np.array(fillLatencies) * 1000
+        name = "reactor" if reactor is not None else "threads"
+        print(f'{name:<8} {ticksPerSecond:6d} ticks/s: sent {metrics["messages"] / duration:6.0f}/s, '
+              f'{counts["bars"] / duration:6.0f} bars/s in {counts["dispatches"] / duration:5.0f} dispatches/s, '
+              f'CPU {cpu / duration * 100:3.0f}%')
+        print(f'{"":25} {metrics["orders"]} orders, {metrics["fills"]} filled, {len(liveBroker.getActiveOrders())} '
+              f'active in the broker, place_order p50 {np.percentile(placeLatencies, 50):4.1f} ms '
+              f'p99 {np.percentile(placeLatencies, 99):4.1f} ms, submit to fill event p50 '
+              f'{np.percentile(fillLatencies, 50):4.0f} ms p99 {np.percentile(fillLatencies, 99):4.0f} ms')
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('pyalgomate.brokers.finvasia.broker').setLevel(logging.ERROR)
+    random.seed(1)
+    for ticksPerSecond in (10000, 20000):
+        run(ticksPerSecond)
+        reactor = Reactor()
+        run(ticksPerSecond, reactor)
+        reactor.stop()
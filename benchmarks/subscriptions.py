@@ -0,0 +1,64 @@
+"""
+A trending session: BANKNIFTY moves 2000 points in ticks of up to 20 points. A fixed subscription of +-20 strikes
+around the open ends the day with the ATM outside of it, while
+:class:`pyalgomate.barfeed.subscriptions.SubscriptionManager` follows the ATM with a bounded number of subscriptions.
+
+Run from the repository root with `python -m benchmarks.subscriptions`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import random
+
+from pyalgomate.barfeed.subscriptions import SubscriptionManager
+
+
+if __name__ == "__main__":
+    class FakeFeed(object):
+        def __init__(self, instruments):
+            self.instruments = set(instruments)
+
+        def setSubscriptionManager(self, manager):
+            pass
+
+        def getNewValuesEvent(self):
+            class Event(object):
+                def subscribe(self, handler):
+                    pass
+            return Event()
+
+        def subscribeInstruments(self, instruments):
+            self.instruments.update(instruments)
+            return instruments
+
+        def unsubscribeInstruments(self, instruments):
+            self.instruments.difference_update(instruments)
+
+    def getOptionSymbol(underlying, expiry, strike, callOrPut):
+        return f'{underlying}{expiry:%d%b%y}{callOrPut}{strike}'.upper()
+
+    random.seed(1)
+    underlying = 'BANKNIFTY'
+    expiry = datetime.date(2024, 4, 10)
+    ltp = 47000.0
+
+    manager = SubscriptionManager(getOptionSymbol)
+    staticSymbols = set(manager.addWindow(underlying, expiry, ltp, 100, 20))
+    feed = FakeFeed(manager.getInstruments())
+    manager.attach(feed)
+
+    maxSubscriptions = 0
+    for tick in range(5000):
+        ltp += random.uniform(-19.6, 20.4)
+        manager.update(underlying, ltp)
+        maxSubscriptions = max(maxSubscriptions, len(feed.instruments))
+
+    atm = int(ltp / 100) * 100
+    atmSymbols = {getOptionSymbol(underlying, expiry, strike, callOrPut) for strike in range(atm - 500, atm + 600, 100)
+                  for callOrPut in 'CP'}
+    print(f'LTP moved from 47000 to {ltp:.0f}')
+    print(f'static : {len(staticSymbols)} subscriptions, {len(atmSymbols & staticSymbols)} of the {len(atmSymbols)} '
+          f'options within 5 strikes of the ATM covered')
+    print(f'managed: {len(feed.instruments)} subscriptions (max {maxSubscriptions}), '
+          f'{len(atmSymbols & feed.instruments)} of the {len(atmSymbols)} covered, {manager.getMetrics()}')
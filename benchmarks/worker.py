@@ -0,0 +1,83 @@
+"""
+Time spent on the dispatcher thread per tick when the greeks are computed inline and when they are handed to
+:class:`pyalgomate.greeks.worker.GreeksWorker`, on a BANKNIFTY chain where the underlying and a few options move every
+tick.
+
+Run from the repository root with `python -m benchmarks.worker`.
+
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import random
+import time
+
+import numpy as np
+from pyalgotrade import bar
+
+from pyalgomate.barfeed.arrays import BarArrays
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.greeks.calculator import GreeksCalculator
+from pyalgomate.greeks.worker import GreeksWorker
+from pyalgomate.strategies import OptionContract
+
+
+if __name__ == "__main__":
+    underlying = 'NSE|NIFTY BANK'
+    expiry = datetime.date(2024, 4, 10)
+    contracts = {f'BANKNIFTY24410{strike}{type_}': OptionContract(f'BANKNIFTY24410{strike}{type_}', strike, expiry,
+                                                                    type_.lower(), underlying)
+                 for strike in range(44000, 52000, 100) for type_ in 'CP'}
+    ticks = 500
+
+    def priceOption(contract, underlyingPrice):
+        intrinsic = max(underlyingPrice - contract.strike if contract.type == 'c' else
+                        contract.strike - underlyingPrice, 0)
+        return intrinsic + 150 * np.exp(-abs(underlyingPrice - contract.strike) / 800)
+
+    random.seed(1)
+    underlyingPrice = 48000.0
+    dateTime = datetime.datetime(2024, 4, 8, 10, 0)
+    allBars = []
+    for tick in range(ticks):
+        underlyingPrice += random.choice([-5, 0, 5])
+        dateTime += datetime.timedelta(seconds=1)
+        bars = {underlying: QuoteBar(dateTime, underlyingPrice, underlyingPrice, underlyingPrice, underlyingPrice, 0,
+                                     0, underlying)}
+        for symbol in (contracts if tick == 0 else random.sample(list(contracts), 20)):
+            price = priceOption(contracts[symbol], underlyingPrice)
+            bars[symbol] = QuoteBar(dateTime, price, price, price, price, 0, 100, symbol)
+        allBars.append(bar.Bars(bars))
+
+    def replay(useWorker):
+        barArrays = BarArrays()
+        calculator = GreeksCalculator(contracts.get)
+        worker = GreeksWorker(calculator) if useWorker else None
+        if worker is not None:
+            worker.start()
+        elapsed = 0
+        staleness = []
+        for bars in allBars:
+            barArrays.update(bars)
+            start = time.perf_counter()
+            calculator.addInstruments(barArrays)
+            if worker is None:
+                calculator.calculate(barArrays)
+            else:
+                worker.submit(barArrays.copy())
+            elapsed += time.perf_counter() - start
+            if worker is not None and worker.getSnapshot() is not None:
+                staleness.append(worker.getStaleness())
+            # Some strategy work between ticks
+            time.sleep(0.0005)
+        if worker is not None:
+            worker.stop()
+            worker.join()
+            print(f'worker : {elapsed * 1e3 / ticks:.3f} ms/tick on the dispatcher thread, '
+                  f'{worker.getComputedCount()} of {worker.getSubmittedCount()} submissions computed, '
+                  f'mean staleness {np.mean(staleness) * 1e3:.3f} ms')
+        else:
+            print(f'inline : {elapsed * 1e3 / ticks:.3f} ms/tick on the dispatcher thread')
+
+    replay(False)
+    replay(True)
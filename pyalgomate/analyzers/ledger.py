@@ -0,0 +1,258 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import math
+
+from pyalgotrade import broker
+from pyalgotrade import stratanalyzer
+from pyalgotrade.stratanalyzer import returns
+
+
+class Holding(object):
+    """The fills, last price and greeks of one instrument held by a strategy."""
+
+    def __init__(self, instrument, instrumentTraits, price):
+        self.instrument = instrument
+        self.tracker = returns.PositionTracker(instrumentTraits)
+        self.price = price
+        self.positions = 0
+        self.delta = 0.0
+        self.gamma = 0.0
+        self.theta = 0.0
+        self.vega = 0.0
+
+    def getQuantity(self):
+        return self.tracker.getPosition()
+
+    def getUnrealizedPnL(self):
+        if not self.price:
+            return 0.0
+        return (self.price - self.tracker.getAvgPrice()) * self.tracker.getPosition()
+
+    def isEmpty(self):
+        return self.positions == 0 and self.tracker.getPosition() == 0
+
+
+def _finite(value):
+    return value if value is not None and math.isfinite(value) else 0.0
+
+
+class Ledger(stratanalyzer.StrategyAnalyzer):
+    """Running PnL and greeks of the positions of a strategy.
+
+    Fills are applied as they happen and prices are only updated for the instruments that are held, so
+    :meth:`getPnL` and :meth:`getDelta` are O(1) instead of walking every position ever opened. Realized PnL is
+    accumulated per instrument on an average cost basis, which gives the same total as summing the PnL of every
+    position.
+
+    The strategy reports its positions with :meth:`addPositionOrder` and :meth:`removePosition`, and the fills of
+    their orders with :meth:`updateOrder`. Fills are applied by comparing the filled quantity and value of an order
+    with the ones already seen, so an order can be reported more than once.
+    """
+
+    def __init__(self):
+        super(Ledger, self).__init__()
+        self.__strategy = None
+        self.reset()
+
+    def reset(self):
+        self.__holdings = dict()
+        self.__orders = dict()
+        self.__positions = set()
+        self.__optionData = dict()
+        self.__bars = None
+        self.__realizedPnL = 0.0
+        self.__unrealizedPnL = 0.0
+        self.__positionDelta = 0.0
+        self.__netDelta = 0.0
+        self.__netGamma = 0.0
+        self.__netTheta = 0.0
+        self.__netVega = 0.0
+
+    def attached(self, strat):
+        self.__strategy = strat
+        # Catches the fills of strategies that override onOrderUpdated without calling the base class
+        strat.getBroker().getOrderUpdatedEvent().subscribe(self.__onOrderEvent)
+
+    def beforeOnBars(self, strat, bars):
+        self.__updatePrices(bars)
+
+    def __updatePrices(self, bars):
+        if bars is None or bars is self.__bars:
+            return
+
+        self.__bars = bars
+        for instrument, holding in self.__holdings.items():
+            bar = bars.getBar(instrument)
+            if bar is not None:
+                self.__setPrice(holding, bar.getPrice())
+
+    def __onOrderEvent(self, broker_, orderEvent):
+        if orderEvent.getEventType() in (broker.OrderEvent.Type.PARTIALLY_FILLED, broker.OrderEvent.Type.FILLED):
+            self.updateOrder(orderEvent.getOrder())
+
+    def __getHolding(self, instrument, instrumentTraits):
+        holding = self.__holdings.get(instrument, None)
+        if holding is None:
+            price = self.__strategy.getLastPrice(instrument) if self.__strategy is not None else None
+            holding = Holding(instrument, instrumentTraits, price)
+            self.__setGreeks(holding, self.__optionData.get(instrument, None))
+            self.__holdings[instrument] = holding
+        return holding
+
+    def __releaseHolding(self, holding):
+        if not holding.isEmpty():
+            return
+
+        self.__unrealizedPnL -= holding.getUnrealizedPnL()
+        del self.__holdings[holding.instrument]
+        if len(self.__holdings) == 0:
+            # Nothing is held, clear the rounding errors of the incremental updates
+            self.__unrealizedPnL = 0.0
+            self.__positionDelta = 0.0
+            self.__netDelta = self.__netGamma = self.__netTheta = self.__netVega = 0.0
+
+    def __setPrice(self, holding, price):
+        if holding.price == price:
+            return
+        unrealizedPnL = holding.getUnrealizedPnL()
+        holding.price = price
+        self.__unrealizedPnL += holding.getUnrealizedPnL() - unrealizedPnL
+
+    def __setGreeks(self, holding, optionGreeks):
+        if optionGreeks is None:
+            delta = gamma = theta = vega = 0.0
+        else:
+            delta = _finite(optionGreeks.delta)
+            gamma = _finite(optionGreeks.gamma)
+            theta = _finite(optionGreeks.theta)
+            vega = _finite(optionGreeks.vega)
+
+        quantity = holding.getQuantity()
+        self.__positionDelta += (delta - holding.delta) * holding.positions
+        self.__netDelta += (delta - holding.delta) * quantity
+        self.__netGamma += (gamma - holding.gamma) * quantity
+        self.__netTheta += (theta - holding.theta) * quantity
+        self.__netVega += (vega - holding.vega) * quantity
+        holding.delta, holding.gamma, holding.theta, holding.vega = delta, gamma, theta, vega
+
+    def addPositionOrder(self, position, order):
+        """Starts tracking the fills of an order of a position.
+
+        :param position: The position.
+        :type position: :class:`pyalgomate.core.position.OpenPosition`.
+        :param order: The order.
+        :type order: :class:`pyalgotrade.broker.Order`.
+        """
+        holding = self.__getHolding(order.getInstrument(), order.getInstrumentTraits())
+        if position not in self.__positions:
+            self.__positions.add(position)
+            holding.positions += 1
+            self.__positionDelta += holding.delta
+        if order not in self.__orders:
+            # Filled quantity, filled value and commissions already applied
+            self.__orders[order] = [0, 0.0, 0.0]
+        self.updateOrder(order)
+
+    def removePosition(self, position):
+        """Stops counting a position that was closed. Its PnL stays in the realized PnL."""
+        if position not in self.__positions:
+            return
+
+        self.__positions.remove(position)
+        holding = self.__holdings.get(position.getInstrument(), None)
+        if holding is not None:
+            holding.positions -= 1
+            self.__positionDelta -= holding.delta
+            self.__releaseHolding(holding)
+
+    def updateOrder(self, order):
+        """Applies the fills of a tracked order that were not applied yet. Other orders are ignored.
+
+        :param order: The order.
+        :type order: :class:`pyalgotrade.broker.Order`.
+        """
+        applied = self.__orders.get(order, None)
+        if applied is None:
+            return
+
+        filled = order.getFilled()
+        quantity = order.getInstrumentTraits().roundQuantity(filled - applied[0])
+        if quantity > 0:
+            value = order.getAvgFillPrice() * filled
+            commissions = order.getCommissions()
+            price = (value - applied[1]) / quantity
+            commission = max(commissions - applied[2], 0)
+            applied[0], applied[1], applied[2] = filled, value, commissions
+            self.__applyFill(order, quantity if order.isBuy() else -quantity, price, commission)
+
+        if not order.isActive():
+            del self.__orders[order]
+
+    def __applyFill(self, order, quantity, price, commission):
+        if self.__strategy is not None:
+            # The broker fills orders before the strategy gets the bars, bring the prices up to date first
+            self.__updatePrices(self.__strategy.getFeed().getCurrentBars())
+
+        holding = self.__getHolding(order.getInstrument(), order.getInstrumentTraits())
+        if not holding.price:
+            holding.price = price
+
+        tracker = holding.tracker
+        realizedPnL = tracker.getPnL()
+        unrealizedPnL = holding.getUnrealizedPnL()
+        tracker.update(quantity, price, commission)
+        self.__realizedPnL += tracker.getPnL() - realizedPnL
+        self.__unrealizedPnL += holding.getUnrealizedPnL() - unrealizedPnL
+
+        self.__netDelta += holding.delta * quantity
+        self.__netGamma += holding.gamma * quantity
+        self.__netTheta += holding.theta * quantity
+        self.__netVega += holding.vega * quantity
+        self.__releaseHolding(holding)
+
+    def updateGreeks(self, optionData: dict):
+        """Refreshes the greeks of the instruments that are held.
+
+        :param optionData: The :class:`pyalgomate.strategies.OptionGreeks` keyed by symbol.
+        :type optionData: dict.
+        """
+        if optionData is self.__optionData:
+            return
+
+        self.__optionData = optionData
+        for instrument, holding in self.__holdings.items():
+            self.__setGreeks(holding, optionData.get(instrument, None))
+
+    def getHoldings(self) -> dict:
+        """Returns the :class:`Holding` of the instruments with open positions or quantity, keyed by instrument."""
+        return self.__holdings
+
+    def getRealizedPnL(self):
+        """Returns the PnL of the quantity that was closed, net of all the commissions paid."""
+        return self.__realizedPnL
+
+    def getUnrealizedPnL(self):
+        """Returns the PnL of the quantity that is held, at the last price of each instrument."""
+        return self.__unrealizedPnL
+
+    def getPnL(self):
+        return self.__realizedPnL + self.__unrealizedPnL
+
+    def getDelta(self):
+        """Returns the sum of the deltas of the instruments of the active positions, one per position."""
+        return self.__positionDelta
+
+    def getNetDelta(self):
+        """Returns the delta of the quantity that is held, a short quantity counting negative."""
+        return self.__netDelta
+
+    def getNetGamma(self):
+        return self.__netGamma
+
+    def getNetTheta(self):
+        return self.__netTheta
+
+    def getNetVega(self):
+        return self.__netVega
@@ -0,0 +1,389 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import glob
+import heapq
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyalgotrade import bar
+from pyalgomate.barfeed import BaseBarFeed
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.barfeed.journal import JOURNAL_EXTENSION, readJournal, readJournalRecords
+
+logger = logging.getLogger(__name__)
+
+PARQUET_EXTENSION = '.parquet'
+
+
+def getReplayFiles(source):
+    """Returns the journal and parquet files of a file, a directory, a glob pattern or a list of them, sorted by name.
+
+    :param source: The files to replay.
+    :type source: string or list of strings.
+    """
+    paths = [source] if isinstance(source, str) else list(source)
+    ret = []
+    for path in paths:
+        if os.path.isdir(path):
+            ret += [os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+                    if name.endswith((JOURNAL_EXTENSION, PARQUET_EXTENSION))]
+        elif os.path.isfile(path):
+            ret.append(path)
+        else:
+            ret += glob.glob(path)
+    if len(ret) == 0:
+        raise Exception(f'No ticks to replay in {source}')
+    return sorted(set(ret))
+
+
+def dataFrameToTicks(df: pd.DataFrame):
+    """Yields the rows of a tick DataFrame, like the ones of :func:`pyalgomate.barfeed.journal.journalToDataFrame`,
+    as :class:`pyalgomate.barfeed.QuoteBar.QuoteBar` instances in Date/Time order.
+
+    Bar DataFrames, with a Close column instead of a Price one, are replayed with a tick per bar.
+    """
+    df = df.sort_values('Date/Time', kind='stable')
+    prices = df['Price'] if 'Price' in df.columns else df['Close']
+    dateTimes = [dateTime.to_pydatetime() for dateTime in pd.to_datetime(df['Date/Time'])]
+    exchangeDateTimes = [dateTime.to_pydatetime() for dateTime in pd.to_datetime(df['Exchange Date/Time'])] \
+        if 'Exchange Date/Time' in df.columns else dateTimes
+    volumes = df['Volume'].tolist() if 'Volume' in df.columns else [0] * len(df)
+    openInterests = df['Open Interest'].tolist() if 'Open Interest' in df.columns else [0] * len(df)
+
+    for instrument, dateTime, exchangeDateTime, price, volume, openInterest in zip(
+            df['Ticker'].tolist(), dateTimes, exchangeDateTimes, prices.tolist(), volumes, openInterests):
+        yield QuoteBar(dateTime, price, price, price, price, volume, openInterest, instrument, exchangeDateTime)
+
+
+def readTicks(path):
+    """Yields the ticks of a journal or parquet file."""
+    if path.endswith(JOURNAL_EXTENSION):
+        return readJournal(path)
+    return dataFrameToTicks(pd.read_parquet(path))
+
+
+def readInstruments(path):
+    """Returns the instruments of a journal or parquet file, without building its ticks."""
+    if path.endswith(JOURNAL_EXTENSION):
+        ret = dict()
+        for records, instrumentTable in readJournalRecords(path):
+            instruments = instrumentTable.getInstruments()
+            for instrument in np.unique(records['instrument']).tolist():
+                ret[instruments[instrument]] = None
+        return list(ret)
+    return pd.read_parquet(path, columns=['Ticker'])['Ticker'].unique().tolist()
+
+
+class ReplayFeed(BaseBarFeed):
+    """A BarFeed that replays recorded ticks through the interface of the live feeds, so paper strategies can be run,
+    load tested and regression tested offline.
+
+    :param source: The ticks to replay: tick journals or parquet files, given as a file, a directory, a glob pattern
+        or a list of them, or a DataFrame with the columns of :func:`pyalgomate.barfeed.journal.journalToDataFrame`.
+        The ticks of several files are merged in datetime order.
+    :type source: string, list of strings or :class:`pandas.DataFrame`.
+    :param speed: None to replay as fast as possible, 1 to replay in real time and N to replay N times faster than
+        real time.
+    :type speed: float.
+    :param maxLen: The maximum number of values that the :class:`pyalgotrade.dataseries.bards.BarDataSeries` will hold.
+        If None then dataseries.DEFAULT_MAX_LEN is used.
+    :type maxLen: int.
+
+    .. note::
+        As fast as possible, the feed behaves like a backtesting feed: the ticks that share a datetime are dispatched
+        as one :class:`pyalgotrade.bar.Bars`, in order, and two runs dispatch the same bars.
+
+    .. note::
+        In real time or accelerated, the feed behaves like :class:`pyalgomate.brokers.finvasia.feed.LiveTradeFeed`: a
+        thread releases every tick when it is due and the ticks of an instrument that are released while the strategy
+        is busy are coalesced into one bar with the latest values. Bar datetimes, :meth:`getCurrentDateTime` and
+        :meth:`isDataFeedAlive` follow the replay clock, which starts at the first tick when the feed starts.
+    """
+
+    # How long getNextBars waits for a due tick before giving the other subjects of the dispatcher a turn.
+    WAIT_TIMEOUT = 0.01
+    # The longest the replay thread sleeps at once, so stopping the feed doesn't wait for a distant tick.
+    MAX_SLEEP = 0.1
+
+    def __init__(self, source, speed=None, maxLen=None):
+        super(ReplayFeed, self).__init__(bar.Frequency.TRADE, maxLen)
+
+        if speed is not None and speed <= 0:
+            raise Exception("Invalid speed")
+
+        if isinstance(source, pd.DataFrame):
+            self.__paths = None
+            self.__df = source
+            instruments = source['Ticker'].unique().tolist()
+        else:
+            self.__paths = getReplayFiles(source)
+            self.__df = None
+            instruments = list(dict.fromkeys(instrument for path in self.__paths
+                                             for instrument in readInstruments(path)))
+
+        self.__speed = speed
+        self.__recordedInstruments = set(instruments)
+        self.__instruments = set(instruments)
+        for instrument in instruments:
+            self.registerDataSeries(instrument)
+
+        self.__ticks = None
+        self.__nextTick = None
+        self.__started = False
+        self.__stopped = False
+        self.__exhausted = False
+        self.__currentDateTime = None
+        self.__lastUpdateTime = None
+        self.__lastReceivedTime = None
+        self.__nextBarsTime = None
+        self.__lastBarsDateTime = None
+
+        # Replay clock
+        self.__firstDateTime = None
+        self.__startTime = None
+
+        # Ticks released by the replay thread and not dispatched yet, the latest of each instrument
+        self.__pending = dict()
+        self.__condition = threading.Condition(threading.Lock())
+        self.__thread = None
+
+        self.__tickCount = 0
+        self.__barCount = 0
+        self.__dispatchCount = 0
+        self.__conflated = 0
+        self.__maxLag = 0
+
+    def __readTicks(self):
+        if self.__df is not None:
+            return dataFrameToTicks(self.__df)
+        if len(self.__paths) == 1:
+            return readTicks(self.__paths[0])
+        return heapq.merge(*[readTicks(path) for path in self.__paths], key=lambda tick: tick.getDateTime())
+
+    def __open(self):
+        if self.__ticks is None:
+            self.__ticks = iter(self.__readTicks())
+            self.__nextTick = next(self.__ticks, None)
+            self.__exhausted = self.__nextTick is None
+
+    def __popTick(self):
+        ret = self.__nextTick
+        self.__tickCount += 1
+        self.__nextTick = next(self.__ticks, None)
+        if self.__nextTick is None:
+            self.__exhausted = True
+        return ret
+
+    def getApi(self):
+        return None
+
+    def getSpeed(self):
+        return self.__speed
+
+    def isRealTime(self):
+        return self.__speed is not None
+
+    def getReplayDateTime(self):
+        """Returns the datetime of the replay clock, or None before the feed starts."""
+        if self.__speed is None or self.__startTime is None:
+            return self.__currentDateTime
+        return self.__firstDateTime + datetime.timedelta(
+            seconds=(time.monotonic() - self.__startTime) * self.__speed)
+
+    def getCurrentDateTime(self):
+        ret = self.getReplayDateTime()
+        return ret if ret is not None else self.peekDateTime()
+
+    def barsHaveAdjClose(self):
+        return False
+
+    def start(self):
+        if self.__started:
+            logger.info("Already started!")
+            return
+
+        super(ReplayFeed, self).start()
+        self.__started = True
+        self.__open()
+        if self.__exhausted:
+            return
+
+        if self.__speed is not None:
+            self.__firstDateTime = self.__nextTick.getDateTime()
+            self.__startTime = time.monotonic()
+            self.__thread = threading.Thread(target=self.__replay, name='replay', daemon=True)
+            self.__thread.start()
+
+    def __replay(self):
+        while not self.__stopped and not self.__exhausted:
+            replayDateTime = self.getReplayDateTime()
+            ticks = []
+            while not self.__exhausted and self.__nextTick.getDateTime() <= replayDateTime:
+                ticks.append(self.__popTick())
+
+            if len(ticks) == 0:
+                delay = (self.__nextTick.getDateTime() - replayDateTime).total_seconds() / self.__speed
+                time.sleep(min(delay, ReplayFeed.MAX_SLEEP))
+                continue
+
+            self.__maxLag = max(self.__maxLag,
+                                (replayDateTime - ticks[0].getDateTime()).total_seconds() / self.__speed)
+            self.__release(ticks)
+
+        with self.__condition:
+            self.__condition.notify_all()
+        wakeUp = self.getWakeUp()
+        if wakeUp is not None:
+            wakeUp.notify()
+
+    def __release(self, ticks):
+        # All the due ticks at once, so the dispatcher thread doesn't wake up for every one of them
+        with self.__condition:
+            wasEmpty = len(self.__pending) == 0
+            for tick in ticks:
+                if tick.getInstrument() in self.__pending:
+                    self.__conflated += 1
+                self.__pending[tick.getInstrument()] = tick
+            if wasEmpty:
+                self.__condition.notify_all()
+        if wasEmpty:
+            wakeUp = self.getWakeUp()
+            if wakeUp is not None:
+                wakeUp.notify()
+
+    def __takeDueTicks(self):
+        with self.__condition:
+            if len(self.__pending) == 0 and not self.__exhausted and not self.__stopped and self.getWakeUp() is None:
+                self.__condition.wait(ReplayFeed.WAIT_TIMEOUT)
+            ret = list(self.__pending.values())
+            self.__pending = dict()
+        return ret
+
+    def __takeNextTicks(self):
+        # The ticks that share the datetime of the next one, the latest of each instrument
+        ret = dict()
+        dateTime = self.__nextTick.getDateTime()
+        while not self.__exhausted and self.__nextTick.getDateTime() == dateTime:
+            tick = self.__popTick()
+            if tick.getInstrument() in ret:
+                self.__conflated += 1
+            ret[tick.getInstrument()] = tick
+        return list(ret.values())
+
+    def getNextBars(self):
+        if self.__speed is None:
+            if self.__exhausted:
+                return None
+            ticks = self.__takeNextTicks()
+            barsDateTime = ticks[0].getDateTime()
+        else:
+            ticks = self.__takeDueTicks()
+            if len(ticks) == 0:
+                return None
+            barsDateTime = self.getReplayDateTime()
+
+        ticks = [tick for tick in ticks if tick.getInstrument() in self.__instruments]
+        if len(ticks) == 0:
+            return None
+
+        # Bar datetimes must keep increasing
+        if self.__lastBarsDateTime is not None and barsDateTime <= self.__lastBarsDateTime:
+            barsDateTime = self.__lastBarsDateTime + datetime.timedelta(microseconds=1)
+
+        self.__currentDateTime = barsDateTime
+        self.__nextBarsTime = barsDateTime
+        self.__lastBarsDateTime = barsDateTime
+        self.__lastReceivedTime = max(tick.getDateTime() for tick in ticks)
+        # Index ticks can be journaled without an exchange datetime
+        self.__lastUpdateTime = max((tick.getExchangeDateTime() for tick in ticks
+                                     if tick.getExchangeDateTime() is not None), default=self.__lastReceivedTime)
+
+        self.__dispatchCount += 1
+        self.__barCount += len(ticks)
+        return bar.Bars({tick.getInstrument(): tick if tick.getDateTime() == barsDateTime else
+                         tick.withDateTime(barsDateTime) for tick in ticks})
+
+    def subscribeInstruments(self, instruments):
+        """Subscribes to more recorded instruments while the feed runs. Returns the ones that were subscribed, the
+        ones that were already subscribed or that were not recorded are skipped."""
+        ret = []
+        for instrument in instruments:
+            if instrument not in self.__recordedInstruments:
+                logger.warning(f'{instrument} was not recorded')
+                continue
+            if instrument in self.__instruments:
+                continue
+            self.__instruments.add(instrument)
+            self.registerDataSeries(instrument)
+            ret.append(instrument)
+        return ret
+
+    def unsubscribeInstruments(self, instruments):
+        """Stops replaying the ticks of instruments and drops their dataseries."""
+        for instrument in instruments:
+            if instrument not in self.__instruments:
+                continue
+            self.__instruments.discard(instrument)
+            self.unregisterInstrument(instrument)
+
+    def peekDateTime(self):
+        # Return None when replaying in real time, like a live feed.
+        if self.__speed is not None:
+            return None
+        self.__open()
+        return None if self.__exhausted else self.__nextTick.getDateTime()
+
+    def stop(self):
+        self.__stopped = True
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def join(self):
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def eof(self):
+        if self.__stopped:
+            return True
+        if not self.__started or not self.__exhausted:
+            return False
+        with self.__condition:
+            return len(self.__pending) == 0
+
+    def getOrderBookUpdateEvent(self):
+        return None
+
+    def getLastUpdatedDateTime(self):
+        return self.__lastUpdateTime
+
+    def getLastReceivedDateTime(self):
+        return self.__lastReceivedTime
+
+    def getNextBarsDateTime(self):
+        return self.__nextBarsTime
+
+    def isDataFeedAlive(self, heartBeatInterval=5):
+        if self.__lastUpdateTime is None:
+            return False
+
+        timeSinceLastDateTime = self.getCurrentDateTime() - self.__lastUpdateTime
+        return timeSinceLastDateTime.total_seconds() <= heartBeatInterval
+
+    def getMetrics(self) -> dict:
+        """Returns the number of replayed ticks, dispatched bars and dispatches, the ticks coalesced with a later one
+        and the most the replay thread fell behind the replay clock, in seconds."""
+        return {
+            'ticks': self.__tickCount,
+            'bars': self.__barCount,
+            'dispatches': self.__dispatchCount,
+            'conflated': self.__conflated,
+            'maxLag': self.__maxLag,
+        }
@@ -0,0 +1,160 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import collections.abc
+
+from pyalgotrade import bar
+
+
+class QuoteBarExtraColumns(collections.abc.Mapping):
+    """Read-only view that exposes the fixed fields of a :class:`QuoteBar` through the
+    :meth:`pyalgotrade.bar.Bar.getExtraColumns` dictionary contract.
+
+    Nothing is copied, the values are read from the bar when a key is looked up.
+    """
+
+    __slots__ = ('__bar',)
+
+    KEYS = ("Instrument", "Open Interest", "Date/Time")
+
+    def __init__(self, quoteBar):
+        self.__bar = quoteBar
+
+    def __getitem__(self, key):
+        if key == "Instrument":
+            return self.__bar.getInstrument()
+        elif key == "Open Interest":
+            return self.__bar.getOpenInterest()
+        elif key == "Date/Time":
+            return self.__bar.getExchangeDateTime()
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(QuoteBarExtraColumns.KEYS)
+
+    def __len__(self):
+        return len(QuoteBarExtraColumns.KEYS)
+
+
+class QuoteBar(object):
+    """A compact bar built from live quotes.
+
+    Open interest, instrument and exchange timestamp are stored as fields instead of in a per bar `extra`
+    dictionary. :meth:`getExtraColumns` still returns a mapping with the `Instrument`, `Open Interest` and
+    `Date/Time` keys for code written against :class:`pyalgomate.barfeed.BasicBarEx.BasicBarEx`.
+
+    .. note::
+        :class:`pyalgotrade.bar.Bar` does not declare `__slots__`, so this class is registered as a virtual
+        subclass instead of inheriting from it. That keeps instances free of a per-instance `__dict__`.
+    """
+
+    __slots__ = (
+        '__dateTime',
+        '__open',
+        '__high',
+        '__low',
+        '__close',
+        '__volume',
+        '__openInterest',
+        '__instrument',
+        '__exchangeDateTime',
+        '__frequency',
+    )
+
+    def __init__(self, dateTime, open_, high, low, close, volume, openInterest, instrument,
+                 exchangeDateTime=None, frequency=bar.Frequency.TRADE):
+        self.__dateTime = dateTime
+        self.__open = open_
+        self.__high = high
+        self.__low = low
+        self.__close = close
+        self.__volume = volume
+        self.__openInterest = openInterest
+        self.__instrument = instrument
+        self.__exchangeDateTime = exchangeDateTime
+        self.__frequency = frequency
+
+    def __setstate__(self, state):
+        (self.__dateTime,
+            self.__open,
+            self.__high,
+            self.__low,
+            self.__close,
+            self.__volume,
+            self.__openInterest,
+            self.__instrument,
+            self.__exchangeDateTime,
+            self.__frequency) = state
+
+    def __getstate__(self):
+        return (
+            self.__dateTime,
+            self.__open,
+            self.__high,
+            self.__low,
+            self.__close,
+            self.__volume,
+            self.__openInterest,
+            self.__instrument,
+            self.__exchangeDateTime,
+            self.__frequency
+        )
+
+    def setUseAdjustedValue(self, useAdjusted):
+        if useAdjusted:
+            raise Exception("Adjusted close is not available")
+
+    def getUseAdjValue(self):
+        return False
+
+    def getDateTime(self):
+        return self.__dateTime
+
+    def getOpen(self, adjusted=False):
+        return self.__open
+
+    def getHigh(self, adjusted=False):
+        return self.__high
+
+    def getLow(self, adjusted=False):
+        return self.__low
+
+    def getClose(self, adjusted=False):
+        return self.__close
+
+    def getVolume(self):
+        return self.__volume
+
+    def getAdjClose(self):
+        return None
+
+    def getFrequency(self):
+        return self.__frequency
+
+    def getTypicalPrice(self):
+        return (self.__high + self.__low + self.__close) / 3.0
+
+    def getPrice(self):
+        return self.__close
+
+    def getOpenInterest(self):
+        return self.__openInterest
+
+    def getInstrument(self):
+        return self.__instrument
+
+    def getExchangeDateTime(self):
+        return self.__exchangeDateTime
+
+    def getExtraColumns(self):
+        return QuoteBarExtraColumns(self)
+
+    def withDateTime(self, dateTime):
+        """Returns a copy of the bar with another datetime. The exchange datetime is kept."""
+        return QuoteBar(dateTime, self.__open, self.__high, self.__low, self.__close, self.__volume,
+                        self.__openInterest, self.__instrument, self.__exchangeDateTime, self.__frequency)
+
+
+bar.Bar.register(QuoteBar)
+
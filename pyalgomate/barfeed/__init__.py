@@ -2,9 +2,13 @@ import abc
 
 import logging
 from pyalgotrade import bar
-from pyalgotrade.dataseries import bards
+from pyalgotrade import dataseries
 from pyalgotrade import feed
 from pyalgotrade import dispatchprio
+from pyalgotrade import observer
+from pyalgomate.barfeed.arrays import BarArrays
+from pyalgomate.barfeed import ringbuffer
+from pyalgomate.core.dispatcher import WakeUp, getWakeUp
 
 # This is only for backward compatibility since Frequency used to be defined here and not in bar.py.
 Frequency = bar.Frequency
@@ -22,19 +26,35 @@ class BaseBarFeed(feed.BaseFeed):
 
     .. note::
         This is a base class and should not be used directly.
+
+    .. note::
+        The feed keeps the registry of its dataseries instead of the one of :class:`pyalgotrade.feed.BaseFeed`, so
+        instruments can be unregistered and the instruments changed event is only emitted for instruments that are
+        actually added or removed.
     """
 
     def __init__(self, frequency, maxLen=None):
         super(BaseBarFeed, self).__init__(maxLen)
+        self.__maxLen = dataseries.get_checked_max_len(maxLen)
+        self.__dataSeries = dict()
         self.__frequency = frequency
         self.__useAdjustedValues = False
         self.__defaultInstrument = None
         self.__currentBars = None
         self.__lastBars = {}
+        self.__barArrays = BarArrays()
+        self.__instrumentsChangedEvent = observer.Event()
+        self.__subscriptionManager = None
+        self.__wakeUp = None
+        self.__journal = None
+        self.__unregistered = set()
 
     def reset(self):
         self.__currentBars = None
         self.__lastBars = {}
+        self.__barArrays.reset()
+        # The same instruments stay registered with empty dataseries, so no instruments changed event
+        self.__dataSeries = {key: self.createDataSeries(key, self.__maxLen) for key in self.__dataSeries}
         super(BaseBarFeed, self).reset()
 
     def setUseAdjustedValues(self, useAdjusted):
@@ -67,13 +87,26 @@ class BaseBarFeed(feed.BaseFeed):
         raise NotImplementedError()
 
     def createDataSeries(self, key, maxLen):
-        ret = bards.BarDataSeries(maxLen)
+        ret = ringbuffer.BarDataSeries(maxLen)
         ret.setUseAdjustedValues(self.__useAdjustedValues)
         return ret
 
+    def getNextValuesAndUpdateDS(self):
+        dateTime, values = self.getNextValues()
+        if dateTime is not None:
+            for key, value in values.items():
+                ds = self.__dataSeries.get(key, None)
+                if ds is None:
+                    self.registerDataSeries(key)
+                    ds = self.__dataSeries[key]
+                ds.appendWithDateTime(dateTime, value)
+        return (dateTime, values)
+
     def getNextValues(self):
         dateTime = None
         bars = self.getNextBars()
+        if bars is not None and self.__unregistered:
+            bars = self.__dropUnregistered(bars)
         if bars is not None:
             dateTime = bars.getDateTime()
 
@@ -90,8 +123,19 @@ class BaseBarFeed(feed.BaseFeed):
             self.__currentBars = bars
             for instrument in bars.getInstruments():
                 self.__lastBars[instrument] = bars[instrument]
+            self.__barArrays.update(bars)
         return (dateTime, bars)
 
+    def __dropUnregistered(self, bars):
+        # A late tick of an unregistered instrument would otherwise re-create its dataseries when the values are
+        # added, without the instruments changed event.
+        instruments = bars.getInstruments()
+        if self.__unregistered.isdisjoint(instruments):
+            return bars
+        remaining = {instrument: bars[instrument] for instrument in instruments
+                     if instrument not in self.__unregistered}
+        return bar.Bars(remaining) if remaining else None
+
     def getFrequency(self):
         return self.__frequency
 
@@ -106,6 +150,15 @@ class BaseBarFeed(feed.BaseFeed):
         """Returns the last :class:`pyalgotrade.bar.Bar` for a given instrument, or None."""
         return self.__lastBars.get(instrument, None)
 
+    def getBarArrays(self):
+        """Returns the :class:`pyalgomate.barfeed.arrays.BarArrays` with the last values of every instrument.
+
+        .. note::
+            This is not part of the pyalgotrade feed interface. Code that can run on any feed should use
+            :func:`pyalgomate.barfeed.arrays.getBarArrays`, which returns None for feeds without bar arrays.
+        """
+        return self.__barArrays
+
     def getDefaultInstrument(self):
         """Returns the last instrument registered."""
         return self.__defaultInstrument
@@ -118,12 +171,69 @@ class BaseBarFeed(feed.BaseFeed):
         self.__defaultInstrument = instrument
         self.registerDataSeries(instrument)
 
+    def registerDataSeries(self, key):
+        if key in self.__dataSeries:
+            return
+        self.__unregistered.discard(key)
+        self.__dataSeries[key] = self.createDataSeries(key, self.__maxLen)
+        self.__instrumentsChangedEvent.emit([key], [])
+
+    def getKeys(self):
+        return list(self.__dataSeries.keys())
+
+    def __getitem__(self, key):
+        """Returns the :class:`pyalgomate.barfeed.ringbuffer.BarDataSeries` for a given key."""
+        return self.__dataSeries[key]
+
+    def __contains__(self, key):
+        return key in self.__dataSeries
+
+    def unregisterInstrument(self, instrument):
+        """Drops the dataseries and the last bar of an instrument that the feed no longer receives, like an option
+        that was unsubscribed. Bars of the instrument that the feed still emits afterwards are dropped, until it is
+        registered again.
+
+        .. note::
+            The instrument keeps its slot in :meth:`getBarArrays`, with its last values.
+        """
+        if not self.isRegistered(instrument):
+            return
+        self.__unregistered.add(instrument)
+        del self.__dataSeries[instrument]
+        self.__lastBars.pop(instrument, None)
+        if self.__defaultInstrument == instrument:
+            self.__defaultInstrument = None
+        self.__instrumentsChangedEvent.emit([], [instrument])
+
+    def isRegistered(self, instrument):
+        return instrument in self
+
+    def getInstrumentsChangedEvent(self):
+        """Returns the event emitted when instruments are registered or unregistered. Handlers receive the list of
+        added and the list of removed instruments."""
+        return self.__instrumentsChangedEvent
+
+    def setSubscriptionManager(self, subscriptionManager):
+        self.__subscriptionManager = subscriptionManager
+
+    def getSubscriptionManager(self):
+        """Returns the :class:`pyalgomate.barfeed.subscriptions.SubscriptionManager` that rolls the option
+        subscriptions of a live feed, or None."""
+        return self.__subscriptionManager
+
+    def setJournal(self, journal):
+        """Sets a :class:`pyalgomate.barfeed.journal.TickJournal` to record the raw ticks of a live feed in."""
+        self.__journal = journal
+
+    def getJournal(self):
+        return self.__journal
+
     def getDataSeries(self, instrument=None):
         """Returns the :class:`pyalgotrade.dataseries.bards.BarDataSeries` for a given instrument.
 
         :param instrument: Instrument identifier. If None, the default instrument is returned.
         :type instrument: string.
-        :rtype: :class:`pyalgotrade.dataseries.bards.BarDataSeries`.
+        :rtype: :class:`pyalgomate.barfeed.ringbuffer.BarDataSeries`.
         """
         if instrument is None:
             instrument = self.__defaultInstrument
@@ -132,6 +242,20 @@ class BaseBarFeed(feed.BaseFeed):
     def getDispatchPriority(self):
         return dispatchprio.BAR_FEED
 
+    def isRealTime(self):
+        """Returns True if the feed delivers bars as they happen, like a live or a paced replay feed. Strategies run
+        real-time feeds on a :class:`pyalgomate.core.dispatcher.LiveDispatcher`."""
+        return False
+
+    def onDispatcherRegistered(self, dispatcher):
+        super(BaseBarFeed, self).onDispatcherRegistered(dispatcher)
+        self.__wakeUp = getWakeUp(dispatcher)
+
+    def getWakeUp(self) -> WakeUp:
+        """Returns the :class:`pyalgomate.core.dispatcher.WakeUp` of the live dispatcher running the feed, or None.
+        Live feeds notify it when they queue ticks and don't block in `dispatch` when there is one."""
+        return self.__wakeUp
+
     def getLastUpdatedDateTime(self):
         raise None
 
@@ -0,0 +1,130 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import numpy as np
+
+
+def getOpenInterest(bar_):
+    getOpenInterest_ = getattr(bar_, 'getOpenInterest', None)
+    if getOpenInterest_ is not None:
+        return getOpenInterest_()
+    return bar_.getExtraColumns().get("Open Interest", 0)
+
+
+def getBarArrays(feed):
+    """Returns the :class:`BarArrays` of a feed, or None if the feed doesn't keep them.
+
+    Only :class:`pyalgomate.barfeed.BaseBarFeed` keeps bar arrays. Plain pyalgotrade feeds, like the CSV feeds used
+    for backtesting, don't, so consumers should probe with this function and fill arrays of their own from the bars
+    they receive when it returns None.
+    """
+    getBarArrays_ = getattr(feed, 'getBarArrays', None)
+    return getBarArrays_() if getBarArrays_ is not None else None
+
+
+class BarArrays(object):
+    """Structure-of-arrays view of the last bar of every instrument in a feed.
+
+    Every instrument gets a stable index the first time it is seen. The close, volume and open interest of its
+    last bar are kept at that index, so whole-chain computations can work on NumPy arrays instead of calling
+    the bar accessors one instrument at a time.
+
+    :param capacity: The initial number of instruments. The arrays grow as needed.
+    :type capacity: int.
+
+    .. note::
+        The getters return views of the underlying arrays. Those are replaced when the arrays grow, so the
+        views should not be kept across dispatches.
+    """
+
+    def __init__(self, capacity=256):
+        self.__capacity = capacity
+        self.reset()
+
+    def reset(self):
+        self.__indices = dict()
+        self.__instruments = []
+        self.__closes = np.full(self.__capacity, np.nan)
+        self.__volumes = np.zeros(self.__capacity)
+        self.__openInterests = np.zeros(self.__capacity)
+        self.__versions = np.zeros(self.__capacity, dtype=np.int64)
+        self.__version = 0
+        self.__dateTime = None
+
+    def copy(self):
+        """Returns a copy of the arrays, for consumers that run in another thread."""
+        ret = BarArrays(0)
+        count = len(self.__instruments)
+        ret.__indices = dict(self.__indices)
+        ret.__instruments = list(self.__instruments)
+        ret.__closes = self.__closes[:count].copy()
+        ret.__volumes = self.__volumes[:count].copy()
+        ret.__openInterests = self.__openInterests[:count].copy()
+        ret.__versions = self.__versions[:count].copy()
+        ret.__version = self.__version
+        ret.__dateTime = self.__dateTime
+        return ret
+
+    def __grow(self):
+        size = max(len(self.__closes), 1)
+        self.__closes = np.concatenate([self.__closes, np.full(size, np.nan)])
+        self.__volumes = np.concatenate([self.__volumes, np.zeros(size)])
+        self.__openInterests = np.concatenate([self.__openInterests, np.zeros(size)])
+        self.__versions = np.concatenate([self.__versions, np.zeros(size, dtype=np.int64)])
+
+    def getIndex(self, instrument):
+        """Returns the index of the instrument in the arrays, assigning a new one if it was not seen before."""
+        index = self.__indices.get(instrument, None)
+        if index is None:
+            index = len(self.__instruments)
+            if index == len(self.__closes):
+                self.__grow()
+            self.__indices[instrument] = index
+            self.__instruments.append(instrument)
+        return index
+
+    def getIndices(self, instruments):
+        """Returns a NumPy array with the indices of the given instruments."""
+        return np.fromiter((self.getIndex(instrument) for instrument in instruments), dtype=np.intp,
+                           count=len(instruments))
+
+    def update(self, bars):
+        """Stores the values of the given :class:`pyalgotrade.bar.Bars`."""
+        self.__version += 1
+        for instrument, bar_ in bars.items():
+            index = self.getIndex(instrument)
+            self.__closes[index] = bar_.getClose()
+            self.__volumes[index] = bar_.getVolume()
+            self.__openInterests[index] = getOpenInterest(bar_)
+            self.__versions[index] = self.__version
+        self.__dateTime = bars.getDateTime()
+
+    def getDateTime(self):
+        """Returns the datetime of the last update."""
+        return self.__dateTime
+
+    def getInstruments(self):
+        """Returns the instruments in index order."""
+        return self.__instruments
+
+    def getCloses(self):
+        return self.__closes[:len(self.__instruments)]
+
+    def getVolumes(self):
+        return self.__volumes[:len(self.__instruments)]
+
+    def getOpenInterests(self):
+        return self.__openInterests[:len(self.__instruments)]
+
+    def getVersion(self):
+        """Returns the number of updates so far."""
+        return self.__version
+
+    def getVersions(self):
+        """Returns, for every instrument, the update number in which its values last changed."""
+        return self.__versions[:len(self.__instruments)]
+
+    def getUpdated(self):
+        """Returns a boolean mask of the instruments that were part of the last update."""
+        return self.getVersions() == self.__version
@@ -0,0 +1,229 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import struct
+
+import numpy as np
+import pandas as pd
+
+from pyalgotrade import bar
+from pyalgomate.barfeed.arrays import getOpenInterest
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+# Fixed layout, little endian records. Datetimes are microseconds since the epoch of the naive (local) datetime.
+BAR_DTYPE = np.dtype([
+    ('dateTime', '<i8'),
+    ('instrument', '<u4'),
+    ('frequency', '<i4'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('openInterest', '<f8'),
+])
+
+TICK_DTYPE = np.dtype([
+    ('dateTime', '<i8'),
+    ('exchangeDateTime', '<i8'),
+    ('instrument', '<u4'),
+    ('price', '<f8'),
+    ('volume', '<f8'),
+    ('openInterest', '<f8'),
+])
+
+class RecordType:
+    BAR = 1
+    TICK = 2
+
+
+# magic, version, record type, length of the instrument names, number of records
+FRAME_HEADER = struct.Struct('<2sBBII')
+FRAME_MAGIC = b'PB'
+FRAME_VERSION = 1
+RECORD_DTYPES = {RecordType.BAR: BAR_DTYPE, RecordType.TICK: TICK_DTYPE}
+
+
+class InstrumentTable(object):
+    """Assigns a stable integer id to every instrument so records don't have to carry the names."""
+
+    def __init__(self, instruments=None):
+        self.__ids = dict()
+        self.__instruments = []
+        for instrument in instruments or []:
+            self.getId(instrument)
+
+    def __len__(self):
+        return len(self.__instruments)
+
+    def getId(self, instrument):
+        id_ = self.__ids.get(instrument, None)
+        if id_ is None:
+            id_ = len(self.__instruments)
+            self.__ids[instrument] = id_
+            self.__instruments.append(instrument)
+        return id_
+
+    def getInstrument(self, id_):
+        return self.__instruments[id_]
+
+    def getInstruments(self):
+        return self.__instruments
+
+
+def toTimestamps(dateTimes):
+    """Converts a list of datetimes (or None) to an int64 array of microseconds since the epoch."""
+    return np.array(dateTimes, dtype='datetime64[us]').astype(np.int64)
+
+
+def fromTimestamps(timestamps):
+    """Converts an int64 array of microseconds since the epoch to a list of datetimes (None for missing values)."""
+    return timestamps.astype('datetime64[us]').tolist()
+
+
+def barsToRecords(bars, instrumentTable):
+    """Encodes bars into a :data:`BAR_DTYPE` array.
+
+    :param bars: A :class:`pyalgotrade.bar.Bars` or a list of (instrument, bar) pairs.
+    :param instrumentTable: The table used to map instruments to ids.
+    :type instrumentTable: :class:`InstrumentTable`.
+    """
+    items = bars.items() if isinstance(bars, bar.Bars) else bars
+    records = np.empty(len(items), dtype=BAR_DTYPE)
+    if len(items) == 0:
+        return records
+
+    records['dateTime'] = toTimestamps([bar_.getDateTime() for _, bar_ in items])
+    records['instrument'] = [instrumentTable.getId(instrument) for instrument, _ in items]
+    records['frequency'] = [bar_.getFrequency() for _, bar_ in items]
+    records['open'] = [bar_.getOpen() for _, bar_ in items]
+    records['high'] = [bar_.getHigh() for _, bar_ in items]
+    records['low'] = [bar_.getLow() for _, bar_ in items]
+    records['close'] = [bar_.getClose() for _, bar_ in items]
+    records['volume'] = [bar_.getVolume() for _, bar_ in items]
+    records['openInterest'] = [getOpenInterest(bar_) for _, bar_ in items]
+    return records
+
+
+def recordsToBars(records, instrumentTable):
+    """Decodes a :data:`BAR_DTYPE` array into a list of (instrument, :class:`QuoteBar`) pairs."""
+    instruments = instrumentTable.getInstruments()
+    return [(instruments[instrument], QuoteBar(dateTime, open_, high, low, close, volume, openInterest,
+                                               instruments[instrument], None, frequency))
+            for dateTime, instrument, frequency, open_, high, low, close, volume, openInterest in zip(
+                fromTimestamps(records['dateTime']),
+                records['instrument'].tolist(),
+                records['frequency'].tolist(),
+                records['open'].tolist(),
+                records['high'].tolist(),
+                records['low'].tolist(),
+                records['close'].tolist(),
+                records['volume'].tolist(),
+                records['openInterest'].tolist())]
+
+
+def recordsToDataFrame(records, instrumentTable):
+    """Builds a DataFrame with the Ticker, Date/Time, Open, High, Low, Close, Volume and Open Interest columns used
+    for the data files from a :data:`BAR_DTYPE` array."""
+    instruments = instrumentTable.getInstruments()
+    return pd.DataFrame({
+        "Ticker": [instruments[instrument] for instrument in records['instrument'].tolist()],
+        "Date/Time": records['dateTime'].astype('datetime64[us]').astype('datetime64[ns]'),
+        "Open": records['open'],
+        "High": records['high'],
+        "Low": records['low'],
+        "Close": records['close'],
+        "Volume": records['volume'],
+        "Open Interest": records['openInterest'],
+    })
+
+
+def ticksToRecords(quoteBars, instrumentTable):
+    """Encodes trade :class:`QuoteBar` instances into a :data:`TICK_DTYPE` array."""
+    records = np.empty(len(quoteBars), dtype=TICK_DTYPE)
+    if len(quoteBars) == 0:
+        return records
+
+    records['dateTime'] = toTimestamps([quoteBar.getDateTime() for quoteBar in quoteBars])
+    records['exchangeDateTime'] = toTimestamps([quoteBar.getExchangeDateTime() for quoteBar in quoteBars])
+    records['instrument'] = [instrumentTable.getId(quoteBar.getInstrument()) for quoteBar in quoteBars]
+    records['price'] = [quoteBar.getClose() for quoteBar in quoteBars]
+    records['volume'] = [quoteBar.getVolume() for quoteBar in quoteBars]
+    records['openInterest'] = [quoteBar.getOpenInterest() for quoteBar in quoteBars]
+    return records
+
+
+def recordsToTicks(records, instrumentTable):
+    """Decodes a :data:`TICK_DTYPE` array into a list of trade :class:`QuoteBar` instances."""
+    instruments = instrumentTable.getInstruments()
+    return [QuoteBar(dateTime, price, price, price, price, volume, openInterest, instruments[instrument],
+                     exchangeDateTime)
+            for dateTime, exchangeDateTime, instrument, price, volume, openInterest in zip(
+                fromTimestamps(records['dateTime']),
+                fromTimestamps(records['exchangeDateTime']),
+                records['instrument'].tolist(),
+                records['price'].tolist(),
+                records['volume'].tolist(),
+                records['openInterest'].tolist())]
+
+
+def encodeFrame(recordType, records, instrumentTable):
+    """Packs records into a self-contained frame.
+
+    The frame carries the names of the instruments it references and the ids in the records are remapped to
+    positions in that list, so the receiver doesn't need the sender's :class:`InstrumentTable`.
+    """
+    ids, localIds = np.unique(records['instrument'], return_inverse=True)
+    names = '\n'.join(instrumentTable.getInstrument(id_) for id_ in ids.tolist()).encode()
+    records = records.copy()
+    records['instrument'] = localIds
+    return b''.join([FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, recordType, len(names), len(records)),
+                     names, records.tobytes()])
+
+
+def decodeFrame(data):
+    """Unpacks a frame built with :func:`encodeFrame`.
+
+    :returns: The record type, the records and an :class:`InstrumentTable` with the instruments they reference.
+    """
+    magic, version, recordType, namesLength, count = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise Exception("Invalid frame")
+
+    offset = FRAME_HEADER.size
+    names = bytes(data[offset:offset + namesLength]).decode()
+    offset += namesLength
+    records = np.frombuffer(data, dtype=RECORD_DTYPES[recordType], count=count, offset=offset)
+    return recordType, records, InstrumentTable(names.split('\n') if names else [])
+
+
+class BarCodec(object):
+    """Batch encoder/decoder of bars and ticks to self-contained binary frames.
+
+    :param instrumentTable: The table used to assign instrument ids. A new one is created if None.
+    :type instrumentTable: :class:`InstrumentTable`.
+    """
+
+    def __init__(self, instrumentTable=None):
+        self.__instrumentTable = instrumentTable if instrumentTable is not None else InstrumentTable()
+
+    def getInstrumentTable(self):
+        return self.__instrumentTable
+
+    def encodeBars(self, bars):
+        return encodeFrame(RecordType.BAR, barsToRecords(bars, self.__instrumentTable), self.__instrumentTable)
+
+    def encodeTicks(self, quoteBars):
+        return encodeFrame(RecordType.TICK, ticksToRecords(quoteBars, self.__instrumentTable),
+                           self.__instrumentTable)
+
+    def decode(self, data):
+        """Decodes a frame into a list of (instrument, bar) pairs for bar frames, or a list of bars for tick
+        frames."""
+        recordType, records, instrumentTable = decodeFrame(data)
+        if recordType == RecordType.BAR:
+            return recordsToBars(records, instrumentTable)
+        elif recordType == RecordType.TICK:
+            return recordsToTicks(records, instrumentTable)
+        raise Exception(f"Unknown record type {recordType}")
@@ -0,0 +1,121 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import time
+
+from pyalgotrade import bar
+
+
+class TickConflator(object):
+    """Merges the ticks of a live feed into multi-instrument :class:`pyalgotrade.bar.Bars`, keeping the latest tick
+    of each instrument.
+
+    The feed adds every tick it takes from its websocket queue with :meth:`add` and asks for bars with :meth:`pop`.
+    With a window, the pending ticks are held until the window has passed since the first of them. With
+    :attr:`DRAIN_ALL` they are emitted as soon as the feed asks, so a strategy that falls behind gets everything that
+    arrived meanwhile in one `onBars` instead of one `onBars` per tick.
+
+    :param window: How long, in seconds, to collect ticks before emitting them, usually between 0.05 and 0.25.
+    :type window: float.
+
+    .. note::
+        All the bars of a :class:`pyalgotrade.bar.Bars` must share a datetime, so the bars are stamped with the
+        datetime of the latest tick of the batch. The exchange datetime of each tick is kept.
+    """
+
+    # Emit whatever is pending every time the feed asks for bars.
+    DRAIN_ALL = 0
+
+    def __init__(self, window=DRAIN_ALL):
+        assert window is not None and window >= 0, "Invalid conflation window"
+        self.__window = window
+        self.__pending = dict()
+        self.__firstPendingTime = None
+        self.__lastDateTime = None
+        self.__ticks = 0
+        self.__bars = 0
+        self.__batches = 0
+        self.__queueDepth = 0
+        self.__maxQueueDepth = 0
+
+    def __len__(self):
+        return len(self.__pending)
+
+    def getWindow(self):
+        return self.__window
+
+    def add(self, quoteBar):
+        """Adds a tick, replacing the pending tick of the same instrument.
+
+        :param quoteBar: The tick.
+        :type quoteBar: :class:`pyalgomate.barfeed.QuoteBar.QuoteBar`.
+        """
+        if self.__firstPendingTime is None:
+            self.__firstPendingTime = time.monotonic()
+        self.__pending[quoteBar.getInstrument()] = quoteBar
+        self.__ticks += 1
+
+    def isReady(self):
+        """Returns True if there are pending ticks and the window has passed since the first of them."""
+        return self.__firstPendingTime is not None and \
+            (self.__window == TickConflator.DRAIN_ALL or time.monotonic() - self.__firstPendingTime >= self.__window)
+
+    def pop(self) -> bar.Bars:
+        """Returns the pending ticks as a :class:`pyalgotrade.bar.Bars` and clears them, or None if they are not
+        :meth:`isReady`."""
+        if not self.isReady():
+            return None
+
+        pending = self.__pending
+        self.__pending = dict()
+        self.__firstPendingTime = None
+
+        dateTime = max(quoteBar.getDateTime() for quoteBar in pending.values())
+        # Bar datetimes must keep increasing
+        if self.__lastDateTime is not None and dateTime <= self.__lastDateTime:
+            dateTime = self.__lastDateTime + datetime.timedelta(microseconds=1)
+        self.__lastDateTime = dateTime
+
+        self.__bars += len(pending)
+        self.__batches += 1
+        return bar.Bars({instrument: quoteBar if quoteBar.getDateTime() == dateTime else
+                          quoteBar.withDateTime(dateTime) for instrument, quoteBar in pending.items()})
+
+    def recordQueueDepth(self, depth):
+        """Records the number of events waiting in the feed's websocket queue."""
+        self.__queueDepth = depth
+        self.__maxQueueDepth = max(self.__maxQueueDepth, depth)
+
+    def getQueueDepth(self):
+        """Returns the last recorded depth of the feed's websocket queue."""
+        return self.__queueDepth
+
+    def getMaxQueueDepth(self):
+        return self.__maxQueueDepth
+
+    def getTickCount(self):
+        return self.__ticks
+
+    def getBarCount(self):
+        """Returns the number of instrument bars emitted."""
+        return self.__bars
+
+    def getBatchCount(self):
+        """Returns the number of :class:`pyalgotrade.bar.Bars` emitted, one `onBars` each."""
+        return self.__batches
+
+    def getConflationRatio(self):
+        """Returns the number of ticks per emitted :class:`pyalgotrade.bar.Bars`, or 0 if none was emitted."""
+        return self.__ticks / self.__batches if self.__batches else 0.0
+
+    def getMetrics(self) -> dict:
+        return {
+            'ticks': self.__ticks,
+            'bars': self.__bars,
+            'batches': self.__batches,
+            'conflationRatio': self.getConflationRatio(),
+            'queueDepth': self.__queueDepth,
+            'maxQueueDepth': self.__maxQueueDepth,
+        }
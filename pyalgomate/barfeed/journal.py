@@ -0,0 +1,292 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import logging
+import os
+import struct
+import threading
+
+import pandas as pd
+
+from pyalgomate.barfeed import codec
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# magic, version, compression
+JOURNAL_HEADER = struct.Struct('<4sBB')
+JOURNAL_MAGIC = b'PTKJ'
+JOURNAL_VERSION = 1
+# length of the block, number of ticks in it
+BLOCK_HEADER = struct.Struct('<II')
+JOURNAL_EXTENSION = '.ptkj'
+
+
+class Compression:
+    NONE = 0
+    ZSTD = 1
+
+
+class TickJournal(object):
+    """An append-only binary journal of the raw ticks of live feeds, one file per day.
+
+    :meth:`record` appends the tick to a bounded in-memory buffer and returns, a writer thread encodes the buffered
+    ticks into blocks and appends them to the file of their day. A block is a length-prefixed
+    :func:`pyalgomate.barfeed.codec.encodeFrame` tick frame, zstd compressed if the journal is, so every block is
+    self-contained and a file cut short by a crash reads up to its last complete block. Use :func:`readJournal` to
+    read a file back and :func:`journalToParquet` to convert it.
+
+    :param directory: The directory of the journal files.
+    :type directory: string.
+    :param prefix: The prefix of the journal file names, followed by the date.
+    :type prefix: string.
+    :param compression: :attr:`Compression.NONE` or :attr:`Compression.ZSTD`, which needs the zstandard package.
+    :type compression: int.
+    :param maxPending: How many ticks to buffer. Ticks recorded while the buffer is full are dropped and counted.
+    :type maxPending: int.
+    :param blockSize: How many ticks to buffer before waking up the writer.
+    :type blockSize: int.
+    :param flushInterval: How often, in seconds, the writer writes what is buffered.
+    :type flushInterval: float.
+    """
+
+    def __init__(self, directory, prefix='ticks', compression=Compression.NONE, maxPending=1000000, blockSize=4096,
+                 flushInterval=1.0):
+        if compression == Compression.ZSTD and zstandard is None:
+            raise Exception("zstd compression needs the zstandard package")
+
+        self.__directory = directory
+        self.__prefix = prefix
+        self.__compression = compression
+        self.__maxPending = maxPending
+        self.__blockSize = blockSize
+        self.__flushInterval = flushInterval
+        self.__lock = threading.Lock()
+        self.__pending = []
+        self.__blockReady = threading.Event()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.__file = None
+        self.__fileDate = None
+        self.__recorded = 0
+        self.__dropped = 0
+        self.__written = 0
+        self.__blocks = 0
+        self.__bytes = 0
+
+    def getPath(self, date):
+        """Returns the path of the journal file of a date."""
+        return os.path.join(self.__directory, f'{self.__prefix}-{date:%Y%m%d}{JOURNAL_EXTENSION}')
+
+    def start(self):
+        """Starts the writer thread. Recording before starting buffers the ticks."""
+        if self.__thread is not None:
+            return
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__thread = threading.Thread(target=self.__run, name='journal', daemon=True)
+        self.__thread.start()
+
+    def close(self):
+        """Writes the buffered ticks and stops the writer thread."""
+        self.__stopped.set()
+        self.__blockReady.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        else:
+            self.__write()
+        self.__closeFile()
+
+    def record(self, quoteBar):
+        """Appends a tick to the journal. It can be called from any thread and doesn't block on I/O.
+
+        :param quoteBar: The tick.
+        :type quoteBar: :class:`pyalgomate.barfeed.QuoteBar.QuoteBar`.
+        """
+        with self.__lock:
+            pending = len(self.__pending)
+            if pending >= self.__maxPending:
+                self.__dropped += 1
+                return
+            self.__pending.append(quoteBar)
+            self.__recorded += 1
+        if pending + 1 == self.__blockSize:
+            self.__blockReady.set()
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            self.__blockReady.wait(self.__flushInterval)
+            self.__blockReady.clear()
+            try:
+                self.__write()
+            except Exception as e:
+                logger.exception(f'Failed to write the tick journal: {e}')
+        self.__write()
+
+    def __write(self):
+        with self.__lock:
+            pending = self.__pending
+            self.__pending = []
+        if len(pending) == 0:
+            return
+
+        # Rotate on the day of the ticks, they arrive in order
+        start = 0
+        for end in range(1, len(pending) + 1):
+            if end == len(pending) or pending[end].getDateTime().date() != pending[start].getDateTime().date():
+                for blockStart in range(start, end, self.__blockSize):
+                    self.__writeBlock(pending[blockStart:min(blockStart + self.__blockSize, end)])
+                start = end
+        self.__file.flush()
+
+    def __writeBlock(self, quoteBars):
+        self.__openFile(quoteBars[0].getDateTime().date())
+        instrumentTable = codec.InstrumentTable()
+        block = codec.encodeFrame(codec.RecordType.TICK, codec.ticksToRecords(quoteBars, instrumentTable),
+                                  instrumentTable)
+        if self.__compression == Compression.ZSTD:
+            block = zstandard.ZstdCompressor().compress(block)
+        self.__file.write(BLOCK_HEADER.pack(len(block), len(quoteBars)))
+        self.__file.write(block)
+        self.__written += len(quoteBars)
+        self.__blocks += 1
+        self.__bytes += BLOCK_HEADER.size + len(block)
+
+    def __openFile(self, date):
+        if self.__fileDate == date:
+            return
+        self.__closeFile()
+        path = self.getPath(date)
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, 'r+b') as f:
+                compression = readJournalHeader(f)
+                if compression != self.__compression:
+                    raise Exception(f'{path} was written with another compression')
+                # Drop a block cut short by a crash, the blocks appended after it would be unreadable
+                end = findJournalEnd(f)
+                if end != os.path.getsize(path):
+                    logger.warning(f'Truncating the incomplete last block of {path}')
+                    f.truncate(end)
+        self.__file = open(path, 'ab')
+        if not exists:
+            self.__file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.__compression))
+        self.__fileDate = date
+        logger.info(f'Journaling ticks to {path}')
+
+    def __closeFile(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+            self.__fileDate = None
+
+    def getPendingCount(self):
+        return len(self.__pending)
+
+    def getMetrics(self) -> dict:
+        return {
+            'recorded': self.__recorded,
+            'dropped': self.__dropped,
+            'written': self.__written,
+            'pending': len(self.__pending),
+            'blocks': self.__blocks,
+            'bytes': self.__bytes,
+        }
+
+
+def readJournalHeader(f):
+    """Reads the header of a journal file and returns its compression."""
+    data = f.read(JOURNAL_HEADER.size)
+    if len(data) < JOURNAL_HEADER.size:
+        raise Exception("Invalid journal")
+    magic, version, compression = JOURNAL_HEADER.unpack(data)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise Exception("Invalid journal")
+    if compression == Compression.ZSTD and zstandard is None:
+        raise Exception("The journal is zstd compressed, reading it needs the zstandard package")
+    return compression
+
+
+def findJournalEnd(f):
+    """Returns the offset of the end of the last complete block of a journal file positioned after its header."""
+    size = os.fstat(f.fileno()).st_size
+    end = f.tell()
+    while end + BLOCK_HEADER.size <= size:
+        f.seek(end)
+        length, _ = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+        if end + BLOCK_HEADER.size + length > size:
+            break
+        end += BLOCK_HEADER.size + length
+    return end
+
+
+def readJournalRecords(path):
+    """Yields the :data:`pyalgomate.barfeed.codec.TICK_DTYPE` records of every block of a journal file with the
+    :class:`pyalgomate.barfeed.codec.InstrumentTable` of their instruments. An incomplete last block is skipped."""
+    with open(path, 'rb') as f:
+        compression = readJournalHeader(f)
+        decompressor = zstandard.ZstdDecompressor() if compression == Compression.ZSTD else None
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                break
+            length, count = BLOCK_HEADER.unpack(header)
+            block = f.read(length)
+            if len(block) < length:
+                logger.warning(f'{path} ends with an incomplete block of {count} ticks')
+                break
+            if decompressor is not None:
+                block = decompressor.decompress(block)
+            _, records, instrumentTable = codec.decodeFrame(block)
+            yield records, instrumentTable
+
+
+def readJournal(path):
+    """Yields the ticks of a journal file as :class:`pyalgomate.barfeed.QuoteBar.QuoteBar` instances."""
+    for records, instrumentTable in readJournalRecords(path):
+        yield from codec.recordsToTicks(records, instrumentTable)
+
+
+def journalToDataFrame(path) -> pd.DataFrame:
+    """Returns the ticks of a journal file with the Ticker, Date/Time, Exchange Date/Time, Price, Volume and
+    Open Interest columns."""
+    frames = []
+    for records, instrumentTable in readJournalRecords(path):
+        instruments = instrumentTable.getInstruments()
+        frames.append(pd.DataFrame({
+            "Ticker": [instruments[instrument] for instrument in records['instrument'].tolist()],
+            "Date/Time": records['dateTime'].astype('datetime64[us]').astype('datetime64[ns]'),
+            "Exchange Date/Time": records['exchangeDateTime'].astype('datetime64[us]').astype('datetime64[ns]'),
+            "Price": records['price'],
+            "Volume": records['volume'],
+            "Open Interest": records['openInterest'],
+        }))
+    if len(frames) == 0:
+        return pd.DataFrame(columns=["Ticker", "Date/Time", "Exchange Date/Time", "Price", "Volume",
+                                     "Open Interest"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def journalToParquet(path, directory):
+    """Converts a journal file to a parquet partition of `directory`, `date=YYYY-MM-DD/<name>.parquet`, and returns
+    its path.
+
+    :param path: The journal file.
+    :type path: string.
+    :param directory: The root directory of the partitions.
+    :type directory: string.
+    """
+    df = journalToDataFrame(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    date = datetime.datetime.strptime(name.rsplit('-', 1)[-1], '%Y%m%d').date()
+    partition = os.path.join(directory, f'date={date:%Y-%m-%d}')
+    os.makedirs(partition, exist_ok=True)
+    ret = os.path.join(partition, f'{name}.parquet')
+    df.to_parquet(ret, index=False)
+    return ret
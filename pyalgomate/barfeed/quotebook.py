@@ -0,0 +1,75 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+
+class QuoteBook(object):
+    """The last quote of every key of a live feed, written by the websocket thread and read by the dispatcher.
+
+    Every key holds an immutable `(version, quote)` entry, where the version is the number of updates applied to the
+    quote. A tick merges into a new quote dictionary and replaces the entry of its key with a single dictionary
+    assignment, so only the quote that changed is copied. Readers never take a lock, never block the writer and never
+    see a half-applied update. A new key is added to a copy of the entries that then replaces them, so the entries
+    readers iterate never change size under them. The book also has a sequence, the number of updates applied
+    overall.
+
+    .. note::
+        The book expects a single writer, the websocket thread. Each entry is consistent on its own, but the entries
+        of different keys may be read from different points in the tick stream.
+    """
+
+    def __init__(self):
+        self.__entries = dict()
+        self.__sequence = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def update(self, key, message):
+        """Merges a tick into the quote of a key. Returns the version of the quote.
+
+        :param key: The quote key.
+        :type key: string.
+        :param message: The fields of the tick. Fields missing from it keep their previous values.
+        :type message: dict.
+        """
+        entry = self.__entries.get(key, None)
+        if entry is None:
+            entries = dict(self.__entries)
+            version = 1
+            entries[key] = (version, dict(message))
+            self.__entries = entries
+        else:
+            version, quote = entry[0] + 1, dict(entry[1])
+            quote.update(message)
+            self.__entries[key] = (version, quote)
+        self.__sequence += 1
+        return version
+
+    def get(self, key, default=None) -> dict:
+        """Returns the quote of a key. The quote must not be modified."""
+        entry = self.__entries.get(key, None)
+        return entry[1] if entry is not None else default
+
+    def getVersion(self, key):
+        """Returns the number of updates applied to the quote of a key, 0 if there were none."""
+        entry = self.__entries.get(key, None)
+        return entry[0] if entry is not None else 0
+
+    def getEntry(self, key):
+        """Returns the `(version, quote)` of a key, or None. Both belong to the same update."""
+        return self.__entries.get(key, None)
+
+    def getSequence(self):
+        """Returns the number of updates applied to the book."""
+        return self.__sequence
+
+    def keys(self):
+        return self.__entries.keys()
+
+    def items(self):
+        """Returns the `(version, quote)` entries keyed by key. They can be iterated while ticks arrive."""
+        return self.__entries.items()
@@ -0,0 +1,138 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import numpy as np
+
+from pyalgotrade import dataseries
+from pyalgotrade.dataseries import bards
+from pyalgomate.barfeed.arrays import getOpenInterest
+from pyalgomate.core.constants import ist_tz
+
+
+def toDateTime64(dateTime):
+    """Returns a datetime as a microsecond :class:`numpy.datetime64`. NumPy doesn't take timezone aware datetimes, so
+    those are converted to naive IST datetimes, like the ones the feeds build with `datetime.datetime.now()`."""
+    if dateTime.tzinfo is not None:
+        dateTime = dateTime.astimezone(ist_tz).replace(tzinfo=None)
+    return np.datetime64(dateTime, 'us')
+
+
+class BarRingBuffer(object):
+    """Fixed capacity NumPy ring buffers for the fields of a sequence of bars.
+
+    Every value is written twice, at its slot and at its slot plus the buffer size. That way the last `n` values of a
+    field are always a contiguous slice and :meth:`last` returns a view without copying. Storage starts small and
+    doubles until it reaches the capacity.
+
+    :param capacity: The maximum number of values to hold. Older values are discarded once it is reached.
+        If None then dataseries.DEFAULT_MAX_LEN is used.
+    :type capacity: int.
+    """
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume', 'openInterest')
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, capacity=None):
+        self.__capacity = dataseries.get_checked_max_len(capacity)
+        self.__count = 0
+        self.__allocate(min(self.__capacity, BarRingBuffer.INITIAL_CAPACITY))
+
+    def __allocate(self, size):
+        buffers = {field: np.full(size * 2, np.nan) for field in BarRingBuffer.FIELDS}
+        buffers['dateTime'] = np.full(size * 2, np.datetime64('NaT'), dtype='datetime64[us]')
+
+        # Storage only grows before the buffers wrap around, so the values are still in slot order.
+        if self.__count:
+            for field, buffer in buffers.items():
+                values = self.__buffers[field][:self.__count]
+                buffer[:self.__count] = values
+                buffer[size:size + self.__count] = values
+
+        self.__buffers = buffers
+        self.__size = size
+
+    def __len__(self):
+        return min(self.__count, self.__capacity)
+
+    def getCapacity(self):
+        return self.__capacity
+
+    def append(self, dateTime, open_, high, low, close, volume, openInterest=0):
+        if self.__count == self.__size and self.__size < self.__capacity:
+            self.__allocate(min(self.__size * 2, self.__capacity))
+
+        size = self.__size
+        slot = self.__count % size
+        buffers = self.__buffers
+        for field, value in (('dateTime', toDateTime64(dateTime)), ('open', open_), ('high', high),
+                             ('low', low), ('close', close), ('volume', volume), ('openInterest', openInterest)):
+            buffer = buffers[field]
+            buffer[slot] = value
+            buffer[slot + size] = value
+        self.__count += 1
+
+    def appendBar(self, bar_):
+        self.append(bar_.getDateTime(), bar_.getOpen(), bar_.getHigh(), bar_.getLow(), bar_.getClose(),
+                    bar_.getVolume(), getOpenInterest(bar_))
+
+    def last(self, n=None, field='close'):
+        """Returns a read-only view with the last `n` values of a field, oldest first.
+
+        :param n: The number of values. If None, all the values held are returned.
+        :type n: int.
+        :param field: One of :attr:`FIELDS` or `dateTime`.
+        :type field: string.
+        """
+        length = len(self)
+        n = length if n is None else min(n, length)
+        end = (self.__count - 1) % self.__size + 1 + self.__size
+        ret = self.__buffers[field][end - n:end]
+        ret.flags.writeable = False
+        return ret
+
+
+class BarDataSeries(bards.BarDataSeries):
+    """A :class:`pyalgotrade.dataseries.bards.BarDataSeries` that can also keep the bar fields in a
+    :class:`BarRingBuffer`, for indicators and strategies that work on NumPy windows.
+
+    The ring buffer is opt-in: it is created the first time a strategy asks for it with :meth:`getRingBuffer` or
+    :meth:`last`, filled with the bars held so far, and only then kept up to date. Dataseries that nobody reads as
+    arrays don't pay for it.
+
+    :param maxLen: The maximum number of values to hold. If None then dataseries.DEFAULT_MAX_LEN is used.
+    :type maxLen: int.
+    :param capacity: The capacity of the ring buffers. If None then maxLen is used.
+    :type capacity: int.
+    """
+
+    def __init__(self, maxLen=None, capacity=None):
+        super(BarDataSeries, self).__init__(maxLen)
+        self.__capacity = capacity if capacity is not None else maxLen
+        self.__ringBuffer = None
+
+    def appendWithDateTime(self, dateTime, bar):
+        super(BarDataSeries, self).appendWithDateTime(dateTime, bar)
+        if self.__ringBuffer is not None:
+            self.__ringBuffer.append(dateTime, bar.getOpen(), bar.getHigh(), bar.getLow(), bar.getClose(),
+                                     bar.getVolume(), getOpenInterest(bar))
+
+    def hasRingBuffer(self):
+        return self.__ringBuffer is not None
+
+    def getRingBuffer(self):
+        """Returns the :class:`BarRingBuffer` with the bar fields, creating it the first time."""
+        if self.__ringBuffer is None:
+            ringBuffer = BarRingBuffer(self.__capacity)
+            dateTimes = self.getDateTimes()
+            for i in range(max(len(self) - ringBuffer.getCapacity(), 0), len(self)):
+                bar = self[i]
+                ringBuffer.append(dateTimes[i], bar.getOpen(), bar.getHigh(), bar.getLow(), bar.getClose(),
+                                  bar.getVolume(), getOpenInterest(bar))
+            self.__ringBuffer = ringBuffer
+        return self.__ringBuffer
+
+    def last(self, n=None, field='close'):
+        """Returns a read-only NumPy view with the last `n` values of a field. See :meth:`BarRingBuffer.last`."""
+        return self.getRingBuffer().last(n, field)
@@ -0,0 +1,181 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OptionWindow(object):
+    """The option strikes subscribed for one underlying and expiry: `count` strikes on each side of a center strike,
+    calls and puts.
+
+    :param underlying: The underlying.
+    :type underlying: string.
+    :param expiry: The expiry.
+    :type expiry: datetime.date.
+    :param strikeDifference: The spacing of the strikes.
+    :type strikeDifference: int.
+    :param count: The number of strikes on each side of the center.
+    :type count: int.
+    """
+
+    def __init__(self, underlying, expiry, strikeDifference, count):
+        self.underlying = underlying
+        self.expiry = expiry
+        self.strikeDifference = strikeDifference
+        self.count = count
+        self.center = None
+        # Strike of every subscribed symbol
+        self.strikes = dict()
+
+    def getCenter(self, ltp):
+        # Same rounding as the brokers' getOptionSymbols, so the initial window matches the one they build
+        return int(float(ltp) / self.strikeDifference) * self.strikeDifference
+
+    def getStrikes(self, center):
+        return [center + n * self.strikeDifference for n in range(-self.count, self.count + 1)]
+
+    def isFar(self, strike, center, retireBuffer):
+        return abs(strike - center) > (self.count + retireBuffer) * self.strikeDifference
+
+
+class SubscriptionManager(object):
+    """Keeps the option subscriptions of a live feed centered on the LTP of each underlying.
+
+    Every underlying has a window of strikes per expiry. When the ATM strike moves `rollThreshold` strikes away from
+    the center of a window, the window is re-centered: the strikes that entered it are subscribed and the ones more
+    than `retireBuffer` strikes outside of it are unsubscribed. The two margins keep an LTP that oscillates around a
+    strike from subscribing and unsubscribing the same instruments over and over, and bound the number of
+    subscriptions of a window to `2 * (2 * (count + retireBuffer) + 1)`.
+
+    The feed must implement `subscribeInstruments(instruments)`, returning the instruments it subscribed, and
+    `unsubscribeInstruments(instruments)`.
+
+    :param getOptionSymbol: The broker's `getOptionSymbol(underlying, expiry, strike, callOrPut)`.
+    :type getOptionSymbol: function.
+    :param rollThreshold: How many strikes the ATM must move from the center of a window before it is re-centered.
+    :type rollThreshold: int.
+    :param retireBuffer: How many strikes outside of a window are kept subscribed.
+    :type retireBuffer: int.
+    """
+
+    def __init__(self, getOptionSymbol, rollThreshold=2, retireBuffer=2):
+        assert rollThreshold >= 1, "Invalid roll threshold"
+        assert retireBuffer >= 0, "Invalid retire buffer"
+        self.__getOptionSymbol = getOptionSymbol
+        self.__rollThreshold = rollThreshold
+        self.__retireBuffer = retireBuffer
+        self.__windows = dict()
+        self.__retentionChecks = []
+        self.__feed = None
+        self.__subscribed = 0
+        self.__unsubscribed = 0
+        self.__rolls = 0
+
+    def addWindow(self, underlying, expiry, ltp, strikeDifference, count):
+        """Adds the window of an underlying and expiry, centered on an LTP. Returns its option symbols, to be
+        subscribed when the feed is built.
+
+        :param underlying: The underlying.
+        :type underlying: string.
+        :param expiry: The expiry.
+        :type expiry: datetime.date.
+        :param ltp: The LTP of the underlying.
+        :type ltp: int/float.
+        :param strikeDifference: The spacing of the strikes.
+        :type strikeDifference: int.
+        :param count: The number of strikes on each side of the ATM strike.
+        :type count: int.
+        """
+        window = OptionWindow(underlying, expiry, strikeDifference, count)
+        window.center = window.getCenter(ltp)
+        for strike in window.getStrikes(window.center):
+            for callOrPut in ('C', 'P'):
+                window.strikes[self.__getOptionSymbol(underlying, expiry, strike, callOrPut)] = strike
+        self.__windows.setdefault(underlying, []).append(window)
+        return list(window.strikes.keys())
+
+    def getInstruments(self):
+        """Returns the option symbols of all the windows."""
+        return list(dict.fromkeys(symbol for windows in self.__windows.values() for window in windows
+                                  for symbol in window.strikes))
+
+    def getWindows(self, underlying):
+        return self.__windows.get(underlying, [])
+
+    def addRetentionCheck(self, check):
+        """Adds a function that returns True for the instruments that must stay subscribed, like the ones with open
+        positions."""
+        self.__retentionChecks.append(check)
+
+    def attach(self, feed):
+        """Starts following the LTPs in the bars of a feed."""
+        self.__feed = feed
+        feed.setSubscriptionManager(self)
+        feed.getNewValuesEvent().subscribe(self.__onBars)
+
+    def __onBars(self, dateTime, bars):
+        for underlying in self.__windows:
+            bar = bars.getBar(underlying)
+            if bar is not None:
+                self.update(underlying, bar.getClose())
+
+    def __isRetained(self, instrument):
+        return any(check(instrument) for check in self.__retentionChecks)
+
+    def update(self, underlying, ltp):
+        """Re-centers the windows of an underlying that the LTP moved away from."""
+        for window in self.__windows.get(underlying, []):
+            center = window.getCenter(ltp)
+            if abs(center - window.center) < self.__rollThreshold * window.strikeDifference:
+                continue
+            self.__roll(window, center)
+
+    def __roll(self, window, center):
+        self.__rolls += 1
+        window.center = center
+
+        added = dict()
+        for strike in window.getStrikes(center):
+            for callOrPut in ('C', 'P'):
+                symbol = self.__getOptionSymbol(window.underlying, window.expiry, strike, callOrPut)
+                if symbol not in window.strikes:
+                    added[symbol] = strike
+        retired = [symbol for symbol, strike in window.strikes.items()
+                   if window.isFar(strike, center, self.__retireBuffer) and not self.__isRetained(symbol)]
+
+        logger.info(f'Rolling the {window.underlying} {window.expiry} options to {center}. Subscribing '
+                    f'{len(added)} and unsubscribing {len(retired)} instruments')
+
+        # Symbols of other windows, like a weekly expiry that is also the monthly one, are already subscribed
+        for symbol in [symbol for symbol in added if self.__isSubscribed(symbol)]:
+            window.strikes[symbol] = added.pop(symbol)
+        if len(added):
+            subscribed = self.__feed.subscribeInstruments(list(added.keys())) if self.__feed is not None else []
+            for symbol in subscribed:
+                window.strikes[symbol] = added[symbol]
+            self.__subscribed += len(subscribed)
+
+        for symbol in retired:
+            del window.strikes[symbol]
+        retired = [symbol for symbol in retired if not self.__isSubscribed(symbol)]
+        if len(retired) and self.__feed is not None:
+            self.__feed.unsubscribeInstruments(retired)
+            self.__unsubscribed += len(retired)
+
+    def __isSubscribed(self, symbol):
+        return any(symbol in window.strikes for windows in self.__windows.values() for window in windows)
+
+    def getSubscriptionCount(self):
+        """Returns the number of option symbols subscribed by all the windows."""
+        return len(self.getInstruments())
+
+    def getMetrics(self) -> dict:
+        return {
+            'subscriptions': self.getSubscriptionCount(),
+            'rolls': self.__rolls,
+            'subscribed': self.__subscribed,
+            'unsubscribed': self.__unsubscribed,
+        }
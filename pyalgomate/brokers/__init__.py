@@ -3,8 +3,8 @@
 """
 import os
 import datetime
-import re
 import pandas as pd
+import functools
 import logging
 from typing import List
 
@@ -15,7 +15,7 @@ from pyalgomate.utils import UnderlyingIndex
 import pyalgomate.utils as utils
 from pyalgomate.backtesting.DataFrameFeed import DataFrameFeed
 
-from pyalgomate.strategies import OptionContract
+from pyalgomate.brokers.contracts import OptionContractParser, OptionContractRegistry, datedGrammar, strikeGrammar
 
 logger = logging.getLogger()
 
@@ -52,6 +52,13 @@ underlyingMapping = {
 }
 
 
+# Backtesting data names options after their underlying, like BANKNIFTY47000CE
+optionContractRegistry = OptionContractRegistry(OptionContractParser([
+    datedGrammar(r'[A-Z\|]+'),
+    strikeGrammar(r'[A-Z]+')
+]))
+
+
 def getUnderlyingMappings():
     return underlyingMapping
 
@@ -60,6 +67,8 @@ def getUnderlyingDetails(underlying):
     return underlyingMapping[underlying]
 
 
+# Strategies build the same symbols on every bar, build each one once
+@functools.lru_cache(maxsize=4096, typed=True)
 def getOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut):
     return f'{underlyingInstrument}{expiry.strftime("%d%b%y").upper()}{callOrPut.upper()}{strikePrice}'
 
@@ -102,22 +111,7 @@ class BacktestingBroker(backtesting.Broker):
         return underlyingInstrument + str(ceStrikePrice) + "CE", underlyingInstrument + str(peStrikePrice) + "PE"
 
     def getOptionContract(self, symbol):
-        m = re.match(r"([A-Z\|]+)(\d{2})([A-Z]{3})(\d{2})([CP])(\d+)", symbol)
-
-        if m is not None:
-            day = int(m.group(2))
-            month = m.group(3)
-            year = int(m.group(4)) + 2000
-            expiry = datetime.date(
-                year, datetime.datetime.strptime(month, '%b').month, day)
-            return OptionContract(symbol, int(m.group(6)), expiry, "c" if m.group(5) == "C" else "p", m.group(1))
-
-        m = re.match(r"([A-Z]+)(\d+)(CE|PE)", symbol)
-
-        if m is None:
-            return None
-
-        return OptionContract(symbol, int(m.group(2)), None, "c" if m.group(3) == "CE" else "p", m.group(1))
+        return optionContractRegistry.getOptionContract(symbol)
 
     def getHistoricalData(self, exchangeSymbol: str, startTime: datetime.datetime, interval: str) -> pd.DataFrame():
         return pd.DataFrame(columns=['Date/Time', 'Open', 'High', 'Low', 'Close', 'Volume', 'Open Interest'])
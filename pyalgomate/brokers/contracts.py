@@ -0,0 +1,340 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import bisect
+import calendar
+import datetime
+import math
+import re
+import threading
+
+import pyalgomate.utils as utils
+from pyalgomate.strategies import OptionContract
+
+MONTHS = {month.upper(): number for number, month in enumerate(calendar.month_abbr) if month}
+
+# Weekly symbols spell the month with a single character
+WEEKLY_MONTHS = dict({str(number): number for number in range(1, 10)}, O=10, N=11, D=12)
+
+
+class SymbolGrammar(object):
+    """One way of spelling option symbols: a regular expression and a function that builds the contract from its
+    match.
+
+    :param pattern: The regular expression, matched at the start of the symbol.
+    :type pattern: string.
+    :param build: Called with the symbol, the match and the underlying resolver. Returns the
+        :class:`pyalgomate.strategies.OptionContract`, or None if the match doesn't name a known contract.
+    :type build: function.
+    """
+
+    def __init__(self, pattern, build):
+        self.__regex = re.compile(pattern)
+        self.__build = build
+
+    def parse(self, symbol, resolveUnderlying):
+        m = self.__regex.match(symbol)
+        if m is None:
+            return None
+
+        try:
+            return self.__build(symbol, m, resolveUnderlying)
+        except ValueError:
+            # Not a valid date
+            return None
+
+
+def __optionType(value):
+    return "c" if value in ("C", "CE") else "p"
+
+
+def datedGrammar(prefix):
+    """`<prefix><DD><MON><YY><C|P><strike>`, as in NFO|BANKNIFTY28MAR24C47000."""
+    def build(symbol, m, resolveUnderlying):
+        month = MONTHS.get(m.group(3), None)
+        underlying = resolveUnderlying(m.group(1))
+        if month is None or underlying is None:
+            return None
+        expiry = datetime.date(int(m.group(4)) + 2000, month, int(m.group(2)))
+        return OptionContract(symbol, int(m.group(6)), expiry, __optionType(m.group(5)), underlying)
+
+    return SymbolGrammar(rf"({prefix})(\d{{2}})([A-Z]{{3}})(\d{{2}})([CP])(\d+)", build)
+
+
+def monthlyGrammar(prefix, getIndex=None):
+    """`<prefix><YY><MON><strike><CE|PE>`, as in NFO:BANKNIFTY24MAR47000CE. The expiry is the monthly expiry of
+    that month.
+
+    :param getIndex: Returns the :class:`pyalgomate.utils.UnderlyingIndex` of an underlying, used to find its monthly
+        expiry. If None, the BANKNIFTY expiry is used.
+    """
+    def build(symbol, m, resolveUnderlying):
+        month = MONTHS.get(m.group(3), None)
+        underlying = resolveUnderlying(m.group(1))
+        if month is None or underlying is None:
+            return None
+        firstDay = datetime.date(int(m.group(2)) + 2000, month, 1)
+        expiry = utils.getNearestMonthlyExpiryDate(firstDay) if getIndex is None else \
+            utils.getNearestMonthlyExpiryDate(firstDay, getIndex(underlying))
+        return OptionContract(symbol, int(m.group(4)), expiry, __optionType(m.group(5)), underlying)
+
+    return SymbolGrammar(rf"({prefix})(\d{{2}})([A-Z]{{3}})(\d+)([CP])E", build)
+
+
+def weeklyGrammar(prefix):
+    """`<prefix><YY><M><DD><strike><CE|PE>`, with the months October to December spelled O, N and D, as in
+    NFO:BANKNIFTY2432747000CE."""
+    def build(symbol, m, resolveUnderlying):
+        underlying = resolveUnderlying(m.group(1))
+        if underlying is None:
+            return None
+        expiry = datetime.date(int(m.group(2)) + 2000, WEEKLY_MONTHS[m.group(3)], int(m.group(4)))
+        return OptionContract(symbol, int(m.group(5)), expiry, __optionType(m.group(6)), underlying)
+
+    return SymbolGrammar(rf"({prefix})(\d{{2}})(\d|[OND])(\d{{2}})(\d+)([CP])E", build)
+
+
+def strikeGrammar(prefix):
+    """`<prefix><strike><CE|PE>`, without an expiry, as in BANKNIFTY47000CE."""
+    def build(symbol, m, resolveUnderlying):
+        underlying = resolveUnderlying(m.group(1))
+        if underlying is None:
+            return None
+        return OptionContract(symbol, int(m.group(2)), None, __optionType(m.group(3)), underlying)
+
+    return SymbolGrammar(rf"({prefix})(\d+)(CE|PE)", build)
+
+
+def mappingResolver(underlyingMapping):
+    """Returns an underlying resolver that looks the option prefix up in a broker's underlying mapping."""
+    def resolve(optionPrefix):
+        for underlying, underlyingDetails in underlyingMapping.items():
+            if underlyingDetails['optionPrefix'] == optionPrefix:
+                return underlying
+        return None
+
+    return resolve
+
+
+def prefixResolver(optionPrefix):
+    """The underlying resolver of brokers whose option prefix is the underlying itself."""
+    return optionPrefix
+
+
+class OptionContractParser(object):
+    """Parses option symbols with the grammars of a broker. The first grammar that builds a contract wins.
+
+    :param grammars: The :class:`SymbolGrammar` of the broker, in the order they are tried.
+    :type grammars: list.
+    :param resolveUnderlying: Returns the underlying of an option prefix, or None if it is unknown.
+    :type resolveUnderlying: function.
+    """
+
+    def __init__(self, grammars, resolveUnderlying=prefixResolver):
+        self.__grammars = grammars
+        self.__resolveUnderlying = resolveUnderlying
+
+    def parse(self, symbol) -> OptionContract:
+        for grammar in self.__grammars:
+            ret = grammar.parse(symbol, self.__resolveUnderlying)
+            if ret is not None:
+                return ret
+        return None
+
+
+class OptionContractRegistry(object):
+    """The option contracts of a broker, keyed by symbol.
+
+    A symbol is parsed the first time it is seen, at subscription time or on the first lookup, and every later lookup
+    is a dictionary hit that returns the same immutable :class:`pyalgomate.strategies.OptionContract`. Symbols that
+    aren't options are remembered as None. A registry is shared by all the broker instances that use the same
+    symbols, and can be used from any thread.
+
+    :param parser: The parser of the broker's symbols.
+    :type parser: :class:`OptionContractParser`.
+    """
+
+    def __init__(self, parser: OptionContractParser):
+        self.__parser = parser
+        self.__contracts = dict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__contracts)
+
+    def getOptionContract(self, symbol) -> OptionContract:
+        """Returns the contract of a symbol, or None if it is not an option."""
+        try:
+            return self.__contracts[symbol]
+        except KeyError:
+            pass
+
+        optionContract = self.__parser.parse(symbol)
+        with self.__lock:
+            # Another thread may have parsed it meanwhile, keep the first contract so it stays unique
+            return self.__contracts.setdefault(symbol, optionContract)
+
+    def register(self, symbols):
+        """Parses the given symbols ahead of their first lookup, usually when they are subscribed."""
+        for symbol in symbols:
+            self.getOptionContract(symbol)
+
+    def addAlias(self, key, symbol):
+        """Makes the contract of a symbol available under another key, like the instrument token used by the
+        broker's feed."""
+        optionContract = self.getOptionContract(symbol)
+        with self.__lock:
+            self.__contracts[key] = optionContract
+
+    def clear(self):
+        with self.__lock:
+            self.__contracts = dict()
+
+
+class StrikeLadder(object):
+    """The option contracts of one underlying and expiry, indexed by strike.
+
+    Strikes are kept sorted, and a contract is found by its strike and type with a dictionary lookup instead of a scan
+    of every contract. When the strikes are evenly spaced, as they are when the feed subscribes a window around the
+    ATM strike, the index of the ATM strike is computed from the LTP directly.
+
+    :param underlying: The underlying of the contracts.
+    :type underlying: string.
+    :param expiry: The expiry of the contracts.
+    :type expiry: datetime.date.
+    """
+
+    def __init__(self, underlying, expiry):
+        self.__underlying = underlying
+        self.__expiry = expiry
+        self.__contracts = dict()
+        self.__strikes = []
+        self.__step = None
+
+    def getUnderlying(self):
+        return self.__underlying
+
+    def getExpiry(self):
+        return self.__expiry
+
+    def __len__(self):
+        return len(self.__contracts)
+
+    def add(self, optionContract: OptionContract):
+        """Adds a contract. If the ladder already has one with the same strike and type, the first one is kept."""
+        key = (optionContract.strike, optionContract.type)
+        if key in self.__contracts:
+            return
+
+        self.__contracts[key] = optionContract
+        strike = optionContract.strike
+        index = bisect.bisect_left(self.__strikes, strike)
+        if index == len(self.__strikes) or self.__strikes[index] != strike:
+            self.__strikes.insert(index, strike)
+            self.__step = self.__getStep()
+
+    def remove(self, optionContract: OptionContract):
+        """Removes a contract, if it is the one the ladder has for its strike and type."""
+        key = (optionContract.strike, optionContract.type)
+        if self.__contracts.get(key, None) is not optionContract:
+            return
+
+        del self.__contracts[key]
+        strike = optionContract.strike
+        if (strike, 'c') not in self.__contracts and (strike, 'p') not in self.__contracts:
+            self.__strikes.remove(strike)
+            self.__step = self.__getStep()
+
+    def __getStep(self):
+        # The spacing of the strikes, or None if they aren't evenly spaced integers
+        if len(self.__strikes) < 2:
+            return None
+
+        steps = set(b - a for a, b in zip(self.__strikes, self.__strikes[1:]))
+        if len(steps) != 1:
+            return None
+        step = steps.pop()
+        return step if float(step).is_integer() else None
+
+    def getStrikes(self):
+        """Returns the strikes, sorted."""
+        return self.__strikes
+
+    def getStrikeDifference(self):
+        """Returns the spacing of the strikes, or None if they aren't evenly spaced."""
+        return self.__step
+
+    def getStrike(self, index):
+        """Returns the strike at an index of the ladder, or None if the index is out of it."""
+        return self.__strikes[index] if 0 <= index < len(self.__strikes) else None
+
+    def getContract(self, strike, type_) -> OptionContract:
+        """Returns the contract of a strike and type, `c` or `p`, or None if there is none."""
+        return self.__contracts.get((strike, type_), None)
+
+    def getSymbol(self, strike, type_):
+        """Returns the symbol of a strike and type, `c` or `p`, or None if there is none."""
+        optionContract = self.__contracts.get((strike, type_), None)
+        return optionContract.symbol if optionContract is not None else None
+
+    def getATMIndex(self, ltp, strikeDifference=None):
+        """Returns the index of the ATM strike: the LTP rounded to the nearest multiple of the strike difference,
+        halves rounding up, clamped to the strikes of the ladder. Returns None if the ladder is empty.
+
+        :param ltp: The last price of the underlying.
+        :type ltp: int/float.
+        :param strikeDifference: The strike difference to round the LTP with. Defaults to the spacing of the strikes.
+        :type strikeDifference: int.
+        """
+        if len(self.__strikes) == 0:
+            return None
+
+        if strikeDifference is None:
+            strikeDifference = self.__step if self.__step is not None else 1
+        atmStrike = roundToStrike(ltp, strikeDifference)
+
+        if self.__step is not None:
+            index = int(math.floor((atmStrike - self.__strikes[0]) / self.__step + 0.5))
+            return min(max(index, 0), len(self.__strikes) - 1)
+
+        # Uneven strikes, take the nearest listed one
+        index = bisect.bisect_left(self.__strikes, atmStrike)
+        if index == len(self.__strikes):
+            return index - 1
+        if index > 0 and atmStrike - self.__strikes[index - 1] < self.__strikes[index] - atmStrike:
+            return index - 1
+        return index
+
+    def getATMStrike(self, ltp, strikeDifference=None):
+        """Returns the strike at :meth:`getATMIndex`, or None if the ladder is empty."""
+        index = self.getATMIndex(ltp, strikeDifference)
+        return self.__strikes[index] if index is not None else None
+
+
+def roundToStrike(ltp, strikeDifference):
+    """Rounds a price to the nearest multiple of the strike difference, halves rounding up. This is the ATM strike
+    when the strike exists."""
+    inputPrice = int(ltp)
+    remainder = int(inputPrice % strikeDifference)
+    if remainder < int(strikeDifference / 2):
+        return inputPrice - remainder
+    else:
+        return inputPrice + (strikeDifference - remainder)
+
+
+def buildStrikeLadders(optionContracts) -> dict:
+    """Returns a :class:`StrikeLadder` per underlying and expiry, keyed by `(underlying, expiry)`.
+
+    :param optionContracts: The :class:`pyalgomate.strategies.OptionContract` to index.
+    :type optionContracts: iterable.
+    """
+    ret = dict()
+    for optionContract in optionContracts:
+        key = (optionContract.underlying, optionContract.expiry)
+        ladder = ret.get(key, None)
+        if ladder is None:
+            ladder = StrikeLadder(optionContract.underlying, optionContract.expiry)
+            ret[key] = ladder
+        ladder.add(optionContract)
+    return ret
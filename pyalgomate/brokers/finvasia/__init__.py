@@ -14,8 +14,10 @@ from concurrent.futures import ThreadPoolExecutor
 import pyotp
 from NorenRestApiPy.NorenApi import NorenApi as ShoonyaApi
 from pyalgomate.brokers import getDefaultUnderlyings, getExpiryDates
-from pyalgomate.brokers.finvasia.broker import getOptionSymbols, getUnderlyingDetails
+from pyalgomate.brokers.finvasia.broker import getOptionSymbol, getUnderlyingDetails
 from pyalgomate.brokers.finvasia.feed import LiveTradeFeed
+from pyalgomate.brokers.reactor import getReactor
+from pyalgomate.barfeed.subscriptions import SubscriptionManager
 import pyalgomate.utils as utils
 
 logger = logging.getLogger()
@@ -71,8 +73,9 @@ def getTokenMappings() -> dict:
     return tokenMappings
 
 def getFeed(cred, registerOptions, underlyings):
+    websocketUrl = 'wss://api.shoonya.com/NorenWSTP/'
     api = ShoonyaApi(host='https://api.shoonya.com/NorenWClientTP/',
-                        websocket='wss://api.shoonya.com/NorenWSTP/')
+                        websocket=websocketUrl)
     userToken = None
     tokenFile = 'shoonyakey.txt'
     if os.path.exists(tokenFile) and (datetime.datetime.fromtimestamp(os.path.getmtime(tokenFile)).date() == datetime.datetime.today().date()):
@@ -89,8 +92,9 @@ def getFeed(cred, registerOptions, underlyings):
                                 vendor_code=cred['vc'], api_secret=cred['apikey'], imei=cred['imei'])
 
         if loginStatus:
+            userToken = loginStatus.get('susertoken')
             with open(tokenFile, 'w') as f:
-                f.write(loginStatus.get('susertoken'))
+                f.write(userToken)
 
             logger.info(
                 f"{loginStatus.get('uname')}={loginStatus.get('stat')} token={loginStatus.get('susertoken')}")
@@ -101,7 +105,8 @@ def getFeed(cred, registerOptions, underlyings):
         if len(underlyings) == 0:
             underlyings = [underlying.replace(":","|") for underlying in getDefaultUnderlyings()]
 
-        optionSymbols = []
+        # Keeps the option subscriptions centered on the LTP of each underlying as the market moves
+        subscriptionManager = SubscriptionManager(getOptionSymbol)
         tokenMappings = getTokenMappings()
         for underlying in underlyings:
             exchange = underlying.split('|')[0]
@@ -124,21 +129,27 @@ def getFeed(cred, registerOptions, underlyings):
                 (currentWeeklyExpiry,nextWeekExpiry,monthlyExpiry) = getExpiryDates(index)
 
                 if "Weekly" in registerOptions:
-                    optionSymbols += getOptionSymbols(
-                        underlying, currentWeeklyExpiry, ltp, 20, strikeDifference)
+                    subscriptionManager.addWindow(
+                        underlying, currentWeeklyExpiry, ltp, strikeDifference, 20)
                 if "NextWeekly" in registerOptions:
-                    optionSymbols += getOptionSymbols(
-                        underlying, nextWeekExpiry, ltp, 20, strikeDifference)
+                    subscriptionManager.addWindow(
+                        underlying, nextWeekExpiry, ltp, strikeDifference, 20)
                 if "Monthly" in registerOptions:
-                    optionSymbols += getOptionSymbols(
-                        underlying, monthlyExpiry, ltp, 20, strikeDifference)
+                    subscriptionManager.addWindow(
+                        underlying, monthlyExpiry, ltp, strikeDifference, 20)
             except Exception as e:
                 logger.exception(f'Exception: {e}')
 
-        optionSymbols = list(dict.fromkeys(optionSymbols))
+        optionSymbols = subscriptionManager.getInstruments()
+        logger.info("Options symbols are " + ",".join(optionSymbols))
 
         logger.info('Creating feed object')
-        return LiveTradeFeed(api, tokenMappings, underlyings + optionSymbols), api
+        # The websocket runs on the reactor shared by the feeds of the process, unless the api runs its own thread
+        reactor = getReactor() if cred.get('reactor', False) else None
+        feed = LiveTradeFeed(api, tokenMappings, underlyings + optionSymbols, reactor=reactor,
+                             websocketUrl=websocketUrl, userId=cred['user'], userToken=userToken)
+        subscriptionManager.attach(feed)
+        return feed, api
     else:
         exit(1)
 
@@ -4,11 +4,11 @@
 
 import threading
 import time
+import functools
 import logging
 import datetime
 import six
 import calendar
-import re
 import pandas as pd
 from typing import ForwardRef, List, Dict
 
@@ -16,7 +16,10 @@ from pyalgotrade import broker
 from pyalgotrade.broker import Order
 from pyalgomate.barfeed import BaseBarFeed
 from pyalgomate.brokers import BacktestingBroker, QuantityTraits
+from pyalgomate.core.dispatcher import WakeUpQueue, getWakeUp
 from pyalgomate.strategies import OptionContract
+from pyalgomate.brokers.contracts import OptionContractParser, OptionContractRegistry, datedGrammar, \
+    monthlyGrammar, weeklyGrammar, mappingResolver
 from NorenRestApiPy.NorenApi import NorenApi
 from pyalgomate.utils import UnderlyingIndex
 import pyalgomate.utils as utils
@@ -69,6 +72,15 @@ def getUnderlyingMappings():
 def getUnderlyingDetails(underlying):
     return underlyingMapping[underlying]
 
+# Options are spelled NFO|BANKNIFTY28MAR24C47000, or NFO|BANKNIFTY24MAR47000CE and NFO|BANKNIFTY2432847000CE
+optionContractRegistry = OptionContractRegistry(OptionContractParser([
+    datedGrammar(r'[A-Z\|]+'),
+    monthlyGrammar(r'[A-Z\|]+', lambda underlying: underlyingMapping[underlying]['index']),
+    weeklyGrammar(r'[A-Z\|]+')
+], mappingResolver(underlyingMapping)))
+
+# Strategies build the same symbols on every bar, build each one once
+@functools.lru_cache(maxsize=4096, typed=True)
 def getOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut):
     underlyingDetails = getUnderlyingDetails(underlyingInstrument)
     optionPrefix = underlyingDetails['optionPrefix']
@@ -98,6 +110,17 @@ def getOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut):
             return optionPrefix + str(expiry.year % 100) + f"{monthlySymbol}{expiry.day:02d}" + strikePlusOption
 
 
+@functools.lru_cache(maxsize=4096, typed=True)
+def getDatedOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut):
+    """Returns the `<prefix><DD><MON><YY><C|P><strike>` symbol of an option, the spelling the broker instances use for
+    every underlying."""
+    symbol = getUnderlyingDetails(underlyingInstrument)['optionPrefix']
+
+    dayMonthYear = f"{expiry.day:02d}" + \
+        calendar.month_abbr[expiry.month].upper() + str(expiry.year % 100)
+    return symbol + dayMonthYear + ('C' if (callOrPut == 'C' or callOrPut == 'Call') else 'P') + str(strikePrice)
+
+
 def getOptionSymbols(underlyingInstrument, expiry, ltp, count, strikeDifference=100):
     ltp = int(float(ltp) / strikeDifference) * strikeDifference
     logger.info(f"Nearest strike price of {underlyingInstrument} is <{ltp}>")
@@ -169,66 +192,13 @@ class PaperTradingBroker(BacktestingBroker):
         return getHistoricalData(self.__api, exchangeSymbol, startTime, interval)
 
     def getOptionSymbol(self, underlyingInstrument, expiry, strikePrice, callOrPut):
-        symbol = getUnderlyingDetails(underlyingInstrument)['optionPrefix']
-
-        dayMonthYear = f"{expiry.day:02d}" + \
-            calendar.month_abbr[expiry.month].upper() + str(expiry.year % 100)
-        return symbol + dayMonthYear + ('C' if (callOrPut == 'C' or callOrPut == 'Call') else 'P') + str(strikePrice)
+        return getDatedOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut)
 
     def getOptionSymbols(self, underlyingInstrument, expiry, ceStrikePrice, peStrikePrice):
         return getOptionSymbol(underlyingInstrument, expiry, ceStrikePrice, 'C'), getOptionSymbol(underlyingInstrument, expiry, peStrikePrice, 'P')
 
     def getOptionContract(self, symbol) -> OptionContract:
-        m = re.match(r"([A-Z\|]+)(\d{2})([A-Z]{3})(\d{2})([CP])(\d+)", symbol)
-
-        if m is None:
-            m = re.match(r"([A-Z\|]+)(\d{2})([A-Z]{3})(\d+)([CP])E", symbol)
-
-            if m is not None:
-                optionPrefix = m.group(1)
-                for underlying, underlyingDetails in underlyingMapping.items():
-                    if underlyingDetails['optionPrefix'] == optionPrefix:
-                        index = self.getUnderlyingDetails(underlying)['index']
-                        month = datetime.datetime.strptime(m.group(3), '%b').month
-                        year = int(m.group(2)) + 2000
-                        expiry = utils.getNearestMonthlyExpiryDate(
-                            datetime.date(year, month, 1), index)
-                        return OptionContract(symbol, int(m.group(4)), expiry, "c" if m.group(5) == "C" else "p", underlying)
-
-            m = re.match(r"([A-Z\|]+)(\d{2})(\d|[OND])(\d{2})(\d+)([CP])E", symbol)
-
-            if m is None:
-                return None
-
-            day = int(m.group(4))
-            month = m.group(3)
-            if month == 'O':
-                month = 10
-            elif month == 'N':
-                month = 11
-            elif month == 'D':
-                month = 12
-            else:
-                month = int(month)
-
-            year = int(m.group(2)) + 2000
-            expiry = datetime.date(year, month, day)
-            optionPrefix = m.group(1)
-            for underlying, underlyingDetails in underlyingMapping.items():
-                if underlyingDetails['optionPrefix'] == optionPrefix:
-                    return OptionContract(symbol, int(m.group(5)), expiry, "c" if m.group(6) == "C" else "p", underlying)
-
-        day = int(m.group(2))
-        month = m.group(3)
-        year = int(m.group(4)) + 2000
-        expiry = datetime.date(
-            year, datetime.datetime.strptime(month, '%b').month, day)
-
-        optionPrefix = m.group(1)
-
-        for underlying, underlyingDetails in underlyingMapping.items():
-            if underlyingDetails['optionPrefix'] == optionPrefix:
-                return OptionContract(symbol, int(m.group(6)), expiry, "c" if m.group(5) == "C" else "p", underlying)
+        return optionContractRegistry.getOptionContract(symbol)
 
     pass
 
@@ -366,7 +336,7 @@ class TradeMonitor(threading.Thread):
         super(TradeMonitor, self).__init__()
         self.__api: NorenApi = liveBroker.getApi()
         self.__broker: LiveBroker = liveBroker
-        self.__queue = six.moves.queue.Queue()
+        self.__queue = WakeUpQueue()
         self.__stop = False
         self.__retryData = dict()
 
@@ -525,66 +495,13 @@ class LiveBroker(broker.Broker):
         return underlyingMapping[underlying]
 
     def getOptionSymbol(self, underlyingInstrument, expiry, strikePrice, callOrPut):
-        symbol = getUnderlyingDetails(underlyingInstrument)['optionPrefix']
-
-        dayMonthYear = f"{expiry.day:02d}" + \
-            calendar.month_abbr[expiry.month].upper() + str(expiry.year % 100)
-        return symbol + dayMonthYear + ('C' if (callOrPut == 'C' or callOrPut == 'Call') else 'P') + str(strikePrice)
+        return getDatedOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut)
 
     def getOptionSymbols(self, underlyingInstrument, expiry, ceStrikePrice, peStrikePrice):
         return getOptionSymbol(underlyingInstrument, expiry, ceStrikePrice, 'C'), getOptionSymbol(underlyingInstrument, expiry, peStrikePrice, 'P')
 
     def getOptionContract(self, symbol) -> OptionContract:
-        m = re.match(r"([A-Z\|]+)(\d{2})([A-Z]{3})(\d{2})([CP])(\d+)", symbol)
-
-        if m is None:
-            m = re.match(r"([A-Z\|]+)(\d{2})([A-Z]{3})(\d+)([CP])E", symbol)
-
-            if m is not None:
-                optionPrefix = m.group(1)
-                for underlying, underlyingDetails in underlyingMapping.items():
-                    if underlyingDetails['optionPrefix'] == optionPrefix:
-                        index = self.getUnderlyingDetails(underlying)['index']
-                        month = datetime.datetime.strptime(m.group(3), '%b').month
-                        year = int(m.group(2)) + 2000
-                        expiry = utils.getNearestMonthlyExpiryDate(
-                            datetime.date(year, month, 1), index)
-                        return OptionContract(symbol, int(m.group(4)), expiry, "c" if m.group(5) == "C" else "p", underlying)
-
-            m = re.match(r"([A-Z\|]+)(\d{2})(\d|[OND])(\d{2})(\d+)([CP])E", symbol)
-
-            if m is None:
-                return None
-
-            day = int(m.group(4))
-            month = m.group(3)
-            if month == 'O':
-                month = 10
-            elif month == 'N':
-                month = 11
-            elif month == 'D':
-                month = 12
-            else:
-                month = int(month)
-
-            year = int(m.group(2)) + 2000
-            expiry = datetime.date(year, month, day)
-            optionPrefix = m.group(1)
-            for underlying, underlyingDetails in underlyingMapping.items():
-                if underlyingDetails['optionPrefix'] == optionPrefix:
-                    return OptionContract(symbol, int(m.group(5)), expiry, "c" if m.group(6) == "C" else "p", underlying)
-
-        day = int(m.group(2))
-        month = m.group(3)
-        year = int(m.group(4)) + 2000
-        expiry = datetime.date(
-            year, datetime.datetime.strptime(month, '%b').month, day)
-
-        optionPrefix = m.group(1)
-
-        for underlying, underlyingDetails in underlyingMapping.items():
-            if underlyingDetails['optionPrefix'] == optionPrefix:
-                return OptionContract(symbol, int(m.group(6)), expiry, "c" if m.group(5) == "C" else "p", underlying)
+        return optionContractRegistry.getOptionContract(symbol)
 
     def getHistoricalData(self, exchangeSymbol: str, startTime: datetime.datetime, interval: str) -> pd.DataFrame():
         return getHistoricalData(self.__api, exchangeSymbol, startTime, interval)
@@ -595,6 +512,7 @@ class LiveBroker(broker.Broker):
         self.__api: NorenApi = api
         self.__barFeed: BaseBarFeed = barFeed
         self.__tradeMonitor = TradeMonitor(self)
+        self.__wakeUp = None
         self.__cash = 0
         self.__shares = {}
         self.__activeOrders: Dict[str, Order] = dict()
@@ -720,6 +638,12 @@ class LiveBroker(broker.Broker):
     def eof(self):
         return self.__stop
 
+    def onDispatcherRegistered(self, dispatcher):
+        super(LiveBroker, self).onDispatcherRegistered(dispatcher)
+        # A live dispatcher is woken up by the trade monitor's queue, dispatch must not block it
+        self.__wakeUp = getWakeUp(dispatcher)
+        self.__tradeMonitor.getQueue().setWakeUp(self.__wakeUp)
+
     def dispatch(self):
         # Switch orders from SUBMITTED to ACCEPTED.
         ordersToProcess = list(self.__activeOrders.values())
@@ -732,7 +656,7 @@ class LiveBroker(broker.Broker):
         # Dispatch events from the trade monitor.
         try:
             eventType, eventData = self.__tradeMonitor.getQueue().get(
-                True, LiveBroker.QUEUE_TIMEOUT)
+                True, LiveBroker.QUEUE_TIMEOUT if self.__wakeUp is None else 0)
 
             if eventType == TradeMonitor.ON_USER_TRADE:
                 self._onUserTrades(eventData)
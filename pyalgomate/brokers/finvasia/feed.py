@@ -8,8 +8,9 @@ import traceback
 
 from pyalgotrade import bar
 from pyalgomate.barfeed import BaseBarFeed
-from pyalgomate.barfeed.BasicBarEx import BasicBarEx
+from pyalgomate.barfeed.QuoteBar import QuoteBar
 from pyalgomate.brokers.finvasia.wsclient import WebSocketClient
+from pyalgomate.brokers.reactor import Reactor
 from NorenRestApiPy.NorenApi import NorenApi
 
 logger = logging.getLogger(__name__)
@@ -78,23 +79,18 @@ class QuoteMessage(object):
     @property
     def instrument(self): return f"{self.exchange}|{self.__tokenMappings[f'{self.exchange}|{self.scriptToken}'].split('|')[1]}"
 
-    def getBar(self, dateTime=None) -> BasicBarEx:
-        open = high = low = close = self.price
-
-        return BasicBarEx(self.dateTime if dateTime is None else dateTime,                
-                    open,
-                    high,
-                    low,
-                    close,
-                    self.volume,
-                    None,
-                    bar.Frequency.TRADE,
-                    {
-                        "Instrument": self.instrument,
-                        "Open Interest": self.openInterest,
-                        "Message": self.__eventDict
-                    }
-                )
+    def getBar(self, dateTime=None) -> QuoteBar:
+        price = self.price
+
+        return QuoteBar(self.dateTime if dateTime is None else dateTime,
+                        price,
+                        price,
+                        price,
+                        price,
+                        self.volume,
+                        self.openInterest,
+                        self.instrument,
+                        self.dateTime)
 
 class LiveTradeFeed(BaseBarFeed):
 
@@ -107,22 +103,48 @@ class LiveTradeFeed(BaseBarFeed):
         Once a bounded length is full, when new items are added, a corresponding number of items are discarded
         from the opposite end. If None then dataseries.DEFAULT_MAX_LEN is used.
     :type maxLen: int.
+    :param reactor: A reactor to run the websocket on, shared with other feeds, or None to run it on a thread of
+        the api.
+    :type reactor: :class:`pyalgomate.brokers.reactor.Reactor`.
+    :param websocketUrl: The websocket url of the api. Required with a reactor.
+    :type websocketUrl: string.
+    :param userId: The user id of the api session. Required with a reactor.
+    :type userId: string.
+    :param userToken: The user token of the api session. Required with a reactor.
+    :type userToken: string.
 
     .. note::
         Note that a Bar will be created for every trade, so open, high, low and close values will all be the same.
+
+    .. note::
+        Bars are only emitted for the instruments that were updated since the previous dispatch. Use
+        :meth:`getLastBar` to get the latest bar for the rest.
+
+    .. note::
+        Bars are dispatched as soon as ticks arrive, so bar datetimes have sub-second resolution. Ticks of the same
+        instrument that arrive while the strategy is busy are coalesced into one bar with the latest values.
     """
 
-    def __init__(self, api: NorenApi, tokenMappings: dict, instruments: list, timeout=10, maxLen=None):
+    # How long getNextBars waits for a tick before giving the other subjects of the dispatcher a turn.
+    WAIT_TIMEOUT = 0.01
+
+    def __init__(self, api: NorenApi, tokenMappings: dict, instruments: list, timeout=10, maxLen=None,
+                 reactor: Reactor = None, websocketUrl=None, userId=None, userToken=None):
         super(LiveTradeFeed, self).__init__(bar.Frequency.TRADE, maxLen)
-        self.__instruments = instruments
+        self.__instruments = list(instruments)
         self.__instrumentToTokenIdMapping = {instrument: tokenMappings[instrument] for instrument in self.__instruments if instrument in tokenMappings}
 
         if len(self.__instruments) != len(self.__instrumentToTokenIdMapping):
             raise Exception(f'Could not get tokens for the instruments {[instrument for instrument in self.__instruments if instrument not in tokenMappings]}')
 
+        self.__tokenMappings = tokenMappings
         self.__channels = {value: key for key, value in self.__instrumentToTokenIdMapping.items()}
         self.__api = api
         self.__timeout = timeout
+        self.__reactor = reactor
+        self.__websocketUrl = websocketUrl
+        self.__userId = userId
+        self.__userToken = userToken
 
         for key, value in self.__instrumentToTokenIdMapping.items():
             self.registerDataSeries(key)
@@ -131,6 +153,8 @@ class LiveTradeFeed(BaseBarFeed):
         self.__stopped = False
         self.__nextBarsTime = None
         self.__lastUpdateTime = None
+        self.__lastBarsDateTime = None
+        self.__lastBars = dict()
 
     def getApi(self):
         return self.__api
@@ -140,7 +164,10 @@ class LiveTradeFeed(BaseBarFeed):
 
     def __initializeClient(self):
         logger.info("Initializing websocket client")
-        self.__wsClient = WebSocketClient(self.__api, self.__channels)
+        self.__wsClient = WebSocketClient(self.__api, self.__channels, self.__reactor, self.__websocketUrl,
+                                          self.__userId, self.__userToken)
+        self.__wsClient.setWakeUp(self.getWakeUp())
+        self.__wsClient.setTickListener(self.__onTick)
         self.__wsClient.startClient()
         logger.info("Waiting for websocket initialization to complete")
         initialized = self.__wsClient.waitInitialized(self.__timeout)
@@ -151,31 +178,115 @@ class LiveTradeFeed(BaseBarFeed):
             logger.error("Initialization failed")
         return initialized
 
+    def __onTick(self, key, quote):
+        # Runs on the websocket thread. The channels are replaced, never modified, when instruments are subscribed
+        # or unsubscribed, so the ones read here stay consistent.
+        journal = self.getJournal()
+        channels = self.__channels
+        if journal is not None and channels.get(key, None) is not None:
+            journal.record(QuoteMessage(quote, channels).getBar(quote['ct']))
+
     def barsHaveAdjClose(self):
         return False
 
     def getLastBar(self, instrument) -> bar.Bar:
-        lastBarQuote = self.__wsClient.getQuotes().get(self.__instrumentToTokenIdMapping[instrument], None)
-        if lastBarQuote is not None:
-            return QuoteMessage(lastBarQuote, self.__channels).getBar()
-        return None
+        key = self.__instrumentToTokenIdMapping.get(instrument, None)
+        entry = self.__wsClient.getQuotes().getEntry(key) if key is not None else None
+        if entry is None:
+            return None
+
+        version, lastBarQuote = entry
+        lastBar = self.__lastBars.get(instrument, None)
+        if lastBar is not None and lastBar[0] == version:
+            return lastBar[1]
+
+        quoteBar = QuoteMessage(lastBarQuote, self.__channels).getBar()
+        self.__lastBars[instrument] = (version, quoteBar)
+        return quoteBar
 
     def getNextBars(self):
-        def getBar(lastBar, lastQuoteDateTime):
-            bar = QuoteMessage(lastBar, self.__channels).getBar(lastQuoteDateTime)
-            return bar.getInstrument(), bar
-
-        bars = None
-        lastQuoteDateTime = self.__wsClient.getLastQuoteDateTime()
-        if self.__lastUpdateTime != lastQuoteDateTime:
-            self.__nextBarsTime = datetime.datetime.now()
-            self.__lastUpdateTime = lastQuoteDateTime
-            bars = bar.Bars({
-                instrument: bar
-                for lastBar in self.__wsClient.getQuotes().values()
-                for instrument, bar in [getBar(lastBar, self.__nextBarsTime.replace(microsecond=0))]
-            })
-        return bars
+        # Blocks until the websocket client queues an update, so the dispatch loop wakes up on ticks instead of
+        # spinning. A live dispatcher sleeps on its wake up instead, which the client notifies.
+        updatedKeys = self.__wsClient.waitUpdatedKeys(LiveTradeFeed.WAIT_TIMEOUT if self.getWakeUp() is None else 0)
+        if len(updatedKeys) == 0:
+            return None
+
+        nextBarsTime = datetime.datetime.now()
+        # Bar datetimes must keep increasing
+        barsDateTime = nextBarsTime if self.__lastBarsDateTime is None or nextBarsTime > self.__lastBarsDateTime \
+            else self.__lastBarsDateTime + datetime.timedelta(microseconds=1)
+
+        self.__nextBarsTime = nextBarsTime
+        self.__lastUpdateTime = self.__wsClient.getLastQuoteDateTime()
+
+        quotes = self.__wsClient.getQuotes()
+        barDict = dict()
+        for key in updatedKeys:
+            if key not in self.__channels:
+                # Unsubscribed
+                continue
+            quoteBar = QuoteMessage(quotes.get(key), self.__channels).getBar(barsDateTime)
+            barDict[quoteBar.getInstrument()] = quoteBar
+
+        if len(barDict) == 0:
+            return None
+
+        self.__lastBarsDateTime = barsDateTime
+        return bar.Bars(barDict)
+
+    def subscribeInstruments(self, instruments):
+        """Subscribes to more instruments while the feed runs. Returns the ones that were subscribed, the ones that
+        were already subscribed or that have no token are skipped."""
+        channels = []
+        ret = []
+        # Copy on write, the websocket thread reads the channels
+        channelMappings = dict(self.__channels)
+        for instrument in instruments:
+            channel = self.__tokenMappings.get(instrument, None)
+            if channel is None:
+                logger.warning(f'Could not get the token of {instrument}')
+                continue
+            if instrument in self.__instrumentToTokenIdMapping:
+                continue
+
+            self.__instrumentToTokenIdMapping[instrument] = channel
+            channelMappings[channel] = instrument
+            self.__instruments.append(instrument)
+            self.registerDataSeries(instrument)
+            channels.append(channel)
+            ret.append(instrument)
+        self.__channels = channelMappings
+
+        if len(channels) and self.__wsClient is not None:
+            self.__wsClient.subscribe(channels)
+        return ret
+
+    def unsubscribeInstruments(self, instruments):
+        """Unsubscribes from instruments and drops their dataseries."""
+        channels = []
+        removed = []
+        # Copy on write, the websocket thread reads the channels
+        channelMappings = dict(self.__channels)
+        for instrument in instruments:
+            channel = self.__instrumentToTokenIdMapping.pop(instrument, None)
+            if channel is None:
+                continue
+
+            channelMappings.pop(channel, None)
+            channels.append(channel)
+            removed.append(instrument)
+        self.__channels = channelMappings
+
+        for instrument in removed:
+            self.__instruments.remove(instrument)
+            self.__lastBars.pop(instrument, None)
+            self.unregisterInstrument(instrument)
+
+        if len(channels) and self.__wsClient is not None:
+            self.__wsClient.unsubscribe(channels)
+
+    def isRealTime(self):
+        return True
 
     def peekDateTime(self):
         # Return None since this is a realtime subject.
@@ -0,0 +1,600 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import math
+import threading
+import time
+import urllib.parse
+import uuid
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+from NorenRestApiPy.NorenApi import NorenApi
+
+from pyalgomate.brokers.finvasia.broker import getOptionSymbol, getUnderlyingDetails
+from pyalgomate.greeks.iv import blackScholesPrice
+
+logger = logging.getLogger(__name__)
+
+# Seconds in a trading year, the time unit of the volatilities
+TRADING_YEAR = 252 * 375 * 60
+
+
+def getRequestTime():
+    return datetime.datetime.now().strftime('%H:%M:%S %d-%m-%Y')
+
+
+def roundToTick(price, tickSize=0.05):
+    return max(round(round(price / tickSize) * tickSize, 2), tickSize)
+
+
+class SimulatedScrip(object):
+    """A scrip of the simulator: its quote and, for options, its contract."""
+
+    def __init__(self, exchange, token, tradingSymbol, ltp, lotSize=1):
+        self.exchange = exchange
+        self.token = token
+        self.tradingSymbol = tradingSymbol
+        self.lotSize = lotSize
+        self.ltp = roundToTick(ltp)
+        self.open = self.high = self.low = self.close = self.ltp
+        self.volume = 0
+        self.openInterest = 0
+        # Set for the options of a chain
+        self.chain = None
+        self.index = None
+        # Set for the underlying of a chain
+        self.underlyingOf = None
+        # How often it ticks, relative to the other scrips
+        self.weight = 1.0
+
+    def getKey(self):
+        return f'{self.exchange}|{self.token}'
+
+    def getFairPrice(self):
+        if self.chain is not None:
+            return self.chain.getPrice(self)
+        if self.underlyingOf is not None:
+            return self.underlyingOf.spot
+        return self.ltp
+
+    def update(self, ltp, volume):
+        self.ltp = roundToTick(ltp)
+        self.high = max(self.high, self.ltp)
+        self.low = min(self.low, self.ltp)
+        self.volume += volume
+
+    def getQuote(self):
+        return {'e': self.exchange, 'tk': self.token, 'ts': self.tradingSymbol, 'pp': '2', 'ti': '0.05',
+                'ls': str(self.lotSize), 'lp': f'{self.ltp:.2f}', 'o': f'{self.open:.2f}', 'h': f'{self.high:.2f}',
+                'l': f'{self.low:.2f}', 'c': f'{self.close:.2f}', 'v': str(self.volume),
+                'oi': str(self.openInterest), 'ft': str(int(time.time()))}
+
+
+class SimulatedChain(object):
+    """An underlying that follows a geometric brownian motion and its options, priced with Black-Scholes at a flat
+    volatility."""
+
+    def __init__(self, underlying: SimulatedScrip, expiry, volatility):
+        self.underlying = underlying
+        underlying.underlyingOf = self
+        self.expiry = expiry
+        self.volatility = volatility
+        self.spot = underlying.ltp
+        self.options = []
+        self.strikes = None
+        self.isCall = None
+        self.prices = None
+
+    def addOption(self, scrip: SimulatedScrip, strike, isCall):
+        scrip.chain = self
+        scrip.index = len(self.options)
+        self.options.append((scrip, strike, isCall))
+        self.strikes = np.array([strike for _, strike, _ in self.options], dtype=float)
+        self.isCall = np.array([isCall for _, _, isCall in self.options])
+
+    def getTimeToExpiry(self):
+        expiry = datetime.datetime.combine(self.expiry, datetime.time(15, 30))
+        # An hour at least, so the options keep some time value on the expiry day
+        return max((expiry - datetime.datetime.now()).total_seconds(), 3600) / (365 * 24 * 3600)
+
+    def move(self, seconds, random):
+        self.spot *= math.exp(self.volatility * math.sqrt(seconds / TRADING_YEAR) * random.standard_normal())
+        self.prices = None
+
+    def getPrice(self, scrip: SimulatedScrip):
+        if self.prices is None:
+            self.prices, _ = blackScholesPrice(self.spot, self.strikes, self.getTimeToExpiry(), 0.0, self.volatility,
+                                               self.isCall)
+        return float(self.prices[scrip.index])
+
+
+class NorenSimulator(object):
+    """A local stand-in for the Shoonya servers, to load test the live stack without a broker connection.
+
+    It speaks the part of the Noren REST and websocket protocol that :class:`pyalgomate.brokers.finvasia.broker.LiveBroker`,
+    its :class:`pyalgomate.brokers.finvasia.broker.TradeMonitor` and
+    :class:`pyalgomate.brokers.finvasia.wsclient.WebSocketClient` use: `QuickAuth`, `PlaceOrder`, `ModifyOrder`,
+    `CancelOrder`, `OrderBook`, `SingleOrdHist`, `Limits` and `GetQuotes`, and touchline subscriptions. The scrips are
+    synthetic option chains, added with :meth:`addOptionChain`, that tick `ticksPerSecond` times a second in total,
+    the strikes near the money more often. Orders are matched against the ticks of their scrip:
+
+    * Market orders fill at the LTP.
+    * Limit orders fill at the LTP once it reaches their price.
+    * Stop orders wait in TRIGGER_PENDING until the LTP crosses their trigger price.
+    * Orders that would take the margin used above the cash are REJECTED.
+
+    :param host: The address to listen on.
+    :type host: string.
+    :param port: The port to listen on.
+    :type port: int.
+    :param ticksPerSecond: How many ticks a second the subscribed scrips get in total.
+    :type ticksPerSecond: int.
+    :param cash: The cash of the account.
+    :type cash: float.
+    :param latency: How long, in seconds, the REST requests take.
+    :type latency: float.
+    :param seed: The seed of the ticks.
+    :type seed: int.
+
+    .. note::
+        The margin used is the premium paid less the premium received, plus :attr:`SHORT_MARGIN` of the underlying
+        value of the short option quantities.
+    """
+
+    # How often the ticks are generated, in seconds
+    TICK_INTERVAL = 0.01
+    SHORT_MARGIN = 0.1
+
+    def __init__(self, host='127.0.0.1', port=18765, ticksPerSecond=10000, cash=1000000.0, latency=0.0, seed=None):
+        self.__host = host
+        self.__port = port
+        self.__ticksPerSecond = ticksPerSecond
+        self.__cash = cash
+        self.__latency = latency
+        self.__random = np.random.default_rng(seed)
+
+        self.__scrips = dict()
+        self.__scripsBySymbol = dict()
+        self.__chains = []
+        self.__nextToken = 1000
+
+        self.__sessions = set()
+        self.__sockets = dict()
+        self.__tickingKeys = None
+        self.__tickingWeights = None
+
+        self.__orders = dict()
+        self.__openOrders = dict()
+        self.__nextOrderId = 1
+        self.__positions = dict()
+        self.__premium = 0.0
+
+        self.__loop = None
+        self.__thread = None
+        self.__runner = None
+        self.__ticker = None
+
+        self.__ticks = 0
+        self.__messages = 0
+        self.__requests = 0
+        self.__fills = 0
+
+    # Scrips
+
+    def addInstrument(self, instrument, ltp, token=None, lotSize=1) -> SimulatedScrip:
+        """Adds a scrip, like `NSE|NIFTY BANK`, that ticks at its LTP until something moves it.
+
+        :param instrument: The instrument, `<exchange>|<trading symbol>`.
+        :type instrument: string.
+        :param ltp: The LTP.
+        :type ltp: float.
+        :param token: The token, or None to give it one.
+        :type token: string.
+        """
+        exchange, tradingSymbol = instrument.split('|')
+        if token is None:
+            token = str(self.__nextToken)
+            self.__nextToken += 1
+        scrip = SimulatedScrip(exchange, str(token), tradingSymbol, ltp, lotSize)
+        self.__scrips[scrip.getKey()] = scrip
+        self.__scripsBySymbol[instrument] = scrip
+        self.__tickingKeys = None
+        return scrip
+
+    def addOptionChain(self, underlying, ltp, expiry, count=20, volatility=0.15, token=None) -> dict:
+        """Adds an underlying and the calls and puts of `count` strikes on each side of its ATM strike. Returns the
+        token mappings of its scrips, like :func:`pyalgomate.brokers.finvasia.getTokenMappings`.
+
+        :param underlying: The underlying, like `NSE|NIFTY BANK`.
+        :type underlying: string.
+        :param ltp: The LTP of the underlying.
+        :type ltp: float.
+        :param expiry: The expiry of the options.
+        :type expiry: datetime.date.
+        :param count: The number of strikes on each side of the ATM strike.
+        :type count: int.
+        :param volatility: The annual volatility of the underlying and the implied volatility of the options.
+        :type volatility: float.
+        """
+        underlyingDetails = getUnderlyingDetails(underlying)
+        strikeDifference = underlyingDetails['strikeDifference']
+        lotSize = underlyingDetails['lotSize']
+
+        underlyingScrip = self.addInstrument(underlying, ltp, token)
+        chain = SimulatedChain(underlyingScrip, expiry, volatility)
+        self.__chains.append(chain)
+
+        ret = {underlying: underlyingScrip.getKey()}
+        atm = int(ltp / strikeDifference) * strikeDifference
+        for n in range(-count, count + 1):
+            strike = atm + n * strikeDifference
+            for callOrPut in ('C', 'P'):
+                symbol = getOptionSymbol(underlying, expiry, strike, callOrPut)
+                scrip = self.addInstrument(symbol, 0.05, lotSize=lotSize)
+                chain.addOption(scrip, strike, callOrPut == 'C')
+                # The options near the money trade the most
+                scrip.weight = 1.0 / (1 + abs(n)) ** 2
+                ret[symbol] = scrip.getKey()
+
+        for scrip, _, _ in chain.options:
+            scrip.update(chain.getPrice(scrip), 0)
+            scrip.open = scrip.high = scrip.low = scrip.close = scrip.ltp
+        return ret
+
+    def getTokenMappings(self) -> dict:
+        """Returns the token of every scrip, `<exchange>|<trading symbol>` to `<exchange>|<token>`."""
+        return {instrument: scrip.getKey() for instrument, scrip in self.__scripsBySymbol.items()}
+
+    def __refresh(self, scrip: SimulatedScrip):
+        # Scrips that nobody subscribes to don't tick, price them when they are quoted or traded
+        scrip.update(scrip.getFairPrice(), 0)
+
+    # Server
+
+    def getHost(self):
+        """Returns the REST host to build a :class:`NorenRestApiPy.NorenApi.NorenApi` with."""
+        return f'http://{self.__host}:{self.__port}/NorenWClientTP'
+
+    def getWebsocketUrl(self):
+        return f'ws://{self.__host}:{self.__port}/NorenWSTP/'
+
+    def createSession(self, userId='SIMULATOR'):
+        """Returns a :class:`NorenRestApiPy.NorenApi.NorenApi` with a session of the simulator, like the one
+        `finvasia.getFeed` logs in, and the user token of the session."""
+        api = NorenApi(host=self.getHost(), websocket=self.getWebsocketUrl())
+        userToken = uuid.uuid4().hex
+        self.__sessions.add(userToken)
+        api.set_session(userid=userId, password='', usertoken=userToken)
+        return api, userToken
+
+    def start(self):
+        """Starts serving, on a thread of its own."""
+        if self.__thread is not None:
+            return
+        self.__loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, args=(started,), name='noren-simulator', daemon=True)
+        self.__thread.start()
+        started.wait()
+
+    def __run(self, started):
+        asyncio.set_event_loop(self.__loop)
+        app = web.Application()
+        app.router.add_post('/{path:.*}', self.__onRequest)
+        app.router.add_get('/{path:.*}', self.__onWebsocket)
+        self.__runner = web.AppRunner(app)
+        self.__loop.run_until_complete(self.__runner.setup())
+        self.__loop.run_until_complete(web.TCPSite(self.__runner, self.__host, self.__port).start())
+        self.__ticker = self.__loop.create_task(self.__tick())
+        logger.info(f'Noren simulator listening on {self.__host}:{self.__port}')
+        started.set()
+        try:
+            self.__loop.run_forever()
+        finally:
+            self.__loop.close()
+
+    def stop(self):
+        if self.__thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.__shutdown(), self.__loop).result()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__thread = None
+
+    async def __shutdown(self):
+        self.__ticker.cancel()
+        await asyncio.gather(self.__ticker, return_exceptions=True)
+        # A client that fell behind doesn't drain its socket, don't wait for it
+        try:
+            await asyncio.wait_for(asyncio.gather(*[socket.close() for socket in list(self.__sockets)],
+                                                  return_exceptions=True), 1)
+        except asyncio.TimeoutError:
+            pass
+        await self.__runner.cleanup()
+
+    # Websocket
+
+    async def __onWebsocket(self, request):
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        loggedIn = False
+        try:
+            async for message in socket:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                message = json.loads(message.data)
+                field = message.get('t', None)
+                if field == 'c':
+                    loggedIn = message.get('susertoken', None) in self.__sessions
+                    await socket.send_str(json.dumps({'t': 'ck', 's': 'OK' if loggedIn else 'Not_Ok',
+                                                      'uid': message.get('uid', None)}))
+                    if loggedIn:
+                        self.__sockets[socket] = set()
+                elif not loggedIn:
+                    continue
+                elif field == 't':
+                    keys = [key for key in message['k'].split('#') if key in self.__scrips]
+                    self.__sockets[socket].update(keys)
+                    self.__tickingKeys = None
+                    for key in keys:
+                        scrip = self.__scrips[key]
+                        self.__refresh(scrip)
+                        quote = scrip.getQuote()
+                        quote['t'] = 'tk'
+                        await socket.send_str(json.dumps(quote))
+                elif field == 'u':
+                    self.__sockets[socket].difference_update(message['k'].split('#'))
+                    self.__tickingKeys = None
+                elif field == 'o':
+                    await socket.send_str(json.dumps({'t': 'ok'}))
+        finally:
+            self.__sockets.pop(socket, None)
+            self.__tickingKeys = None
+        return socket
+
+    def __getTickingScrips(self):
+        if self.__tickingKeys is None:
+            keys = list(dict.fromkeys(key for keys in self.__sockets.values() for key in keys))
+            weights = np.array([self.__scrips[key].weight for key in keys], dtype=float)
+            self.__tickingKeys = keys
+            self.__tickingWeights = weights / weights.sum() if len(keys) else weights
+        return self.__tickingKeys, self.__tickingWeights
+
+    async def __tick(self):
+        lastTime = time.monotonic()
+        pending = 0.0
+        while True:
+            await asyncio.sleep(NorenSimulator.TICK_INTERVAL)
+            now = time.monotonic()
+            elapsed = now - lastTime
+            lastTime = now
+
+            for chain in self.__chains:
+                chain.move(elapsed, self.__random)
+
+            keys, weights = self.__getTickingScrips()
+            pending += self.__ticksPerSecond * elapsed
+            count = int(pending)
+            pending -= count
+            if count == 0 or len(keys) == 0:
+                continue
+
+            try:
+                await self.__sendTicks([keys[i] for i in self.__random.choice(len(keys), count, p=weights)])
+            except Exception as e:
+                logger.exception(f'Failed to send ticks: {e}')
+
+    async def __sendTicks(self, keys):
+        ft = int(time.time())
+        sockets = list(self.__sockets.items())
+        for key, lots in zip(keys, self.__random.integers(1, 20, len(keys)).tolist()):
+            scrip = self.__scrips[key]
+            scrip.update(scrip.getFairPrice(), lots * scrip.lotSize)
+            self.__ticks += 1
+            self.__match(scrip)
+
+            message = f'{{"t": "tf", "e": "{scrip.exchange}", "tk": "{scrip.token}", "lp": "{scrip.ltp:.2f}", ' \
+                      f'"v": "{scrip.volume}", "ft": "{ft}"}}'
+            for socket, subscribed in sockets:
+                if key in subscribed and not socket.closed:
+                    await socket.send_str(message)
+                    self.__messages += 1
+
+    # Orders
+
+    def __getMargin(self, positions=None, premium=None):
+        positions = self.__positions if positions is None else positions
+        ret = self.__premium if premium is None else premium
+        for key, quantity in positions.items():
+            if quantity < 0:
+                scrip = self.__scrips[key]
+                value = scrip.chain.spot if scrip.chain is not None else scrip.ltp
+                ret += NorenSimulator.SHORT_MARGIN * value * -quantity
+        return max(ret, 0.0)
+
+    def __fill(self, order, scrip: SimulatedScrip, price):
+        quantity = int(order['qty'])
+        signedQuantity = quantity if order['trantype'] == 'B' else -quantity
+        positions = dict(self.__positions)
+        positions[scrip.getKey()] = positions.get(scrip.getKey(), 0) + signedQuantity
+        premium = self.__premium + price * signedQuantity
+        if signedQuantity > 0 or positions[scrip.getKey()] < 0:
+            if self.__getMargin(positions, premium) > self.__cash:
+                self.__close(order, 'REJECTED', 'RMS:Margin Exceeds')
+                return
+
+        self.__positions = positions
+        self.__premium = premium
+        self.__fills += 1
+        order['fillshares'] = str(quantity)
+        order['avgprc'] = f'{price:.2f}'
+        self.__close(order, 'COMPLETE')
+
+    def __close(self, order, status, reason=None):
+        order['status'] = status
+        order['norentm'] = getRequestTime()
+        if reason is not None:
+            order['rejreason'] = reason
+        openOrders = self.__openOrders.get(order['token'], None)
+        if openOrders is not None:
+            openOrders.pop(order['norenordno'], None)
+
+    def __matchOrder(self, order, scrip: SimulatedScrip):
+        ltp = scrip.ltp
+        isBuy = order['trantype'] == 'B'
+        if order['status'] == 'TRIGGER_PENDING':
+            triggerPrice = float(order['trgprc'])
+            if (isBuy and ltp < triggerPrice) or (not isBuy and ltp > triggerPrice):
+                return
+            order['status'] = 'OPEN'
+
+        if order['prctyp'] in ('MKT', 'SL-MKT'):
+            self.__fill(order, scrip, ltp)
+        else:
+            price = float(order['prc'])
+            if (isBuy and ltp <= price) or (not isBuy and ltp >= price):
+                self.__fill(order, scrip, ltp)
+
+    def __match(self, scrip: SimulatedScrip):
+        openOrders = self.__openOrders.get(scrip.getKey(), None)
+        if openOrders:
+            for order in list(openOrders.values()):
+                self.__matchOrder(order, scrip)
+
+    def __placeOrder(self, values):
+        instrument = f"{values['exch']}|{urllib.parse.unquote_plus(values['tsym'])}"
+        scrip = self.__scripsBySymbol.get(instrument, None)
+        if scrip is None:
+            return {'stat': 'Not_Ok', 'request_time': getRequestTime(), 'emsg': f'Invalid Trading Symbol {instrument}'}
+
+        orderId = f'{datetime.date.today():%y%m%d}{self.__nextOrderId:08d}'
+        self.__nextOrderId += 1
+        now = getRequestTime()
+        order = {
+            'stat': 'Ok', 'norenordno': orderId, 'uid': values.get('uid', None), 'actid': values.get('actid', None),
+            'exch': scrip.exchange, 'tsym': scrip.tradingSymbol, 'token': scrip.getKey(), 'trantype': values['trantype'],
+            'prd': values.get('prd', None), 'prctyp': values['prctyp'], 'prc': values.get('prc', '0'),
+            'trgprc': values.get('trgprc', None), 'qty': values['qty'], 'ret': values.get('ret', 'DAY'),
+            'remarks': values.get('remarks', None), 'ls': str(scrip.lotSize), 'fillshares': '0',
+            'status': 'TRIGGER_PENDING' if values['prctyp'] in ('SL-LMT', 'SL-MKT') else 'OPEN',
+            'norentm': now, 'ordenttm': str(int(time.time())),
+        }
+        self.__orders[orderId] = order
+        self.__openOrders.setdefault(scrip.getKey(), dict())[orderId] = order
+        self.__refresh(scrip)
+        self.__matchOrder(order, scrip)
+        return {'stat': 'Ok', 'request_time': now, 'norenordno': orderId}
+
+    def __modifyOrder(self, values):
+        order = self.__orders.get(values.get('norenordno', None), None)
+        if order is None or order['status'] not in ('OPEN', 'TRIGGER_PENDING'):
+            return {'stat': 'Not_Ok', 'request_time': getRequestTime(),
+                    'emsg': 'Rejected : ORA:Order not found or not open'}
+
+        order['qty'] = values.get('qty', order['qty'])
+        order['prctyp'] = values.get('prctyp', order['prctyp'])
+        order['prc'] = values.get('prc', order['prc'])
+        order['trgprc'] = values.get('trgprc', order['trgprc'])
+        order['norentm'] = getRequestTime()
+        if order['prctyp'] in ('LMT', 'MKT'):
+            order['status'] = 'OPEN'
+        scrip = self.__scrips[order['token']]
+        self.__refresh(scrip)
+        self.__matchOrder(order, scrip)
+        return {'stat': 'Ok', 'request_time': order['norentm'], 'result': order['norenordno']}
+
+    def __cancelOrder(self, values):
+        order = self.__orders.get(values.get('norenordno', None), None)
+        if order is None or order['status'] not in ('OPEN', 'TRIGGER_PENDING'):
+            return {'stat': 'Not_Ok', 'request_time': getRequestTime(),
+                    'emsg': 'Rejected : ORA:Order not found or not open'}
+
+        self.__close(order, 'CANCELED')
+        return {'stat': 'Ok', 'request_time': order['norentm'], 'result': order['norenordno']}
+
+    def __getOrderBook(self, values):
+        if len(self.__orders) == 0:
+            return {'stat': 'Not_Ok', 'request_time': getRequestTime(), 'emsg': 'Error Occurred : 5 "no data"'}
+        # Latest first, like Noren
+        return list(reversed(list(self.__orders.values())))
+
+    def __getSingleOrderHistory(self, values):
+        order = self.__orders.get(values.get('norenordno', None), None)
+        if order is None:
+            return {'stat': 'Not_Ok', 'request_time': getRequestTime(), 'emsg': 'Error Occurred : 5 "no data"'}
+        return [order]
+
+    def __getLimits(self, values):
+        return {'stat': 'Ok', 'request_time': getRequestTime(), 'prfname': 'SIMULATOR', 'cash': f'{self.__cash:.2f}',
+                'payin': '0.00', 'payout': '0.00', 'marginused': f'{self.__getMargin():.2f}'}
+
+    def __getQuotes(self, values):
+        scrip = self.__scrips.get(f"{values.get('exch', None)}|{values.get('token', None)}", None)
+        if scrip is None:
+            return {'stat': 'Not_Ok', 'request_time': getRequestTime(), 'emsg': 'Error Occurred : 5 "no data"'}
+        self.__refresh(scrip)
+        ret = scrip.getQuote()
+        ret['stat'] = 'Ok'
+        ret['request_time'] = getRequestTime()
+        ret['exch'] = ret.pop('e')
+        ret['token'] = ret.pop('tk')
+        ret['tsym'] = ret.pop('ts')
+        return ret
+
+    def __login(self, values):
+        userToken = uuid.uuid4().hex
+        self.__sessions.add(userToken)
+        return {'stat': 'Ok', 'request_time': getRequestTime(), 'susertoken': userToken, 'actid': values['uid'],
+                'uname': values['uid']}
+
+    async def __onRequest(self, request):
+        self.__requests += 1
+        # NorenApi posts `jData=<json>&jKey=<user token>` without encoding it
+        body = await request.text()
+        jData, _, jKey = body.partition('&jKey=')
+        route = request.path.rstrip('/').rsplit('/', 1)[-1]
+        try:
+            values = json.loads(jData[len('jData='):])
+        except ValueError:
+            return web.json_response({'stat': 'Not_Ok', 'request_time': getRequestTime(),
+                                      'emsg': 'Error Occurred : 2 "invalid input"'})
+
+        if self.__latency:
+            await asyncio.sleep(self.__latency)
+
+        if route == 'QuickAuth':
+            return web.json_response(self.__login(values))
+        if jKey not in self.__sessions:
+            return web.json_response({'stat': 'Not_Ok', 'request_time': getRequestTime(),
+                                      'emsg': 'Session Expired :  Invalid Session Key'})
+
+        handler = {
+            'PlaceOrder': self.__placeOrder,
+            'ModifyOrder': self.__modifyOrder,
+            'CancelOrder': self.__cancelOrder,
+            'OrderBook': self.__getOrderBook,
+            'SingleOrdHist': self.__getSingleOrderHistory,
+            'Limits': self.__getLimits,
+            'GetQuotes': self.__getQuotes,
+        }.get(route, None)
+        if handler is None:
+            return web.json_response({'stat': 'Not_Ok', 'request_time': getRequestTime(),
+                                      'emsg': f'{route} is not simulated'})
+        return web.json_response(handler(values))
+
+    def getMetrics(self) -> dict:
+        return {
+            'ticks': self.__ticks,
+            'messages': self.__messages,
+            'connections': len(self.__sockets),
+            'requests': self.__requests,
+            'orders': len(self.__orders),
+            'fills': self.__fills,
+        }
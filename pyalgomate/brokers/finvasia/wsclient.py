@@ -6,26 +6,203 @@ import time
 import threading
 import logging
 import datetime
+import json
 
 from NorenRestApiPy.NorenApi import NorenApi
+from pyalgomate.barfeed.quotebook import QuoteBook
+from pyalgomate.brokers.reactor import Reactor, ReactorAdapter
 
 logger = logging.getLogger(__name__)
 
+
+class CoalescingQueue(object):
+    """A queue of the keys that changed since they were last taken, each key held once however often it is put.
+
+    The websocket thread puts the key of every quote it receives, and the feed takes all the pending keys at once
+    with :meth:`drain`, waiting on a condition variable until there is one. A quote that ticks several times between
+    two drains is delivered once, with its latest values.
+    """
+
+    def __init__(self):
+        self.__pending = dict()
+        self.__condition = threading.Condition(threading.Lock())
+        self.__closed = False
+        self.__wakeUp = None
+
+    def __len__(self):
+        return len(self.__pending)
+
+    def setWakeUp(self, wakeUp):
+        """Sets a :class:`pyalgomate.core.dispatcher.WakeUp` to notify when the queue stops being empty."""
+        self.__wakeUp = wakeUp
+        if wakeUp is not None and len(self.__pending):
+            wakeUp.notify()
+
+    def put(self, key):
+        with self.__condition:
+            wasEmpty = len(self.__pending) == 0
+            self.__pending[key] = None
+            if wasEmpty:
+                self.__condition.notify_all()
+        if wasEmpty and self.__wakeUp is not None:
+            self.__wakeUp.notify()
+
+    def drain(self, timeout=None):
+        """Takes the pending keys, in the order they were first put since the previous drain.
+
+        :param timeout: How long to wait, in seconds, for a key if there is none. 0 returns immediately and None waits
+            until a key is put or the queue is closed.
+        :type timeout: float.
+        :rtype: list.
+        """
+        with self.__condition:
+            if len(self.__pending) == 0 and timeout != 0 and not self.__closed:
+                self.__condition.wait(timeout)
+            if len(self.__pending) == 0:
+                return []
+            ret = list(self.__pending)
+            self.__pending = dict()
+        return ret
+
+    def close(self):
+        """Wakes the threads waiting in :meth:`drain`. Later drains don't wait."""
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+
+    def isClosed(self):
+        return self.__closed
+
+
+class NorenAdapter(ReactorAdapter):
+    """The Noren websocket protocol of :class:`NorenRestApiPy.NorenApi.NorenApi`, run by a
+    :class:`pyalgomate.brokers.reactor.Reactor` instead of a websocket thread of its own.
+
+    :param websocketUrl: The websocket url the api was created with.
+    :type websocketUrl: string.
+    :param userId: The user id of the session.
+    :type userId: string.
+    :param userToken: The user token of the session, returned by the login.
+    :type userToken: string.
+    """
+
+    # NorenApi pings every 3 seconds
+    HEARTBEAT = 3
+
+    def __init__(self, websocketUrl, userId, userToken, subscribeCallback, socketOpenCallback, socketCloseCallback,
+                 socketErrorCallback, orderUpdateCallback=None):
+        self.__url = websocketUrl
+        self.__userId = userId
+        self.__userToken = userToken
+        self.__subscribeCallback = subscribeCallback
+        self.__socketOpenCallback = socketOpenCallback
+        self.__socketCloseCallback = socketCloseCallback
+        self.__socketErrorCallback = socketErrorCallback
+        self.__orderUpdateCallback = orderUpdateCallback
+        self.__reactor = None
+
+    def getUrl(self):
+        return self.__url.format(access_token=self.__userToken)
+
+    def getHeartbeat(self):
+        return NorenAdapter.HEARTBEAT
+
+    def onConnected(self, reactor):
+        self.__reactor = reactor
+        reactor.send(self, json.dumps({"t": "c", "uid": self.__userId, "actid": self.__userId,
+                                       "susertoken": self.__userToken, "source": "API"}))
+
+    def onMessage(self, message):
+        message = json.loads(message)
+        field = message['t']
+        if field in ('tk', 'tf', 'dk', 'df'):
+            self.__subscribeCallback(message)
+        elif field == 'ck':
+            if message.get('s', None) == 'OK':
+                self.__socketOpenCallback()
+            else:
+                self.__socketErrorCallback(message)
+        elif field == 'om' and self.__orderUpdateCallback is not None:
+            self.__orderUpdateCallback(message)
+
+    def onDisconnected(self):
+        self.__socketCloseCallback()
+
+    def onError(self, error):
+        self.__socketErrorCallback(error)
+
+    def subscribe(self, channels):
+        if self.__reactor is not None:
+            self.__reactor.send(self, json.dumps({"t": "t", "k": "#".join(channels)}))
+
+    def unsubscribe(self, channels):
+        if self.__reactor is not None:
+            self.__reactor.send(self, json.dumps({"t": "u", "k": "#".join(channels)}))
+
+
 class WebSocketClient:
-    def __init__(self, api, tokenMappings):
+    """The Finvasia market data websocket.
+
+    :param api: A logged in api.
+    :type api: :class:`NorenRestApiPy.NorenApi.NorenApi`.
+    :param tokenMappings: The instruments keyed by channel.
+    :type tokenMappings: dict.
+    :param reactor: A reactor to run the websocket on, or None to run it on a thread of the api.
+    :type reactor: :class:`pyalgomate.brokers.reactor.Reactor`.
+    :param websocketUrl: The websocket url of the api. Required with a reactor.
+    :type websocketUrl: string.
+    :param userId: The user id of the api session. Required with a reactor.
+    :type userId: string.
+    :param userToken: The user token of the api session. Required with a reactor.
+    :type userToken: string.
+    """
+
+    def __init__(self, api, tokenMappings, reactor: Reactor = None, websocketUrl=None, userId=None, userToken=None):
         assert len(tokenMappings), "Missing subscriptions"
-        self.__quotes = dict()
+        if reactor is not None and None in (websocketUrl, userId, userToken):
+            raise Exception("The websocket url, user id and user token are required to run on a reactor")
+        self.__quotes = QuoteBook()
+        self.__updatedKeys = CoalescingQueue()
         self.__lastQuoteDateTime = None
         self.__lastReceivedDateTime = None
         self.__api: NorenApi = api
-        self.__tokenMappings = tokenMappings
+        # The subscribed channels, replayed when the websocket reconnects. Replaced, never modified, because
+        # the websocket thread reads them.
+        self.__channels = tuple(tokenMappings.keys())
         self.__pending_subscriptions = list()
         self.__connected = False
         self.__connectionOpened = threading.Event()
+        self.__reactor = reactor
+        self.__websocketUrl = websocketUrl
+        self.__userId = userId
+        self.__userToken = userToken
+        self.__adapter = None
+        self.__tickListener = None
 
-    def getQuotes(self):
+    def getQuotes(self) -> QuoteBook:
+        """Returns the last quote of every key. It can be read while ticks arrive."""
         return self.__quotes
 
+    def getQuoteVersion(self, key):
+        return self.__quotes.getVersion(key)
+
+    def popUpdatedKeys(self):
+        """Returns the keys of the quotes updated since the previous call, without waiting."""
+        return self.__updatedKeys.drain(0)
+
+    def waitUpdatedKeys(self, timeout):
+        """Returns the keys of the quotes updated since the previous call, waiting up to `timeout` seconds for an
+        update if there is none."""
+        return self.__updatedKeys.drain(timeout)
+
+    def setTickListener(self, tickListener):
+        """Sets a function called from the websocket thread with the key and the merged quote of every tick."""
+        self.__tickListener = tickListener
+
+    def setWakeUp(self, wakeUp):
+        """Sets a :class:`pyalgomate.core.dispatcher.WakeUp` to notify when quotes are updated."""
+        self.__updatedKeys.setWakeUp(wakeUp)
+
     def getLastQuoteDateTime(self):
         return self.__lastQuoteDateTime
     
@@ -33,6 +210,16 @@ class WebSocketClient:
         return self.__lastReceivedDateTime
 
     def startClient(self):
+        if self.__reactor is not None:
+            self.__adapter = NorenAdapter(self.__websocketUrl, self.__userId, self.__userToken,
+                                          subscribeCallback=self.onQuoteUpdate,
+                                          socketOpenCallback=self.onOpened,
+                                          socketCloseCallback=self.onClosed,
+                                          socketErrorCallback=self.onError,
+                                          orderUpdateCallback=self.onOrderBookUpdate)
+            self.__reactor.addAdapter(self.__adapter)
+            return
+
         self.__api.start_websocket(order_update_callback=self.onOrderBookUpdate,
                                    subscribe_callback=self.onQuoteUpdate,
                                    socket_open_callback=self.onOpened,
@@ -40,6 +227,10 @@ class WebSocketClient:
                                    socket_error_callback=self.onError)
 
     def stopClient(self):
+        self.__updatedKeys.close()
+        if self.__adapter is not None:
+            self.__reactor.removeAdapter(self.__adapter)
+            return
         try:
             if self.__connected:
                 self.__api.close_websocket()
@@ -67,13 +258,40 @@ class WebSocketClient:
     def isConnected(self):
         return self.__connected
 
+    def getChannels(self):
+        """Returns the subscribed channels."""
+        return self.__channels
+
+    def subscribe(self, channels):
+        self.__channels = tuple(dict.fromkeys(self.__channels + tuple(channels)))
+        for channel in channels:
+            logger.info("Subscribing to channel %s." % channel)
+        if self.__adapter is not None:
+            self.__adapter.subscribe(channels)
+        else:
+            self.__api.subscribe(channels)
+
+    def unsubscribe(self, channels):
+        removed = set(channels)
+        self.__channels = tuple(channel for channel in self.__channels if channel not in removed)
+        for channel in channels:
+            logger.info("Unsubscribing from channel %s." % channel)
+        if self.__adapter is not None:
+            self.__adapter.unsubscribe(channels)
+        else:
+            self.__api.unsubscribe(channels)
+
     def onOpened(self):
         logger.info("Websocket connected")
         self.__connected = True
-        self.__pending_subscriptions = list(self.__tokenMappings.keys())
-        for channel in self.__pending_subscriptions:
-            logger.info("Subscribing to channel %s." % channel)
-            self.__api.subscribe(channel)
+        self.__pending_subscriptions = list(self.__channels)
+        if self.__adapter is not None:
+            # One frame for all the channels
+            self.subscribe(self.__pending_subscriptions)
+        else:
+            for channel in self.__pending_subscriptions:
+                logger.info("Subscribing to channel %s." % channel)
+                self.__api.subscribe(channel)
         self.__connectionOpened.set()
 
     def onClosed(self):
@@ -95,12 +313,11 @@ class WebSocketClient:
         self.__lastQuoteDateTime = datetime.datetime.fromtimestamp(int(message['ft'])) if 'ft' in message else self.__lastReceivedDateTime.replace(microsecond=0)
         message['ft'] = self.__lastQuoteDateTime
 
-        if key in self.__quotes:
-            symbolInfo =  self.__quotes[key]
-            symbolInfo.update(message)
-            self.__quotes[key] = symbolInfo
-        else:
-            self.__quotes[key] = message
+        # Publish the quote before queueing its key, so the feed finds it when it drains the key
+        self.__quotes.update(key, message)
+        self.__updatedKeys.put(key)
+        if self.__tickListener is not None:
+            self.__tickListener(key, self.__quotes.get(key))
 
     def onOrderBookUpdate(self, message):
         pass
@@ -6,13 +6,15 @@ import csv
 import calendar
 import threading
 import time
+import functools
 import logging
 import datetime
 import six
-import re
 from pyalgotrade import broker
 from pyalgomate.brokers import BacktestingBroker, QuantityTraits
-from pyalgomate.strategies import OptionContract
+from pyalgomate.core.dispatcher import WakeUpQueue, getWakeUp
+from pyalgomate.brokers.contracts import OptionContractParser, OptionContractRegistry, monthlyGrammar, \
+    weeklyGrammar
 import pyalgomate.utils as utils
 from neo_api_client import NeoAPI
 from pyalgomate.utils import UnderlyingIndex
@@ -58,6 +60,17 @@ def getUnderlyingDetails(underlying):
     return underlyingMapping[underlying]
 
 
+def getOptionUnderlying(optionPrefix):
+    return optionPrefix.replace('NFO:BANKNIFTY', 'NSE:NIFTY BANK').replace('NFO:NIFTY', 'NSE:NIFTY 50')
+
+
+# Options are spelled NFO:BANKNIFTY24MAR47000CE or NFO:BANKNIFTY2432847000CE
+optionContractRegistry = OptionContractRegistry(OptionContractParser([
+    monthlyGrammar(r'[A-Z\:]+'),
+    weeklyGrammar(r'[A-Z\:]+')
+], getOptionUnderlying))
+
+
 status_mapping = {
     "rejected": "REJECTED",
     "cancelled": "CANCELED",
@@ -83,6 +96,8 @@ status_mapping = {
 #         expiry_day_str = f"0{expiry.day}"
 #     return f"{underlyingInstrument}23{expiry_month_str}{expiry_day_str}{strikePrice}{callOrPut}E"
 
+# Strategies build the same symbols on every bar, build each one once
+@functools.lru_cache(maxsize=4096, typed=True)
 def getOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut):
     monthly = utils.getNearestMonthlyExpiryDate(expiry) == expiry
     strikePlusOption = str(strikePrice) + ('CE' if (callOrPut ==
@@ -220,34 +235,7 @@ class PaperTradingBroker(BacktestingBroker):
         return getOptionSymbol(underlyingInstrument, expiry, ceStrikePrice, 'C'), getOptionSymbol(underlyingInstrument, expiry, peStrikePrice, 'P')
 
     def getOptionContract(self, symbol):
-        m = re.match(r"([A-Z\:]+)(\d{2})([A-Z]{3})(\d+)([CP])E", symbol)
-
-        if m is not None:
-            month = datetime.datetime.strptime(m.group(3), '%b').month
-            year = int(m.group(2)) + 2000
-            expiry = utils.getNearestMonthlyExpiryDate(
-                datetime.date(year, month, 1))
-            return OptionContract(symbol, int(m.group(4)), expiry, "c" if m.group(5) == "C" else "p", m.group(1).replace('NFO:BANKNIFTY', 'NSE:NIFTY BANK').replace('NFO:NIFTY', 'NSE:NIFTY 50'))
-
-        m = re.match(r"([A-Z\:]+)(\d{2})(\d|[OND])(\d{2})(\d+)([CP])E", symbol)
-
-        if m is None:
-            return None
-
-        day = int(m.group(4))
-        month = m.group(3)
-        if month == 'O':
-            month = 10
-        elif month == 'N':
-            month = 11
-        elif month == 'D':
-            month = 12
-        else:
-            month = int(month)
-
-        year = int(m.group(2)) + 2000
-        expiry = datetime.date(year, month, day)
-        return OptionContract(symbol, int(m.group(5)), expiry, "c" if m.group(6) == "C" else "p", m.group(1).replace('NFO:BANKNIFTY', 'NSE:NIFTY BANK').replace('NFO:NIFTY', 'NSE:NIFTY 50'))
+        return optionContractRegistry.getOptionContract(symbol)
 
 
 class TradeEvent(object):
@@ -283,7 +271,7 @@ class TradeMonitor(threading.Thread):
         super(TradeMonitor, self).__init__()
         self.__api = liveBroker.getApi()
         self.__broker = liveBroker
-        self.__queue = six.moves.queue.Queue()
+        self.__queue = WakeUpQueue()
         self.__stop = False
 
     def _getNewTrades(self):
@@ -398,34 +386,7 @@ class LiveBroker(broker.Broker):
         return getOptionSymbol(underlyingInstrument, expiry, ceStrikePrice, 'C'), getOptionSymbol(underlyingInstrument, expiry, peStrikePrice, 'P')
 
     def getOptionContract(self, symbol):
-        m = re.match(r"([A-Z\:]+)(\d{2})([A-Z]{3})(\d+)([CP])E", symbol)
-
-        if m is not None:
-            month = datetime.datetime.strptime(m.group(3), '%b').month
-            year = int(m.group(2)) + 2000
-            expiry = utils.getNearestMonthlyExpiryDate(
-                datetime.date(year, month, 1))
-            return OptionContract(symbol, int(m.group(4)), expiry, "c" if m.group(5) == "C" else "p", m.group(1).replace('NFO:BANKNIFTY', 'NSE:NIFTY BANK').replace('NFO:NIFTY', 'NSE:NIFTY 50'))
-
-        m = re.match(r"([A-Z\:]+)(\d{2})(\d|[OND])(\d{2})(\d+)([CP])E", symbol)
-
-        if m is None:
-            return None
-
-        day = int(m.group(4))
-        month = m.group(3)
-        if month == 'O':
-            month = 10
-        elif month == 'N':
-            month = 11
-        elif month == 'D':
-            month = 12
-        else:
-            month = int(month)
-
-        year = int(m.group(2)) + 2000
-        expiry = datetime.date(year, month, day)
-        return OptionContract(symbol, int(m.group(5)), expiry, "c" if m.group(6) == "C" else "p", m.group(1).replace('NFO:BANKNIFTY', 'NSE:NIFTY BANK').replace('NFO:NIFTY', 'NSE:NIFTY 50'))
+        return optionContractRegistry.getOptionContract(symbol)
 
     # def getHistoricalData(self, exchangeSymbol: str, startTime: datetime.datetime, interval: str) -> pd.DataFrame():
     #     return getHistoricalData(self.__api, exchangeSymbol, startTime, interval)
@@ -435,6 +396,7 @@ class LiveBroker(broker.Broker):
         self.__stop = False
         self.__api = api
         self.__tradeMonitor = TradeMonitor(self)
+        self.__wakeUp = None
         self.__cash = 0
         self.__shares = {}
         self.__activeOrders = {}
@@ -537,6 +499,12 @@ class LiveBroker(broker.Broker):
     def eof(self):
         return self.__stop
 
+    def onDispatcherRegistered(self, dispatcher):
+        super(LiveBroker, self).onDispatcherRegistered(dispatcher)
+        # A live dispatcher is woken up by the trade monitor's queue, dispatch must not block it
+        self.__wakeUp = getWakeUp(dispatcher)
+        self.__tradeMonitor.getQueue().setWakeUp(self.__wakeUp)
+
     def dispatch(self):
         # Switch orders from SUBMITTED to ACCEPTED.
         ordersToProcess = list(self.__activeOrders.values())
@@ -549,7 +517,7 @@ class LiveBroker(broker.Broker):
         # Dispatch events from the trade monitor.
         try:
             eventType, eventData = self.__tradeMonitor.getQueue().get(
-                True, LiveBroker.QUEUE_TIMEOUT)
+                True, LiveBroker.QUEUE_TIMEOUT if self.__wakeUp is None else 0)
 
             if eventType == TradeMonitor.ON_USER_TRADE:
                 self._onUserTrades(eventData)
@@ -5,11 +5,11 @@
 import datetime
 import logging
 import six
-import queue
 import traceback
 
 from pyalgotrade import bar
 from pyalgomate.barfeed import BaseBarFeed
+from pyalgomate.barfeed.conflator import TickConflator
 from pyalgotrade import observer
 from pyalgomate.brokers.kotak import wsclient
 
@@ -85,16 +85,27 @@ class LiveTradeFeed(BaseBarFeed):
         Once a bounded length is full, when new items are added, a corresponding number of items are discarded
         from the opposite end. If None then dataseries.DEFAULT_MAX_LEN is used.
     :type maxLen: int.
+    :param conflationWindow: How long, in seconds, to merge ticks into one multi-instrument
+        :class:`pyalgotrade.bar.Bars`, keeping the latest tick of each instrument. Defaults to
+        :attr:`pyalgomate.barfeed.conflator.TickConflator.DRAIN_ALL`, which merges all the ticks that are pending
+        when the dispatcher asks for bars.
+    :type conflationWindow: float.
 
     .. note::
         Note that a Bar will be created for every trade, so open, high, low and close values will all be the same.
+
+    .. note::
+        The feed subscribes its instruments once, when it starts. It doesn't implement `subscribeInstruments` and
+        `unsubscribeInstruments`, so it can't be used with a
+        :class:`pyalgomate.barfeed.subscriptions.SubscriptionManager` and its options don't follow the LTP.
     """
 
     QUEUE_TIMEOUT = 0.01
 
-    def __init__(self, api, tokenMappings, timeout=10, maxLen=None):
+    def __init__(self, api, tokenMappings, timeout=10, maxLen=None,
+                 conflationWindow=TickConflator.DRAIN_ALL):
         super(LiveTradeFeed, self).__init__(bar.Frequency.TRADE, maxLen)
-        self.__tradeBars = queue.Queue()
+        self.__conflator = TickConflator(conflationWindow)
         self.__channels = tokenMappings
         self.__api = api
         self.__timeout = timeout
@@ -127,6 +138,7 @@ class LiveTradeFeed(BaseBarFeed):
         try:
             # Start the thread that runs the client.
             self.__thread = self.buildWebSocketClientThread()
+            self.__thread.getQueue().setWakeUp(self.getWakeUp())
             self.__thread.start()
         except Exception as e:
             logger.error("Error connecting : %s" % str(e))
@@ -152,40 +164,62 @@ class LiveTradeFeed(BaseBarFeed):
 
     def __dispatchImpl(self, eventFilter):
         ret = False
+        eventQueue = self.__thread.getQueue()
+        self.__conflator.recordQueueDepth(eventQueue.qsize())
         try:
-            eventType, eventData = self.__thread.getQueue().get(
-                True, LiveTradeFeed.QUEUE_TIMEOUT)
-            if eventFilter is not None and eventType not in eventFilter:
-                return False
-
-            ret = True
-            if eventType == wsclient.WebSocketClient.Event.TRADE:
-                self.__onTrade(eventData)
-                self.__lastDataTime = datetime.datetime.now()
-            elif eventType == wsclient.WebSocketClient.Event.ORDER_BOOK_UPDATE:
-                self.__orderBookUpdateEvent.emit(eventData)
-            elif eventType == wsclient.WebSocketClient.Event.DISCONNECTED:
-                self.__onDisconnected()
-            else:
-                ret = False
-                logger.error(
-                    "Invalid event received to dispatch: %s - %s" % (eventType, eventData))
+            # A live dispatcher is woken up by the queue, the feed must not block it
+            eventType, eventData = eventQueue.get(
+                True, LiveTradeFeed.QUEUE_TIMEOUT if self.getWakeUp() is None else 0)
+            # Take the events that are already queued too, so their ticks are conflated into the next bars
+            queued = eventQueue.qsize()
+            while True:
+                if self.__dispatchEvent(eventType, eventData, eventFilter):
+                    ret = True
+                if queued == 0 or eventType == wsclient.WebSocketClient.Event.DISCONNECTED:
+                    break
+                queued -= 1
+                eventType, eventData = eventQueue.get_nowait()
         except six.moves.queue.Empty:
             pass
         return ret
 
+    def __dispatchEvent(self, eventType, eventData, eventFilter):
+        if eventFilter is not None and eventType not in eventFilter:
+            return False
+
+        ret = True
+        if eventType == wsclient.WebSocketClient.Event.TRADE:
+            self.__onTrade(eventData)
+            self.__lastDataTime = datetime.datetime.now()
+        elif eventType == wsclient.WebSocketClient.Event.ORDER_BOOK_UPDATE:
+            self.__orderBookUpdateEvent.emit(eventData)
+        elif eventType == wsclient.WebSocketClient.Event.DISCONNECTED:
+            self.__onDisconnected()
+        else:
+            ret = False
+            logger.error(
+                "Invalid event received to dispatch: %s - %s" % (eventType, eventData))
+        return ret
+
     def __onTrade(self, trade):
-        self.__tradeBars.put(
-            {trade.getExtraColumns().get("Instrument"): trade})
+        journal = self.getJournal()
+        if journal is not None:
+            journal.record(trade)
+        self.__conflator.add(trade)
+
+    def getConflator(self) -> TickConflator:
+        """Returns the :class:`pyalgomate.barfeed.conflator.TickConflator` of the feed, with its queue depth and
+        conflation ratio metrics."""
+        return self.__conflator
 
     def barsHaveAdjClose(self):
         return False
 
     def getNextBars(self):
-        if self.__tradeBars.qsize() > 0:
-            return bar.Bars(self.__tradeBars.get())
+        return self.__conflator.pop()
 
-        return None
+    def isRealTime(self):
+        return True
 
     def peekDateTime(self):
         # Return None since this is a realtime subject.
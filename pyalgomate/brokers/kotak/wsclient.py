@@ -3,11 +3,11 @@
 """
 
 import threading
-import queue
 import logging
 import datetime
 
-from pyalgotrade import bar
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.core.dispatcher import WakeUpQueue
 
 logger = logging.getLogger(__name__)
 
@@ -71,19 +71,15 @@ class SubscribeEvent(object):
     def TradeBar(self, instrument):
         open = high = low = close = self.price
 
-        return bar.BasicBar(self.dateTime,
-                            open,
-                            high,
-                            low,
-                            close,
-                            self.volume,
-                            None,
-                            bar.Frequency.TRADE,
-                            {
-                                "Instrument": instrument,
-                                "Open Interest": self.openInterest,
-                                "Date/Time": self.tickDateTime
-                            })
+        return QuoteBar(self.dateTime,
+                        open,
+                        high,
+                        low,
+                        close,
+                        self.volume,
+                        self.openInterest,
+                        instrument,
+                        self.tickDateTime)
 
 
 class WebSocketClient:
@@ -192,7 +188,8 @@ class WebSocketClient:
 class WebSocketClientThreadBase(threading.Thread):
     def __init__(self, wsCls, *args, **kwargs):
         super(WebSocketClientThreadBase, self).__init__()
-        self.__queue = queue.Queue()
+        # Notifies the live dispatcher, if the feed runs on one
+        self.__queue = WakeUpQueue()
         self.__wsClient = None
         self.__wsCls = wsCls
         self.__args = args
@@ -0,0 +1,221 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import abc
+import asyncio
+import logging
+import threading
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class ReactorAdapter(abc.ABC):
+    """The protocol of a broker websocket, run by a :class:`Reactor`.
+
+    The callbacks are called from the reactor thread and must not block: they parse the message, publish it and
+    return. Anything slow belongs to the feed or the strategy.
+    """
+
+    def getName(self):
+        return type(self).__name__
+
+    @abc.abstractmethod
+    def getUrl(self):
+        """Returns the url of the websocket."""
+        raise NotImplementedError()
+
+    def getHeartbeat(self):
+        """Returns the interval, in seconds, of the websocket pings, or None to send none."""
+        return None
+
+    def onConnected(self, reactor):
+        """Called when the websocket connects, to log in and subscribe with :meth:`Reactor.send`."""
+        pass
+
+    @abc.abstractmethod
+    def onMessage(self, message):
+        """Called with every text or binary message of the websocket."""
+        raise NotImplementedError()
+
+    def onDisconnected(self):
+        """Called when the websocket disconnects. The reactor reconnects unless the adapter was removed."""
+        pass
+
+    def onError(self, error):
+        logger.error(f'{self.getName()} error: {error}')
+
+
+class Reactor(object):
+    """Runs the websockets of several brokers on one asyncio event loop, in one thread.
+
+    Each broker client used to run its own websocket thread, and its feed polled a queue with a timeout. The adapters
+    of a reactor share a thread and publish their ticks to the feed as soon as they are parsed, so the feed wakes up
+    on the tick instead of on its next poll. Use :func:`getReactor` to get the reactor shared by the feeds of a
+    process.
+
+    Adapters are reconnected with an exponential backoff, from :attr:`RECONNECT_DELAY` up to
+    :attr:`MAX_RECONNECT_DELAY` seconds.
+    """
+
+    RECONNECT_DELAY = 0.1
+    MAX_RECONNECT_DELAY = 5
+
+    def __init__(self):
+        self.__loop = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__session = None
+        self.__tasks = dict()
+        self.__sockets = dict()
+        self.__messages = 0
+        self.__connects = 0
+
+    def start(self):
+        """Starts the reactor thread. Adding an adapter starts it too."""
+        with self.__lock:
+            if self.__thread is not None:
+                return
+            self.__loop = asyncio.new_event_loop()
+            started = threading.Event()
+            self.__thread = threading.Thread(target=self.__run, args=(started,), name='reactor', daemon=True)
+            self.__thread.start()
+        started.wait()
+
+    def __run(self, started):
+        asyncio.set_event_loop(self.__loop)
+        self.__loop.call_soon(started.set)
+        try:
+            self.__loop.run_forever()
+        finally:
+            self.__loop.close()
+
+    def isRunning(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def stop(self):
+        """Disconnects the adapters and stops the reactor thread."""
+        with self.__lock:
+            thread = self.__thread
+            if thread is None:
+                return
+            asyncio.run_coroutine_threadsafe(self.__shutdown(), self.__loop).result()
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            thread.join()
+            self.__thread = None
+            self.__loop = None
+
+    async def __shutdown(self):
+        tasks = list(self.__tasks.values())
+        self.__tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def addAdapter(self, adapter: ReactorAdapter):
+        """Connects an adapter's websocket. It stays connected until :meth:`removeAdapter`."""
+        self.start()
+        self.__loop.call_soon_threadsafe(self.__addAdapter, adapter)
+
+    def __addAdapter(self, adapter):
+        if adapter not in self.__tasks:
+            self.__tasks[adapter] = self.__loop.create_task(self.__connect(adapter))
+
+    def removeAdapter(self, adapter: ReactorAdapter, timeout=None):
+        """Disconnects an adapter's websocket, waiting up to `timeout` seconds for it to close."""
+        if self.__loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.__removeAdapter(adapter), self.__loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            logger.error(f'Failed to remove {adapter.getName()}: {e}')
+
+    async def __removeAdapter(self, adapter):
+        task = self.__tasks.pop(adapter, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def send(self, adapter: ReactorAdapter, payload):
+        """Sends a text payload on an adapter's websocket. It can be called from any thread. Payloads sent while the
+        adapter is disconnected are dropped, the adapter subscribes again in :meth:`ReactorAdapter.onConnected`."""
+        if threading.current_thread() is self.__thread:
+            self.__send(adapter, payload)
+        elif self.__loop is not None:
+            self.__loop.call_soon_threadsafe(self.__send, adapter, payload)
+
+    def __send(self, adapter, payload):
+        socket = self.__sockets.get(adapter, None)
+        if socket is None or socket.closed:
+            logger.warning(f'{adapter.getName()} is not connected, dropping {payload}')
+            return
+        self.__loop.create_task(socket.send_str(payload))
+
+    def isConnected(self, adapter: ReactorAdapter):
+        socket = self.__sockets.get(adapter, None)
+        return socket is not None and not socket.closed
+
+    def getAdapterCount(self):
+        return len(self.__tasks)
+
+    def getMetrics(self) -> dict:
+        return {
+            'adapters': len(self.__tasks),
+            'connected': len(self.__sockets),
+            'connects': self.__connects,
+            'messages': self.__messages,
+        }
+
+    async def __connect(self, adapter):
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession()
+
+        delay = Reactor.RECONNECT_DELAY
+        while True:
+            try:
+                async with self.__session.ws_connect(adapter.getUrl(), heartbeat=adapter.getHeartbeat()) as socket:
+                    logger.info(f'{adapter.getName()} connected')
+                    self.__sockets[adapter] = socket
+                    self.__connects += 1
+                    delay = Reactor.RECONNECT_DELAY
+                    adapter.onConnected(self)
+                    async for message in socket:
+                        if message.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                            self.__messages += 1
+                            try:
+                                adapter.onMessage(message.data)
+                            except Exception as e:
+                                adapter.onError(e)
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            adapter.onError(socket.exception())
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                adapter.onError(e)
+            finally:
+                if self.__sockets.pop(adapter, None) is not None:
+                    logger.info(f'{adapter.getName()} disconnected')
+                    adapter.onDisconnected()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, Reactor.MAX_RECONNECT_DELAY)
+
+
+_reactor = None
+_reactorLock = threading.Lock()
+
+
+def getReactor() -> Reactor:
+    """Returns the :class:`Reactor` shared by the feeds of the process, creating it the first time."""
+    global _reactor
+    with _reactorLock:
+        if _reactor is None:
+            _reactor = Reactor()
+        return _reactor
@@ -4,8 +4,9 @@
 import logging
 import pyotp
 from pyalgomate.brokers.zerodha.kiteext import KiteExt
-from pyalgomate.brokers.zerodha.broker import getZerodhaTokensList, getOptionSymbols, getUnderlyingDetails
+from pyalgomate.brokers.zerodha.broker import getZerodhaTokensList, getOptionSymbol, getUnderlyingDetails
 from pyalgomate.brokers.zerodha.feed import ZerodhaLiveFeed
+from pyalgomate.barfeed.subscriptions import SubscriptionManager
 from pyalgomate.brokers import getDefaultUnderlyings, getExpiryDates
 
 logger = logging.getLogger()
@@ -23,7 +24,8 @@ def getFeed(cred, registerOptions, underlyings):
     if len(underlyings) == 0:
         underlyings = getDefaultUnderlyings()
 
-    optionSymbols = []
+    # Keeps the option subscriptions centered on the LTP of each underlying as the market moves
+    subscriptionManager = SubscriptionManager(getOptionSymbol)
 
     for underlying in underlyings:
         ltp = api.quote(underlying)[
@@ -35,17 +37,19 @@ def getFeed(cred, registerOptions, underlyings):
         (currentWeeklyExpiry, nextWeekExpiry, monthlyExpiry) = getExpiryDates(index)
 
         if "Weekly" in registerOptions:
-            optionSymbols += getOptionSymbols(
-                underlying, currentWeeklyExpiry, ltp, 10, strikeDifference)
+            subscriptionManager.addWindow(
+                underlying, currentWeeklyExpiry, ltp, strikeDifference, 10)
         if "NextWeekly" in registerOptions:
-            optionSymbols += getOptionSymbols(
-                underlying, nextWeekExpiry, ltp, 10, strikeDifference)
+            subscriptionManager.addWindow(
+                underlying, nextWeekExpiry, ltp, strikeDifference, 10)
         if "Monthly" in registerOptions:
-            optionSymbols += getOptionSymbols(
-                underlying, monthlyExpiry, ltp, 10, strikeDifference)
+            subscriptionManager.addWindow(
+                underlying, monthlyExpiry, ltp, strikeDifference, 10)
 
-    optionSymbols = list(dict.fromkeys(optionSymbols))
+    optionSymbols = subscriptionManager.getInstruments()
 
     tokenMappings = getZerodhaTokensList(api, underlyings + optionSymbols)
 
-    return ZerodhaLiveFeed(api, tokenMappings), api
+    feed = ZerodhaLiveFeed(api, tokenMappings)
+    subscriptionManager.attach(feed)
+    return feed, api
@@ -3,18 +3,20 @@
 """
 import threading
 import time
+import functools
 import logging
 import datetime
 import six
 import calendar
-import re
 import pandas as pd
 
 from .kiteext import KiteExt
 
 from pyalgotrade import broker
 from pyalgomate.brokers import BacktestingBroker, QuantityTraits
-from pyalgomate.strategies import OptionContract
+from pyalgomate.core.dispatcher import WakeUpQueue, getWakeUp
+from pyalgomate.brokers.contracts import OptionContractParser, OptionContractRegistry, monthlyGrammar, \
+    weeklyGrammar, mappingResolver
 import pyalgomate.utils as utils
 from pyalgomate.utils import UnderlyingIndex
 
@@ -68,6 +70,15 @@ def getUnderlyingDetails(underlying):
     return underlyingMapping[underlying]
 
 
+# Options are spelled NFO:BANKNIFTY24MAR47000CE or NFO:BANKNIFTY2432847000CE
+optionContractRegistry = OptionContractRegistry(OptionContractParser([
+    monthlyGrammar(r'[A-Z\:]+'),
+    weeklyGrammar(r'[A-Z\:]+')
+], mappingResolver(underlyingMapping)))
+
+
+# Strategies build the same symbols on every bar, build each one once
+@functools.lru_cache(maxsize=4096, typed=True)
 def getOptionSymbol(underlyingInstrument, expiry, strikePrice, callOrPut):
     monthly = utils.getNearestMonthlyExpiryDate(expiry) == expiry
     symbol = getUnderlyingDetails(underlyingInstrument)['optionPrefix']
@@ -177,41 +188,7 @@ class ZerodhaPaperTradingBroker(BacktestingBroker):
                                                                                                   'P')
 
     def getOptionContract(self, symbol):
-        m = re.match(r"([A-Z\:]+)(\d{2})([A-Z]{3})(\d+)([CP])E", symbol)
-
-        if m is not None:
-            month = datetime.datetime.strptime(m.group(3), '%b').month
-            year = int(m.group(2)) + 2000
-            expiry = utils.getNearestMonthlyExpiryDate(
-                datetime.date(year, month, 1))
-            optionPrefix = m.group(1)
-            for underlying, underlyingDetails in underlyingMapping.items():
-                if underlyingDetails['optionPrefix'] == optionPrefix:
-                    return OptionContract(symbol, int(m.group(4)), expiry, "c" if m.group(5) == "C" else "p",
-                                          underlying)
-
-        m = re.match(r"([A-Z\:]+)(\d{2})(\d|[OND])(\d{2})(\d+)([CP])E", symbol)
-
-        if m is None:
-            return None
-
-        day = int(m.group(4))
-        month = m.group(3)
-        if month == 'O':
-            month = 10
-        elif month == 'N':
-            month = 11
-        elif month == 'D':
-            month = 12
-        else:
-            month = int(month)
-
-        year = int(m.group(2)) + 2000
-        expiry = datetime.date(year, month, day)
-        optionPrefix = m.group(1)
-        for underlying, underlyingDetails in underlyingMapping.items():
-            if underlyingDetails['optionPrefix'] == optionPrefix:
-                return OptionContract(symbol, int(m.group(5)), expiry, "c" if m.group(6) == "C" else "p", underlying)
+        return optionContractRegistry.getOptionContract(symbol)
 
 
 class TradeEvent(object):
@@ -248,7 +225,7 @@ class TradeMonitor(threading.Thread):
         super(TradeMonitor, self).__init__()
         self.__api = liveBroker.getApi()
         self.__broker = liveBroker
-        self.__queue = six.moves.queue.Queue()
+        self.__queue = WakeUpQueue()
         self.__stop = False
 
     def _getNewTrades(self):
@@ -355,41 +332,7 @@ class ZerodhaLiveBroker(broker.Broker):
                                                                                                   'P')
 
     def getOptionContract(self, symbol):
-        m = re.match(r"([A-Z\:]+)(\d{2})([A-Z]{3})(\d+)([CP])E", symbol)
-
-        if m is not None:
-            month = datetime.datetime.strptime(m.group(3), '%b').month
-            year = int(m.group(2)) + 2000
-            expiry = utils.getNearestMonthlyExpiryDate(
-                datetime.date(year, month, 1))
-            optionPrefix = m.group(1)
-            for underlying, underlyingDetails in underlyingMapping.items():
-                if underlyingDetails['optionPrefix'] == optionPrefix:
-                    return OptionContract(symbol, int(m.group(4)), expiry, "c" if m.group(5) == "C" else "p",
-                                          underlying)
-
-        m = re.match(r"([A-Z\:]+)(\d{2})(\d|[OND])(\d{2})(\d+)([CP])E", symbol)
-
-        if m is None:
-            return None
-
-        day = int(m.group(4))
-        month = m.group(3)
-        if month == 'O':
-            month = 10
-        elif month == 'N':
-            month = 11
-        elif month == 'D':
-            month = 12
-        else:
-            month = int(month)
-
-        year = int(m.group(2)) + 2000
-        expiry = datetime.date(year, month, day)
-        optionPrefix = m.group(1)
-        for underlying, underlyingDetails in underlyingMapping.items():
-            if underlyingDetails['optionPrefix'] == optionPrefix:
-                return OptionContract(symbol, int(m.group(5)), expiry, "c" if m.group(6) == "C" else "p", underlying)
+        return optionContractRegistry.getOptionContract(symbol)
 
     def getHistoricalData(self, exchangeSymbol: str, startTime: datetime.datetime, interval: str) -> pd.DataFrame():
         return getHistoricalData(self.__api, exchangeSymbol, startTime, interval)
@@ -399,6 +342,7 @@ class ZerodhaLiveBroker(broker.Broker):
         self.__stop = False
         self.__api = api
         self.__tradeMonitor = TradeMonitor(self)
+        self.__wakeUp = None
         self.__cash = 0
         self.__shares = {}
         self.__activeOrders = {}
@@ -477,6 +421,12 @@ class ZerodhaLiveBroker(broker.Broker):
     def eof(self):
         return self.__stop
 
+    def onDispatcherRegistered(self, dispatcher):
+        super(ZerodhaLiveBroker, self).onDispatcherRegistered(dispatcher)
+        # A live dispatcher is woken up by the trade monitor's queue, dispatch must not block it
+        self.__wakeUp = getWakeUp(dispatcher)
+        self.__tradeMonitor.getQueue().setWakeUp(self.__wakeUp)
+
     def dispatch(self):
         # Switch orders from SUBMITTED to ACCEPTED.
         ordersToProcess = list(self.__activeOrders.values())
@@ -489,7 +439,7 @@ class ZerodhaLiveBroker(broker.Broker):
         # Dispatch events from the trade monitor.
         try:
             eventType, eventData = self.__tradeMonitor.getQueue().get(
-                True, ZerodhaLiveBroker.QUEUE_TIMEOUT)
+                True, ZerodhaLiveBroker.QUEUE_TIMEOUT if self.__wakeUp is None else 0)
 
             if eventType == TradeMonitor.ON_USER_TRADE:
                 self._onUserTrades(eventData)
@@ -3,13 +3,13 @@
 """
 
 import threading
-import queue
 import logging
 import datetime
 import pytz
 from .kiteext import KiteExt
 
-from pyalgotrade import bar
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.core.dispatcher import WakeUpQueue
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +69,15 @@ class WebSocketClient:
     def isConnected(self):
         return self.__connected
 
+    def subscribe(self, tokens):
+        logger.info(f"Subscribing to channel {tokens}")
+        self.__kws.subscribe(tokens)
+        self.__kws.set_mode(self.__kws.MODE_FULL, tokens)
+
+    def unsubscribe(self, tokens):
+        logger.info(f"Unsubscribing from channel {tokens}")
+        self.__kws.unsubscribe(tokens)
+
     def onOpened(self, ws, response):
         self.__connected = True
 
@@ -110,21 +119,21 @@ class WebSocketClient:
             if tokenId in self.__pending_subscriptions:
                 self.__onSubscriptionSucceeded(tokenId)
 
-            basicBar = bar.BasicBar(datetime.datetime.now(),
-                                    ltp,
-                                    ltp,
-                                    ltp,
-                                    ltp,
-                                    volume,
-                                    None,
-                                    bar.Frequency.TRADE,
-                                    {
-                "Instrument": instrument,
-                "Open Interest": tick.get('oi', 0),
-                "Date/Time": tick.get('last_trade_time', datetime.datetime.now())
-            })
-
-            self.onTrade(basicBar)
+            # Index ticks (NIFTY BANK, ...) carry no last_trade_time
+            exchangeDateTime = tick.get('last_trade_time') or tick.get('exchange_timestamp') \
+                or self.__lastReceivedDateTime
+
+            quoteBar = QuoteBar(datetime.datetime.now(),
+                                ltp,
+                                ltp,
+                                ltp,
+                                ltp,
+                                volume,
+                                tick.get('oi', 0),
+                                instrument,
+                                exchangeDateTime)
+
+            self.onTrade(quoteBar)
 
     def onOrderBookUpdate(self, message):
         hello = True
@@ -141,7 +150,8 @@ class WebSocketClient:
 class WebSocketClientThreadBase(threading.Thread):
     def __init__(self, wsCls, *args, **kwargs):
         super(WebSocketClientThreadBase, self).__init__()
-        self.__queue = queue.Queue()
+        # Notifies the live dispatcher, if the feed runs on one
+        self.__queue = WakeUpQueue()
         self.__wsClient = None
         self.__wsCls = wsCls
         self.__args = args
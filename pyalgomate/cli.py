@@ -224,7 +224,7 @@ def runBacktest(strategyClass, underlying, data, port, send_to_ui, send_to_teleg
 @click.option('--mode', prompt='Select a trading mode', type=click.Choice(['paper', 'live']),
               help='Select a trading mode')
 @click.option('--underlying', multiple=True, help='Specify an underlying')
-@click.option('--collect-data', help='Specify if the data needs to be collected to data.csv', default=False,
+@click.option('--collect-data', help='Specify if the ticks need to be journaled to data/', default=False,
               type=click.BOOL)
 @click.option('--port', help='Specify a zeroMQ port to send data to', default=5680, type=click.INT)
 @click.option('--send-to-ui', help='Specify if data needs to be sent to UI', default=False, type=click.BOOL)
@@ -0,0 +1,169 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import queue
+import threading
+
+from pyalgotrade import dispatcher
+from pyalgotrade import utils
+
+
+class WakeUp(object):
+    """A flag that live feeds and brokers raise, from any thread, when they have work for the dispatcher.
+
+    Notifications that arrive while the dispatcher is busy are merged into one, the dispatcher dispatches every
+    subject each time it wakes up.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition(threading.Lock())
+        self.__pending = False
+        self.__notifications = 0
+
+    def notify(self):
+        with self.__condition:
+            self.__notifications += 1
+            if not self.__pending:
+                self.__pending = True
+                self.__condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Waits up to `timeout` seconds for a notification and clears it. Returns True if there was one."""
+        with self.__condition:
+            if not self.__pending:
+                self.__condition.wait(timeout)
+            ret = self.__pending
+            self.__pending = False
+        return ret
+
+    def isPending(self):
+        return self.__pending
+
+    def getNotificationCount(self):
+        return self.__notifications
+
+
+class WakeUpQueue(queue.Queue):
+    """A :class:`queue.Queue` that notifies a :class:`WakeUp` when an item is put.
+
+    :param wakeUp: The wake up to notify, it can be set later with :meth:`setWakeUp`.
+    :type wakeUp: :class:`WakeUp`.
+    """
+
+    def __init__(self, wakeUp: WakeUp = None):
+        super(WakeUpQueue, self).__init__()
+        self.__wakeUp = wakeUp
+
+    def setWakeUp(self, wakeUp: WakeUp):
+        self.__wakeUp = wakeUp
+        if wakeUp is not None and self.qsize():
+            wakeUp.notify()
+
+    def put(self, item, block=True, timeout=None):
+        super(WakeUpQueue, self).put(item, block, timeout)
+        wakeUp = self.__wakeUp
+        if wakeUp is not None:
+            wakeUp.notify()
+
+
+class LiveDispatcher(dispatcher.Dispatcher):
+    """A dispatcher for live and paper trading that sleeps until a subject has work.
+
+    :class:`pyalgotrade.dispatcher.Dispatcher` dispatches its subjects in a loop, so live subjects block in their
+    dispatch for a while to keep it from spinning, and an event that arrives while one subject blocks waits for it.
+    The subjects of a live dispatcher get its :class:`WakeUp` in `onDispatcherRegistered`, notify it when they queue
+    work and don't block. The dispatcher waits on the wake up when a pass dispatches nothing, and emits the idle
+    event every `idleTimeout` seconds while there is nothing to dispatch.
+
+    :param idleTimeout: How long to wait, in seconds, for a notification before emitting the idle event.
+    :type idleTimeout: float.
+
+    .. note::
+        Subjects that don't notify the wake up are still dispatched, every `idleTimeout` seconds at worst.
+    """
+
+    IDLE_TIMEOUT = 0.1
+
+    def __init__(self, idleTimeout=IDLE_TIMEOUT):
+        super(LiveDispatcher, self).__init__()
+        self.__wakeUp = WakeUp()
+        self.__idleTimeout = idleTimeout
+        self.__stop = False
+        self.__currDateTime = None
+        self.__passes = 0
+        self.__wakeUps = 0
+        self.__timeouts = 0
+
+    def getWakeUp(self) -> WakeUp:
+        return self.__wakeUp
+
+    def getCurrentDateTime(self):
+        return self.__currDateTime
+
+    def stop(self):
+        self.__stop = True
+        # Don't wait for the idle timeout
+        self.__wakeUp.notify()
+
+    def __dispatchSubject(self, subject, currEventDateTime):
+        ret = False
+        if not subject.eof() and subject.peekDateTime() in (None, currEventDateTime):
+            ret = subject.dispatch() is True
+        return ret
+
+    def __dispatch(self):
+        smallestDateTime = None
+        eof = True
+        eventsDispatched = False
+
+        for subject in self.getSubjects():
+            if not subject.eof():
+                eof = False
+                smallestDateTime = utils.safe_min(smallestDateTime, subject.peekDateTime())
+
+        if not eof:
+            self.__currDateTime = smallestDateTime
+            for subject in self.getSubjects():
+                if self.__dispatchSubject(subject, smallestDateTime):
+                    eventsDispatched = True
+        return eof, eventsDispatched
+
+    def run(self):
+        try:
+            for subject in self.getSubjects():
+                subject.start()
+
+            self.getStartEvent().emit()
+
+            while not self.__stop:
+                self.__passes += 1
+                eof, eventsDispatched = self.__dispatch()
+                if eof:
+                    self.__stop = True
+                elif not eventsDispatched:
+                    self.getIdleEvent().emit()
+                    if self.__wakeUp.wait(self.__idleTimeout):
+                        self.__wakeUps += 1
+                    else:
+                        self.__timeouts += 1
+        finally:
+            self.__currDateTime = None
+
+            for subject in self.getSubjects():
+                subject.stop()
+            for subject in self.getSubjects():
+                subject.join()
+
+    def getMetrics(self) -> dict:
+        return {
+            'passes': self.__passes,
+            'wakeUps': self.__wakeUps,
+            'timeouts': self.__timeouts,
+            'notifications': self.__wakeUp.getNotificationCount(),
+        }
+
+
+def getWakeUp(dispatcher_):
+    """Returns the :class:`WakeUp` of a dispatcher, or None if it is not a :class:`LiveDispatcher`."""
+    return dispatcher_.getWakeUp() if isinstance(dispatcher_, LiveDispatcher) else None
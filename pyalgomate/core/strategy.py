@@ -11,6 +11,7 @@ from pyalgotrade.strategy import position
 
 from pyalgomate.barfeed import BaseBarFeed
 from pyalgomate.core import resampled
+from pyalgomate.core.dispatcher import LiveDispatcher
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -38,7 +39,11 @@ class BaseStrategy(object):
         self.__analyzers = []
         self.__namedAnalyzers = {}
         self.__resampledBarFeeds = []
-        self.__dispatcher = dispatcher.Dispatcher()
+        # Real-time feeds get a dispatcher that sleeps until the feed or the broker has work
+        if isinstance(barFeed, BaseBarFeed) and barFeed.isRealTime():
+            self.__dispatcher = LiveDispatcher()
+        else:
+            self.__dispatcher = dispatcher.Dispatcher()
         self.__broker.getOrderUpdatedEvent().subscribe(self.__onOrderEvent)
         self.__barFeed.getNewValuesEvent().subscribe(self.__onBars)
 
@@ -0,0 +1,3 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
@@ -0,0 +1,235 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import datetime
+import logging
+import threading
+
+import numpy as np
+
+import pyalgomate.utils as utils
+from pyalgomate.core import UnderlyingIndex
+from pyalgomate.strategies import OptionGreeks
+from pyalgomate.greeks.engine import GreeksEngine
+from pyalgomate.greeks.chain import OptionChain
+
+logger = logging.getLogger(__name__)
+
+
+class GreeksCalculator(object):
+    """Computes the greeks of the options in a feed from its :class:`pyalgomate.barfeed.arrays.BarArrays`.
+
+    Option contracts are resolved with :meth:`addInstruments` when instruments first show up in the arrays. It has
+    to be called from the thread that updates the arrays, because it registers the underlyings in them.
+    :meth:`calculate` can then run on that same thread or on a copy of the arrays in another thread.
+
+    :param getOptionContract: Returns the :class:`pyalgomate.strategies.OptionContract` of an instrument, or None
+        if it is not an option. Usually the broker's getOptionContract. It can also be given to each
+        :meth:`addInstruments` call instead.
+    :type getOptionContract: function.
+    :param getUnderlyingIndex: Returns the :class:`pyalgomate.core.UnderlyingIndex` of an underlying. It is used to
+        find the nearest weekly expiry of options without an expiry. If None, or if it raises, BANKNIFTY is assumed.
+    :type getUnderlyingIndex: function.
+    """
+
+    # Options expire at the close of the market
+    EXPIRY_TIME = datetime.time(15, 30)
+
+    # The shortest time to expiry used, in seconds, so options keep finite greeks until the close
+    MIN_TIME_TO_EXPIRY = 60
+
+    SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
+    def __init__(self, getOptionContract=None, getUnderlyingIndex=None):
+        self.__getOptionContract = getOptionContract
+        self.__getUnderlyingIndex = getUnderlyingIndex
+        self.__pendingLock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.__pendingLock:
+            self.__pending = []
+        self.__instrumentCount = 0
+        self.__version = 0
+        self.__contracts = []
+        self.__optionIndices = np.zeros(0, dtype=np.intp)
+        self.__underlyingIndices = np.zeros(0, dtype=np.intp)
+        self.__expiries = np.zeros(0, dtype=np.int64)
+        self.__expiryIndices = np.zeros(0, dtype=np.int64)
+        self.__nearestExpiries = dict()
+        self.__engine = GreeksEngine()
+        self.__optionChain = OptionChain()
+        self.__optionData = dict()
+
+    def getEngine(self) -> GreeksEngine:
+        return self.__engine
+
+    def getOptionChain(self) -> OptionChain:
+        return self.__optionChain
+
+    def getOptionData(self) -> dict:
+        return self.__optionData
+
+    def getVersion(self):
+        """Returns the version of the arrays used in the last calculation."""
+        return self.__version
+
+    def addInstruments(self, barArrays, getOptionContract=None, getUnderlyingIndex=None):
+        """Resolves the option contracts of the instruments that were added to the arrays since the last call.
+
+        :param barArrays: The arrays.
+        :type barArrays: :class:`pyalgomate.barfeed.arrays.BarArrays`.
+        :param getOptionContract: Used instead of the one given to the constructor, if not None.
+        :type getOptionContract: function.
+        :param getUnderlyingIndex: Used instead of the one given to the constructor, if not None.
+        :type getUnderlyingIndex: function.
+        """
+        # Option contracts are resolved once, when an instrument first shows up in the feed
+        instruments = barArrays.getInstruments()
+        if self.__instrumentCount == len(instruments):
+            return
+
+        if getOptionContract is None:
+            getOptionContract = self.__getOptionContract
+
+        optionInstruments = []
+        contracts = []
+        for instrument in instruments[self.__instrumentCount:]:
+            optionContract = getOptionContract(instrument)
+            if optionContract is not None:
+                optionInstruments.append(instrument)
+                contracts.append(optionContract)
+        self.__instrumentCount = len(instruments)
+
+        if len(contracts) == 0:
+            return
+
+        if getUnderlyingIndex is None:
+            getUnderlyingIndex = self.__getUnderlyingIndex
+
+        optionIndices = barArrays.getIndices(optionInstruments)
+        underlyingIndices = barArrays.getIndices([contract.underlying for contract in contracts])
+        # The index is only needed to resolve the expiry of contracts without one
+        expiryIndices = np.array([self.__resolveUnderlyingIndex(getUnderlyingIndex, contract.underlying)
+                                  if contract.expiry is None else -1 for contract in contracts], dtype=np.int64)
+        with self.__pendingLock:
+            self.__pending.append((contracts, optionIndices, underlyingIndices, expiryIndices))
+
+    def __resolveUnderlyingIndex(self, getUnderlyingIndex, underlying):
+        if getUnderlyingIndex is not None:
+            try:
+                return int(getUnderlyingIndex(underlying))
+            except Exception:
+                pass
+        return int(UnderlyingIndex.BANKNIFTY)
+
+    def __addPendingContracts(self):
+        with self.__pendingLock:
+            pending = self.__pending
+            self.__pending = []
+
+        for contracts, optionIndices, underlyingIndices, expiryIndices in pending:
+            self.__contracts += contracts
+            self.__optionIndices = np.concatenate([self.__optionIndices, optionIndices])
+            self.__underlyingIndices = np.concatenate([self.__underlyingIndices, underlyingIndices])
+            # Contracts without an expiry are marked with 0 and resolved to the nearest weekly expiry of their
+            # underlying index on every calculation
+            self.__expiries = np.concatenate(
+                [self.__expiries, np.array([contract.expiry.toordinal() if contract.expiry is not None else 0
+                                            for contract in contracts], dtype=np.int64)])
+            self.__expiryIndices = np.concatenate([self.__expiryIndices, expiryIndices])
+            self.__engine.addOptions([contract.strike for contract in contracts],
+                                     [contract.type for contract in contracts])
+
+    def __getNearestExpiry(self, index, date):
+        key = (index, date)
+        ret = self.__nearestExpiries.get(key, None)
+        if ret is None:
+            ret = utils.getNearestWeeklyExpiryDate(date, UnderlyingIndex(index)).toordinal()
+            self.__nearestExpiries[key] = ret
+        return ret
+
+    def getTimeToExpiries(self, slots, dateTime):
+        """Returns the times to expiry, in years, of the given contracts at the given datetime.
+
+        Expiries are taken at :attr:`EXPIRY_TIME`, so the time to expiry includes the fraction of the current
+        trading day that is left. It is never less than :attr:`MIN_TIME_TO_EXPIRY` seconds.
+        """
+        date = dateTime.date()
+        expiries = self.__expiries[slots]
+        missing = expiries == 0
+        if missing.any():
+            # Resolved once per underlying index and trading date
+            expiries = expiries.copy()
+            indices = self.__expiryIndices[slots]
+            for index in set(indices[missing].tolist()):
+                expiries[missing & (indices == index)] = self.__getNearestExpiry(index, date)
+
+        expiryTime = GreeksCalculator.EXPIRY_TIME
+        secondsToClose = (expiryTime.hour * 3600 + expiryTime.minute * 60 + expiryTime.second) - \
+            (dateTime.hour * 3600 + dateTime.minute * 60 + dateTime.second + dateTime.microsecond / 1e6)
+        seconds = (expiries - date.toordinal()) * 86400.0 + secondsToClose
+        return np.maximum(seconds, GreeksCalculator.MIN_TIME_TO_EXPIRY) / GreeksCalculator.SECONDS_PER_YEAR
+
+    def calculate(self, barArrays):
+        """Recalculates the greeks of the options that traded, or whose underlying moved, since the last calculation.
+
+        :param barArrays: The arrays, or a copy of them.
+        :type barArrays: :class:`pyalgomate.barfeed.arrays.BarArrays`.
+        :rtype: A list with the :class:`pyalgomate.strategies.OptionGreeks` that were updated.
+        """
+        self.__addPendingContracts()
+        if len(self.__contracts) == 0 or barArrays.getDateTime() is None:
+            return []
+
+        closes = barArrays.getCloses()
+        versions = barArrays.getVersions()
+        underlyingPrices = closes[self.__underlyingIndices]
+
+        # Only options that traded, or whose underlying moved, since the previous calculation are recalculated
+        selected = np.flatnonzero(((versions[self.__optionIndices] > self.__version) |
+                                   (versions[self.__underlyingIndices] > self.__version)) &
+                                  ~np.isnan(underlyingPrices))
+        if len(selected) == 0:
+            self.__version = barArrays.getVersion()
+            return []
+
+        optionIndices = self.__optionIndices[selected]
+        underlyingPrices = underlyingPrices[selected]
+        prices = closes[optionIndices]
+        ois = barArrays.getOpenInterests()[optionIndices]
+
+        expiries = self.getTimeToExpiries(selected, barArrays.getDateTime())
+
+        try:
+            # Only the options whose inputs moved are solved again, the rest keep their cached greeks
+            self.__engine.update(selected, prices, underlyingPrices, expiries)
+        except Exception:
+            # The version isn't advanced, so these options are solved again on the next calculation
+            logger.exception(f'Failed to calculate the greeks of {len(selected)} options')
+            return []
+        self.__version = barArrays.getVersion()
+
+        ivs = self.__engine.getImpliedVolatilities()[selected]
+        deltas = self.__engine.getDeltas()[selected]
+        gammas = self.__engine.getGammas()[selected]
+        thetas = self.__engine.getThetas()[selected]
+        vegas = self.__engine.getVegas()[selected]
+
+        # Store the results
+        ret = []
+        for i in range(len(selected)):
+            optionContract = self.__contracts[selected[i]]
+            symbol = optionContract.symbol
+
+            if ois[i] <= 0:
+                if symbol in self.__optionData:
+                    ois[i] = self.__optionData[symbol].oi
+
+            optionGreeks = OptionGreeks(
+                optionContract, prices[i], deltas[i], gammas[i], thetas[i], vegas[i], ivs[i], ois[i])
+            self.__optionData[symbol] = optionGreeks
+            self.__optionChain.update(optionGreeks)
+            ret.append(optionGreeks)
+        return ret
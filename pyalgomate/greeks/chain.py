@@ -0,0 +1,170 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import numpy as np
+
+from pyalgomate.strategies import OptionGreeks
+
+
+class ChainSide(object):
+    """The options of one underlying, expiry and type, with strikes, prices and deltas in NumPy arrays sorted by
+    strike."""
+
+    def __init__(self):
+        self.__strikes = np.zeros(0)
+        self.__prices = np.zeros(0)
+        self.__deltas = np.zeros(0)
+        self.__options = []
+        self.__positions = dict()
+
+    def __len__(self):
+        return len(self.__options)
+
+    def copy(self):
+        ret = ChainSide()
+        ret.__strikes = self.__strikes.copy()
+        ret.__prices = self.__prices.copy()
+        ret.__deltas = self.__deltas.copy()
+        ret.__options = list(self.__options)
+        # The positions are rebuilt, not modified, when an option is inserted, so they can be shared
+        ret.__positions = self.__positions
+        return ret
+
+    def getStrikes(self):
+        return self.__strikes
+
+    def getPrices(self):
+        return self.__prices
+
+    def getDeltas(self):
+        return self.__deltas
+
+    def getOptions(self):
+        return self.__options
+
+    def update(self, optionGreeks: OptionGreeks):
+        symbol = optionGreeks.optionContract.symbol
+        position = self.__positions.get(symbol, None)
+        if position is None:
+            strike = optionGreeks.optionContract.strike
+            position = int(np.searchsorted(self.__strikes, strike, side='right'))
+            self.__strikes = np.insert(self.__strikes, position, strike)
+            self.__prices = np.insert(self.__prices, position, np.nan)
+            self.__deltas = np.insert(self.__deltas, position, np.nan)
+            self.__options.insert(position, optionGreeks)
+            self.__positions = {option.optionContract.symbol: i for i, option in enumerate(self.__options)}
+
+        # NaN values (failed IV solves) are stored as infinity so they are never the nearest
+        price = optionGreeks.price
+        delta = optionGreeks.delta
+        self.__prices[position] = price if price == price else np.inf
+        self.__deltas[position] = delta if delta == delta else np.inf
+        self.__options[position] = optionGreeks
+
+    def nearest(self, values, target):
+        """Returns the position of the value closest to target and its distance, or (None, None)."""
+        if len(values) == 0:
+            return None, None
+
+        distances = np.abs(values - target)
+        position = int(distances.argmin())
+        distance = distances[position]
+        if distance == np.inf:
+            return None, None
+        return position, distance
+
+    def above(self, strike):
+        """Returns the options with a strike above the given one, in ascending strike order."""
+        return self.__options[np.searchsorted(self.__strikes, strike, side='right'):]
+
+    def below(self, strike):
+        """Returns the options with a strike below the given one, in descending strike order."""
+        return self.__options[:np.searchsorted(self.__strikes, strike, side='left')][::-1]
+
+
+class OptionChain(object):
+    """Index of :class:`pyalgomate.strategies.OptionGreeks` keyed by (underlying, expiry, type).
+
+    Each key holds a :class:`ChainSide` with the strikes kept sorted, so strike queries are answered with
+    `searchsorted` and nearest delta/premium queries with a vectorized argmin over one side instead of filtering and
+    sorting every option.
+    """
+
+    def __init__(self):
+        self.__sides = dict()
+        self.__sidesByExpiry = dict()
+
+    def __len__(self):
+        return sum(len(side) for side in self.__sides.values())
+
+    def copy(self):
+        """Returns a copy that is not affected by later updates."""
+        ret = OptionChain()
+        for key, side in self.__sides.items():
+            side = side.copy()
+            ret.__sides[key] = side
+            ret.__sidesByExpiry.setdefault((key[1], key[2]), []).append(side)
+        return ret
+
+    def getSide(self, underlying, expiry, optionType) -> ChainSide:
+        return self.__sides.get((underlying, expiry, optionType), None)
+
+    def __getSides(self, optionType, expiry, underlying=None):
+        if underlying is not None:
+            side = self.__sides.get((underlying, expiry, optionType), None)
+            return [side] if side is not None else []
+        return self.__sidesByExpiry.get((expiry, optionType), [])
+
+    def update(self, optionGreeks: OptionGreeks):
+        """Adds or refreshes the greeks of an option."""
+        optionContract = optionGreeks.optionContract
+        key = (optionContract.underlying, optionContract.expiry, optionContract.type)
+        side = self.__sides.get(key, None)
+        if side is None:
+            side = ChainSide()
+            self.__sides[key] = side
+            self.__sidesByExpiry.setdefault((optionContract.expiry, optionContract.type), []).append(side)
+        side.update(optionGreeks)
+
+    def __nearest(self, sides, getValues, target):
+        ret = None
+        minDistance = None
+        for side in sides:
+            position, distance = side.nearest(getValues(side), target)
+            if position is not None and (minDistance is None or distance < minDistance):
+                ret = side.getOptions()[position]
+                minDistance = distance
+        return ret
+
+    def getNearestDeltaOption(self, optionType, deltaValue, expiry, underlying=None) -> OptionGreeks:
+        target = -abs(deltaValue) if optionType == 'p' else abs(deltaValue)
+        return self.__nearest(self.__getSides(optionType, expiry, underlying), ChainSide.getDeltas, target)
+
+    def getNearestPremiumOption(self, optionType, premium, expiry, underlying=None) -> OptionGreeks:
+        return self.__nearest(self.__getSides(optionType, expiry, underlying), ChainSide.getPrices, premium)
+
+    def __merge(self, options, reverse):
+        if len(options) == 1:
+            return options[0]
+        return sorted([option for sideOptions in options for option in sideOptions],
+                      key=lambda x: x.optionContract.strike, reverse=reverse)
+
+    def getOTMStrikeGreeks(self, strike, optionType, expiry, numberOfOptions=-1) -> list:
+        sides = self.__getSides(optionType, expiry)
+        if len(sides) == 0:
+            return []
+        if optionType == 'c':
+            options = self.__merge([side.above(strike) for side in sides], False)
+        else:
+            options = self.__merge([side.below(strike) for side in sides], True)
+        return options[:numberOfOptions]
+
+    def getITMStrikeGreeks(self, strike, optionType, expiry) -> list:
+        sides = self.__getSides(optionType, expiry)
+        if len(sides) == 0:
+            return []
+        if optionType == 'c':
+            return self.__merge([side.below(strike) for side in sides], True)
+        else:
+            return self.__merge([side.above(strike) for side in sides], False)
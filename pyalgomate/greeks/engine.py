@@ -0,0 +1,177 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import time
+
+import numpy as np
+from py_vollib_vectorized import get_all_greeks
+
+from pyalgomate.greeks.iv import impliedVolatility
+
+
+class GreeksEngine(object):
+    """Keeps implied volatility and greeks for a set of options and only solves the ones whose inputs moved.
+
+    Every option gets a slot when it is added. :meth:`update` compares the option price, underlying price and time to
+    expiry of each slot against the inputs of its last solve, and solves again only when one of them moved beyond
+    its tolerance. The other slots keep their cached values.
+
+    :param priceTolerance: Change in the option price that triggers a new solve.
+    :type priceTolerance: float.
+    :param underlyingPriceTolerance: Change in the underlying price that triggers a new solve.
+    :type underlyingPriceTolerance: float.
+    :param timeToExpiryTolerance: Change in the time to expiry, in years, that triggers a new solve.
+    :type timeToExpiryTolerance: float.
+    :param riskFreeRate: The risk free rate used in the model.
+    :type riskFreeRate: float.
+
+    .. note::
+        With the default tolerances of 0 any change in the inputs triggers a new solve.
+    """
+
+    def __init__(self, priceTolerance=0.0, underlyingPriceTolerance=0.0, timeToExpiryTolerance=0.0, riskFreeRate=0.0):
+        self.setTolerances(priceTolerance, underlyingPriceTolerance, timeToExpiryTolerance)
+        self.__riskFreeRate = riskFreeRate
+
+        self.__strikes = np.zeros(0)
+        self.__types = np.zeros(0, dtype='<U1')
+        self.__prices = np.zeros(0)
+        self.__underlyingPrices = np.zeros(0)
+        self.__timeToExpiries = np.zeros(0)
+        self.__ivs = np.zeros(0)
+        self.__deltas = np.zeros(0)
+        self.__gammas = np.zeros(0)
+        self.__thetas = np.zeros(0)
+        self.__vegas = np.zeros(0)
+
+        self.resetMetrics()
+
+    def __len__(self):
+        return len(self.__strikes)
+
+    def setTolerances(self, priceTolerance=0.0, underlyingPriceTolerance=0.0, timeToExpiryTolerance=0.0):
+        self.__priceTolerance = priceTolerance
+        self.__underlyingPriceTolerance = underlyingPriceTolerance
+        self.__timeToExpiryTolerance = timeToExpiryTolerance
+
+    def addOptions(self, strikes, types):
+        """Adds options and returns their slots.
+
+        :param strikes: The strike prices.
+        :param types: The option types, `c` or `p`.
+        :rtype: A NumPy array with the slots.
+        """
+        count = len(strikes)
+        slots = np.arange(len(self), len(self) + count)
+        missing = np.full(count, np.nan)
+
+        self.__strikes = np.concatenate([self.__strikes, np.asarray(strikes, dtype=float)])
+        self.__types = np.concatenate([self.__types, np.asarray(types, dtype='<U1')])
+        # Slots that were never solved have NaN inputs, so they are always considered as moved.
+        self.__prices = np.concatenate([self.__prices, missing])
+        self.__underlyingPrices = np.concatenate([self.__underlyingPrices, missing])
+        self.__timeToExpiries = np.concatenate([self.__timeToExpiries, missing])
+        self.__ivs = np.concatenate([self.__ivs, missing])
+        self.__deltas = np.concatenate([self.__deltas, missing])
+        self.__gammas = np.concatenate([self.__gammas, missing])
+        self.__thetas = np.concatenate([self.__thetas, missing])
+        self.__vegas = np.concatenate([self.__vegas, missing])
+        return slots
+
+    def update(self, slots, prices, underlyingPrices, timeToExpiries):
+        """Updates the inputs of the given slots and solves the ones that moved beyond the tolerances.
+
+        :param slots: The slots to update.
+        :param prices: The option prices.
+        :param underlyingPrices: The underlying prices.
+        :param timeToExpiries: The times to expiry, in years.
+        :rtype: A NumPy array with the slots that were solved.
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        prices = np.asarray(prices, dtype=float)
+        underlyingPrices = np.asarray(underlyingPrices, dtype=float)
+        timeToExpiries = np.asarray(timeToExpiries, dtype=float)
+
+        lastPrices = self.__prices[slots]
+        moved = (np.isnan(lastPrices) |
+                 (np.abs(prices - lastPrices) > self.__priceTolerance) |
+                 (np.abs(underlyingPrices - self.__underlyingPrices[slots]) > self.__underlyingPriceTolerance) |
+                 (np.abs(timeToExpiries - self.__timeToExpiries[slots]) > self.__timeToExpiryTolerance))
+
+        self.__requested += len(slots)
+        if not moved.any():
+            return slots[moved]
+
+        if not moved.all():
+            slots = slots[moved]
+            prices = prices[moved]
+            underlyingPrices = underlyingPrices[moved]
+            timeToExpiries = timeToExpiries[moved]
+
+        start = time.perf_counter()
+        self.__solve(slots, prices, underlyingPrices, timeToExpiries)
+        self.__lastSolveTime = time.perf_counter() - start
+        self.__solveTime += self.__lastSolveTime
+        self.__solved += len(slots)
+        return slots
+
+    def __solve(self, slots, prices, underlyingPrices, timeToExpiries):
+        strikes = self.__strikes[slots]
+        types = self.__types[slots]
+
+        # Options that were solved before start from their last implied volatility
+        iv = impliedVolatility(prices, underlyingPrices, strikes, timeToExpiries, self.__riskFreeRate, types,
+                               previous=self.__ivs[slots])
+        greeks = get_all_greeks(types, underlyingPrices, strikes, timeToExpiries,
+                                self.__riskFreeRate, iv, 0.0, model='black_scholes', return_as='dict')
+
+        self.__prices[slots] = prices
+        self.__underlyingPrices[slots] = underlyingPrices
+        self.__timeToExpiries[slots] = timeToExpiries
+        self.__ivs[slots] = iv
+        self.__deltas[slots] = greeks['delta']
+        self.__gammas[slots] = greeks['gamma']
+        self.__thetas[slots] = greeks['theta']
+        self.__vegas[slots] = greeks['vega']
+
+    def getImpliedVolatilities(self):
+        return self.__ivs
+
+    def getDeltas(self):
+        return self.__deltas
+
+    def getGammas(self):
+        return self.__gammas
+
+    def getThetas(self):
+        return self.__thetas
+
+    def getVegas(self):
+        return self.__vegas
+
+    def resetMetrics(self):
+        self.__requested = 0
+        self.__solved = 0
+        self.__solveTime = 0.0
+        self.__lastSolveTime = 0.0
+
+    def getHitRatio(self):
+        """Returns the fraction of the updated slots that were served from the cache."""
+        if self.__requested == 0:
+            return 0.0
+        return (self.__requested - self.__solved) / self.__requested
+
+    def getSolveTime(self):
+        """Returns the total time spent solving, in seconds."""
+        return self.__solveTime
+
+    def getLastSolveTime(self):
+        """Returns the time spent in the last solve, in seconds."""
+        return self.__lastSolveTime
+
+    def getSolvedCount(self):
+        return self.__solved
+
+    def getRequestedCount(self):
+        return self.__requested
@@ -0,0 +1,144 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import numpy as np
+from scipy.special import ndtr
+from py_vollib_vectorized import vectorized_implied_volatility
+
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 5.0
+
+
+def blackScholesPrice(underlyingPrices, strikes, timeToExpiries, riskFreeRate, volatilities, isCall):
+    sqrtT = np.sqrt(timeToExpiries)
+    discountedStrikes = strikes * np.exp(-riskFreeRate * timeToExpiries)
+    d1 = (np.log(underlyingPrices / strikes) + (riskFreeRate + 0.5 * volatilities ** 2) * timeToExpiries) / \
+        (volatilities * sqrtT)
+    d2 = d1 - volatilities * sqrtT
+    calls = underlyingPrices * ndtr(d1) - discountedStrikes * ndtr(d2)
+    return np.where(isCall, calls, calls - underlyingPrices + discountedStrikes), d1
+
+
+def blackScholesVega(underlyingPrices, timeToExpiries, d1):
+    return underlyingPrices * np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi) * np.sqrt(timeToExpiries)
+
+
+def libraryImpliedVolatility(prices, underlyingPrices, strikes, timeToExpiries, riskFreeRate, types):
+    """Solves with py_vollib_vectorized. Failed options give NaN."""
+    return vectorized_implied_volatility(prices, underlyingPrices, strikes, timeToExpiries, riskFreeRate, types, q=0,
+                                         model='black_scholes_merton', return_as='numpy', on_error='ignore')
+
+
+def _broadcast(values, shape, dtype=None):
+    values = np.asarray(values, dtype=dtype)
+    return values if values.shape == shape else np.broadcast_to(values, shape)
+
+
+def impliedVolatility(prices, underlyingPrices, strikes, timeToExpiries, riskFreeRate, types, previous=None,
+                      tolerance=1e-6, maxIterations=50, fallback=True):
+    """Vectorized Black-Scholes implied volatility.
+
+    Options with a previous implied volatility, usually the one of the last tick, are solved from it with Newton-Raphson
+    steps taken inside a bracket that is narrowed on every iteration. When vega is too small or the step leaves the
+    bracket a bisection step is taken instead, so the solve can't diverge. Options stop iterating as soon as their
+    price error is below the tolerance. Options without a previous value are solved with py_vollib_vectorized, which is
+    faster than Newton-Raphson without a good starting point.
+
+    :param prices: The option prices.
+    :param underlyingPrices: The underlying prices.
+    :param strikes: The strike prices.
+    :param timeToExpiries: The times to expiry, in years.
+    :param riskFreeRate: The risk free rate.
+    :param types: The option types, `c` or `p`.
+    :param previous: The previous implied volatilities. Options with a previous value between
+        :data:`MIN_VOLATILITY` and :data:`MAX_VOLATILITY` start from it, the rest are solved with py_vollib_vectorized.
+    :param tolerance: The price error at which an option is considered converged.
+    :param maxIterations: The maximum number of iterations.
+    :param fallback: If True, options that don't converge are solved with py_vollib_vectorized.
+    :returns: The implied volatilities. Prices at or below the intrinsic value give 0 and prices above the
+        upper arbitrage bound, or invalid inputs, give NaN.
+    """
+    prices = np.asarray(prices, dtype=float)
+    underlyingPrices = _broadcast(underlyingPrices, prices.shape, float)
+    strikes = _broadcast(strikes, prices.shape, float)
+    timeToExpiries = _broadcast(timeToExpiries, prices.shape, float)
+    types = _broadcast(types, prices.shape)
+    isCall = (types == 'c')
+
+    ret = np.full(prices.shape, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        discountedStrikes = strikes * np.exp(-riskFreeRate * timeToExpiries)
+        lowerBounds = np.maximum(np.where(isCall, underlyingPrices - discountedStrikes,
+                                          discountedStrikes - underlyingPrices), 0)
+        upperBounds = np.where(isCall, underlyingPrices, discountedStrikes)
+        valid = (prices > 0) & (underlyingPrices > 0) & (strikes > 0) & (timeToExpiries > 0)
+        ret[valid & (prices <= lowerBounds)] = 0.0
+
+        active = np.flatnonzero(valid & (prices > lowerBounds) & (prices < upperBounds))
+        if previous is not None and len(active):
+            sigma = _broadcast(previous, prices.shape, float)[active]
+            warm = (sigma > MIN_VOLATILITY) & (sigma < MAX_VOLATILITY)
+        else:
+            sigma = None
+            warm = np.zeros(len(active), dtype=bool)
+
+    cold = active[~warm]
+    if len(cold):
+        ret[cold] = libraryImpliedVolatility(prices[cold], underlyingPrices[cold], strikes[cold], timeToExpiries[cold],
+                                             riskFreeRate, types[cold])
+    if not warm.any():
+        return ret
+
+    active = active[warm]
+    sigma = sigma[warm]
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        S = underlyingPrices[active]
+        K = strikes[active]
+        T = timeToExpiries[active]
+        P = prices[active]
+        C = isCall[active]
+
+        # The working arrays are compacted as options converge, `pending` maps them back to positions in `active`.
+        low = np.full(len(active), MIN_VOLATILITY)
+        high = np.full(len(active), MAX_VOLATILITY)
+        converged = np.zeros(len(active), dtype=bool)
+        solution = np.full(len(active), np.nan)
+        pending = np.arange(len(active))
+
+        for _ in range(maxIterations):
+            modelPrices, d1 = blackScholesPrice(S, K, T, riskFreeRate, sigma, C)
+            error = modelPrices - P
+
+            done = np.abs(error) < tolerance
+            if done.any():
+                converged[pending[done]] = True
+                solution[pending[done]] = sigma[done]
+                if done.all():
+                    break
+                keep = ~done
+                pending, S, K, T, P, C = pending[keep], S[keep], K[keep], T[keep], P[keep], C[keep]
+                sigma, low, high, error = sigma[keep], low[keep], high[keep], error[keep]
+                modelPrices, d1 = modelPrices[keep], d1[keep]
+
+            # The price increases with the volatility, so the error tells on which side of the solution we are.
+            high = np.where(error > 0, sigma, high)
+            low = np.where(error < 0, sigma, low)
+
+            # The step is taken on the log of the price, which is much closer to linear in the volatility for out
+            # of the money options and converges in a few iterations where a plain Newton step would crawl.
+            vega = blackScholesVega(S, T, d1)
+            newton = sigma - np.log(modelPrices / P) * modelPrices / vega
+            useNewton = (vega > 1e-8 * S) & (newton > low) & (newton < high)
+            sigma = np.where(useNewton, newton, (low + high) / 2)
+
+    ret[active[converged]] = solution[converged]
+
+    failed = active[~converged]
+    if fallback and len(failed):
+        ret[failed] = libraryImpliedVolatility(prices[failed], underlyingPrices[failed], strikes[failed],
+                                               timeToExpiries[failed], riskFreeRate, types[failed])
+    return ret
+
@@ -0,0 +1,68 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import functools
+import operator
+
+import numpy as np
+
+from pyalgomate.strategies import OptionGreeks
+
+# The fields exported for each option, in the order the UI payload has always used
+GREEKS_FIELDS = ('delta', 'gamma', 'iv', 'oi', 'price', 'theta', 'vega')
+CONTRACT_FIELDS = ('expiry', 'strike', 'symbol', 'type', 'underlying')
+FIELDS = GREEKS_FIELDS + CONTRACT_FIELDS
+
+_getGreeks = operator.attrgetter(*GREEKS_FIELDS)
+_getContract = operator.attrgetter(*CONTRACT_FIELDS)
+
+
+@functools.lru_cache(maxsize=256)
+def _formatExpiry(expiry):
+    return expiry.strftime('%Y-%m-%d') if expiry is not None else None
+
+
+def toRecord(optionGreeks: OptionGreeks) -> dict:
+    """Returns the fields of an option and its contract as a flat dictionary, with the expiry formatted as
+    `YYYY-MM-DD`."""
+    expiry, strike, symbol, type_, underlying = _getContract(optionGreeks.optionContract)
+    ret = dict(zip(GREEKS_FIELDS, _getGreeks(optionGreeks)))
+    ret['expiry'] = _formatExpiry(expiry)
+    ret['strike'] = strike
+    ret['symbol'] = symbol
+    ret['type'] = type_
+    ret['underlying'] = underlying
+    return ret
+
+
+def toRecords(optionData: dict) -> dict:
+    """Returns the :func:`toRecord` of every option, keyed by symbol. This is the `optionChain` payload sent to the
+    strategy observers.
+
+    :param optionData: The :class:`pyalgomate.strategies.OptionGreeks` keyed by symbol.
+    :type optionData: dict.
+    """
+    return {instrument: toRecord(optionGreeks) for instrument, optionGreeks in optionData.items()}
+
+
+def toColumns(optionData: dict) -> dict:
+    """Returns the options as columns: a NumPy array per field, in the iteration order of `optionData`.
+
+    Greeks, prices and strikes are float arrays and the other fields object arrays, so the result can be handed
+    to `pandas.DataFrame` directly.
+
+    :param optionData: The :class:`pyalgomate.strategies.OptionGreeks` keyed by symbol.
+    :type optionData: dict.
+    """
+    options = list(optionData.values())
+    greeks = np.array([_getGreeks(optionGreeks) for optionGreeks in options], dtype=float).reshape(
+        len(options), len(GREEKS_FIELDS))
+    contracts = [_getContract(optionGreeks.optionContract) for optionGreeks in options]
+
+    ret = {field: greeks[:, i] for i, field in enumerate(GREEKS_FIELDS)}
+    ret['expiry'] = np.array([_formatExpiry(contract[0]) for contract in contracts], dtype=object)
+    ret['strike'] = np.array([contract[1] for contract in contracts], dtype=float)
+    for i, field in enumerate(CONTRACT_FIELDS[2:], 2):
+        ret[field] = np.array([contract[i] for contract in contracts], dtype=object)
+    return ret
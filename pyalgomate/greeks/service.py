@@ -0,0 +1,167 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import threading
+import time
+import weakref
+
+from pyalgomate.barfeed.arrays import getBarArrays
+from pyalgomate.greeks.calculator import GreeksCalculator
+from pyalgomate.greeks.worker import GreeksWorker, GreeksSnapshot, buildSnapshot
+
+
+class GreeksService(object):
+    """Computes the greeks of a feed once per update, for all the strategies that run on it.
+
+    Every strategy calls :meth:`update` when it needs greeks. The first call after the feed's bar arrays changed
+    computes them, inline or through a :class:`pyalgomate.greeks.worker.GreeksWorker`, and later calls for the same
+    bars return the same :class:`pyalgomate.greeks.worker.GreeksSnapshot`. The cost stays flat as strategies are
+    added. Use :func:`getGreeksService` to get the service of a feed.
+
+    :param barArrays: The bar arrays of the feed.
+    :type barArrays: :class:`pyalgomate.barfeed.arrays.BarArrays`.
+
+    .. note::
+        The service doesn't keep a reference to the feed or to the brokers of its subscribers, so it goes away with
+        the feed.
+    """
+
+    def __init__(self, barArrays):
+        self.__barArrays = barArrays
+        self.__lock = threading.Lock()
+        self.__calculator = GreeksCalculator()
+        self.__worker = None
+        self.__snapshot = None
+        self.__version = 0
+        self.__subscribers = weakref.WeakSet()
+        self.__updates = 0
+        self.__calculations = 0
+
+    def subscribe(self, strategy):
+        with self.__lock:
+            self.__subscribers.add(strategy)
+
+    def unsubscribe(self, strategy):
+        with self.__lock:
+            self.__subscribers.discard(strategy)
+
+    def getSubscriberCount(self):
+        return len(self.__subscribers)
+
+    def getCalculator(self) -> GreeksCalculator:
+        return self.__calculator
+
+    def enableWorker(self):
+        """Computes the greeks in a background :class:`pyalgomate.greeks.worker.GreeksWorker`. :meth:`update` then
+        returns the most recent snapshot without waiting for the bars it submits."""
+        with self.__lock:
+            if self.__worker is not None:
+                return
+
+            self.__worker = GreeksWorker(self.__calculator)
+            self.__worker.start()
+
+    def disableWorker(self):
+        with self.__lock:
+            if self.__worker is None:
+                return
+
+            self.__worker.stop()
+            self.__worker.join()
+            self.__worker = None
+
+    def isWorkerEnabled(self):
+        return self.__worker is not None
+
+    def getSnapshot(self) -> GreeksSnapshot:
+        """Returns the most recent snapshot, or None if none was computed yet."""
+        if self.__worker is not None:
+            return self.__worker.getSnapshot()
+        return self.__snapshot
+
+    def getStaleness(self):
+        """Returns how old, in seconds, the bars behind the most recent snapshot are, or None if there is none."""
+        snapshot = self.getSnapshot()
+        return snapshot.getStaleness() if snapshot is not None else None
+
+    def update(self, getOptionContract, getUnderlyingIndex=None) -> GreeksSnapshot:
+        """Computes the greeks if the bars changed since the last update and returns the most recent snapshot.
+
+        :param getOptionContract: Returns the :class:`pyalgomate.strategies.OptionContract` of an instrument, or None
+            if it is not an option. Usually the subscriber's broker getOptionContract.
+        :type getOptionContract: function.
+        :param getUnderlyingIndex: Returns the :class:`pyalgomate.core.UnderlyingIndex` of an underlying.
+        :type getUnderlyingIndex: function.
+        """
+        with self.__lock:
+            self.__updates += 1
+            version = self.__barArrays.getVersion()
+            if version == self.__version:
+                return self.getSnapshot()
+
+            if version < self.__version:
+                # The feed was reset
+                self.__resetCalculator()
+
+            self.__version = version
+            self.__calculations += 1
+            self.__calculator.addInstruments(self.__barArrays, getOptionContract, getUnderlyingIndex)
+            if self.__worker is not None:
+                self.__worker.submit(self.__barArrays.copy())
+                return self.__worker.getSnapshot()
+
+            submittedAt = time.time()
+            updated = self.__calculator.calculate(self.__barArrays)
+            self.__snapshot = buildSnapshot(self.__calculator, self.__barArrays, submittedAt, updated,
+                                            self.__snapshot)
+            return self.__snapshot
+
+    def __resetCalculator(self):
+        worker = self.__worker
+        if worker is not None:
+            worker.stop()
+            worker.join()
+
+        self.__calculator.reset()
+        self.__snapshot = None
+
+        if worker is not None:
+            self.__worker = GreeksWorker(self.__calculator)
+            self.__worker.start()
+
+    def getUpdateCount(self):
+        """Returns the number of calls to :meth:`update`."""
+        return self.__updates
+
+    def getCalculationCount(self):
+        """Returns the number of calls to :meth:`update` that computed greeks. The rest were served the snapshot of
+        an earlier call."""
+        return self.__calculations
+
+
+_services = weakref.WeakKeyDictionary()
+_servicesLock = threading.Lock()
+
+
+def getGreeksService(feed) -> GreeksService:
+    """Returns the :class:`GreeksService` of a feed, creating it the first time, or None if the feed doesn't keep
+    bar arrays.
+
+    :param feed: The feed.
+    :type feed: :class:`pyalgomate.barfeed.BaseBarFeed`.
+
+    .. note::
+        Feeds without bar arrays, like the CSV feeds used for backtesting, can't share a service. Each strategy then
+        needs a :class:`GreeksService` of its own, over arrays it fills from the bars it receives.
+    """
+    barArrays = getBarArrays(feed)
+    if barArrays is None:
+        return None
+
+    with _servicesLock:
+        service = _services.get(feed, None)
+        if service is None:
+            service = GreeksService(barArrays)
+            _services[feed] = service
+        return service
@@ -0,0 +1,172 @@
+"""
+.. moduleauthor:: Nagaraju Gunda
+"""
+
+import logging
+import threading
+import time
+
+from pyalgomate.greeks.calculator import GreeksCalculator
+from pyalgomate.greeks.chain import OptionChain
+from pyalgomate.greeks import serializer
+
+logger = logging.getLogger(__name__)
+
+
+class GreeksSnapshot(object):
+    """A complete, consistent greeks table published by :class:`GreeksWorker`.
+
+    A snapshot is never modified after it is published, so it can be read without locking.
+    """
+
+    def __init__(self, optionData: dict, optionChain: OptionChain, dateTime, version, submittedAt, computedAt):
+        self.__optionData = optionData
+        self.__optionChain = optionChain
+        self.__dateTime = dateTime
+        self.__version = version
+        self.__submittedAt = submittedAt
+        self.__computedAt = computedAt
+        self.__records = None
+        self.__columns = None
+
+    def getOptionData(self) -> dict:
+        """Returns the :class:`pyalgomate.strategies.OptionGreeks` keyed by symbol."""
+        return self.__optionData
+
+    def getOptionChain(self) -> OptionChain:
+        return self.__optionChain
+
+    def getDateTime(self):
+        """Returns the datetime of the bars the greeks were computed from."""
+        return self.__dateTime
+
+    def getVersion(self):
+        """Returns the version of the bar arrays the greeks were computed from."""
+        return self.__version
+
+    def getSubmittedAt(self):
+        """Returns the time, in seconds since the epoch, at which the bars were submitted to the worker."""
+        return self.__submittedAt
+
+    def getComputedAt(self):
+        """Returns the time, in seconds since the epoch, at which the greeks were published."""
+        return self.__computedAt
+
+    def getStaleness(self, now=None):
+        """Returns how old, in seconds, the bars the greeks were computed from are."""
+        return (now if now is not None else time.time()) - self.__submittedAt
+
+    def getRecords(self) -> dict:
+        """Returns the options as flat dictionaries keyed by symbol, see
+        :func:`pyalgomate.greeks.serializer.toRecords`. They are built once and shared by every caller, so they must
+        not be modified."""
+        if self.__records is None:
+            self.__records = serializer.toRecords(self.__optionData)
+        return self.__records
+
+    def getColumns(self) -> dict:
+        """Returns the options as a NumPy array per field, see :func:`pyalgomate.greeks.serializer.toColumns`. They
+        are built once and shared by every caller, so they must not be modified."""
+        if self.__columns is None:
+            self.__columns = serializer.toColumns(self.__optionData)
+        return self.__columns
+
+
+def buildSnapshot(calculator: GreeksCalculator, barArrays, submittedAt, updated, previous: GreeksSnapshot = None):
+    """Publishes the table of a calculator as a :class:`GreeksSnapshot`.
+
+    :param calculator: The calculator that computed the greeks.
+    :param barArrays: The bar arrays they were computed from.
+    :param submittedAt: The time, in seconds since the epoch, at which the bar arrays were captured.
+    :param updated: The options updated by the calculation.
+    :param previous: The previous snapshot. Its table is reused if nothing was updated.
+    """
+    if len(updated) == 0 and previous is not None:
+        # Nothing moved, the previous table is still current
+        optionData = previous.getOptionData()
+        optionChain = previous.getOptionChain()
+    else:
+        optionData = dict(calculator.getOptionData())
+        optionChain = calculator.getOptionChain().copy()
+    return GreeksSnapshot(optionData, optionChain, barArrays.getDateTime(), barArrays.getVersion(), submittedAt,
+                          time.time())
+
+
+class GreeksWorker(threading.Thread):
+    """Computes greeks in a background thread so a slow solve doesn't delay the strategy.
+
+    The strategy submits copies of the feed's bar arrays with :meth:`submit`. Only the latest submission is kept, so
+    the worker always computes from the most recent chain and skips the ones it couldn't keep up with. The worker
+    updates its own greeks table (the back buffer) and, once it is complete, publishes a copy of it as the
+    :class:`GreeksSnapshot` returned by :meth:`getSnapshot` (the front buffer). Publishing swaps a single reference,
+    so readers never block and never see a half written table.
+
+    :param calculator: The calculator used to compute the greeks. It must only be used by this worker afterwards.
+    :type calculator: :class:`pyalgomate.greeks.calculator.GreeksCalculator`.
+    """
+
+    def __init__(self, calculator: GreeksCalculator):
+        super(GreeksWorker, self).__init__(name='GreeksWorker', daemon=True)
+        self.__calculator = calculator
+        self.__condition = threading.Condition()
+        self.__barArrays = None
+        self.__submittedAt = None
+        self.__snapshot = None
+        self.__submitted = 0
+        self.__computed = 0
+        self.__stop = False
+
+    def getCalculator(self) -> GreeksCalculator:
+        return self.__calculator
+
+    def submit(self, barArrays):
+        """Submits the bar arrays to compute the greeks from, replacing the previous submission if it was not picked
+        up yet.
+
+        :param barArrays: A copy of the feed's arrays, that won't be modified afterwards.
+        :type barArrays: :class:`pyalgomate.barfeed.arrays.BarArrays`.
+        """
+        with self.__condition:
+            self.__barArrays = barArrays
+            self.__submittedAt = time.time()
+            self.__submitted += 1
+            self.__condition.notify()
+
+    def getSnapshot(self) -> GreeksSnapshot:
+        """Returns the most recent :class:`GreeksSnapshot`, or None if none was published yet."""
+        return self.__snapshot
+
+    def getStaleness(self, now=None):
+        """Returns how old, in seconds, the bars behind the most recent snapshot are, or None if there is none."""
+        snapshot = self.__snapshot
+        return snapshot.getStaleness(now) if snapshot is not None else None
+
+    def getSubmittedCount(self):
+        return self.__submitted
+
+    def getComputedCount(self):
+        """Returns the number of submissions that were computed. The rest were replaced by newer ones."""
+        return self.__computed
+
+    def stop(self):
+        with self.__condition:
+            self.__stop = True
+            self.__condition.notify()
+
+    def run(self):
+        while True:
+            with self.__condition:
+                while self.__barArrays is None and not self.__stop:
+                    self.__condition.wait()
+                if self.__stop:
+                    break
+                barArrays = self.__barArrays
+                submittedAt = self.__submittedAt
+                self.__barArrays = None
+
+            try:
+                updated = self.__calculator.calculate(barArrays)
+                self.__snapshot = buildSnapshot(self.__calculator, barArrays, submittedAt, updated, self.__snapshot)
+                self.__computed += 1
+            except Exception as e:
+                logger.exception(f'Error computing greeks: {e}')
@@ -11,6 +11,7 @@ import pandas as pd
 import log_setup  # noqa
 
 import pyalgomate.utils as utils
+from pyalgomate.barfeed.ringbuffer import BarRingBuffer
 from pyalgomate.strategies.BaseOptionsGreeksStrategy import BaseOptionsGreeksStrategy
 from pyalgomate.core import State
 
@@ -180,24 +181,8 @@ class ATMStraddleV1(BaseOptionsGreeksStrategy):
 
     def addSuperTrend(self, dateTime, open, high, low, close, volume, openInterest):
         if self.underlying not in self.resampledDict:
-            self.resampledDict[self.underlying] = {
-                'Date/Time': [],
-                'Open': [],
-                'High': [],
-                'Low': [],
-                'Close': [],
-                'Volume': [],
-                'Open Interest': []
-            }
-        self.resampledDict[self.underlying]['Date/Time'].append(
-            dateTime)
-        self.resampledDict[self.underlying]['Open'].append(open)
-        self.resampledDict[self.underlying]['High'].append(high)
-        self.resampledDict[self.underlying]['Low'].append(low)
-        self.resampledDict[self.underlying]['Close'].append(close)
-        self.resampledDict[self.underlying]['Volume'].append(volume)
-        self.resampledDict[self.underlying]['Open Interest'].append(
-            openInterest)
+            self.resampledDict[self.underlying] = BarRingBuffer()
+        self.resampledDict[self.underlying].append(dateTime, open, high, low, close, volume, openInterest)
 
         if self.underlying not in self.supertrend:
             self.supertrend[self.underlying] = SuperTrend(
@@ -263,7 +248,7 @@ class ATMStraddleV1(BaseOptionsGreeksStrategy):
                 currentExpiry = utils.getNearestWeeklyExpiryDate(
                     bars.getDateTime().date(), self.underlyingIndex)
                 supertrendValue = self.supertrend[self.underlying][-1]
-                lastClose = self.resampledDict[self.underlying]['Close'][-1]
+                lastClose = self.resampledDict[self.underlying].last(field='close')[-1]
                 self.log(
                     f'{bars.getDateTime()} - {self.underlying} - LTP <{lastClose}> Supertrend <{supertrendValue.value}>',
                     logging.DEBUG)
@@ -12,8 +12,16 @@ from pyalgotrade.broker import Order
 from pyalgotrade import broker
 from pyalgomate.brokers import QuantityTraits
 import pyalgomate.utils as utils
-from pyalgomate.strategies import OptionGreeks
-from py_vollib_vectorized import vectorized_implied_volatility, get_all_greeks
+from pyalgomate.barfeed import codec, BaseBarFeed
+from pyalgomate.barfeed.arrays import BarArrays
+from pyalgomate.barfeed.journal import TickJournal
+from pyalgomate.greeks.engine import GreeksEngine
+from pyalgomate.greeks.chain import OptionChain
+from pyalgomate.greeks.calculator import GreeksCalculator
+from pyalgomate.greeks.worker import GreeksSnapshot
+from pyalgomate.greeks.service import GreeksService, getGreeksService
+from pyalgomate.analyzers.ledger import Ledger
+from pyalgomate.brokers.contracts import StrikeLadder, buildStrikeLadders, roundToStrike
 from pyalgomate.telegram import TelegramBot
 from pyalgomate.core import State
 from pyalgomate.core.position import LongOpenPosition, ShortOpenPosition
@@ -40,8 +48,13 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
         self.telegramMessageThreadId = telegramMessageThreadId
         self._observers = []
         self.__optionContracts = dict()
+        self.__strikeLadders = dict()
+        self.__instrumentTable = codec.InstrumentTable()
         self.mae = dict()
         self.mfe = dict()
+        # Running PnL and greeks of the positions, so they don't have to be summed over every position on each query
+        self.__ledger = Ledger()
+        self.attachAnalyzer(self.__ledger)
         self.reset()
 
         if self.telegramBot:
@@ -49,6 +62,13 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
 
         # build option contracts
         self.buildOptionContracts()
+        # Live feeds subscribe and unsubscribe options as the underlying moves
+        if isinstance(self.getFeed(), BaseBarFeed):
+            self.getFeed().getInstrumentsChangedEvent().subscribe(self.__onInstrumentsChanged)
+            subscriptionManager = self.getFeed().getSubscriptionManager()
+            if subscriptionManager is not None:
+                # Keep the instruments with open positions subscribed
+                subscriptionManager.addRetentionCheck(lambda instrument: instrument in self.__ledger.getHoldings())
 
         if callback:
             self._observers.append(callback)
@@ -72,12 +92,12 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
 
         self.dataColumns = ["Ticker", "Date/Time", "Open", "High",
                             "Low", "Close", "Volume", "Open Interest"]
-        if self.collectData is not None:
-            self.dataFileName = "data.csv"
-
-            if not os.path.isfile(self.dataFileName):
-                pd.DataFrame(columns=self.dataColumns).to_csv(
-                    self.dataFileName, index=False)
+        self.__journal = None
+        if self.collectData and isinstance(self.getFeed(), BaseBarFeed):
+            # Every raw tick of the feed goes to a daily binary journal, written by a thread of its own
+            self.__journal = TickJournal("data")
+            self.__journal.start()
+            self.getFeed().setJournal(self.__journal)
 
     def buildOrdersFromActiveOrders(self):
         if not self.isBacktest():
@@ -125,7 +145,20 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
 
     def reset(self):
         super().reset()
+        # The greeks are computed once per feed update and shared with the other strategies on the same feed. Feeds
+        # without bar arrays, like the backtesting CSV feeds, get a service of the strategy's own over arrays filled
+        # from its bars in getOptionData.
+        self.__greeksService = getGreeksService(self.getFeed())
+        self.__barArrays = None
+        self.__lastBars = None
+        if self.__greeksService is None:
+            self.__barArrays = BarArrays()
+            self.__greeksService = GreeksService(self.__barArrays)
+        self.__greeksService.subscribe(self)
         self.__optionData = dict()
+        self.__optionChain = OptionChain()
+        self.__greeksSnapshot = None
+        self.__ledger.reset()
         self.overallPnL = 0
         self.state = State.LIVE
 
@@ -185,20 +218,16 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
             "state": str(self.state)
         }
 
-        if self.collectData is not None:
-            df = pd.DataFrame(self.getNewRows(bars), columns=self.dataColumns)
-            df.to_csv(self.dataFileName, mode='a',
-                      header=not os.path.exists(self.dataFileName), index=False)
-
-            dataDf = df.copy()
-            dataDf['Date/Time'] = dataDf['Date/Time'].dt.strftime(
-                '%Y-%m-%d %H:%M:%S')
-
-            jsonData["ohlc"] = dataDf.to_json()
-
         if len(self._observers) == 0:
             return
 
+        # The bars are charted by the UI, collectData only controls the journal
+        dataDf = codec.recordsToDataFrame(codec.barsToRecords(bars, self.__instrumentTable), self.__instrumentTable)
+        dataDf['Date/Time'] = dataDf['Date/Time'].dt.strftime(
+            '%Y-%m-%d %H:%M:%S')
+
+        jsonData["ohlc"] = dataDf.to_json()
+
         if self.state != State.LIVE:
             combinedPremium = 0
             for openPosition in self.getActivePositions():
@@ -212,18 +241,8 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
             jsonData["metrics"]["Combined Premium"] = combinedPremium
             jsonData["trades"] = self.tradesDf.to_json()
 
-        jsonData["optionChain"] = dict()
-        for instrument, optionGreek in self.__optionData.items():
-            optionGreekDict = dict([attr, getattr(optionGreek, attr)]
-                                   for attr in dir(optionGreek) if not attr.startswith('_'))
-            optionContract = optionGreekDict.pop('optionContract')
-            optionContractDict = dict([attr, getattr(optionContract, attr)] for attr in dir(
-                optionContract) if not attr.startswith('_'))
-            if 'expiry' in optionContractDict:
-                optionContractDict['expiry'] = optionContractDict['expiry'].strftime(
-                    '%Y-%m-%d')
-            optionGreekDict.update(optionContractDict)
-            jsonData["optionChain"][instrument] = optionGreekDict
+        # Serialized once per greeks snapshot and shared with the other strategies on the feed
+        jsonData["optionChain"] = self.__greeksSnapshot.getRecords() if self.__greeksSnapshot is not None else dict()
 
         for callback in self._observers:
             callback(self.strategyName, jsonData)
@@ -252,13 +271,23 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
                        'messageThreadId': self.telegramMessageThreadId}
             self.telegramBot.sendMessage(message)
 
-    def getOverallPnL(self):
-        pnl = 0
+    def registerPositionOrder(self, position, order):
+        super().registerPositionOrder(position, order)
+        self.__ledger.addPositionOrder(position, order)
+
+    def unregisterPosition(self, position):
+        super().unregisterPosition(position)
+        self.__ledger.removePosition(position)
+
+    def onOrderUpdated(self, order):
+        # Called before the position is notified, so the ledger already has the fill in onEnterOk and onExitOk
+        self.__ledger.updateOrder(order)
 
-        for pos in self.getActivePositions().copy().union(self.getClosedPositions().copy()):
-            pnl += pos.getPnL()
+    def getLedger(self) -> Ledger:
+        return self.__ledger
 
-        return pnl
+    def getOverallPnL(self):
+        return self.__ledger.getPnL()
 
     def getPnLImage(self):
         pnl = self.getOverallPnL()
@@ -279,6 +308,11 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
     def onStart(self):
         super().onStart()
 
+    def onFinish(self, bars):
+        super().onFinish(bars)
+        if self.__journal is not None:
+            self.__journal.close()
+
     def displaySlippage(self, order: Order):
         orderType = order.getType()
 
@@ -394,135 +428,114 @@ class BaseOptionsGreeksStrategy(BaseStrategy):
         return self.getLastPrice(instrument)
 
     def getNearestDeltaOption(self, optionType, deltaValue, expiry, underlying=None):
-        options = [opt for opt in self.__optionData.values(
-        ) if opt.optionContract.type == optionType and opt.optionContract.expiry == expiry]
-        if underlying:
-            options = [
-                opt for opt in options if opt.optionContract.underlying == underlying]
-        options.sort(key=lambda x: abs(
-            x.delta + abs(deltaValue) if optionType == 'p' else x.delta - abs(deltaValue)))
-        return options[0] if len(options) > 0 else None
+        return self.__optionChain.getNearestDeltaOption(optionType, deltaValue, expiry, underlying)
 
     def getNearestPremiumOption(self, optionType, premium, expiry, underlying=None):
-        options = [opt for opt in self.__optionData.values(
-        ) if opt.optionContract.type == optionType and opt.optionContract.expiry == expiry]
-        if underlying:
-            options = [
-                opt for opt in options if opt.optionContract.underlying == underlying]
-        options.sort(key=lambda x: abs(x.price - premium))
-        return options[0] if len(options) > 0 else None
+        return self.__optionChain.getNearestPremiumOption(optionType, premium, expiry, underlying)
 
     def getOTMStrikeGreeks(self, strike: int, optionType: str, expiry: datetime.date,
                            numberOfOptions: int = -1) -> list:
-        options = [opt for opt in self.__optionData.values(
-        ) if (opt.optionContract.type == optionType) and (opt.optionContract.expiry == expiry) and (
-                       opt.optionContract.strike > strike if optionType == 'c' else opt.optionContract.strike < strike)]
-        options.sort(key=lambda x: x.optionContract.strike,
-                     reverse=True if optionType == 'p' else False)
-        return options[:numberOfOptions]
+        return self.__optionChain.getOTMStrikeGreeks(strike, optionType, expiry, numberOfOptions)
 
     def getITMStrikeGreeks(self, strike: int, optionType: str, expiry: datetime.date) -> list:
-        options = [opt for opt in self.__optionData.values(
-        ) if (opt.optionContract.type == optionType) and (opt.optionContract.expiry == expiry) and (
-                       opt.optionContract.strike < strike if optionType == 'c' else opt.optionContract.strike > strike)]
-        options.sort(key=lambda x: x.optionContract.strike,
-                     reverse=True if optionType == 'c' else False)
-        return options
+        return self.__optionChain.getITMStrikeGreeks(strike, optionType, expiry)
 
     def getOverallDelta(self):
-        delta = 0
-        for openPosition in self.getActivePositions().copy():
-            delta += self.__optionData[openPosition.getInstrument()].delta if self.__optionData.get(
-                openPosition.getInstrument(), None) is not None else 0
-
-        return delta
-
-    def __calculateGreeks(self, bars):
-        # Collect all the necessary data into NumPy arrays
-        optionContracts = []
-        underlyingPrices = []
-        strikes = []
-        prices = []
-        expiries = []
-        types = []
-        ois = []
-        for instrument, bar in bars.items():
-            optionContract = self.getBroker().getOptionContract(instrument)
+        return self.__ledger.getDelta()
 
-            if optionContract is not None:
-                underlyingPrice = self.getLastPrice(optionContract.underlying)
-                if underlyingPrice is None:
-                    return
-                underlyingPrices.append(underlyingPrice)
-                optionContracts.append(optionContract)
-                strikes.append(optionContract.strike)
-                prices.append(bar.getClose())
-                ois.append(bar.getExtraColumns().get("oi", 0))
-                if optionContract.expiry is None:
-                    expiry = utils.getNearestWeeklyExpiryDate(
-                        bar.getDateTime().date())
-                else:
-                    expiry = optionContract.expiry
-                expiries.append(
-                    ((expiry - bar.getDateTime().date()).days + 1) / 365.0)
-                types.append(optionContract.type)
-        underlyingPrices = np.array(underlyingPrices)
-        strikes = np.array(strikes)
-        prices = np.array(prices)
-        expiries = np.array(expiries)
-        types = np.array(types)
-
-        try:
-            # Calculate implied volatilities
-            iv = vectorized_implied_volatility(prices, underlyingPrices, strikes, expiries, 0.0,
-                                               types, q=0, model='black_scholes_merton', return_as='numpy',
-                                               on_error='ignore')
-
-            # Calculate greeks
-            greeks = get_all_greeks(types, underlyingPrices, strikes, expiries,
-                                    0.0, iv, 0.0, model='black_scholes', return_as='dict')
-        except:
-            return
+    def enableGreeksWorker(self):
+        """Computes the greeks in a background :class:`pyalgomate.greeks.worker.GreeksWorker` instead of in
+        :meth:`getOptionData`.
+
+        :meth:`getOptionData` then submits the latest bars to the worker and returns the most recent complete
+        snapshot without waiting for it, so the greeks can lag the bars. See :meth:`getGreeksStaleness`.
+
+        .. note::
+            The worker belongs to the feed's :class:`pyalgomate.greeks.service.GreeksService`, so this applies to
+            every strategy on the same feed, unless the feed doesn't keep bar arrays.
+        """
+        self.__greeksService.enableWorker()
+
+    def disableGreeksWorker(self):
+        self.__greeksService.disableWorker()
 
-        # Store the results
-        for i in range(len(optionContracts)):
-            optionContract = optionContracts[i]
-            symbol = optionContract.symbol
-            deltaVal = greeks['delta'][i]
-            gammaVal = greeks['gamma'][i]
-            thetaVal = greeks['theta'][i]
-            vegaVal = greeks['vega'][i]
-            ivVal = iv[i]
+    def getGreeksSnapshot(self) -> GreeksSnapshot:
+        """Returns the most recent greeks snapshot of the feed, or None if none was computed yet."""
+        return self.__greeksService.getSnapshot()
 
-            if ois[i] <= 0:
-                if symbol in self.__optionData:
-                    ois[i] = self.__optionData[symbol].oi
+    def getGreeksStaleness(self):
+        """Returns how old, in seconds, the bars behind the greeks are, or None if none were computed yet."""
+        return self.__greeksService.getStaleness()
 
-            self.__optionData[symbol] = OptionGreeks(
-                optionContract, prices[i], deltaVal, gammaVal, thetaVal, vegaVal, ivVal, ois[i])
+    def getGreeksService(self) -> GreeksService:
+        return self.__greeksService
+
+    def getGreeksCalculator(self) -> GreeksCalculator:
+        return self.__greeksService.getCalculator()
+
+    def getGreeksEngine(self) -> GreeksEngine:
+        return self.__greeksService.getCalculator().getEngine()
+
+    def getOptionChain(self) -> OptionChain:
+        return self.__optionChain
+
+    def __getUnderlyingIndex(self, underlying):
+        return self.getBroker().getUnderlyingDetails(underlying)['index']
 
     def getOptionData(self, bars) -> dict:
-        self.__calculateGreeks(bars)
+        if self.__barArrays is not None and bars is not self.__lastBars:
+            # Strategies may ask more than once per bars, the arrays are only updated for new ones
+            self.__lastBars = bars
+            self.__barArrays.update(bars)
+        snapshot = self.__greeksService.update(self.getBroker().getOptionContract, self.__getUnderlyingIndex)
+        if snapshot is not None:
+            self.__greeksSnapshot = snapshot
+            self.__optionData = snapshot.getOptionData()
+            self.__optionChain = snapshot.getOptionChain()
+            self.__ledger.updateGreeks(self.__optionData)
         return self.__optionData
 
     def getATMStrike(self, ltp, strikeDifference):
-        inputPrice = int(ltp)
-        remainder = int(inputPrice % strikeDifference)
-        if remainder < int(strikeDifference / 2):
-            return inputPrice - remainder
-        else:
-            return inputPrice + (strikeDifference - remainder)
+        return roundToStrike(ltp, strikeDifference)
 
     def buildOptionContracts(self):
         for instrument in self.getFeed().getRegisteredInstruments():
             optionContract = self.getBroker().getOptionContract(instrument)
             if optionContract is not None:
                 self.__optionContracts[instrument] = optionContract
+        self.__strikeLadders = buildStrikeLadders(self.__optionContracts.values())
+
+    def __onInstrumentsChanged(self, added, removed):
+        for instrument in added:
+            optionContract = self.__optionContracts.get(instrument, None) or \
+                self.getBroker().getOptionContract(instrument)
+            if optionContract is None:
+                continue
+            self.__optionContracts[instrument] = optionContract
+            key = (optionContract.underlying, optionContract.expiry)
+            ladder = self.__strikeLadders.get(key, None)
+            if ladder is None:
+                ladder = StrikeLadder(optionContract.underlying, optionContract.expiry)
+                self.__strikeLadders[key] = ladder
+            ladder.add(optionContract)
+
+        for instrument in removed:
+            # The contract stays known for the positions that were opened on it
+            optionContract = self.__optionContracts.get(instrument, None)
+            if optionContract is None:
+                continue
+            ladder = self.__strikeLadders.get((optionContract.underlying, optionContract.expiry), None)
+            if ladder is not None:
+                ladder.remove(optionContract)
+
+    def getStrikeLadder(self, underlying, expiry) -> StrikeLadder:
+        """Returns the :class:`pyalgomate.brokers.contracts.StrikeLadder` of the registered contracts of an underlying
+        and expiry, or None if there are none."""
+        return self.__strikeLadders.get((underlying, expiry), None)
 
     def getOptionSymbol(self, underlying, expiry, strike, type):
-        options = [opt for opt in self.__optionContracts.values(
-        ) if opt.type == type and opt.expiry == expiry and opt.underlying == underlying and opt.strike == strike]
-        return options[0].symbol if len(options) > 0 else None
+        ladder = self.__strikeLadders.get((underlying, expiry), None)
+        return ladder.getSymbol(strike, type) if ladder is not None else None
 
     def getOptionContracts(self):
         return self.__optionContracts
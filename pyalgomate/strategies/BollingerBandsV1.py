@@ -6,6 +6,7 @@ from talipp.ohlcv import OHLCV
 import pandas as pd
 
 import pyalgomate.utils as utils
+from pyalgomate.barfeed.ringbuffer import BarRingBuffer
 from pyalgomate.strategies.BaseOptionsGreeksStrategy import BaseOptionsGreeksStrategy
 from pyalgomate.core import State
 from pyalgomate.cli import CliMain
@@ -61,24 +62,8 @@ class BollingerBandsV1(BaseOptionsGreeksStrategy):
 
     def addBollingerBands(self, dateTime, open, high, low, close, volume, openInterest):
         if self.underlying not in self.resampledDict:
-            self.resampledDict[self.underlying] = {
-                'Date/Time': [],
-                'Open': [],
-                'High': [],
-                'Low': [],
-                'Close': [],
-                'Volume': [],
-                'Open Interest': []
-            }
-        self.resampledDict[self.underlying]['Date/Time'].append(
-            dateTime)
-        self.resampledDict[self.underlying]['Open'].append(open)
-        self.resampledDict[self.underlying]['High'].append(high)
-        self.resampledDict[self.underlying]['Low'].append(low)
-        self.resampledDict[self.underlying]['Close'].append(close)
-        self.resampledDict[self.underlying]['Volume'].append(volume)
-        self.resampledDict[self.underlying]['Open Interest'].append(
-            openInterest)
+            self.resampledDict[self.underlying] = BarRingBuffer()
+        self.resampledDict[self.underlying].append(dateTime, open, high, low, close, volume, openInterest)
 
         if self.underlying not in self.bollingBands:
             self.bollingBands[self.underlying] = BB(
@@ -140,9 +125,9 @@ class BollingerBandsV1(BaseOptionsGreeksStrategy):
                 bars.getDateTime().date())
             if self.bollingBands[self.underlying][-2] is None:
                 return
-            if (self.resampledDict[self.underlying]['Close'][-2] <= self.bollingBands[self.underlying][-2].ub) and \
-                    (self.resampledDict[self.underlying]['Close'][-1] > self.bollingBands[self.underlying][-1].ub):
-                if bar.getHigh() > self.resampledDict[self.underlying]['High'][-1]:
+            if (self.resampledDict[self.underlying].last(field='close')[-2] <= self.bollingBands[self.underlying][-2].ub) and \
+                    (self.resampledDict[self.underlying].last(field='close')[-1] > self.bollingBands[self.underlying][-1].ub):
+                if bar.getHigh() > self.resampledDict[self.underlying].last(field='high')[-1]:
                     # Bullish entry
                     atmStrike = self.getATMStrike(
                         self.getLTP(self.underlying), self.strikeDifference)
@@ -169,9 +154,9 @@ class BollingerBandsV1(BaseOptionsGreeksStrategy):
                         otmGreeks.optionContract.symbol, 2 * self.quantity))
                     self.positionBearish.append(
                         self.enterShort(atmSymbol, self.quantity))
-            elif (self.resampledDict[self.underlying]['Close'][-2] >= self.bollingBands[self.underlying][-2].lb) and \
-                    (self.resampledDict[self.underlying]['Close'][-1] < self.bollingBands[self.underlying][-1].lb):
-                if bar.getLow() < self.resampledDict[self.underlying]['Low'][-1]:
+            elif (self.resampledDict[self.underlying].last(field='close')[-2] >= self.bollingBands[self.underlying][-2].lb) and \
+                    (self.resampledDict[self.underlying].last(field='close')[-1] < self.bollingBands[self.underlying][-1].lb):
+                if bar.getLow() < self.resampledDict[self.underlying].last(field='low')[-1]:
                     # Bearish entry
                     atmStrike = self.getATMStrike(
                         self.getLTP(self.underlying), self.strikeDifference)
@@ -200,15 +185,15 @@ class BollingerBandsV1(BaseOptionsGreeksStrategy):
                         self.enterShort(atmSymbol, self.quantity))
         elif (self.state == State.ENTERED):
             if len(self.positionBullish) > 0:
-                if self.resampledDict[self.underlying]['Close'][-1] < self.bollingBands[self.underlying][-1].ub:
-                    if bar.getClose() < self.resampledDict[self.underlying]['Low'][-1]:
+                if self.resampledDict[self.underlying].last(field='close')[-1] < self.bollingBands[self.underlying][-1].ub:
+                    if bar.getClose() < self.resampledDict[self.underlying].last(field='low')[-1]:
                         self.log(
                             f'Previous {self.resampleFrequency} Minute candle has closed below Upper BB and price has broken that candle Low. Exiting all positions')
                         self.state = State.PLACING_ORDERS
                         self.closeAllPositions()
             elif len(self.positionBearish) > 0:
-                if self.resampledDict[self.underlying]['Close'][-1] > self.bollingBands[self.underlying][-1].lb:
-                    if bar.getClose() > self.resampledDict[self.underlying]['High'][-1]:
+                if self.resampledDict[self.underlying].last(field='close')[-1] > self.bollingBands[self.underlying][-1].lb:
+                    if bar.getClose() > self.resampledDict[self.underlying].last(field='high')[-1]:
                         self.log(
                             f'Previous {self.resampleFrequency} Minute candle has closed above Lower BB and price has broken that candle High. Exiting all positions')
                         self.state = State.PLACING_ORDERS
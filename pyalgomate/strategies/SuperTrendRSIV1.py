@@ -7,6 +7,7 @@ import pandas as pd
 
 import pyalgotrade.bar
 import pyalgomate.utils as utils
+from pyalgomate.barfeed.ringbuffer import BarRingBuffer
 from pyalgomate.strategies.BaseOptionsGreeksStrategy import BaseOptionsGreeksStrategy
 from pyalgomate.core import State
 
@@ -84,24 +85,8 @@ class SuperTrendRSIV1(BaseOptionsGreeksStrategy):
 
     def addIndicators(self, dateTime, open, high, low, close, volume, openInterest):
         if self.underlying not in self.resampledDict:
-            self.resampledDict[self.underlying] = {
-                'Date/Time': [],
-                'Open': [],
-                'High': [],
-                'Low': [],
-                'Close': [],
-                'Volume': [],
-                'Open Interest': []
-            }
-        self.resampledDict[self.underlying]['Date/Time'].append(
-            dateTime)
-        self.resampledDict[self.underlying]['Open'].append(open)
-        self.resampledDict[self.underlying]['High'].append(high)
-        self.resampledDict[self.underlying]['Low'].append(low)
-        self.resampledDict[self.underlying]['Close'].append(close)
-        self.resampledDict[self.underlying]['Volume'].append(volume)
-        self.resampledDict[self.underlying]['Open Interest'].append(
-            openInterest)
+            self.resampledDict[self.underlying] = BarRingBuffer()
+        self.resampledDict[self.underlying].append(dateTime, open, high, low, close, volume, openInterest)
 
         ohlcv = OHLCV(open, high, low,
                       close, volume, dateTime)
@@ -113,7 +98,7 @@ class SuperTrendRSIV1(BaseOptionsGreeksStrategy):
                 or (len(self.indicators['rsi'][self.underlying]) < self.indicatorValuesToBeAvailable)):
             return
 
-        self.log(f"{dateTime} - LTP <{self.resampledDict[self.underlying]['Close'][-1]}> "
+        self.log(f"{dateTime} - LTP <{self.resampledDict[self.underlying].last(field='close')[-1]}> "
                  f"Supertrend <{self.indicators['supertrend'][self.underlying][-1].trend}> "
                  f"<{self.indicators['supertrend'][self.underlying][-1].value}> RSI "
                  f"<{self.indicators['rsi'][self.underlying][-1]}>", logging.DEBUG)
@@ -136,7 +121,7 @@ class SuperTrendRSIV1(BaseOptionsGreeksStrategy):
 
             supertrendValue = self.indicators['supertrend'][self.underlying][-1]
             rsiValue = self.indicators['rsi'][self.underlying][-1]
-            lastClose = self.resampledDict[self.underlying]['Close'][-1]
+            lastClose = self.resampledDict[self.underlying].last(field='close')[-1]
 
             self.log(
                 f'{bars.getDateTime()} - {self.underlying} - LTP <{lastClose}> Supertrend '
@@ -185,7 +170,7 @@ class SuperTrendRSIV1(BaseOptionsGreeksStrategy):
         elif self.state == State.ENTERED:
             supertrendValue = self.indicators['supertrend'][self.underlying][-1]
             rsiValue = self.indicators['rsi'][self.underlying][-1]
-            lastClose = self.resampledDict[self.underlying]['Close'][-1]
+            lastClose = self.resampledDict[self.underlying].last(field='close')[-1]
 
             if (self.positionBullish is not None) and ((supertrendValue.trend == Trend.DOWN)
                                                        or (rsiValue < self.rsiBuyExitLevel)):
@@ -108,18 +108,35 @@ class OptionStrategy:
 
 
 class OptionContract:
+    """An option contract. Contracts are shared by the strategies through the broker's
+    :class:`pyalgomate.brokers.contracts.OptionContractRegistry`, so they can't be modified."""
+
+    __slots__ = ('symbol', 'strike', 'expiry', 'type', 'underlying')
+
     def __init__(self, symbol: str, strike: int, expiry: datetime.date, type: str, underlying: str):
-        self.symbol = symbol
-        self.strike = strike
-        self.expiry = expiry
-        self.type = type
-        self.underlying = underlying
+        object.__setattr__(self, 'symbol', symbol)
+        object.__setattr__(self, 'strike', strike)
+        object.__setattr__(self, 'expiry', expiry)
+        object.__setattr__(self, 'type', type)
+        object.__setattr__(self, 'underlying', underlying)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __reduce__(self):
+        return self.__class__, (self.symbol, self.strike, self.expiry, self.type, self.underlying)
 
     def __repr__(self):
         return f'OptionContract(symbol={self.symbol}, strike={self.strike}, expiry={self.expiry}, type = {self.type}, underlying={self.underlying})'
 
 
 class OptionGreeks:
+    # One is created for every option on every greeks update, slots keep them small and fast to read
+    __slots__ = ('optionContract', 'price', 'delta', 'gamma', 'theta', 'vega', 'iv', 'oi')
+
     def __init__(self, optionContract: OptionContract, price: float, delta: float, gamma: float, theta: float, vega: float, iv: float, oi: float = 0):
         self.optionContract = optionContract
         self.price = price
@@ -1,55 +1,36 @@
+import csv
+import os
+import threading
+import numpy as np
 import pendulum
 import datetime
 
 from pyalgomate.core import UnderlyingIndex
 
-listOfNseHolidays = set([
-    pendulum.Date(2022, 1, 26),  # Republic Day
-    pendulum.Date(2022, 3, 1),  # Maha Shivaratri
-    pendulum.Date(2022, 3, 18),  # Holi
-    pendulum.Date(2022, 4, 14),  # Dr.Baba Saheb Ambedkar Jayanti
-    pendulum.Date(2022, 4, 15),  # Good friday
-    pendulum.Date(2022, 5, 3),  # Id-ul-Fitr
-    pendulum.Date(2022, 8, 9),  # Moharram
-    pendulum.Date(2022, 8, 15),  # Independence Day
-    pendulum.Date(2022, 8, 31),  # Ganesh Chaturthi
-    pendulum.Date(2022, 10, 5),  # Vijaya Dashami
-    pendulum.Date(2022, 10, 24),  # Diwali-Laxmi Pujan
-    pendulum.Date(2022, 10, 26),  # Diwali-Balipratipada
-    pendulum.Date(2022, 11, 8),   # Guru Nanak Jayanti
-
-    pendulum.Date(2023, 1, 26),  # Republic Day
-    pendulum.Date(2023, 3, 7),  # Holi
-    pendulum.Date(2023, 3, 30),  # Ram Navami
-    pendulum.Date(2023, 4, 4),  # Mahavir Jayanti
-    pendulum.Date(2023, 4, 7),  # Good friday
-    pendulum.Date(2023, 4, 14),  # Dr.Baba Saheb Ambedkar Jayanti
-    pendulum.Date(2023, 4, 21),  # Id-ul-Fitr
-    pendulum.Date(2023, 5, 1),  # Maharashtra Day
-    pendulum.Date(2023, 6, 29),  # Id-ul-adha (Bakri Id)
-    pendulum.Date(2023, 8, 15),  # Independence Day
-    pendulum.Date(2023, 9, 19),  # Ganesh Chaturthi
-    pendulum.Date(2023, 10, 2),  # Mahatma Gandhi Jayanti
-    pendulum.Date(2023, 10, 24),  # Dussehra
-    pendulum.Date(2023, 11, 14),  # Diwali Balipratipada
-    pendulum.Date(2023, 11, 27),  # Gurunanak Jayanti
-    pendulum.Date(2023, 12, 25),   # Christmas
-
-    pendulum.Date(2024, 1, 26),  # Republic Day
-    pendulum.Date(2024, 3, 8),  # Maha Shivaratri
-    pendulum.Date(2024, 3, 25),  # Holi
-    pendulum.Date(2024, 3, 29),  # Good Friday
-    pendulum.Date(2024, 4, 11),  # Eid-Ul-Fitr (Ramzan Eid)
-    pendulum.Date(2024, 4, 17),  # Ram Navami
-    pendulum.Date(2024, 5, 1),  # Maharashtra Day
-    pendulum.Date(2024, 6, 17),  # Bakri Eid
-    pendulum.Date(2024, 7, 17),  # Moharram
-    pendulum.Date(2024, 8, 15),  # Independence Day
-    pendulum.Date(2024, 10, 2),  # Mahatma Gandhi Jayanti
-    pendulum.Date(2024, 11, 1),  # Diwali-Laxmi Pujan*
-    pendulum.Date(2024, 11, 15),  # Gurunanak Jayanti
-    pendulum.Date(2024, 12, 25)   # Christmas
-])
+# The default holiday list, one `Date,Holiday` row per exchange holiday
+HOLIDAYS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nseHolidays.csv')
+
+listOfNseHolidays = set()
+
+
+def loadHolidays(path: str = HOLIDAYS_FILE):
+    """Replaces the exchange holidays with the ones in a CSV file with `Date` (YYYY-MM-DD) and `Holiday` columns, and
+    clears the expiry calendars that were built with the previous ones.
+
+    :param path: The CSV file. Defaults to the holiday list shipped with PyAlgoMate.
+    :type path: string.
+    """
+    holidays = set()
+    with open(path, newline='') as file:
+        for row in csv.DictReader(file):
+            date = datetime.date.fromisoformat(row['Date'].strip())
+            holidays.add(pendulum.Date(date.year, date.month, date.day))
+
+    # Updated in place, so references to the set stay valid
+    listOfNseHolidays.clear()
+    listOfNseHolidays.update(holidays)
+    clearExpiryCache()
+
 
 expiryDays = {
     UnderlyingIndex.NIFTY: {
@@ -124,9 +105,24 @@ def __isSameWeek(date1: datetime.date, date2: datetime.date):
     return date1.month == date2.month and pendulum.date(date1.year, date1.month, date1.day).week_of_month == pendulum.date(date2.year, date2.month, date2.day).week_of_month
 
 
-def getNearestWeeklyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
-    currentDate = pendulum.now().date() if date is None else pendulum.date(
-        date.year, date.month, date.day)
+def __toDate(date: datetime.date = None) -> datetime.date:
+    if type(date) is datetime.date:
+        return date
+    date = pendulum.now().date() if date is None else date
+    return datetime.date(date.year, date.month, date.day)
+
+
+def clearExpiryCache():
+    """Clears the expiry calendars. Needed only if the holiday list or the expiry days are changed."""
+    with _calendarsLock:
+        _calendars.clear()
+
+
+# The calculations below are the reference the expiry calendars are built from. They are slow, so they are only
+# used when a calendar is built.
+
+def _computeNearestWeeklyExpiryDate(date: datetime.date, index: UnderlyingIndex):
+    currentDate = pendulum.date(date.year, date.month, date.day)
     expiryDay, monthlyExpiryDay = _getExpiryDay(currentDate, index)
 
     while True:
@@ -138,7 +134,7 @@ def getNearestWeeklyExpiryDate(date: datetime.date = None, index: UnderlyingInde
         expiryDate = __considerHolidayList(expiryDate)
 
         if expiryDay != monthlyExpiryDay:
-            monthlyExpiryDate = getNearestMonthlyExpiryDate(date, index)
+            monthlyExpiryDate = _computeNearestMonthlyExpiryDate(date, index)
             if __isSameWeek(expiryDate, monthlyExpiryDate) or monthlyExpiryDate < expiryDate:
                 expiryDate = monthlyExpiryDate
 
@@ -150,17 +146,14 @@ def getNearestWeeklyExpiryDate(date: datetime.date = None, index: UnderlyingInde
     return expiryDate
 
 
-def getNextWeeklyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
-    currentDate = pendulum.now().date() if date is None else pendulum.date(
-        date.year, date.month, date.day)
-    expiryDate = getNearestWeeklyExpiryDate(currentDate, index)
+def _computeNextWeeklyExpiryDate(date: datetime.date, index: UnderlyingIndex):
+    expiryDate = _computeNearestWeeklyExpiryDate(date, index)
 
-    return getNearestWeeklyExpiryDate(expiryDate + datetime.timedelta(days=5), index)
+    return _computeNearestWeeklyExpiryDate(expiryDate + datetime.timedelta(days=5), index)
 
 
-def getNearestMonthlyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
-    currentDate = pendulum.now().date() if date is None else pendulum.date(
-        date.year, date.month, date.day)
+def _computeNearestMonthlyExpiryDate(date: datetime.date, index: UnderlyingIndex):
+    currentDate = pendulum.date(date.year, date.month, date.day)
     expiryDay, monthlyExpiryDay = _getExpiryDay(currentDate, index)
     expiryDate = currentDate.last_of('month', monthlyExpiryDay)
     if (currentDate > expiryDate):
@@ -169,9 +162,8 @@ def getNearestMonthlyExpiryDate(date: datetime.date = None, index: UnderlyingInd
     return __considerHolidayList(expiryDate)
 
 
-def getNextMonthlyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
-    currentDate = pendulum.now().date() if date is None else pendulum.date(
-        date.year, date.month, date.day)
+def _computeNextMonthlyExpiryDate(date: datetime.date, index: UnderlyingIndex):
+    currentDate = pendulum.date(date.year, date.month, date.day)
     expiryDay, monthlyExpiryDay = _getExpiryDay(currentDate, index)
     expiryDate = currentDate.last_of('month', monthlyExpiryDay)
     if (currentDate > expiryDate):
@@ -184,6 +176,124 @@ def getNextMonthlyExpiryDate(date: datetime.date = None, index: UnderlyingIndex
     return __considerHolidayList(expiryDate)
 
 
+class ExpiryCalendar(object):
+    """The expiries of an index for every date of a range, stored as day ordinals in a `(days, 4)` array so a lookup
+    is a single indexing operation.
+
+    :param index: The index.
+    :type index: :class:`pyalgomate.core.UnderlyingIndex`.
+    :param startDate: The first date of the range.
+    :type startDate: datetime.date.
+    :param endDate: The end of the range, excluded.
+    :type endDate: datetime.date.
+    """
+
+    WEEKLY = 0
+    NEXT_WEEKLY = 1
+    MONTHLY = 2
+    NEXT_MONTHLY = 3
+
+    def __init__(self, index: UnderlyingIndex, startDate: datetime.date, endDate: datetime.date):
+        self.__index = index
+        self.__startDate = startDate
+        self.__endDate = endDate
+        self.__start = startDate.toordinal()
+
+        days = endDate.toordinal() - self.__start
+        self.__expiries = np.zeros((days, 4), dtype=np.int32)
+        for day in range(days):
+            date = datetime.date.fromordinal(self.__start + day)
+            self.__expiries[day] = (_computeNearestWeeklyExpiryDate(date, index).toordinal(),
+                                    _computeNextWeeklyExpiryDate(date, index).toordinal(),
+                                    _computeNearestMonthlyExpiryDate(date, index).toordinal(),
+                                    _computeNextMonthlyExpiryDate(date, index).toordinal())
+        # Lookups read the dates from rows of date objects, which is faster from Python than indexing the array
+        self.__rows = [tuple(datetime.date.fromordinal(expiry) for expiry in row) for row in self.__expiries.tolist()]
+
+    def getIndex(self) -> UnderlyingIndex:
+        return self.__index
+
+    def getStartDate(self) -> datetime.date:
+        return self.__startDate
+
+    def getEndDate(self) -> datetime.date:
+        return self.__endDate
+
+    def getExpiries(self):
+        """Returns the `(days, 4)` array with the day ordinals of the weekly, next weekly, monthly and next monthly
+        expiries of every date in the range."""
+        return self.__expiries
+
+    def contains(self, date: datetime.date):
+        return self.__startDate <= date < self.__endDate
+
+    def getExpiryDate(self, date: datetime.date, kind: int) -> datetime.date:
+        """Returns an expiry of a date in the range.
+
+        :param date: The date.
+        :type date: datetime.date.
+        :param kind: :attr:`WEEKLY`, :attr:`NEXT_WEEKLY`, :attr:`MONTHLY` or :attr:`NEXT_MONTHLY`.
+        :type kind: int.
+        """
+        return self.__rows[date.toordinal() - self.__start][kind]
+
+
+# Calendars are built a calendar year at a time, the first time a date of that year is looked up
+_calendars = dict()
+_calendarsLock = threading.Lock()
+
+
+def getExpiryCalendar(date: datetime.date, index: UnderlyingIndex) -> ExpiryCalendar:
+    """Returns the calendar of an index for the year of a date, building it if needed."""
+    key = (index, date.year)
+    calendar = _calendars.get(key, None)
+    if calendar is None:
+        with _calendarsLock:
+            calendar = _calendars.get(key, None)
+            if calendar is None:
+                calendar = ExpiryCalendar(index, datetime.date(date.year, 1, 1), datetime.date(date.year + 1, 1, 1))
+                _calendars[key] = calendar
+    return calendar
+
+
+def buildExpiryCalendars(startDate: datetime.date, endDate: datetime.date, indices=None):
+    """Builds the calendars of the years from startDate to endDate ahead of their first lookup.
+
+    :param startDate: The first date.
+    :type startDate: datetime.date.
+    :param endDate: The last date.
+    :type endDate: datetime.date.
+    :param indices: The indices. Defaults to every index in :data:`expiryDays`.
+    :type indices: list.
+    """
+    for index in (indices if indices is not None else expiryDays.keys()):
+        for year in range(startDate.year, endDate.year + 1):
+            getExpiryCalendar(datetime.date(year, 1, 1), index)
+
+
+def getNearestWeeklyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
+    date = __toDate(date)
+    return getExpiryCalendar(date, index).getExpiryDate(date, ExpiryCalendar.WEEKLY)
+
+
+def getNextWeeklyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
+    date = __toDate(date)
+    return getExpiryCalendar(date, index).getExpiryDate(date, ExpiryCalendar.NEXT_WEEKLY)
+
+
+def getNearestMonthlyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
+    date = __toDate(date)
+    return getExpiryCalendar(date, index).getExpiryDate(date, ExpiryCalendar.MONTHLY)
+
+
+def getNextMonthlyExpiryDate(date: datetime.date = None, index: UnderlyingIndex = UnderlyingIndex.BANKNIFTY):
+    date = __toDate(date)
+    return getExpiryCalendar(date, index).getExpiryDate(date, ExpiryCalendar.NEXT_MONTHLY)
+
+
+loadHolidays()
+
+
 if __name__ == '__main__':
     print(f"Today is\t\t\t{pendulum.now().date()}\n")
     print()
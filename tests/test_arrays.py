@@ -0,0 +1,65 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from pyalgotrade import bar
+from pyalgotrade import dispatcher
+
+from pyalgomate.backtesting.CustomCSVFeed import CustomCSVFeed
+from pyalgomate.backtesting.ReplayFeed import ReplayFeed
+from pyalgomate.barfeed.arrays import BarArrays, getBarArrays
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+START = datetime.datetime(2024, 4, 10, 9, 15)
+
+
+def buildBars(dateTime, closes):
+    return bar.Bars({instrument: QuoteBar(dateTime, close, close, close, close, 10, 100, instrument)
+                     for instrument, close in closes.items()})
+
+
+def testUpdate():
+    barArrays = BarArrays(1)
+    barArrays.update(buildBars(START, {'A': 1.0, 'B': 2.0}))
+    barArrays.update(buildBars(START + datetime.timedelta(seconds=1), {'B': 3.0, 'C': 4.0}))
+
+    assert barArrays.getInstruments() == ['A', 'B', 'C']
+    assert barArrays.getCloses().tolist() == [1.0, 3.0, 4.0]
+    assert barArrays.getOpenInterests().tolist() == [100, 100, 100]
+    assert barArrays.getVersion() == 2
+    assert barArrays.getVersions().tolist() == [1, 2, 2]
+    assert barArrays.getUpdated().tolist() == [False, True, True]
+    assert barArrays.getDateTime() == START + datetime.timedelta(seconds=1)
+    assert barArrays.getIndices(['C', 'A']).tolist() == [2, 0]
+
+
+def testCopyIsIndependent():
+    barArrays = BarArrays()
+    barArrays.update(buildBars(START, {'A': 1.0}))
+    copy = barArrays.copy()
+    barArrays.update(buildBars(START + datetime.timedelta(seconds=1), {'A': 2.0, 'B': 3.0}))
+
+    assert copy.getInstruments() == ['A']
+    assert copy.getCloses().tolist() == [1.0]
+    assert copy.getVersion() == 1
+    assert np.isnan(BarArrays().getCloses()).all()
+
+
+def testBaseBarFeedKeepsBarArrays():
+    feed = ReplayFeed(pd.DataFrame({'Ticker': ['A', 'B', 'A'],
+                                    'Date/Time': [START, START, START + datetime.timedelta(seconds=1)],
+                                    'Close': [1.0, 2.0, 3.0]}))
+    dispatcher_ = dispatcher.Dispatcher()
+    dispatcher_.addSubject(feed)
+    dispatcher_.run()
+
+    barArrays = getBarArrays(feed)
+    assert barArrays is feed.getBarArrays()
+    assert dict(zip(barArrays.getInstruments(), barArrays.getCloses().tolist())) == {'A': 3.0, 'B': 2.0}
+
+
+def testPlainFeedHasNoBarArrays():
+    feed = CustomCSVFeed()
+    feed.addBarsFromDataframe(pd.DataFrame({'Ticker': ['A'], 'Date/Time': [START], 'Open': [1.0], 'High': [1.0],
+                                            'Low': [1.0], 'Close': [1.0], 'Volume': [10], 'Open Interest': [100]}))
+    assert getBarArrays(feed) is None
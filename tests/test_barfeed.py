@@ -0,0 +1,116 @@
+import datetime
+
+from pyalgotrade import bar
+
+from pyalgomate.barfeed import BaseBarFeed
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+START = datetime.datetime(2024, 4, 10, 9, 15)
+
+
+class ListFeed(BaseBarFeed):
+    """Emits the given bars, one :class:`pyalgotrade.bar.Bars` per call."""
+
+    def __init__(self, instruments, allBars):
+        super(ListFeed, self).__init__(bar.Frequency.TRADE)
+        self.allBars = allBars
+        self.position = 0
+        self.changes = []
+        self.getInstrumentsChangedEvent().subscribe(lambda added, removed: self.changes.append((added, removed)))
+        for instrument in instruments:
+            self.registerInstrument(instrument)
+
+    def reset(self):
+        self.position = 0
+        super(ListFeed, self).reset()
+
+    def getCurrentDateTime(self):
+        return None
+
+    def barsHaveAdjClose(self):
+        return False
+
+    def getNextBars(self):
+        if self.position == len(self.allBars):
+            return None
+        self.position += 1
+        return self.allBars[self.position - 1]
+
+    def peekDateTime(self):
+        return None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def join(self):
+        pass
+
+    def eof(self):
+        return self.position == len(self.allBars)
+
+
+def buildBars(seconds, prices):
+    dateTime = START + datetime.timedelta(seconds=seconds)
+    return bar.Bars({instrument: QuoteBar(dateTime, price, price, price, price, 0, 0, instrument)
+                     for instrument, price in prices.items()})
+
+
+def testRegistrationEvents():
+    feed = ListFeed(['NSE|NIFTY BANK', 'NFO|35000'], [])
+    assert feed.changes == [(['NSE|NIFTY BANK'], []), (['NFO|35000'], [])]
+
+    # Registering again doesn't emit
+    feed.registerDataSeries('NFO|35000')
+    feed.registerInstrument('NSE|NIFTY BANK')
+    assert len(feed.changes) == 2
+    assert feed.getRegisteredInstruments() == ['NSE|NIFTY BANK', 'NFO|35000']
+    assert feed.getDefaultInstrument() == 'NSE|NIFTY BANK'
+
+
+def testResetKeepsInstrumentsWithoutEvents():
+    feed = ListFeed(['NSE|NIFTY BANK'], [buildBars(0, {'NSE|NIFTY BANK': 48000}),
+                                        buildBars(1, {'NSE|NIFTY BANK': 48010, 'NFO|35000': 250})])
+    feed.getNewValuesEvent().subscribe(lambda dateTime, bars: None)
+    while feed.dispatch():
+        pass
+    # Instruments that first show up in the bars are registered with an event
+    assert feed.changes == [(['NSE|NIFTY BANK'], []), (['NFO|35000'], [])]
+    assert len(feed['NSE|NIFTY BANK']) == 2 and len(feed['NFO|35000']) == 1
+
+    changes = len(feed.changes)
+    feed.reset()
+    assert len(feed.changes) == changes
+    assert sorted(feed.getRegisteredInstruments()) == ['NFO|35000', 'NSE|NIFTY BANK']
+    assert len(feed['NSE|NIFTY BANK']) == 0 and len(feed['NFO|35000']) == 0
+    assert feed.getBarArrays().getVersion() == 0
+
+    # And the replay fills them again
+    while feed.dispatch():
+        pass
+    assert len(feed['NSE|NIFTY BANK']) == 2
+    assert len(feed.changes) == changes
+
+
+def testUnregisterInstrument():
+    feed = ListFeed(['NSE|NIFTY BANK', 'NFO|35000'], [buildBars(0, {'NSE|NIFTY BANK': 48000, 'NFO|35000': 250}),
+                                                     buildBars(1, {'NFO|35000': 255}),
+                                                     buildBars(2, {'NSE|NIFTY BANK': 48010, 'NFO|35000': 260})])
+    assert feed.dispatch()
+    feed.unregisterInstrument('NFO|35000')
+    feed.unregisterInstrument('NFO|35000')
+    assert feed.changes[-1] == ([], ['NFO|35000'])
+    assert 'NFO|35000' not in feed and not feed.isRegistered('NFO|35000')
+    assert feed.getLastBar('NFO|35000') is None
+
+    # Late bars of the instrument are dropped instead of registering it again
+    assert feed.getNextValuesAndUpdateDS() == (None, None)
+    dateTime, bars = feed.getNextValuesAndUpdateDS()
+    assert bars.getInstruments() == ['NSE|NIFTY BANK']
+    assert feed.getRegisteredInstruments() == ['NSE|NIFTY BANK']
+
+    feed.registerDataSeries('NFO|35000')
+    assert feed.changes[-1] == (['NFO|35000'], [])
+    assert len(feed['NFO|35000']) == 0
@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+from pyalgotrade import bar
+
+from pyalgomate.barfeed import codec
+from pyalgomate.barfeed.BasicBarEx import BasicBarEx
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+START = datetime.datetime(2024, 4, 10, 9, 15, 0, 250)
+INSTRUMENTS = ['NSE|NIFTY BANK', 'NFO|BANKNIFTY24APR48000CE', 'NFO|BANKNIFTY24APR48000PE']
+
+
+def buildBars():
+    return bar.Bars({instrument: BasicBarEx(START, 100.5 + i, 101.5 + i, 99.5 + i, 100.75 + i, 1000 + i, None,
+                                            bar.Frequency.MINUTE, {"Instrument": instrument, "Open Interest": 5000 + i})
+                     for i, instrument in enumerate(INSTRUMENTS)})
+
+
+def testBarsRoundTrip():
+    bars = buildBars()
+    decoded = dict(codec.BarCodec().decode(codec.BarCodec().encodeBars(bars)))
+
+    assert sorted(decoded) == sorted(INSTRUMENTS)
+    for instrument, decodedBar in decoded.items():
+        original = bars[instrument]
+        assert decodedBar.getInstrument() == instrument
+        assert decodedBar.getDateTime() == START
+        assert decodedBar.getFrequency() == bar.Frequency.MINUTE
+        assert (decodedBar.getOpen(), decodedBar.getHigh(), decodedBar.getLow(), decodedBar.getClose()) == \
+            (original.getOpen(), original.getHigh(), original.getLow(), original.getClose())
+        assert decodedBar.getVolume() == original.getVolume()
+        assert decodedBar.getOpenInterest() == original.getExtraColumns()["Open Interest"]
+
+
+def testTicksRoundTrip():
+    quoteBars = [
+        QuoteBar(START, 48000.5, 48000.5, 48000.5, 48000.5, 0, 0, INSTRUMENTS[0], None),
+        QuoteBar(START, 250.25, 250.25, 250.25, 250.25, 1200, 4500, INSTRUMENTS[1], START.replace(microsecond=0)),
+    ]
+    decoded = codec.BarCodec().decode(codec.BarCodec().encodeTicks(quoteBars))
+
+    assert [quoteBar.getInstrument() for quoteBar in decoded] == INSTRUMENTS[:2]
+    assert [quoteBar.getClose() for quoteBar in decoded] == [48000.5, 250.25]
+    assert [quoteBar.getDateTime() for quoteBar in decoded] == [START, START]
+    # Missing exchange datetimes are encoded as NaT and come back as None
+    assert [quoteBar.getExchangeDateTime() for quoteBar in decoded] == [None, START.replace(microsecond=0)]
+    assert decoded[1].getVolume() == 1200
+    assert decoded[1].getOpenInterest() == 4500
+
+
+def testFramesCarryTheirInstruments():
+    encoder = codec.BarCodec()
+    # Ids assigned by earlier frames don't leak into later ones
+    encoder.encodeBars(buildBars())
+    quoteBar = QuoteBar(START, 1, 1, 1, 1, 0, 0, 'NFO|BANKNIFTY24APR48100CE')
+    data = encoder.encodeTicks([quoteBar])
+
+    recordType, records, instrumentTable = codec.decodeFrame(data)
+    assert recordType == codec.RecordType.TICK
+    assert instrumentTable.getInstruments() == ['NFO|BANKNIFTY24APR48100CE']
+    assert records['instrument'].tolist() == [0]
+
+
+def testEmpty():
+    assert codec.BarCodec().decode(codec.BarCodec().encodeTicks([])) == []
+    assert codec.BarCodec().decode(codec.BarCodec().encodeBars([])) == []
+
+
+def testInvalidFrame():
+    data = bytearray(codec.BarCodec().encodeBars(buildBars()))
+    data[0:2] = b'XX'
+    with pytest.raises(Exception, match="Invalid frame"):
+        codec.decodeFrame(bytes(data))
+
+
+def testRecordsToDataFrame():
+    instrumentTable = codec.InstrumentTable()
+    df = codec.recordsToDataFrame(codec.barsToRecords(buildBars(), instrumentTable), instrumentTable)
+
+    assert list(df.columns) == ["Ticker", "Date/Time", "Open", "High", "Low", "Close", "Volume", "Open Interest"]
+    assert sorted(df["Ticker"].tolist()) == sorted(INSTRUMENTS)
+    assert (df["Date/Time"] == START).all()
+    assert df.set_index("Ticker").loc[INSTRUMENTS[2], "Open Interest"] == 5002
@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+from pyalgomate.barfeed import conflator
+from pyalgomate.barfeed.conflator import TickConflator
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+START = datetime.datetime(2024, 4, 10, 9, 15)
+
+
+def buildTick(instrument, price, seconds, volume=0):
+    dateTime = START + datetime.timedelta(seconds=seconds)
+    return QuoteBar(dateTime, price, price, price, price, volume, 0, instrument, dateTime.replace(microsecond=0))
+
+
+def testLatestTickOfEachInstrumentWins():
+    tickConflator = TickConflator()
+    assert tickConflator.pop() is None
+
+    tickConflator.add(buildTick('NSE|NIFTY BANK', 48000, 0.1))
+    tickConflator.add(buildTick('NFO|BANKNIFTY24APR48000CE', 250, 0.2, 10))
+    tickConflator.add(buildTick('NSE|NIFTY BANK', 48005, 0.3))
+    tickConflator.add(buildTick('NFO|BANKNIFTY24APR48000CE', 251, 1.4, 20))
+    assert len(tickConflator) == 2
+
+    bars = tickConflator.pop()
+    assert sorted(bars.getInstruments()) == ['NFO|BANKNIFTY24APR48000CE', 'NSE|NIFTY BANK']
+    assert bars['NSE|NIFTY BANK'].getClose() == 48005
+    assert bars['NFO|BANKNIFTY24APR48000CE'].getClose() == 251
+    assert bars['NFO|BANKNIFTY24APR48000CE'].getVolume() == 20
+    # Stamped with the latest tick, each keeping its own exchange datetime
+    assert bars.getDateTime() == START + datetime.timedelta(seconds=1.4)
+    assert bars['NSE|NIFTY BANK'].getDateTime() == bars.getDateTime()
+    assert bars['NSE|NIFTY BANK'].getExchangeDateTime() == START
+    assert bars['NFO|BANKNIFTY24APR48000CE'].getExchangeDateTime() == START + datetime.timedelta(seconds=1)
+
+    assert len(tickConflator) == 0
+    assert tickConflator.pop() is None
+    assert tickConflator.getMetrics() == {'ticks': 4, 'bars': 2, 'batches': 1, 'conflationRatio': 4.0,
+                                          'queueDepth': 0, 'maxQueueDepth': 0}
+
+
+def testDateTimesKeepIncreasing():
+    tickConflator = TickConflator()
+    tickConflator.add(buildTick('NSE|NIFTY BANK', 48000, 1))
+    first = tickConflator.pop().getDateTime()
+
+    # A late tick with an older datetime
+    tickConflator.add(buildTick('NFO|BANKNIFTY24APR48000CE', 250, 0.5))
+    bars = tickConflator.pop()
+    assert bars.getDateTime() == first + datetime.timedelta(microseconds=1)
+    assert bars['NFO|BANKNIFTY24APR48000CE'].getDateTime() == bars.getDateTime()
+
+
+def testWindow(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(conflator.time, 'monotonic', lambda: now[0])
+    tickConflator = TickConflator(0.25)
+    assert tickConflator.getWindow() == 0.25
+
+    tickConflator.add(buildTick('NSE|NIFTY BANK', 48000, 0))
+    now[0] += 0.2
+    tickConflator.add(buildTick('NSE|NIFTY BANK', 48005, 0.2))
+    assert not tickConflator.isReady()
+    assert tickConflator.pop() is None
+
+    # The window runs from the first pending tick
+    now[0] += 0.05
+    assert tickConflator.isReady()
+    assert tickConflator.pop()['NSE|NIFTY BANK'].getClose() == 48005
+    assert not tickConflator.isReady()
+
+
+def testQueueDepth():
+    tickConflator = TickConflator()
+    tickConflator.recordQueueDepth(12)
+    tickConflator.recordQueueDepth(3)
+    assert tickConflator.getQueueDepth() == 3
+    assert tickConflator.getMaxQueueDepth() == 12
+    assert tickConflator.getConflationRatio() == 0.0
+
+
+def testInvalidWindow():
+    with pytest.raises(AssertionError):
+        TickConflator(-1)
@@ -0,0 +1,101 @@
+import datetime
+
+from pyalgomate.brokers.contracts import OptionContractParser, OptionContractRegistry, StrikeLadder, \
+    buildStrikeLadders, datedGrammar, mappingResolver, monthlyGrammar, roundToStrike, strikeGrammar, weeklyGrammar
+from pyalgomate.strategies import OptionContract
+
+UNDERLYING = 'NSE|NIFTY BANK'
+EXPIRY = datetime.date(2024, 4, 10)
+
+
+def testGrammars():
+    parser = OptionContractParser([weeklyGrammar('BANKNIFTY'), monthlyGrammar('BANKNIFTY'), datedGrammar('BANKNIFTY'),
+                                   strikeGrammar('BANKNIFTY')],
+                                  mappingResolver({UNDERLYING: {'optionPrefix': 'BANKNIFTY'}}))
+
+    contract = parser.parse('BANKNIFTY10APR24C47000')
+    assert (contract.strike, contract.expiry, contract.type, contract.underlying) == (47000, EXPIRY, 'c', UNDERLYING)
+    contract = parser.parse('BANKNIFTY24O0947000PE')
+    assert (contract.strike, contract.expiry, contract.type) == (47000, datetime.date(2024, 10, 9), 'p')
+    contract = parser.parse('BANKNIFTY24MAR47000CE')
+    assert (contract.strike, contract.expiry.month, contract.type) == (47000, 3, 'c')
+    contract = parser.parse('BANKNIFTY47000PE')
+    assert (contract.strike, contract.expiry, contract.type) == (47000, None, 'p')
+
+    assert parser.parse('NIFTY10APR24C22000') is None
+    assert parser.parse(UNDERLYING) is None
+
+
+def testRegistryCachesContracts():
+    symbols = [f'NFO|BANKNIFTY10APR24{type_}{strike}' for strike in range(47000, 48000, 100) for type_ in 'CP']
+    registry = OptionContractRegistry(OptionContractParser([datedGrammar(r'[A-Z\|]+')]))
+    registry.register(symbols)
+    assert len(registry) == len(symbols)
+
+    contract = registry.getOptionContract(symbols[0])
+    assert contract is registry.getOptionContract(symbols[0])
+    assert (contract.strike, contract.expiry, contract.type, contract.underlying) == \
+        (47000, EXPIRY, 'c', 'NFO|BANKNIFTY')
+
+    # Symbols that aren't options are remembered too
+    assert registry.getOptionContract('NSE|NIFTY BANK') is None
+    assert len(registry) == len(symbols) + 1
+
+    registry.addAlias('12345', symbols[1])
+    assert registry.getOptionContract('12345') is registry.getOptionContract(symbols[1])
+
+    registry.clear()
+    assert len(registry) == 0
+    assert registry.getOptionContract(symbols[0]) is not contract
+
+
+def buildContract(strike, type_, expiry=EXPIRY):
+    return OptionContract(f'BANKNIFTY{strike}{type_.upper()}E', strike, expiry, type_, UNDERLYING)
+
+
+def testStrikeLadder():
+    contracts = [buildContract(strike, type_) for strike in range(46000, 48100, 100) for type_ in 'cp']
+    contracts.append(buildContract(47000, 'c', datetime.date(2024, 4, 17)))
+    ladders = buildStrikeLadders(contracts)
+    assert sorted(ladders) == [(UNDERLYING, EXPIRY), (UNDERLYING, datetime.date(2024, 4, 17))]
+
+    ladder = ladders[(UNDERLYING, EXPIRY)]
+    assert len(ladder) == 42
+    assert ladder.getStrikeDifference() == 100
+    assert ladder.getSymbol(47000, 'c') == 'BANKNIFTY47000CE'
+    assert ladder.getContract(47000, 'p') is contracts[21]
+    assert ladder.getSymbol(48100, 'c') is None
+
+    assert ladder.getATMStrike(47049.5) == 47000
+    assert ladder.getATMStrike(47050) == 47100
+    # Clamped to the listed strikes
+    assert ladder.getATMStrike(50000) == 48000
+    assert ladder.getATMStrike(40000) == 46000
+    assert ladder.getStrike(ladder.getATMIndex(47050) + 1) == 47200
+    assert ladder.getStrike(100) is None
+
+
+def testUnevenStrikes():
+    ladder = StrikeLadder(UNDERLYING, EXPIRY)
+    assert ladder.getATMStrike(47000) is None
+    for strike in (46000, 46500, 47000, 47100):
+        ladder.add(buildContract(strike, 'c'))
+    assert ladder.getStrikeDifference() is None
+    assert ladder.getATMStrike(46740, 100) == 46500
+    assert ladder.getATMStrike(46760, 100) == 47000
+    assert ladder.getATMStrike(47300, 100) == 47100
+
+    # Removing a contract that isn't the ladder's own does nothing
+    ladder.remove(buildContract(47100, 'c'))
+    assert ladder.getStrikes() == [46000, 46500, 47000, 47100]
+    ladder.remove(ladder.getContract(47100, 'c'))
+    ladder.remove(ladder.getContract(46000, 'c'))
+    assert ladder.getStrikes() == [46500, 47000]
+    assert ladder.getStrikeDifference() == 500
+
+
+def testRoundToStrike():
+    assert roundToStrike(47049.5, 100) == 47000
+    assert roundToStrike(47050, 100) == 47100
+    assert roundToStrike(22024, 50) == 22000
+    assert roundToStrike(22025, 50) == 22050
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from pyalgotrade import observer
+
+from pyalgomate.core.dispatcher import LiveDispatcher, WakeUp, WakeUpQueue, getWakeUp
+
+
+class Subject(observer.Subject):
+    """A live subject with a queue of work. It notifies the dispatcher's wake up only if `notify` is set."""
+
+    def __init__(self, notify):
+        super(Subject, self).__init__()
+        self.notify = notify
+        self.queue = WakeUpQueue()
+        self.dispatched = []
+        self.dispatchedEvent = threading.Event()
+        self.stopped = False
+
+    def onDispatcherRegistered(self, dispatcher_):
+        if self.notify:
+            self.queue.setWakeUp(getWakeUp(dispatcher_))
+
+    def start(self):
+        pass
+
+    def stop(self):
+        self.stopped = True
+
+    def join(self):
+        pass
+
+    def eof(self):
+        return False
+
+    def peekDateTime(self):
+        return None
+
+    def dispatch(self):
+        if self.queue.empty():
+            return False
+        self.dispatched.append((self.queue.get(), time.perf_counter()))
+        self.dispatchedEvent.set()
+        return True
+
+
+def startDispatcher(idleTimeout, subject):
+    dispatcher_ = LiveDispatcher(idleTimeout)
+    dispatcher_.addSubject(subject)
+    thread = threading.Thread(target=dispatcher_.run, daemon=True)
+    thread.start()
+    # Let the loop go idle
+    time.sleep(0.05)
+    return dispatcher_, thread
+
+
+def testNotifyingSubjectWakesTheLoop():
+    subject = Subject(notify=True)
+    dispatcher_, thread = startDispatcher(60, subject)
+
+    sentAt = time.perf_counter()
+    subject.queue.put('tick')
+    assert subject.dispatchedEvent.wait(5)
+    assert subject.dispatched[0][1] - sentAt < 1
+    assert dispatcher_.getMetrics()['wakeUps'] >= 1
+
+    dispatcher_.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def testSilentSubjectIsDispatchedWithinTheIdleTimeout():
+    idleTimeout = 0.05
+    subject = Subject(notify=False)
+    dispatcher_, thread = startDispatcher(idleTimeout, subject)
+    idleEvents = []
+    dispatcher_.getIdleEvent().subscribe(lambda: idleEvents.append(None))
+
+    sentAt = time.perf_counter()
+    subject.queue.put('tick')
+    assert subject.dispatchedEvent.wait(5)
+    # The wake up was never notified, the loop found the work when its wait timed out
+    assert subject.dispatched[0][1] - sentAt < idleTimeout + 0.1
+    assert dispatcher_.getWakeUp().getNotificationCount() == 0
+    assert dispatcher_.getMetrics()['timeouts'] >= 1
+    assert len(idleEvents) >= 1
+
+    dispatcher_.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def testStopWakesTheLoop():
+    subject = Subject(notify=False)
+    dispatcher_, thread = startDispatcher(60, subject)
+
+    stoppedAt = time.perf_counter()
+    dispatcher_.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    # Without the notification the loop would sleep for the idle timeout
+    assert time.perf_counter() - stoppedAt < 1
+    assert subject.stopped
+    assert dispatcher_.getMetrics()['timeouts'] == 0
+
+
+def testWakeUpMergesNotifications():
+    wakeUp = WakeUp()
+    assert not wakeUp.wait(0)
+    wakeUp.notify()
+    wakeUp.notify()
+    assert wakeUp.isPending()
+    assert wakeUp.wait(0)
+    assert not wakeUp.wait(0)
+    assert wakeUp.getNotificationCount() == 2
@@ -0,0 +1,43 @@
+import numpy as np
+from py_vollib_vectorized import vectorized_implied_volatility
+
+from pyalgomate.greeks.engine import GreeksEngine
+
+STRIKES = np.array([47900.0, 48000.0, 48100.0, 48000.0])
+TYPES = np.array(['c', 'c', 'c', 'p'])
+EXPIRIES = np.full(4, 3 / 365.0)
+UNDERLYINGS = np.full(4, 48000.0)
+PRICES = np.array([420.0, 350.0, 290.0, 345.0])
+
+
+def testSolvesOnlyMovedSlots():
+    engine = GreeksEngine(priceTolerance=0.05)
+    slots = engine.addOptions(STRIKES, TYPES)
+    assert np.isnan(engine.getImpliedVolatilities()).all()
+
+    assert engine.update(slots, PRICES, UNDERLYINGS, EXPIRIES).tolist() == [0, 1, 2, 3]
+    ivs = engine.getImpliedVolatilities().copy()
+    expected = vectorized_implied_volatility(PRICES, UNDERLYINGS, STRIKES, EXPIRIES, 0.0, TYPES, q=0,
+                                             model='black_scholes_merton', return_as='numpy')
+    assert np.allclose(ivs, expected, atol=1e-6)
+    assert (engine.getDeltas()[:3] > 0).all() and engine.getDeltas()[3] < 0
+
+    # Within the tolerance the cached values are kept
+    prices = PRICES + np.array([0.04, 0.0, 1.0, 0.0])
+    assert engine.update(slots, prices, UNDERLYINGS, EXPIRIES).tolist() == [2]
+    assert engine.getImpliedVolatilities()[0] == ivs[0]
+    assert engine.getImpliedVolatilities()[2] > ivs[2]
+
+    assert engine.getSolvedCount() == 5
+    assert engine.getRequestedCount() == 8
+    assert engine.getHitRatio() == 3 / 8
+
+
+def testUnderlyingAndExpiryMoves():
+    engine = GreeksEngine(underlyingPriceTolerance=2, timeToExpiryTolerance=1e-4)
+    slots = engine.addOptions(STRIKES, TYPES)
+    engine.update(slots, PRICES, UNDERLYINGS, EXPIRIES)
+
+    assert len(engine.update(slots, PRICES, UNDERLYINGS + 1, EXPIRIES)) == 0
+    assert len(engine.update(slots, PRICES, UNDERLYINGS + 3, EXPIRIES)) == 4
+    assert len(engine.update(slots[:2], PRICES[:2], UNDERLYINGS[:2] + 3, EXPIRIES[:2] - 1e-3)) == 2
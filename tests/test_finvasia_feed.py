@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from pyalgomate.brokers.finvasia.feed import LiveTradeFeed
+
+TOKEN_MAPPINGS = {
+    'NSE|Nifty Bank': 'NSE|26009',
+    'NFO|BANKNIFTY24APR48000C': 'NFO|35000',
+    'NFO|BANKNIFTY24APR48000P': 'NFO|35001',
+}
+
+
+class FakeApi(object):
+    """Stands in for NorenApi: the websocket opens at once and every subscription gets its first quote."""
+
+    def __init__(self):
+        self.callbacks = dict()
+        self.subscribed = []
+        self.unsubscribed = []
+
+    def start_websocket(self, **callbacks):
+        self.callbacks = callbacks
+        self.callbacks['socket_open_callback']()
+
+    def subscribe(self, channels):
+        channels = channels if isinstance(channels, list) else [channels]
+        self.subscribed.extend(channels)
+        for channel in channels:
+            self.tick(channel, 100.0)
+
+    def unsubscribe(self, channels):
+        self.unsubscribed.extend(channels)
+
+    def close_websocket(self):
+        pass
+
+    def tick(self, channel, price, volume=0):
+        exchange, token = channel.split('|')
+        self.callbacks['subscribe_callback']({'t': 'tf', 'e': exchange, 'tk': token, 'lp': f'{price:.2f}',
+                                              'v': str(volume), 'ft': str(int(time.time()))})
+
+
+@pytest.fixture
+def feed():
+    api = FakeApi()
+    # The last strike is known but only subscribed by the tests that need it
+    feed = LiveTradeFeed(api, dict(TOKEN_MAPPINGS, **{'NFO|BANKNIFTY24APR48100C': 'NFO|35002'}), list(TOKEN_MAPPINGS))
+    feed.start()
+    # The first quotes of the subscriptions
+    assert sorted(feed.getNextBars().getInstruments()) == sorted(TOKEN_MAPPINGS)
+    yield feed
+    feed.stop()
+
+
+def testBarsOfUpdatedInstrumentsOnly(feed):
+    api = feed.getApi()
+    assert feed.getNextBars() is None
+
+    api.tick('NFO|35000', 250.0)
+    bars = feed.getNextBars()
+    assert bars.getInstruments() == ['NFO|BANKNIFTY24APR48000C']
+    assert bars['NFO|BANKNIFTY24APR48000C'].getClose() == 250.0
+
+    # The others keep their last bar
+    assert feed.getLastBar('NSE|Nifty Bank').getClose() == 100.0
+    assert feed.getLastBar('NFO|BANKNIFTY24APR48000C').getClose() == 250.0
+    assert feed.getLastBar('NFO|BANKNIFTY24APR48100C') is None
+
+
+def testTicksAreCoalesced(feed):
+    api = feed.getApi()
+    api.tick('NFO|35001', 240.0, 10)
+    api.tick('NSE|26009', 48010.0)
+    api.tick('NFO|35001', 245.0, 20)
+
+    bars = feed.getNextBars()
+    assert bars.getInstruments() == ['NFO|BANKNIFTY24APR48000P', 'NSE|Nifty Bank']
+    assert bars['NFO|BANKNIFTY24APR48000P'].getClose() == 245.0
+    assert bars['NFO|BANKNIFTY24APR48000P'].getVolume() == 20
+    assert feed.getNextBars() is None
+
+    # Bar datetimes keep increasing
+    api.tick('NSE|26009', 48020.0)
+    assert feed.getNextBars().getDateTime() > bars.getDateTime()
+
+
+def testSubscribeAndUnsubscribe(feed):
+    api = feed.getApi()
+    changes = []
+    feed.getInstrumentsChangedEvent().subscribe(lambda added, removed: changes.append((added, removed)))
+
+    assert feed.subscribeInstruments(['NFO|BANKNIFTY24APR48100C', 'NSE|Nifty Bank', 'NFO|UNKNOWN']) == \
+        ['NFO|BANKNIFTY24APR48100C']
+    assert changes == [(['NFO|BANKNIFTY24APR48100C'], [])]
+    assert api.subscribed[-1] == 'NFO|35002'
+    assert feed.getNextBars().getInstruments() == ['NFO|BANKNIFTY24APR48100C']
+    assert 'NFO|BANKNIFTY24APR48100C' in feed
+
+    feed.unsubscribeInstruments(['NFO|BANKNIFTY24APR48000C', 'NFO|BANKNIFTY24APR48000C'])
+    assert changes[1:] == [([], ['NFO|BANKNIFTY24APR48000C'])]
+    assert api.unsubscribed == ['NFO|35000']
+    assert 'NFO|BANKNIFTY24APR48000C' not in feed
+    assert 'NFO|BANKNIFTY24APR48000C' not in feed.getKeys()
+    assert feed.getLastBar('NFO|BANKNIFTY24APR48000C') is None
+
+    # Late ticks of an unsubscribed channel are dropped
+    api.tick('NFO|35000', 260.0)
+    assert feed.getNextBars() is None
+
+    # A reconnection subscribes to the current channels
+    del api.subscribed[:]
+    api.callbacks['socket_open_callback']()
+    assert sorted(api.subscribed) == ['NFO|35001', 'NFO|35002', 'NSE|26009']
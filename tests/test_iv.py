@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from py_vollib.black_scholes import black_scholes
+from py_vollib.black_scholes.implied_volatility import implied_volatility
+
+from pyalgomate.greeks.iv import impliedVolatility, MAX_VOLATILITY
+
+# Max absolute volatility error vs py_vollib. Prices are rounded to 0.05 ticks, so the chains are solved to the price
+# tolerance and not to the volatility.
+MAX_ERROR = 1e-5
+
+CHAINS = {
+    'BANKNIFTY weekly': (48000, 100, 3, 8),
+    'BANKNIFTY monthly': (48000, 100, 24, 8),
+    'NIFTY weekly': (22000, 50, 2, 3),
+    'NIFTY expiry day': (22000, 50, 0.2, 3),
+}
+
+
+def buildChain(spot, strikeDifference, days, strikeCount=40):
+    """Prices a chain with a volatility smile, in 0.05 ticks."""
+    strikes = float(spot) + strikeDifference * np.arange(-strikeCount, strikeCount + 1)
+    strikes = np.concatenate([strikes, strikes])
+    types = np.array(['c'] * (2 * strikeCount + 1) + ['p'] * (2 * strikeCount + 1))
+    T = np.full(len(strikes), days / 365.0)
+    moneyness = np.log(strikes / spot)
+    volatilities = 0.13 + 0.8 * moneyness ** 2 - 0.1 * moneyness
+    prices = np.array([black_scholes(flag, spot, strike, t, 0.0, volatility)
+                       for flag, strike, t, volatility in zip(types.tolist(), strikes.tolist(), T.tolist(),
+                                                              volatilities.tolist())]).ravel()
+    prices = np.maximum(np.round(prices / 0.05) * 0.05, 0.05)
+    return prices, np.full(len(strikes), float(spot)), strikes, T, types
+
+
+def referenceVolatilities(prices, S, K, T, types):
+    ret = []
+    for price, s, k, t, flag in zip(prices.tolist(), S.tolist(), K.tolist(), T.tolist(), types.tolist()):
+        try:
+            ret.append(float(np.ravel(implied_volatility(price, s, k, t, 0.0, flag))[0]))
+        except Exception:
+            ret.append(np.nan)
+    return np.array(ret)
+
+
+def maxError(ivs, reference):
+    compared = np.isfinite(reference) & (reference > 0)
+    assert compared.sum() > len(reference) / 2, f'only {compared.sum()} options were compared'
+    assert np.isfinite(ivs[compared]).all()
+    return np.max(np.abs(ivs[compared] - reference[compared]))
+
+
+@pytest.mark.parametrize('name', list(CHAINS))
+def testColdStartAccuracy(name):
+    spot, strikeDifference, days, _ = CHAINS[name]
+    prices, S, K, T, types = buildChain(spot, strikeDifference, days)
+    ivs = impliedVolatility(prices, S, K, T, 0.0, types)
+    assert maxError(ivs, referenceVolatilities(prices, S, K, T, types)) < MAX_ERROR
+
+
+@pytest.mark.parametrize('name', list(CHAINS))
+def testWarmStartAccuracy(name):
+    # Next tick: the underlying moved by a few points and the options were repriced with it
+    spot, strikeDifference, days, move = CHAINS[name]
+    prices, S, K, T, types = buildChain(spot, strikeDifference, days)
+    previous = impliedVolatility(prices, S, K, T, 0.0, types)
+    prices, S, K, T, types = buildChain(spot + move, strikeDifference, days)
+
+    # Without the fallback every option has to converge with Newton-Raphson steps from the previous tick
+    ivs = impliedVolatility(prices, S, K, T, 0.0, types, previous=previous, fallback=False)
+    assert maxError(ivs, referenceVolatilities(prices, S, K, T, types)) < MAX_ERROR
+
+
+def testPathologicalQuotesUseTheFallback():
+    # Stale expiry day prices far above the fair value. Their volatility is above MAX_VOLATILITY, so they can't
+    # converge inside the bracket even from a previous value.
+    prices = np.array([1500.0, 2500.0, 99.0])
+    S = np.array([22000.0, 22000.0, 100.0])
+    K = np.array([22000.0, 22000.0, 100.0])
+    T = np.array([0.2 / 365, 0.2 / 365, 1.0])
+    types = np.array(['c', 'p', 'c'])
+    previous = np.full(3, 0.5)
+    reference = referenceVolatilities(prices, S, K, T, types)
+    assert (reference > MAX_VOLATILITY).all()
+
+    assert np.isnan(impliedVolatility(prices, S, K, T, 0.0, types, previous=previous, fallback=False)).all()
+    ivs = impliedVolatility(prices, S, K, T, 0.0, types, previous=previous)
+    assert np.max(np.abs(ivs - reference)) < MAX_ERROR
+    ivs = impliedVolatility(prices, S, K, T, 0.0, types)
+    assert np.max(np.abs(ivs - reference)) < MAX_ERROR
+
+
+def testBounds():
+    # At the intrinsic value, above the upper bound, and invalid inputs
+    ivs = impliedVolatility(np.array([100.0, 48001.0, 0.0, 10.0]), np.array([48100.0, 48000.0, 48000.0, 48000.0]),
+                            48000.0, np.array([0.01, 0.01, 0.01, 0.0]), 0.0, 'c', previous=np.full(4, 0.2))
+    assert ivs[0] == 0.0
+    assert np.isnan(ivs[1:]).all()
+
+
+def testPartiallyWarm():
+    prices, S, K, T, types = buildChain(48000, 100, 3)
+    reference = impliedVolatility(prices, S, K, T, 0.0, types)
+    previous = reference.copy()
+    previous[::3] = np.nan
+    ivs = impliedVolatility(prices, S, K, T, 0.0, types, previous=previous)
+    assert np.allclose(ivs, reference, atol=MAX_ERROR, equal_nan=True)
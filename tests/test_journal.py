@@ -0,0 +1,93 @@
+import datetime
+import os
+
+import pytest
+
+from pyalgomate.barfeed.journal import TickJournal, journalToDataFrame, readJournal
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+START = datetime.datetime(2024, 4, 10, 23, 59, 59, 990000)
+INSTRUMENTS = ['NSE|NIFTY BANK', 'NFO|BANKNIFTY24APR48000CE', 'NFO|BANKNIFTY24APR48000PE']
+
+
+def buildTicks(count, start=START):
+    ret = []
+    for i in range(count):
+        dateTime = start + datetime.timedelta(milliseconds=i)
+        ret.append(QuoteBar(dateTime, 100 + i, 100 + i, 100 + i, 100 + i, i, 10 * i, INSTRUMENTS[i % 3],
+                            dateTime.replace(microsecond=0) if i % 2 else None))
+    return ret
+
+
+def assertSameTicks(ticks, readTicks):
+    assert len(readTicks) == len(ticks)
+    for tick, readTick in zip(ticks, readTicks):
+        assert readTick.getInstrument() == tick.getInstrument()
+        assert readTick.getDateTime() == tick.getDateTime()
+        assert readTick.getExchangeDateTime() == tick.getExchangeDateTime()
+        assert readTick.getClose() == tick.getClose()
+        assert readTick.getVolume() == tick.getVolume()
+        assert readTick.getOpenInterest() == tick.getOpenInterest()
+
+
+def writeJournal(directory, ticks, **kwargs):
+    journal = TickJournal(str(directory), blockSize=10, **kwargs)
+    journal.start()
+    for tick in ticks:
+        journal.record(tick)
+    journal.close()
+    return journal
+
+
+def testRoundTripRotatesOnTheDay(tmp_path):
+    # The last 5 ticks are on the next day
+    ticks = buildTicks(15)
+    journal = writeJournal(tmp_path, ticks)
+
+    firstDay = journal.getPath(START.date())
+    nextDay = journal.getPath(START.date() + datetime.timedelta(days=1))
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(firstDay), os.path.basename(nextDay)]
+    assertSameTicks(ticks[:10], list(readJournal(firstDay)))
+    assertSameTicks(ticks[10:], list(readJournal(nextDay)))
+    assert journal.getMetrics()['written'] == 15
+
+    df = journalToDataFrame(firstDay)
+    assert df["Ticker"].tolist() == [tick.getInstrument() for tick in ticks[:10]]
+    assert df["Exchange Date/Time"].isna().tolist() == [i % 2 == 0 for i in range(10)]
+
+
+def testTruncatedBlockRecovery(tmp_path):
+    ticks = buildTicks(25, START.replace(hour=10))
+    journal = writeJournal(tmp_path, ticks)
+    path = journal.getPath(START.date())
+    assert journal.getMetrics()['blocks'] == 3
+
+    # A crash while the last block was written
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size - 7)
+    assertSameTicks(ticks[:20], list(readJournal(path)))
+
+    # Journaling the same day again drops the incomplete block before appending
+    moreTicks = buildTicks(5, ticks[-1].getDateTime() + datetime.timedelta(seconds=1))
+    writeJournal(tmp_path, moreTicks)
+    assertSameTicks(ticks[:20] + moreTicks, list(readJournal(path)))
+
+
+def testDropsTicksWhenFull(tmp_path):
+    journal = TickJournal(str(tmp_path), maxPending=4)
+    for tick in buildTicks(6, START.replace(hour=10)):
+        journal.record(tick)
+    assert journal.getPendingCount() == 4
+    # Without the writer thread, close writes the buffered ticks itself
+    journal.close()
+    metrics = journal.getMetrics()
+    assert (metrics['recorded'], metrics['dropped'], metrics['written'], metrics['pending']) == (4, 2, 4, 0)
+    assert len(list(readJournal(journal.getPath(START.date())))) == 4
+
+
+def testInvalidJournal(tmp_path):
+    path = tmp_path / 'ticks-20240410.ptkj'
+    path.write_bytes(b'PTKX\x01\x00')
+    with pytest.raises(Exception, match="Invalid journal"):
+        list(readJournal(str(path)))
@@ -0,0 +1,123 @@
+import datetime
+import random
+
+import pytest
+from pyalgotrade import bar
+from pyalgotrade import broker
+from pyalgotrade.stratanalyzer import returns
+
+from pyalgomate.analyzers.ledger import Ledger
+from pyalgomate.brokers import QuantityTraits
+from pyalgomate.strategies import OptionGreeks
+
+START = datetime.datetime(2024, 4, 8, 9, 15)
+INSTRUMENTS = ['BANKNIFTY48000CE', 'BANKNIFTY48000PE', 'BANKNIFTY48100CE']
+
+
+class Position(object):
+    """The baseline: every position tracks its own fills and is marked at the last price."""
+
+    def __init__(self, instrument):
+        self.instrument = instrument
+        self.tracker = returns.PositionTracker(QuantityTraits())
+
+    def getInstrument(self):
+        return self.instrument
+
+    def getPnL(self, price):
+        return self.tracker.getPnL(price)
+
+
+def submit(ledger, position, action, quantity, orderId):
+    order = broker.MarketOrder(action, position.getInstrument(), quantity, False, QuantityTraits())
+    order.setSubmitted(orderId, START)
+    order.switchState(broker.Order.State.SUBMITTED)
+    order.switchState(broker.Order.State.ACCEPTED)
+    ledger.addPositionOrder(position, order)
+    return order
+
+
+def fill(ledger, position, order, quantity, price, commission):
+    order.addExecutionInfo(broker.OrderExecutionInfo(price, quantity, commission, START))
+    ledger.updateOrder(order)
+    # Reporting an order again doesn't apply its fills twice
+    ledger.updateOrder(order)
+    position.tracker.update(quantity if order.isBuy() else -quantity, price, commission)
+
+
+def updatePrices(ledger, lastPrices):
+    ledger.beforeOnBars(None, bar.Bars({instrument: bar.BasicBar(START, price, price, price, price, 0, None,
+                                                                   bar.Frequency.TRADE)
+                                        for instrument, price in lastPrices.items()}))
+
+
+def baselinePnL(positions, lastPrices):
+    return sum(position.getPnL(lastPrices[position.getInstrument()]) for position in positions)
+
+
+def testPnLMatchesThePositions():
+    random.seed(1)
+    ledger = Ledger()
+    lastPrices = {instrument: 200.0 for instrument in INSTRUMENTS}
+    positions = []
+    openPositions = []
+    for orderId in range(60):
+        position = Position(random.choice(INSTRUMENTS))
+        positions.append(position)
+        entryAction, exitAction = random.choice([(broker.Order.Action.BUY, broker.Order.Action.SELL),
+                                                 (broker.Order.Action.SELL, broker.Order.Action.BUY)])
+
+        # Entries are filled in two parts
+        entry = submit(ledger, position, entryAction, 30, f'{orderId}-entry')
+        fill(ledger, position, entry, 15, random.uniform(50, 500), random.uniform(0, 2))
+        fill(ledger, position, entry, 15, random.uniform(50, 500), random.uniform(0, 2))
+
+        lastPrices = {instrument: random.uniform(50, 500) for instrument in INSTRUMENTS}
+        updatePrices(ledger, lastPrices)
+        if random.random() < 0.3:
+            openPositions.append(position)
+        else:
+            exitOrder = submit(ledger, position, exitAction, 30, f'{orderId}-exit')
+            fill(ledger, position, exitOrder, 30, random.uniform(50, 500), random.uniform(0, 2))
+            ledger.removePosition(position)
+
+        assert ledger.getPnL() == pytest.approx(baselinePnL(positions, lastPrices), abs=1e-6)
+
+    closedPnL = sum(position.getPnL(None) for position in positions if position not in openPositions)
+    openPnL = baselinePnL(openPositions, lastPrices)
+    assert ledger.getPnL() == pytest.approx(closedPnL + openPnL, abs=1e-6)
+    assert sorted(ledger.getHoldings()) == sorted({position.getInstrument() for position in openPositions})
+
+    # Closing the rest leaves only realized PnL
+    for orderId, position in enumerate(openPositions):
+        quantity = position.tracker.getPosition()
+        action = broker.Order.Action.SELL if quantity > 0 else broker.Order.Action.BUY
+        exitOrder = submit(ledger, position, action, abs(quantity), f'{orderId}-close')
+        fill(ledger, position, exitOrder, abs(quantity), lastPrices[position.getInstrument()], 0)
+        ledger.removePosition(position)
+
+    assert ledger.getHoldings() == {}
+    assert ledger.getUnrealizedPnL() == 0
+    assert ledger.getPnL() == pytest.approx(baselinePnL(positions, lastPrices), abs=1e-6)
+    assert ledger.getPnL() == pytest.approx(sum(position.getPnL(None) for position in positions), abs=1e-6)
+
+
+def testDelta():
+    ledger = Ledger()
+    call, put = Position(INSTRUMENTS[0]), Position(INSTRUMENTS[1])
+    ledger.updateGreeks({
+        INSTRUMENTS[0]: OptionGreeks(None, 200, 0.5, 0.001, -10, 20, 0.15),
+        INSTRUMENTS[1]: OptionGreeks(None, 200, -0.5, 0.001, -10, 20, 0.15),
+    })
+    order = submit(ledger, call, broker.Order.Action.SELL, 15, 'call')
+    fill(ledger, call, order, 15, 200, 0)
+    order = submit(ledger, put, broker.Order.Action.SELL, 15, 'put')
+    fill(ledger, put, order, 15, 200, 0)
+    assert ledger.getDelta() == pytest.approx(0)
+    assert ledger.getNetDelta() == pytest.approx(0)
+    assert ledger.getNetTheta() == pytest.approx(300)
+
+    ledger.updateGreeks({INSTRUMENTS[0]: OptionGreeks(None, 250, 0.6, 0.001, -10, 20, 0.15),
+                         INSTRUMENTS[1]: OptionGreeks(None, 150, -0.4, 0.001, -10, 20, 0.15)})
+    assert ledger.getDelta() == pytest.approx(0.2)
+    assert ledger.getNetDelta() == pytest.approx(-3)
@@ -0,0 +1,85 @@
+import datetime
+import pickle
+import queue
+
+from pyalgotrade import bar
+
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+
+
+def buildQuoteBar(exchangeDateTime=datetime.datetime(2024, 4, 10, 9, 15)):
+    return QuoteBar(datetime.datetime(2024, 4, 10, 9, 15, 0, 500), 100.5, 101, 99.5, 100.75, 1200, 4500,
+                    'NFO|BANKNIFTY24APR48000CE', exchangeDateTime)
+
+
+def testFields():
+    quoteBar = buildQuoteBar()
+    assert isinstance(quoteBar, bar.Bar)
+    assert quoteBar.getDateTime() == datetime.datetime(2024, 4, 10, 9, 15, 0, 500)
+    assert quoteBar.getOpen() == 100.5
+    assert quoteBar.getHigh() == 101
+    assert quoteBar.getLow() == 99.5
+    assert quoteBar.getClose() == 100.75
+    assert quoteBar.getPrice() == 100.75
+    assert quoteBar.getVolume() == 1200
+    assert quoteBar.getOpenInterest() == 4500
+    assert quoteBar.getAdjClose() is None
+    assert quoteBar.getFrequency() == bar.Frequency.TRADE
+    assert not hasattr(quoteBar, '__dict__')
+
+
+def testExtraColumns():
+    quoteBar = buildQuoteBar()
+    assert dict(quoteBar.getExtraColumns()) == {
+        "Instrument": 'NFO|BANKNIFTY24APR48000CE',
+        "Open Interest": 4500,
+        "Date/Time": datetime.datetime(2024, 4, 10, 9, 15),
+    }
+    assert quoteBar.getExtraColumns().get("Message") is None
+
+
+def testPickle():
+    quoteBar = pickle.loads(pickle.dumps(buildQuoteBar()))
+    assert quoteBar.getInstrument() == 'NFO|BANKNIFTY24APR48000CE'
+    assert quoteBar.getClose() == 100.75
+    assert quoteBar.getExchangeDateTime() == datetime.datetime(2024, 4, 10, 9, 15)
+
+
+def testWithDateTimeKeepsExchangeDateTime():
+    dateTime = datetime.datetime(2024, 4, 10, 9, 15, 1)
+    quoteBar = buildQuoteBar().withDateTime(dateTime)
+    assert quoteBar.getDateTime() == dateTime
+    assert quoteBar.getExchangeDateTime() == datetime.datetime(2024, 4, 10, 9, 15)
+    assert quoteBar.getClose() == 100.75
+
+
+class KiteTicker(object):
+    MODE_FULL = 'full'
+
+    def subscribe(self, tokens):
+        pass
+
+    def set_mode(self, mode, tokens):
+        pass
+
+
+def testZerodhaIndexTickHasExchangeDateTime():
+    from pyalgomate.brokers.zerodha.wsclient import WebSocketClient
+
+    events = queue.Queue()
+    client = WebSocketClient(events, None, {260105: 'NSE|NIFTY BANK', 35000: 'NFO|BANKNIFTY24APR48000CE'})
+    client.onOpened(KiteTicker(), None)
+    exchangeTimestamp = datetime.datetime(2024, 4, 10, 9, 15, 2)
+    lastTradeTime = datetime.datetime(2024, 4, 10, 9, 15, 1)
+    client.onQuoteUpdate(None, [
+        # Index ticks have no last_trade_time
+        {'instrument_token': 260105, 'last_price': 48000.5, 'exchange_timestamp': exchangeTimestamp},
+        {'instrument_token': 260105, 'last_price': 48001.5},
+        {'instrument_token': 35000, 'last_price': 250.0, 'last_trade_time': lastTradeTime,
+         'exchange_timestamp': exchangeTimestamp},
+    ])
+
+    quoteBars = [events.get_nowait()[1] for _ in range(3)]
+    assert quoteBars[0].getExchangeDateTime() == exchangeTimestamp
+    assert quoteBars[1].getExchangeDateTime() is not None
+    assert quoteBars[2].getExchangeDateTime() == lastTradeTime
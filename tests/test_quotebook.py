@@ -0,0 +1,73 @@
+import threading
+import time
+
+from pyalgomate.barfeed.quotebook import QuoteBook
+
+
+def testMergesTicks():
+    book = QuoteBook()
+    assert book.getEntry('NSE|26009') is None
+    assert book.getVersion('NSE|26009') == 0
+
+    assert book.update('NSE|26009', {'lp': '48000.05', 'v': '10'}) == 1
+    quote = book.get('NSE|26009')
+    assert book.update('NSE|26009', {'lp': '48001.10'}) == 2
+    assert book.get('NSE|26009') == {'lp': '48001.10', 'v': '10'}
+    # Published quotes are never modified
+    assert quote == {'lp': '48000.05', 'v': '10'}
+
+    book.update('NFO|35000', {'lp': '250.00'})
+    assert sorted(book.keys()) == ['NFO|35000', 'NSE|26009']
+    assert book.getEntry('NSE|26009') == (2, {'lp': '48001.10', 'v': '10'})
+    assert book.getSequence() == 3
+    assert len(book) == 2 and 'NFO|35000' in book
+
+
+def testConcurrentReaders():
+    # A writer ticks 81 keys, adding them as it goes, while readers iterate the book. Each tick carries fields derived
+    # from the same counter, so a torn quote shows up as fields that don't agree with each other or with its version.
+    keys = [f'NFO|{35000 + i}' for i in range(81)]
+    book = QuoteBook()
+    stopped = threading.Event()
+    errors = []
+    reads = [0, 0]
+
+    def write():
+        counts = dict()
+        tick = 0
+        while not stopped.is_set():
+            key = keys[tick % len(keys)] if tick >= len(keys) * 10 else keys[(tick // 10) % len(keys)]
+            count = counts.get(key, 0) + 1
+            counts[key] = count
+            book.update(key, {'count': count, 'lp': count * 2, 'v': count * 3})
+            tick += 1
+            if tick % 100 == 0:
+                time.sleep(0)
+
+    def read(reader):
+        versions = dict()
+        try:
+            while not stopped.is_set():
+                for key, (version, quote) in book.items():
+                    count = quote['count']
+                    if quote['lp'] != count * 2 or quote['v'] != count * 3 or version != count:
+                        errors.append((key, version, quote))
+                    if version < versions.get(key, 0):
+                        errors.append((key, version, versions[key]))
+                    versions[key] = version
+                reads[reader] += 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    stopped.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert min(reads) > 0
+    assert len(book) == len(keys)
+    assert book.getSequence() == sum(book.getVersion(key) for key in keys)
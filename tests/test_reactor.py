@@ -0,0 +1,189 @@
+import asyncio
+import json
+import threading
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from pyalgomate.brokers.finvasia.wsclient import WebSocketClient
+from pyalgomate.brokers.reactor import Reactor, ReactorAdapter
+
+TOKEN_MAPPINGS = {'NSE|26009': 'NSE|Nifty Bank', 'NFO|35000': 'NFO|BANKNIFTY24APR48000C'}
+
+
+def waitUntil(condition, timeout=5):
+    end = time.time() + timeout
+    while not condition():
+        if time.time() > end:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class FakeNorenServer(object):
+    """A Noren websocket server on a local port: it accepts every login and answers every subscription with a quote.
+    It runs on a loop of its own, in a thread."""
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        self.__sockets = set()
+        self.__loop = asyncio.new_event_loop()
+        self.__runner = None
+        self.port = None
+
+    def start(self):
+        started = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, args=(started,), daemon=True)
+        self.__thread.start()
+        started.wait()
+
+    def __run(self, started):
+        asyncio.set_event_loop(self.__loop)
+        app = web.Application()
+        app.router.add_get('/', self.__serve)
+        self.__runner = web.AppRunner(app)
+        self.__loop.run_until_complete(self.__runner.setup())
+        site = web.TCPSite(self.__runner, '127.0.0.1', 0)
+        self.__loop.run_until_complete(site.start())
+        self.port = self.__runner.addresses[0][1]
+        started.set()
+        self.__loop.run_forever()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.__runner.cleanup(), self.__loop).result(5)
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+
+    def getUrl(self):
+        return f'ws://127.0.0.1:{self.port}/'
+
+    def getSubscriptions(self):
+        return [message['k'] for message in self.messages if message['t'] == 't']
+
+    def isConnected(self):
+        return len(self.__sockets) > 0
+
+    def disconnect(self):
+        """Closes the open websockets, as the broker does when it drops a session."""
+        async def close():
+            for socket in list(self.__sockets):
+                await socket.close()
+        asyncio.run_coroutine_threadsafe(close(), self.__loop).result(5)
+
+    async def __serve(self, request):
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.connections += 1
+        self.__sockets.add(socket)
+        try:
+            async for message in socket:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                message = json.loads(message.data)
+                self.messages.append(message)
+                if message['t'] == 'c':
+                    await socket.send_str(json.dumps({'t': 'ck', 's': 'OK', 'uid': message['uid']}))
+                elif message['t'] == 't':
+                    for channel in message['k'].split('#'):
+                        exchange, token = channel.split('|')
+                        await socket.send_str(json.dumps({'t': 'tk', 'e': exchange, 'tk': token, 'lp': '100.00',
+                                                          'ft': str(int(time.time()))}))
+        finally:
+            self.__sockets.discard(socket)
+        return socket
+
+
+class RecordingAdapter(ReactorAdapter):
+    def __init__(self, url):
+        self.url = url
+        self.events = []
+
+    def getUrl(self):
+        return self.url
+
+    def onConnected(self, reactor):
+        self.events.append('connected')
+
+    def onMessage(self, message):
+        self.events.append(message)
+
+    def onDisconnected(self):
+        self.events.append('disconnected')
+
+
+@pytest.fixture
+def server():
+    server = FakeNorenServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def reactor():
+    reactor = Reactor()
+    yield reactor
+    reactor.stop()
+
+
+def testReconnects(server, reactor):
+    adapter = RecordingAdapter(server.getUrl())
+    reactor.addAdapter(adapter)
+    assert waitUntil(lambda: reactor.isConnected(adapter))
+
+    server.disconnect()
+    assert waitUntil(lambda: adapter.events.count('connected') == 2)
+    assert adapter.events == ['connected', 'disconnected', 'connected']
+    assert server.connections == 2
+    assert reactor.getMetrics()['connects'] == 2
+
+    # Sends go to the new websocket
+    reactor.send(adapter, json.dumps({'t': 'c', 'uid': 'USER'}))
+    assert waitUntil(lambda: len(adapter.events) == 4)
+    assert json.loads(adapter.events[-1])['t'] == 'ck'
+
+
+def testSubscriptionsAreReplayed(server, reactor):
+    client = WebSocketClient(None, TOKEN_MAPPINGS, reactor, server.getUrl(), 'USER', 'TOKEN')
+    client.startClient()
+    assert client.waitInitialized(5)
+    assert server.getSubscriptions() == ['NSE|26009#NFO|35000']
+
+    client.subscribe(['NFO|35001'])
+    client.unsubscribe(['NFO|35000'])
+    assert waitUntil(lambda: client.getQuotes().get('NFO|35001') is not None)
+    assert client.getChannels() == ('NSE|26009', 'NFO|35001')
+
+    del server.messages[:]
+    server.disconnect()
+    assert waitUntil(lambda: len(server.getSubscriptions()) == 1)
+    # Logged in again, then subscribed to the current channels in one frame
+    assert [message['t'] for message in server.messages] == ['c', 't']
+    assert server.getSubscriptions() == ['NSE|26009#NFO|35001']
+    assert waitUntil(client.isConnected)
+    client.stopClient()
+
+
+def testShutdown(server, reactor):
+    adapters = [RecordingAdapter(server.getUrl()) for _ in range(2)]
+    for adapter in adapters:
+        reactor.addAdapter(adapter)
+    assert waitUntil(lambda: all(reactor.isConnected(adapter) for adapter in adapters))
+
+    # Removing an adapter closes its websocket only, and it doesn't reconnect
+    reactor.removeAdapter(adapters[0], 5)
+    assert adapters[0].events == ['connected', 'disconnected']
+    assert reactor.getAdapterCount() == 1
+    assert reactor.isConnected(adapters[1])
+
+    reactor.stop()
+    assert not reactor.isRunning()
+    assert adapters[1].events == ['connected', 'disconnected']
+    assert waitUntil(lambda: not server.isConnected())
+    assert server.connections == 2
+    # Stopping twice and sending after the stop are no-ops
+    reactor.stop()
+    reactor.send(adapters[1], 'ignored')
@@ -0,0 +1,105 @@
+import datetime
+
+import pandas as pd
+import pytest
+from pyalgotrade import dispatcher
+
+from pyalgomate.backtesting.ReplayFeed import ReplayFeed
+from pyalgomate.barfeed.journal import TickJournal
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.core.dispatcher import LiveDispatcher
+
+START = datetime.datetime(2024, 4, 10, 9, 15)
+INDEX = 'NSE|NIFTY BANK'
+CALL = 'NFO|BANKNIFTY24APR48000CE'
+PUT = 'NFO|BANKNIFTY24APR48000PE'
+
+
+def buildTick(milliseconds, instrument, price, exchangeDateTime=True):
+    dateTime = START + datetime.timedelta(milliseconds=milliseconds)
+    # Index ticks are journaled without an exchange datetime
+    return QuoteBar(dateTime, price, price, price, price, 10, 100, instrument,
+                    dateTime.replace(microsecond=0) if exchangeDateTime and instrument != INDEX else None)
+
+
+def writeJournal(directory, prefix, ticks):
+    journal = TickJournal(str(directory), prefix)
+    for tick in ticks:
+        journal.record(tick)
+    journal.close()
+
+
+def replay(feed, dispatcher_):
+    ret = []
+    feed.getNewValuesEvent().subscribe(lambda dateTime, bars: ret.append(
+        (dateTime, {instrument: bars[instrument].getClose() for instrument in bars.getInstruments()})))
+    dispatcher_.addSubject(feed)
+    dispatcher_.run()
+    return ret
+
+
+@pytest.fixture
+def journals(tmp_path):
+    # The index and the options were journaled by two feeds. The ticks of a file are in order, the files interleave.
+    writeJournal(tmp_path, 'index', [buildTick(0, INDEX, 48000), buildTick(2, INDEX, 48001),
+                                     buildTick(5, INDEX, 48002)])
+    writeJournal(tmp_path, 'options', [buildTick(1, CALL, 250), buildTick(2, CALL, 250.5), buildTick(2, PUT, 240),
+                                       buildTick(2, CALL, 251), buildTick(4, PUT, 241)])
+    return tmp_path
+
+
+def testReplaysInDateTimeOrder(journals):
+    feed = ReplayFeed(str(journals))
+    bars = replay(feed, dispatcher.Dispatcher())
+
+    # The ticks that share a datetime are dispatched together, with the latest value of each instrument, whether or
+    # not they have an exchange datetime
+    assert [(dateTime - START, values) for dateTime, values in bars] == [
+        (datetime.timedelta(milliseconds=0), {INDEX: 48000}),
+        (datetime.timedelta(milliseconds=1), {CALL: 250}),
+        (datetime.timedelta(milliseconds=2), {INDEX: 48001, PUT: 240, CALL: 251}),
+        (datetime.timedelta(milliseconds=4), {PUT: 241}),
+        (datetime.timedelta(milliseconds=5), {INDEX: 48002}),
+    ]
+    assert feed.getMetrics()['conflated'] == 1
+    assert feed.getLastBar(INDEX).getExchangeDateTime() is None
+    # The last tick has no exchange datetime, its datetime is used instead
+    assert feed.getLastUpdatedDateTime() == START + datetime.timedelta(milliseconds=5)
+
+    # Two runs dispatch the same bars
+    assert replay(ReplayFeed(str(journals)), dispatcher.Dispatcher()) == bars
+
+
+def testReplaysInRealTime(journals):
+    feed = ReplayFeed(str(journals), speed=100)
+    bars = replay(feed, LiveDispatcher())
+
+    lastValues = dict()
+    for _, values in bars:
+        lastValues.update(values)
+    assert lastValues == {INDEX: 48002, CALL: 251, PUT: 241}
+    assert all(a[0] < b[0] for a, b in zip(bars, bars[1:]))
+    assert feed.getMetrics()['ticks'] == 8
+    assert feed.getLastBar(INDEX).getExchangeDateTime() is None
+    assert feed.getLastUpdatedDateTime() is not None
+
+
+def testReplaysDataFrames():
+    # Unsorted, and without the exchange datetime column
+    df = pd.DataFrame({
+        'Ticker': [CALL, INDEX, CALL],
+        'Date/Time': [START + datetime.timedelta(seconds=1), START, START],
+        'Price': [251.0, 48000.0, 250.0],
+    })
+    bars = replay(ReplayFeed(df), dispatcher.Dispatcher())
+    assert bars == [(START, {CALL: 250.0, INDEX: 48000.0}), (START + datetime.timedelta(seconds=1), {CALL: 251.0})]
+
+
+def testUnsubscribedInstrumentsAreSkipped(journals):
+    feed = ReplayFeed(str(journals))
+    feed.unsubscribeInstruments([PUT])
+    assert feed.subscribeInstruments(['NFO|UNKNOWN']) == []
+
+    bars = replay(feed, dispatcher.Dispatcher())
+    assert all(PUT not in values for _, values in bars)
+    assert len(bars) == 4
@@ -0,0 +1,62 @@
+import datetime
+import warnings
+
+import numpy as np
+import pytz
+
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.barfeed.ringbuffer import BarRingBuffer, BarDataSeries
+
+START = datetime.datetime(2024, 4, 10, 9, 15)
+
+
+def buildQuoteBar(i, dateTime=None):
+    dateTime = dateTime if dateTime is not None else START + datetime.timedelta(minutes=i)
+    return QuoteBar(dateTime, i, i + 1, i - 1, i + 0.5, 10 * i, 100 * i, 'NSE|NIFTY BANK')
+
+
+def testLastWrapsAround():
+    ringBuffer = BarRingBuffer(5)
+    for i in range(12):
+        ringBuffer.appendBar(buildQuoteBar(i))
+
+    assert len(ringBuffer) == 5
+    assert ringBuffer.last().tolist() == [7.5, 8.5, 9.5, 10.5, 11.5]
+    assert ringBuffer.last(2, 'high').tolist() == [11, 12]
+    assert ringBuffer.last(100, 'openInterest').tolist() == [700, 800, 900, 1000, 1100]
+    assert ringBuffer.last(1, 'dateTime')[0] == np.datetime64(START + datetime.timedelta(minutes=11), 'us')
+    assert not ringBuffer.last().flags.writeable
+
+
+def testGrowsToCapacity():
+    ringBuffer = BarRingBuffer(200)
+    for i in range(150):
+        ringBuffer.appendBar(buildQuoteBar(i))
+    assert ringBuffer.last(3, 'open').tolist() == [147, 148, 149]
+    assert ringBuffer.last().tolist() == [i + 0.5 for i in range(150)]
+
+
+def testTimezoneAwareDateTimes():
+    ringBuffer = BarRingBuffer(5)
+    dateTime = pytz.timezone('Asia/Kolkata').localize(START)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        ringBuffer.appendBar(buildQuoteBar(0, dateTime))
+        ringBuffer.appendBar(buildQuoteBar(1, dateTime.astimezone(pytz.utc) + datetime.timedelta(minutes=1)))
+
+    assert ringBuffer.last(field='dateTime').tolist() == [START, START + datetime.timedelta(minutes=1)]
+
+
+def testDataSeriesRingBufferIsOptIn():
+    dataSeries = BarDataSeries(maxLen=10, capacity=4)
+    for i in range(6):
+        dataSeries.appendWithDateTime(START + datetime.timedelta(minutes=i), buildQuoteBar(i))
+    assert not dataSeries.hasRingBuffer()
+
+    # Created with the bars held so far, then kept up to date
+    assert dataSeries.last().tolist() == [2.5, 3.5, 4.5, 5.5]
+    assert dataSeries.hasRingBuffer()
+    dataSeries.appendWithDateTime(START + datetime.timedelta(minutes=6), buildQuoteBar(6))
+    assert dataSeries.last(2).tolist() == [5.5, 6.5]
+    assert dataSeries.getRingBuffer() is dataSeries.getRingBuffer()
+    assert len(dataSeries) == 7
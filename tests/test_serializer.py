@@ -0,0 +1,61 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from pyalgomate.greeks.serializer import FIELDS, toColumns, toRecords
+from pyalgomate.strategies import OptionContract, OptionGreeks
+
+EXPIRY = datetime.date(2024, 4, 10)
+
+
+def buildOptionData():
+    optionData = dict()
+    for strike in (47900, 48000):
+        for type_ in 'cp':
+            symbol = f'BANKNIFTY24410{strike}{type_.upper()}E'
+            optionData[symbol] = OptionGreeks(OptionContract(symbol, strike, EXPIRY, type_, 'NSE|NIFTY BANK'),
+                                              np.float64(120.5), np.float64(0.45), np.float64(0.0004),
+                                              np.float64(-25.3), np.float64(12.1), np.float64(0.14), 1500.0)
+    return optionData
+
+
+def reflect(optionData):
+    """The payload the strategies used to build with reflection."""
+    ret = dict()
+    for instrument, optionGreek in optionData.items():
+        optionGreekDict = dict([attr, getattr(optionGreek, attr)]
+                               for attr in dir(optionGreek) if not attr.startswith('_'))
+        optionContract = optionGreekDict.pop('optionContract')
+        optionContractDict = dict([attr, getattr(optionContract, attr)] for attr in dir(
+            optionContract) if not attr.startswith('_'))
+        if 'expiry' in optionContractDict:
+            optionContractDict['expiry'] = optionContractDict['expiry'].strftime('%Y-%m-%d')
+        optionGreekDict.update(optionContractDict)
+        ret[instrument] = optionGreekDict
+    return ret
+
+
+def testRecordsMatchTheReflectedPayload():
+    optionData = buildOptionData()
+    records = toRecords(optionData)
+    assert records == reflect(optionData)
+    assert all(list(record) == list(FIELDS) for record in records.values())
+
+
+def testColumns():
+    optionData = buildOptionData()
+    # A contract without an expiry
+    optionData['BANKNIFTY48100CE'] = OptionGreeks(OptionContract('BANKNIFTY48100CE', 48100, None, 'c', 'BANKNIFTY'),
+                                                  100.0, 0.4, 0.0003, -20.0, 11.0, 0.15)
+    columns = toColumns(optionData)
+
+    assert sorted(columns) == sorted(FIELDS)
+    assert columns['symbol'].tolist() == list(optionData)
+    assert columns['strike'].dtype == float and columns['delta'].dtype == float
+    assert columns['expiry'].tolist() == ['2024-04-10'] * 4 + [None]
+    assert columns['oi'].tolist() == [1500.0] * 4 + [0.0]
+    df = pd.DataFrame(columns)
+    assert df.loc[4, 'underlying'] == 'BANKNIFTY'
+
+    assert all(len(column) == 0 for column in toColumns(dict()).values())
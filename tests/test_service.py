@@ -0,0 +1,86 @@
+import datetime
+import logging
+
+import pandas as pd
+from pyalgotrade import bar
+
+from pyalgomate.backtesting.CustomCSVFeed import CustomCSVFeed
+from pyalgomate.barfeed.arrays import BarArrays
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.brokers import BacktestingBroker
+from pyalgomate.greeks.service import GreeksService, getGreeksService
+from pyalgomate.strategies import OptionContract
+from pyalgomate.strategies.BaseOptionsGreeksStrategy import BaseOptionsGreeksStrategy
+
+START = datetime.datetime(2024, 4, 8, 9, 15)
+STRIKES = (47900, 48000, 48100)
+
+
+def priceOption(strike, type_, underlyingPrice):
+    intrinsic = max(underlyingPrice - strike if type_ == 'C' else strike - underlyingPrice, 0)
+    return round(intrinsic + 300, 2)
+
+
+class GreeksStrategy(BaseOptionsGreeksStrategy):
+    def __init__(self, feed, broker):
+        super(GreeksStrategy, self).__init__(feed, broker, 'GreeksStrategy', logging.getLogger(__name__))
+        self.optionData = []
+
+    def onBars(self, bars):
+        self.getOptionData(bars)
+        # Asking again for the same bars doesn't update the arrays
+        self.optionData.append(dict(self.getOptionData(bars)))
+
+
+def testStrategyOnCSVFeed(tmp_path, monkeypatch):
+    # Strategies write their results to the working directory
+    monkeypatch.chdir(tmp_path)
+    rows = []
+    for minute in range(5):
+        dateTime = START + datetime.timedelta(minutes=minute)
+        underlyingPrice = 48000.0 + 20 * minute
+        rows.append(('BANKNIFTY', dateTime, underlyingPrice))
+        for strike in STRIKES:
+            for type_ in 'CP':
+                rows.append((f'BANKNIFTY10APR24{type_}{strike}', dateTime, priceOption(strike, type_, underlyingPrice)))
+    df = pd.DataFrame([{'Ticker': ticker, 'Date/Time': dateTime, 'Open': price, 'High': price, 'Low': price,
+                        'Close': price, 'Volume': 0, 'Open Interest': 100} for ticker, dateTime, price in rows])
+
+    feed = CustomCSVFeed()
+    feed.addBarsFromDataframe(df)
+    assert getGreeksService(feed) is None
+    strategy = GreeksStrategy(feed, BacktestingBroker(200000, feed))
+    strategy.run()
+
+    service = strategy.getGreeksService()
+    assert len(strategy.optionData) == 5
+    assert service.getCalculationCount() == 5
+    assert service.getUpdateCount() == 10
+    optionData = strategy.optionData[-1]
+    assert len(optionData) == 2 * len(STRIKES)
+    call = optionData['BANKNIFTY10APR24C48000']
+    put = optionData['BANKNIFTY10APR24P48000']
+    assert call.price == priceOption(48000, 'C', 48080.0)
+    assert 0 < call.delta < 1 and -1 < put.delta < 0
+    assert call.iv > 0 and put.iv > 0
+
+
+def testStrategiesShareTheService():
+    barArrays = BarArrays()
+    service = GreeksService(barArrays)
+    underlying = 'NSE|NIFTY BANK'
+    contracts = {f'BANKNIFTY24410{strike}{type_}': OptionContract(f'BANKNIFTY24410{strike}{type_}', strike,
+                                                                    datetime.date(2024, 4, 10), type_.lower(),
+                                                                    underlying)
+                 for strike in STRIKES for type_ in 'CP'}
+    bars = {underlying: QuoteBar(START, 48000, 48000, 48000, 48000, 0, 0, underlying)}
+    for symbol, contract in contracts.items():
+        price = priceOption(contract.strike, contract.type.upper(), 48000)
+        bars[symbol] = QuoteBar(START, price, price, price, price, 0, 100, symbol)
+    barArrays.update(bar.Bars(bars))
+
+    snapshots = [service.update(contracts.get) for _ in range(3)]
+    assert snapshots[0] is snapshots[1] is snapshots[2]
+    assert sorted(snapshots[0].getOptionData()) == sorted(contracts)
+    assert service.getCalculationCount() == 1
+    assert service.getUpdateCount() == 3
@@ -0,0 +1,133 @@
+import datetime
+import socket
+import time
+
+import pytest
+
+from pyalgomate.brokers.finvasia.broker import getOptionSymbol
+from pyalgomate.brokers.finvasia.simulator import NorenSimulator
+from pyalgomate.brokers.finvasia.wsclient import WebSocketClient
+from pyalgomate.brokers.reactor import Reactor
+
+UNDERLYING = 'NSE|NIFTY BANK'
+EXPIRY = datetime.date.today() + datetime.timedelta(days=7)
+CALL = getOptionSymbol(UNDERLYING, EXPIRY, 47000, 'C')
+
+
+def getFreePort():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def startSimulator():
+    simulators = []
+
+    def start(**kwargs):
+        simulator = NorenSimulator(port=getFreePort(), seed=1, **kwargs)
+        tokenMappings = simulator.addOptionChain(UNDERLYING, 47050, EXPIRY, count=2)
+        simulator.start()
+        simulators.append(simulator)
+        api, userToken = simulator.createSession()
+        return simulator, api, userToken, tokenMappings
+
+    yield start
+    for simulator in simulators:
+        simulator.stop()
+
+
+def placeOrder(api, buyOrSell, priceType, price=0.0, triggerPrice=None, quantity=15):
+    exchange, tradingSymbol = CALL.split('|')
+    ret = api.place_order(buy_or_sell=buyOrSell, product_type='M', exchange=exchange, tradingsymbol=tradingSymbol,
+                          quantity=quantity, discloseqty=0, price_type=priceType, price=price,
+                          trigger_price=triggerPrice)
+    assert ret['stat'] == 'Ok'
+    return ret['norenordno']
+
+
+def getOrder(api, orderId):
+    return api.single_order_history(orderno=orderId)[0]
+
+
+def testMarketOrderFillsAtTheLtp(startSimulator):
+    simulator, api, _, tokenMappings = startSimulator(ticksPerSecond=0)
+    orderId = placeOrder(api, 'B', 'MKT')
+
+    order = getOrder(api, orderId)
+    assert order['status'] == 'COMPLETE'
+    assert order['fillshares'] == '15'
+    ltp = float(api.get_quotes(exchange='NFO', token=tokenMappings[CALL].split('|')[1])['lp'])
+    # The option is repriced with the underlying between the two requests
+    assert abs(float(order['avgprc']) - ltp) < 5
+    assert float(api.get_limits()['marginused']) == pytest.approx(float(order['avgprc']) * 15)
+    assert simulator.getMetrics()['fills'] == 1
+
+
+def testLimitOrders(startSimulator):
+    _, api, _, _ = startSimulator(ticksPerSecond=0)
+
+    # Below the LTP, it waits
+    orderId = placeOrder(api, 'B', 'LMT', 0.05)
+    assert getOrder(api, orderId)['status'] == 'OPEN'
+
+    # Modified through the LTP, it fills at the LTP
+    exchange, tradingSymbol = CALL.split('|')
+    api.modify_order(orderno=orderId, exchange=exchange, tradingsymbol=tradingSymbol, newquantity=15,
+                     newprice_type='LMT', newprice=10000.0)
+    order = getOrder(api, orderId)
+    assert order['status'] == 'COMPLETE'
+    assert float(order['avgprc']) < 10000
+
+    orderId = placeOrder(api, 'S', 'LMT', 10000.0)
+    assert api.cancel_order(orderno=orderId)['stat'] == 'Ok'
+    assert getOrder(api, orderId)['status'] == 'CANCELED'
+    # Closed orders can't be canceled again
+    assert api.cancel_order(orderno=orderId) is None
+
+
+def testStopOrderWaitsForItsTrigger(startSimulator):
+    _, api, _, _ = startSimulator(ticksPerSecond=0)
+    orderId = placeOrder(api, 'B', 'SL-LMT', 10000.0, 9000.0)
+    assert getOrder(api, orderId)['status'] == 'TRIGGER_PENDING'
+
+    # A sell stop above the LTP is triggered at once
+    orderId = placeOrder(api, 'S', 'SL-MKT', triggerPrice=9000.0)
+    assert getOrder(api, orderId)['status'] == 'COMPLETE'
+
+
+def testOrdersOverTheCashAreRejected(startSimulator):
+    _, api, _, _ = startSimulator(ticksPerSecond=0, cash=1000.0)
+    order = getOrder(api, placeOrder(api, 'B', 'MKT'))
+    assert order['status'] == 'REJECTED'
+    assert order['rejreason'] == 'RMS:Margin Exceeds'
+    assert float(api.get_limits()['marginused']) == 0
+
+
+def testOrdersFillOnTicks(startSimulator):
+    simulator, api, userToken, tokenMappings = startSimulator(ticksPerSecond=500)
+    reactor = Reactor()
+    channel = tokenMappings[CALL]
+    client = WebSocketClient(api, {channel: CALL}, reactor, simulator.getWebsocketUrl(), 'SIMULATOR', userToken)
+    client.startClient()
+    try:
+        assert client.waitInitialized(5)
+        ltp = float(client.getQuotes().get(channel)['lp'])
+        # Limits a point on each side of the LTP, the ticks move the price through one of them first
+        buyOrderId = placeOrder(api, 'B', 'LMT', round(ltp - 1, 2))
+        sellOrderId = placeOrder(api, 'S', 'LMT', round(ltp + 1, 2))
+
+        end = time.time() + 20
+        while simulator.getMetrics()['fills'] == 0 and time.time() < end:
+            time.sleep(0.05)
+        orders = [getOrder(api, buyOrderId), getOrder(api, sellOrderId)]
+        assert sorted(order['status'] for order in orders) == ['COMPLETE', 'OPEN']
+        filled = next(order for order in orders if order['status'] == 'COMPLETE')
+        if filled['trantype'] == 'B':
+            assert float(filled['avgprc']) <= ltp - 1
+        else:
+            assert float(filled['avgprc']) >= ltp + 1
+        assert simulator.getMetrics()['ticks'] > 0
+    finally:
+        client.stopClient()
+        reactor.stop()
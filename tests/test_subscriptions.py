@@ -0,0 +1,120 @@
+import datetime
+
+from pyalgomate.barfeed.subscriptions import SubscriptionManager
+
+UNDERLYING = 'BANKNIFTY'
+WEEKLY = datetime.date(2024, 4, 10)
+
+
+def getOptionSymbol(underlying, expiry, strike, callOrPut):
+    return f'{underlying}{expiry:%d%b%y}{callOrPut}{strike}'.upper()
+
+
+def getStrikes(instruments, expiry):
+    prefix = f'{UNDERLYING}{expiry:%d%b%y}C'.upper()
+    return sorted(int(instrument[len(prefix):]) for instrument in instruments if instrument.startswith(prefix))
+
+
+class FakeFeed(object):
+    def __init__(self):
+        self.instruments = set()
+        self.subscriptionManager = None
+        self.newValuesHandlers = []
+        self.unsubscribed = []
+
+    def setSubscriptionManager(self, subscriptionManager):
+        self.subscriptionManager = subscriptionManager
+
+    def getNewValuesEvent(self):
+        feed = self
+
+        class Event(object):
+            def subscribe(self, handler):
+                feed.newValuesHandlers.append(handler)
+        return Event()
+
+    def subscribeInstruments(self, instruments):
+        instruments = [instrument for instrument in instruments if instrument not in self.instruments]
+        self.instruments.update(instruments)
+        return instruments
+
+    def unsubscribeInstruments(self, instruments):
+        self.unsubscribed.extend(instruments)
+        self.instruments.difference_update(instruments)
+
+
+def buildManager(**kwargs):
+    manager = SubscriptionManager(getOptionSymbol, **kwargs)
+    symbols = manager.addWindow(UNDERLYING, WEEKLY, 47030, 100, 2)
+    feed = FakeFeed()
+    feed.instruments.update(symbols)
+    manager.attach(feed)
+    return manager, feed
+
+
+def testInitialWindow():
+    manager, feed = buildManager()
+    assert feed.subscriptionManager is manager
+    assert len(feed.newValuesHandlers) == 1
+    assert getStrikes(manager.getInstruments(), WEEKLY) == [46800, 46900, 47000, 47100, 47200]
+    assert manager.getSubscriptionCount() == 10
+    assert manager.getWindows(UNDERLYING)[0].center == 47000
+
+
+def testRollsOnlyPastTheThreshold():
+    manager, feed = buildManager(rollThreshold=2, retireBuffer=1)
+    manager.update(UNDERLYING, 47190)
+    assert manager.getMetrics()['rolls'] == 0
+
+    manager.update(UNDERLYING, 47210)
+    assert manager.getWindows(UNDERLYING)[0].center == 47200
+    # The new strikes are subscribed, the ones more than retireBuffer strikes outside of the window are retired
+    assert getStrikes(feed.instruments, WEEKLY) == [46900, 47000, 47100, 47200, 47300, 47400]
+    assert sorted(feed.unsubscribed) == ['BANKNIFTY10APR24C46800', 'BANKNIFTY10APR24P46800']
+    assert manager.getMetrics() == {'subscriptions': 12, 'rolls': 1, 'subscribed': 4, 'unsubscribed': 2}
+
+    # Moving back within the threshold doesn't roll again
+    manager.update(UNDERLYING, 47110)
+    assert manager.getMetrics()['rolls'] == 1
+    assert manager.getWindows(UNDERLYING)[0].center == 47200
+
+
+def testRetainedInstrumentsStaySubscribed():
+    manager, feed = buildManager(rollThreshold=1, retireBuffer=0)
+    manager.addRetentionCheck(lambda instrument: instrument == 'BANKNIFTY10APR24P46800')
+    manager.update(UNDERLYING, 47530)
+    assert 'BANKNIFTY10APR24P46800' in feed.instruments
+    assert 'BANKNIFTY10APR24C46800' not in feed.instruments
+    assert 'BANKNIFTY10APR24P46800' in manager.getInstruments()
+
+
+def testSharedSymbolsAreKept():
+    # A weekly expiry that is also the monthly one
+    manager, feed = buildManager(rollThreshold=1, retireBuffer=0)
+    feed.instruments.update(manager.addWindow(UNDERLYING, WEEKLY, 47030, 100, 4))
+    manager.update(UNDERLYING, 47130)
+    # The narrow window retires 46800, but the wider one still holds it
+    assert 'BANKNIFTY10APR24C46800' not in manager.getWindows(UNDERLYING)[0].strikes
+    assert 'BANKNIFTY10APR24C46800' in feed.instruments
+    assert 'BANKNIFTY10APR24C46600' not in feed.instruments
+    assert 'BANKNIFTY10APR24C46800' not in feed.unsubscribed
+
+
+def testFollowsTheBarsOfTheFeed():
+    manager, feed = buildManager(rollThreshold=1, retireBuffer=0)
+    manager.addWindow('NIFTY', WEEKLY, 22010, 50, 1)
+
+    class Bar(object):
+        def __init__(self, price):
+            self.price = price
+
+        def getClose(self):
+            return self.price
+
+    class Bars(object):
+        def getBar(self, instrument):
+            return {UNDERLYING: Bar(47330)}.get(instrument, None)
+
+    feed.newValuesHandlers[0](None, Bars())
+    assert manager.getWindows(UNDERLYING)[0].center == 47300
+    assert manager.getWindows('NIFTY')[0].center == 22000
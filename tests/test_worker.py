@@ -0,0 +1,69 @@
+import datetime
+import time
+
+from pyalgotrade import bar
+
+from pyalgomate.barfeed.arrays import BarArrays
+from pyalgomate.barfeed.QuoteBar import QuoteBar
+from pyalgomate.greeks.calculator import GreeksCalculator
+from pyalgomate.greeks.worker import GreeksWorker
+from pyalgomate.strategies import OptionContract
+
+UNDERLYING = 'NSE|NIFTY BANK'
+EXPIRY = datetime.date(2024, 4, 10)
+CONTRACTS = {f'BANKNIFTY24410{strike}{type_}': OptionContract(f'BANKNIFTY24410{strike}{type_}', strike, EXPIRY,
+                                                                type_.lower(), UNDERLYING)
+             for strike in (47900, 48000, 48100) for type_ in 'CP'}
+
+
+def buildBars(dateTime, underlyingPrice):
+    bars = {UNDERLYING: QuoteBar(dateTime, underlyingPrice, underlyingPrice, underlyingPrice, underlyingPrice, 0, 0,
+                                 UNDERLYING)}
+    for symbol, contract in CONTRACTS.items():
+        intrinsic = max(underlyingPrice - contract.strike if contract.type == 'c' else
+                        contract.strike - underlyingPrice, 0)
+        price = round(intrinsic + 300, 2)
+        bars[symbol] = QuoteBar(dateTime, price, price, price, price, 0, 100, symbol)
+    return bar.Bars(bars)
+
+
+def waitFor(condition, timeout=30):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def testPublishesSnapshots():
+    barArrays = BarArrays()
+    calculator = GreeksCalculator(CONTRACTS.get)
+    worker = GreeksWorker(calculator)
+    worker.start()
+    try:
+        assert worker.getSnapshot() is None and worker.getStaleness() is None
+
+        dateTime = datetime.datetime(2024, 4, 8, 10, 0)
+        barArrays.update(buildBars(dateTime, 48000.0))
+        calculator.addInstruments(barArrays)
+        worker.submit(barArrays.copy())
+        waitFor(lambda: worker.getSnapshot() is not None)
+
+        snapshot = worker.getSnapshot()
+        assert snapshot.getVersion() == barArrays.getVersion()
+        assert snapshot.getDateTime() == dateTime
+        assert sorted(snapshot.getOptionData()) == sorted(CONTRACTS)
+        assert snapshot.getRecords() is snapshot.getRecords()
+        assert worker.getStaleness() >= 0
+
+        # A new snapshot is published for the next bars, the previous one is left untouched
+        barArrays.update(buildBars(dateTime + datetime.timedelta(seconds=1), 48050.0))
+        worker.submit(barArrays.copy())
+        waitFor(lambda: worker.getSnapshot() is not snapshot)
+        assert worker.getSnapshot().getVersion() == barArrays.getVersion()
+        assert snapshot.getDateTime() == dateTime
+    finally:
+        worker.stop()
+        worker.join(5)
+    assert not worker.is_alive()
+    assert worker.getSubmittedCount() == 2
+    assert worker.getComputedCount() == 2